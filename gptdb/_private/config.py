@@ -176,6 +176,17 @@ class Config(metaclass=Singleton):
         self.NATIVE_SQL_CAN_RUN_WRITE = (
             os.getenv("NATIVE_SQL_CAN_RUN_WRITE", "True").lower() == "true"
         )
+        # The max rows and bytes of the SQL result to display
+        self.SQL_RESULT_MAX_ROWS = int(os.getenv("SQL_RESULT_MAX_ROWS", 10000))
+        self.SQL_RESULT_MAX_BYTES = int(
+            os.getenv("SQL_RESULT_MAX_BYTES", 16 * 1024 * 1024)
+        )
+        # The connection pool of the datasource connectors
+        self.DATASOURCE_POOL_SIZE = int(os.getenv("DATASOURCE_POOL_SIZE", 5))
+        self.DATASOURCE_POOL_OVERFLOW = int(os.getenv("DATASOURCE_POOL_OVERFLOW", 10))
+        self.DATASOURCE_POOL_RECYCLE = int(os.getenv("DATASOURCE_POOL_RECYCLE", 3600))
+        # Seconds, the cached connector which is idle longer than it will be disposed
+        self.DATASOURCE_IDLE_TIMEOUT = int(os.getenv("DATASOURCE_IDLE_TIMEOUT", 1800))
 
         # gptdb meta info database connection configuration
         self.LOCAL_DB_HOST = os.getenv("LOCAL_DB_HOST")
@@ -275,6 +286,11 @@ class Config(metaclass=Singleton):
         self.KNOWLEDGE_CHAT_SHOW_RELATIONS = (
             os.getenv("KNOWLEDGE_CHAT_SHOW_RELATIONS", "False").lower() == "true"
         )
+        # Whether to create the full-text index of the chunk content, SQLite FTS5
+        # or MySQL FULLTEXT, to search the chunks without scanning all of them.
+        self.KNOWLEDGE_CHUNK_CONTENT_INDEX = (
+            os.getenv("KNOWLEDGE_CHUNK_CONTENT_INDEX", "False").lower() == "true"
+        )
 
         # SUMMARY_CONFIG Configuration
         self.SUMMARY_CONFIG = os.getenv("SUMMARY_CONFIG", "FAST")
@@ -301,6 +317,11 @@ class Config(metaclass=Singleton):
         self.MODEL_CACHE_STORAGE_DISK_DIR: Optional[str] = os.getenv(
             "MODEL_CACHE_STORAGE_DISK_DIR"
         )
+        # The seconds the chat components of an app or a knowledge space (prompt
+        # templates, retrievers, model operators) are reused, 0 disables the cache
+        self.CHAT_COMPONENT_CACHE_TTL: float = float(
+            os.getenv("CHAT_COMPONENT_CACHE_TTL", 300)
+        )
         # global gptdb api key
         self.API_KEYS = os.getenv("API_KEYS", None)
         self.ENCRYPT_KEY = os.getenv("ENCRYPT_KEY", "your_secret_key")
@@ -313,6 +334,12 @@ class Config(metaclass=Singleton):
         self.GPTDB_APP_SCENE_NON_STREAMING_PARALLELISM_BASE = int(
             os.getenv("GPTDB_APP_SCENE_NON_STREAMING_PARALLELISM_BASE", 1)
         )
+        # Start the parallel executions only when the first call is slower than the
+        # latency percentile of the model, all start together if not set
+        hedge_percentile = os.getenv("GPTDB_APP_SCENE_NON_STREAMING_HEDGE_PERCENTILE")
+        self.GPTDB_APP_SCENE_NON_STREAMING_HEDGE_PERCENTILE: Optional[float] = (
+            float(hedge_percentile) if hedge_percentile else None
+        )
         # experimental financial report model configuration
         self.FIN_REPORT_MODEL = os.getenv("FIN_REPORT_MODEL", None)
         # Whether to enable the new web UI, enabled by default
@@ -3,10 +3,13 @@
 import asyncio
 import json
 import logging
+import operator
 from asyncio import Queue
 from collections import defaultdict
-from typing import Dict, List, Optional, Union
+from itertools import compress, count, islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
+from gptdb.util.json_utils import serialize
 from gptdb.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_client
 
 from ...action.base import ActionOutput
@@ -15,10 +18,287 @@ from .base import GptsMessage, GptsMessageMemory, GptsPlansMemory
 from .default_gpts_memory import DefaultGptsMessageMemory, DefaultGptsPlansMemory
 
 NONE_GOAL_PREFIX: str = "none_goal_count_"
+LINK_AGENTS: List[str] = ["Intent Recognition Expert", "App Link"]
 
 logger = logging.getLogger(__name__)
 
 
+def apply_vis_diff(items: List[List[Any]], diff: Dict[str, Any]) -> List[List[Any]]:
+    """Apply an incremental vis diff to the items of a conversation view.
+
+    The consumer keeps a list of ``[item_id, content]`` pairs and applies every diff
+    pushed by :meth:`GptsMemory.push_message` in incremental mode. In vis mode, the
+    contents of the items joined with newlines are the full conversation view.
+
+    A vis list item, e.g. a plan, is sent as its tag and entries, so that a change of
+    one entry is sent alone. Its pair keeps the entries as a third element and its
+    content is rendered from them.
+
+    Args:
+        items(List[List[Any]]): The current items, modified in place.
+        diff(Dict[str, Any]): The diff pushed to the conversation queue.
+
+    Returns:
+        List[List[Any]]: The updated items.
+    """
+    for op in diff["ops"]:
+        kind = op["op"]
+        if kind == "append":
+            items.append(_vis_diff_item(op))
+        elif kind == "insert":
+            items.insert(op["index"], _vis_diff_item(op))
+        elif kind in ("update", "patch"):
+            for index, item in enumerate(items):
+                if item[0] != op["id"]:
+                    continue
+                if kind == "update":
+                    items[index] = _vis_diff_item(op)
+                else:
+                    vis_list = item[2]
+                    for key in op["remove"]:
+                        vis_list["entries"].pop(key, None)
+                    vis_list["entries"].update(op["set"])
+                    item[1] = _render_vis_list(
+                        vis_list["tag"], vis_list["entries"].values()
+                    )
+                break
+        elif kind == "remove":
+            items[:] = [item for item in items if item[0] != op["id"]]
+        else:
+            raise ValueError(f"Unknown vis diff op: {kind}")
+    return items
+
+
+def _vis_diff_item(op: Dict[str, Any]) -> List[Any]:
+    if "entries" not in op:
+        return [op["id"], op["content"]]
+    entries = dict(op["entries"])
+    return [
+        op["id"],
+        _render_vis_list(op["tag"], entries.values()),
+        {"tag": op["tag"], "entries": entries},
+    ]
+
+
+def _render_vis_list(tag: str, parts: Iterable[str]) -> str:
+    """Join the serialized items of a list, the same as displaying the list."""
+    return f"```{tag}\n[{', '.join(parts)}]\n```"
+
+
+class _VisList:
+    """A vis list item of the conversation view, its entries are serialized."""
+
+    def __init__(self, tag: str, entries: Dict[str, str]):
+        self.tag = tag
+        self.entries = entries
+
+    def op(self, kind: str, item_id: str) -> Dict[str, Any]:
+        return {
+            "op": kind,
+            "id": item_id,
+            "tag": self.tag,
+            "entries": list(self.entries.items()),
+        }
+
+    def patch(self, old: "_VisList", item_id: str) -> Optional[Dict[str, Any]]:
+        """Return the op to change the old list to this one, None if unchanged.
+
+        The changed and the new entries are sent alone if the kept entries are in the
+        same order and the new ones are after them, else the whole list is sent.
+        """
+        removed = [key for key in old.entries if key not in self.entries]
+        kept = [key for key in old.entries if key in self.entries]
+        if self.tag != old.tag or kept != list(self.entries)[: len(kept)]:
+            return self.op("update", item_id)
+        changed = [
+            (key, entry)
+            for key, entry in self.entries.items()
+            if old.entries.get(key) != entry
+        ]
+        if not changed and not removed:
+            return None
+        return {"op": "patch", "id": item_id, "set": changed, "remove": removed}
+
+
+def _message_fingerprint(message: GptsMessage) -> tuple:
+    """Return the fingerprint of a message in the conversation view.
+
+    The first ``_IDENTITY_FIELDS`` fields identify the message and decide its group,
+    the rest is the content rendered in its view.
+    """
+    return (
+        message.rounds,
+        message.sender,
+        message.receiver,
+        message.current_goal,
+        message.content,
+        message.action_report,
+        message.model_name,
+        message.resource_info,
+    )
+
+
+_IDENTITY_FIELDS: int = 4
+_APP_LINK: str = "app_link"
+_APP_LAUNCHER: str = "app_launcher"
+
+
+def _vis_item_op(kind: str, item_id: str, content: Any) -> Dict[str, Any]:
+    if isinstance(content, _VisList):
+        return content.op(kind, item_id)
+    return {"op": kind, "id": item_id, "content": content}
+
+
+class _VisRenderCursor:
+    """Render state of a conversation in incremental mode.
+
+    It keeps the message groups of the conversation up to date with the messages
+    cache, together with the rendered parts of every message, group and plan item and
+    the items already pushed to the consumer, so that each push only renders what
+    changed.
+
+    Only the new, replaced and updated messages are fingerprinted: a new message is
+    added to its group, an updated message marks its group to render again and a
+    message whose identity changed, e.g. a removed message, groups the conversation
+    again.
+    """
+
+    def __init__(self, start: int = 0):
+        # Index of the first message of the messages cache to show
+        self.start = start
+        # Serialized views of the messages by their fingerprints
+        self.message_views: Dict[tuple, str] = {}
+        # Items already pushed to the consumer, in order
+        self.item_ids: List[str] = []
+        self.item_contents: Dict[str, Any] = {}
+        # Indexes of the messages updated in place, see GptsMemory.update_message
+        self.updated: Set[int] = set()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the message groups, all of them are rendered again."""
+        self.messages: List[GptsMessage] = []
+        self.fingerprints: List[tuple] = []
+        # The group key and the index in the group of every message
+        self.locations: List[Optional[Tuple[str, int]]] = []
+        self.groups: Dict[str, List[GptsMessage]] = {}
+        self.app_link_message: Optional[GptsMessage] = None
+        self.app_launcher_message: Optional[GptsMessage] = None
+        self.none_goal_count = 1
+        self.dirty_groups: Set[str] = set()
+        self.app_link_dirty = True
+        # Agents vis of each group and serialized plan item of each goal
+        self.group_views: Dict[str, str] = {}
+        self.plan_items: Dict[str, Tuple[int, str]] = {}
+
+    def sync(self, messages: List[GptsMessage]) -> Set[int]:
+        """Sync the message groups with the messages, return the changed indexes.
+
+        Only the new messages, the replaced ones and the ones updated in place are
+        fingerprinted, the others are compared by identity.
+        """
+        start = self.start
+        known = len(self.messages)
+        if len(messages) - start < known:
+            return self._rebuild(messages[start:])
+        changed = self.updated | set(
+            compress(
+                count(),
+                map(
+                    operator.is_not,
+                    islice(messages, start, start + known),
+                    self.messages,
+                ),
+            )
+        )
+        self.updated = set()
+        for index in sorted(changed):
+            message = messages[start + index]
+            fingerprint = _message_fingerprint(message)
+            old = self.fingerprints[index]
+            if fingerprint[:_IDENTITY_FIELDS] != old[:_IDENTITY_FIELDS]:
+                return self._rebuild(messages[start:])
+            self.messages[index] = message
+            if fingerprint != old:
+                self.message_views.pop(old, None)
+                self.fingerprints[index] = fingerprint
+                self.replace(self.locations[index], message)
+            else:
+                changed.discard(index)
+        for message in islice(messages, start + known, None):
+            changed.add(len(self.messages))
+            self.messages.append(message)
+            self.fingerprints.append(_message_fingerprint(message))
+            self.locations.append(self.add(message))
+        return changed
+
+    def _rebuild(self, messages: List[GptsMessage]) -> Set[int]:
+        """Group all the messages again, e.g. after a message is removed."""
+        self.reset()
+        self.updated = set()
+        for message in messages:
+            self.messages.append(message)
+            self.fingerprints.append(_message_fingerprint(message))
+            self.locations.append(self.add(message))
+        # Drop the views of the messages which are not in the conversation anymore
+        fingerprints = set(self.fingerprints)
+        self.message_views = {
+            fingerprint: view
+            for fingerprint, view in self.message_views.items()
+            if fingerprint in fingerprints
+        }
+        return set(range(len(messages)))
+
+    def add(self, message: GptsMessage) -> Optional[Tuple[str, int]]:
+        """Add a message to the conversation groups, return its location."""
+        if message.sender in LINK_AGENTS or message.receiver in LINK_AGENTS:
+            if message.sender in LINK_AGENTS and message.receiver == "AppLauncher":
+                self.app_link_message = message
+                self.app_link_dirty = True
+                return _APP_LINK, 0
+            if message.receiver != "Human":
+                return None
+
+        if message.sender == "AppLauncher":
+            if message.receiver == "Human":
+                self.app_launcher_message = message
+                self.app_link_dirty = True
+                return _APP_LAUNCHER, 0
+            return None
+
+        current_goal = message.current_goal
+        last_goal = next(reversed(self.groups)) if self.groups else None
+        if last_goal and current_goal and current_goal == last_goal:
+            self.groups[last_goal].append(message)
+            key = last_goal
+        elif current_goal:
+            self.groups[current_goal] = [message]
+            key = current_goal
+        else:
+            key = f"{NONE_GOAL_PREFIX}{self.none_goal_count}"
+            self.groups[key] = [message]
+            self.none_goal_count += 1
+        self.dirty_groups.add(key)
+        return key, len(self.groups[key]) - 1
+
+    def replace(
+        self, location: Optional[Tuple[str, int]], message: GptsMessage
+    ) -> None:
+        """Replace an updated message at its location."""
+        if location is None:
+            return
+        key, index = location
+        if key == _APP_LINK:
+            self.app_link_message = message
+            self.app_link_dirty = True
+        elif key == _APP_LAUNCHER:
+            self.app_launcher_message = message
+            self.app_link_dirty = True
+        else:
+            self.groups[key][index] = message
+            self.dirty_groups.add(key)
+
+
 class GptsMemory:
     """GPTs memory."""
 
@@ -39,6 +319,7 @@ class GptsMemory:
         self.channels: defaultdict = defaultdict(Queue)
         self.enable_vis_map: defaultdict = defaultdict(bool)
         self.start_round_map: defaultdict = defaultdict(int)
+        self.render_cursors: Dict[str, _VisRenderCursor] = {}
 
     @property
     def plans_memory(self) -> GptsPlansMemory:
@@ -56,12 +337,29 @@ class GptsMemory:
         enable_vis_message: bool = True,
         history_messages: Optional[List[GptsMessage]] = None,
         start_round: int = 0,
+        incremental: bool = False,
     ):
-        """Gpt memory init."""
+        """Gpt memory init.
+
+        Args:
+            conv_id(str): The conversation id.
+            enable_vis_message(bool): Whether to push vis messages.
+            history_messages(List[GptsMessage]): The history messages.
+            start_round(int): The index of the first message to show.
+            incremental(bool): Push compact diffs of the conversation view instead of
+                re-rendering the whole conversation for every message, see
+                :func:`apply_vis_diff`.
+        """
         self.channels[conv_id] = asyncio.Queue()
         self.enable_vis_map[conv_id] = enable_vis_message
         self.messages_cache[conv_id] = history_messages if history_messages else []
         self.start_round_map[conv_id] = start_round
+        if incremental:
+            self.render_cursors[conv_id] = _VisRenderCursor(
+                start_round if enable_vis_message else 0
+            )
+        else:
+            self.render_cursors.pop(conv_id, None)
 
     def enable_vis_message(self, conv_id):
         """Enable conversation message vis tag."""
@@ -89,11 +387,18 @@ class GptsMemory:
         start_round = self.start_round_map.pop(conv_id)  # noqa
         del start_round
 
+        # clear render cursor
+        self.render_cursors.pop(conv_id, None)
+
     async def push_message(self, conv_id: str, temp_msg: Optional[str] = None):
         """Push conversation message."""
         queue = self.queue(conv_id)
         enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
-        if enable_vis_tag:
+        if conv_id in self.render_cursors:
+            diff = await self.incremental_message(conv_id, temp_msg)
+            if diff["ops"]:
+                await queue.put(diff)
+        elif enable_vis_tag:
             # 如果有临时消息内容需要push 拼接再最末尾，否则直接从短期记忆中发布最后消息
             message_view = await self.app_link_chat_message(conv_id)
             if temp_msg:
@@ -164,6 +469,236 @@ class GptsMemory:
 
         return new_list
 
+    async def incremental_message(
+        self, conv_id: str, temp_msg: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the diff of the conversation view since the last push.
+
+        Only the new and updated messages are rendered, together with the groups and
+        plan items they touch, the diff contains the items that changed.
+        """
+        cursor = self.render_cursors[conv_id]
+        messages = self.messages_cache[conv_id]
+        if self.enable_vis_message(conv_id):
+            cursor.sync(messages)
+            layout = await self._incremental_vis_layout(cursor, temp_msg)
+        else:
+            layout = await self._incremental_simple_layout(cursor, messages, temp_msg)
+        return {"type": "incremental", "ops": self._diff_items(cursor, layout)}
+
+    async def _incremental_simple_layout(
+        self,
+        cursor: _VisRenderCursor,
+        messages: List[GptsMessage],
+        temp_msg: Optional[str] = None,
+    ):
+        layout: Dict[str, Any] = {}
+        changed = cursor.sync(messages)
+        # The simple view is not grouped
+        cursor.dirty_groups.clear()
+        for index, message in enumerate(cursor.messages):
+            item_id = f"message:{index}"
+            if index not in changed:
+                if item_id in cursor.item_contents:
+                    layout[item_id] = None
+                continue
+            view = self._message_to_simple_view(message)
+            if view is not None:
+                layout[item_id] = view
+        if temp_msg:
+            temp_view = await self.agent_stream_message(temp_msg, False)
+            layout["temp"] = temp_view[0]
+        return layout
+
+    async def _incremental_vis_layout(
+        self, cursor: _VisRenderCursor, temp_msg: Optional[str] = None
+    ):
+        """Build the items of the conversation view.
+
+        The items are the same as the ones joined by :meth:`_message_group_vis_build`,
+        an item is ``None`` when its content is unchanged since the last push.
+        """
+        layout: Dict[str, Any] = {}
+
+        def _changed(item_id: str, dirty: bool) -> bool:
+            return dirty or item_id not in cursor.item_contents
+
+        if cursor.app_link_message:
+            layout["app_link"] = (
+                await self._messages_to_app_link_vis(
+                    cursor.app_link_message, cursor.app_launcher_message
+                )
+                if _changed("app_link", cursor.app_link_dirty)
+                else None
+            )
+
+        for key in cursor.dirty_groups:
+            cursor.group_views[key] = self._group_to_agents_vis(
+                cursor, cursor.groups[key]
+            )
+
+        num: int = 0
+        plan_index: int = 0
+        plan_goals: List[Tuple[str, int]] = []
+        plan_dirty = False
+        for key in cursor.groups:
+            num = num + 1
+            if key.startswith(NONE_GOAL_PREFIX):
+                plan_id, agents_id = f"plan:{plan_index}", f"agents:{key}"
+                layout[plan_id] = (
+                    self._goals_to_plan_vis(cursor, plan_goals)
+                    if _changed(plan_id, plan_dirty)
+                    else None
+                )
+                layout[agents_id] = (
+                    cursor.group_views[key]
+                    if _changed(agents_id, key in cursor.dirty_groups)
+                    else None
+                )
+                plan_index += 1
+                plan_goals = []
+                plan_dirty = False
+                num = 0
+            else:
+                num += 1
+                plan_goals.append((key, num))
+                plan_dirty = plan_dirty or key in cursor.dirty_groups
+        if plan_goals:
+            plan_id = f"plan:{plan_index}"
+            layout[plan_id] = (
+                self._goals_to_plan_vis(cursor, plan_goals)
+                if _changed(plan_id, plan_dirty)
+                else None
+            )
+
+        if cursor.groups:
+            last_goal = next(reversed(cursor.groups))
+            if not last_goal.startswith(NONE_GOAL_PREFIX):
+                layout["last_goal_message"] = (
+                    self._group_to_agents_vis(
+                        cursor, [cursor.groups[last_goal][-1]], True
+                    )
+                    if _changed("last_goal_message", last_goal in cursor.dirty_groups)
+                    else None
+                )
+        if temp_msg:
+            layout["temp"] = await self.agent_stream_message(temp_msg)
+
+        cursor.dirty_groups.clear()
+        cursor.app_link_dirty = False
+        return layout
+
+    @staticmethod
+    def _diff_items(cursor: _VisRenderCursor, layout: Dict[str, Any]) -> List[Dict]:
+        """Diff the new items with the items already pushed to the consumer."""
+        ops: List[Dict[str, Any]] = []
+        item_ids = cursor.item_ids
+        removed = [item_id for item_id in item_ids if item_id not in layout]
+        for item_id in removed:
+            ops.append({"op": "remove", "id": item_id})
+            item_ids.remove(item_id)
+            cursor.item_contents.pop(item_id, None)
+
+        for index, (item_id, content) in enumerate(layout.items()):
+            if index < len(item_ids) and item_ids[index] == item_id:
+                old = cursor.item_contents[item_id]
+                if content is None:
+                    continue
+                if isinstance(content, _VisList) and isinstance(old, _VisList):
+                    op = content.patch(old, item_id)
+                elif content != old:
+                    op = _vis_item_op("update", item_id, content)
+                else:
+                    op = None
+                if op:
+                    cursor.item_contents[item_id] = content
+                    ops.append(op)
+                continue
+            if item_id in cursor.item_contents:
+                # The item moved, e.g. the last goal message after a new plan item
+                item_ids.remove(item_id)
+                ops.append({"op": "remove", "id": item_id})
+                if content is None:
+                    content = cursor.item_contents[item_id]
+            cursor.item_contents[item_id] = content
+            if index == len(item_ids):
+                item_ids.append(item_id)
+                ops.append(_vis_item_op("append", item_id, content))
+            else:
+                item_ids.insert(index, item_id)
+                op = _vis_item_op("insert", item_id, content)
+                op["index"] = index
+                ops.append(op)
+        return ops
+
+    def _group_to_agents_vis(
+        self,
+        cursor: _VisRenderCursor,
+        messages: List[GptsMessage],
+        is_last_message: bool = False,
+    ) -> str:
+        if not messages:
+            return ""
+        parts = []
+        for message in messages:
+            if is_last_message:
+                parts.append(self._to_vis_json(self._message_to_view(message, True)))
+                continue
+            fingerprint = _message_fingerprint(message)
+            view = cursor.message_views.get(fingerprint)
+            if view is None:
+                view = self._to_vis_json(self._message_to_view(message))
+                cursor.message_views[fingerprint] = view
+            parts.append(view)
+        return self._vis_list(VisAgentMessages.vis_tag(), parts)
+
+    def _goals_to_plan_vis(
+        self, cursor: _VisRenderCursor, goals: List[Tuple[str, int]]
+    ) -> Union[str, _VisList]:
+        """Render the plan of the goals, only the changed plan items are serialized."""
+        if not goals:
+            return ""
+        entries = {}
+        for key, num in goals:
+            item = cursor.plan_items.get(key)
+            if item is None or item[0] != num or key in cursor.dirty_groups:
+                messages = cursor.groups[key]
+                plan_item = {
+                    "name": key,
+                    "num": num,
+                    "status": "complete",
+                    "agent": messages[0].receiver if messages else "",
+                    "markdown": cursor.group_views[key],
+                }
+                item = (num, self._to_vis_json(plan_item))
+                cursor.plan_items[key] = item
+            entries[key] = item[1]
+        return _VisList(VisAgentPlans.vis_tag(), entries)
+
+    @staticmethod
+    def _to_vis_json(value: Any) -> str:
+        """Serialize a value of the vis content like :meth:`Vis.display`."""
+        return json.dumps(value, default=serialize, ensure_ascii=False)
+
+    @staticmethod
+    def _vis_list(tag: str, parts: List[str]) -> str:
+        """Join the serialized items of a list, the same as displaying the list."""
+        return _render_vis_list(tag, parts)
+
+    async def update_message(self, conv_id: str, message: GptsMessage):
+        """Push a message of the conversation which is updated in place.
+
+        A message replaced or removed in the messages cache is found by the next push,
+        a message changed in place must be reported here.
+        """
+        cursor = self.render_cursors.get(conv_id)
+        if cursor:
+            for index, known in enumerate(cursor.messages):
+                if known is message:
+                    cursor.updated.add(index)
+                    break
+        await self.push_message(conv_id)
+
     async def _message_group_vis_build(self, message_group, vis_items: list):
         num: int = 0
         if message_group:
@@ -261,28 +796,32 @@ class GptsMemory:
 
         simple_message_list = []
         for message in messages:
-            if message.sender == "Human":
-                continue
-
-            action_report_str = message.action_report
-            view_info = message.content
-            action_out = None
-            if action_report_str and len(action_report_str) > 0:
-                action_out = ActionOutput.from_dict(json.loads(action_report_str))
-            if action_out is not None:
-                view_info = action_out.content
-
-            simple_message_list.append(
-                {
-                    "sender": message.sender,
-                    "receiver": message.receiver,
-                    "model": message.model_name,
-                    "markdown": view_info,
-                }
-            )
+            view = self._message_to_simple_view(message)
+            if view is not None:
+                simple_message_list.append(view)
 
         return simple_message_list
 
+    @staticmethod
+    def _message_to_simple_view(message: GptsMessage) -> Optional[Dict[str, Any]]:
+        if message.sender == "Human":
+            return None
+
+        action_report_str = message.action_report
+        view_info = message.content
+        action_out = None
+        if action_report_str and len(action_report_str) > 0:
+            action_out = ActionOutput.from_dict(json.loads(action_report_str))
+        if action_out is not None:
+            view_info = action_out.content
+
+        return {
+            "sender": message.sender,
+            "receiver": message.receiver,
+            "model": message.model_name,
+            "markdown": view_info,
+        }
+
     async def app_link_chat_message(self, conv_id: str):
         """Get app link chat message."""
         messages = []
@@ -299,90 +838,53 @@ class GptsMemory:
             messages = self.message_memory.get_by_conv_id(conv_id=conv_id)
 
         # VIS消息组装
-        temp_group: Dict = {}
-        app_link_message: Optional[GptsMessage] = None
-        app_lanucher_message: Optional[GptsMessage] = None
-
-        none_goal_count = 1
+        cursor = _VisRenderCursor()
         for message in messages:
-            if message.sender in [
-                "Intent Recognition Expert",
-                "App Link",
-            ] or message.receiver in ["Intent Recognition Expert", "App Link"]:
-                if (
-                    message.sender in ["Intent Recognition Expert", "App Link"]
-                    and message.receiver == "AppLauncher"
-                ):
-                    app_link_message = message
-                if message.receiver != "Human":
-                    continue
-
-            if message.sender == "AppLauncher":
-                if message.receiver == "Human":
-                    app_lanucher_message = message
-                continue
-
-            current_gogal = message.current_goal
-
-            last_goal = next(reversed(temp_group)) if temp_group else None
-            if last_goal:
-                last_goal_messages = temp_group[last_goal]
-                if current_gogal:
-                    if current_gogal == last_goal:
-                        last_goal_messages.append(message)
-                    else:
-                        temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
-            else:
-                if current_gogal:
-                    temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
+            cursor.add(message)
 
         vis_items: list = []
-        if app_link_message:
+        if cursor.app_link_message:
             vis_items.append(
                 await self._messages_to_app_link_vis(
-                    app_link_message, app_lanucher_message
+                    cursor.app_link_message, cursor.app_launcher_message
                 )
             )
 
-        return await self._message_group_vis_build(temp_group, vis_items)
+        return await self._message_group_vis_build(cursor.groups, vis_items)
 
     async def _messages_to_agents_vis(
         self, messages: List[GptsMessage], is_last_message: bool = False
     ):
         if messages is None or len(messages) <= 0:
             return ""
-        messages_view = []
-        for message in messages:
-            action_report_str = message.action_report
-            view_info = message.content
-            if action_report_str and len(action_report_str) > 0:
-                action_out = ActionOutput.from_dict(json.loads(action_report_str))
-                if action_out is not None:  # noqa
-                    if action_out.is_exe_success or is_last_message:  # noqa
-                        view = action_out.view
-                        view_info = view if view else action_out.content
-
-            messages_view.append(
-                {
-                    "sender": message.sender,
-                    "receiver": message.receiver,
-                    "model": message.model_name,
-                    "markdown": view_info,
-                    "resource": message.resource_info
-                    if message.resource_info
-                    else None,
-                }
-            )
+        messages_view = [
+            self._message_to_view(message, is_last_message) for message in messages
+        ]
         return await vis_client.get(VisAgentMessages.vis_tag()).display(
             content=messages_view
         )
 
+    @staticmethod
+    def _message_to_view(
+        message: GptsMessage, is_last_message: bool = False
+    ) -> Dict[str, Any]:
+        action_report_str = message.action_report
+        view_info = message.content
+        if action_report_str and len(action_report_str) > 0:
+            action_out = ActionOutput.from_dict(json.loads(action_report_str))
+            if action_out is not None:  # noqa
+                if action_out.is_exe_success or is_last_message:  # noqa
+                    view = action_out.view
+                    view_info = view if view else action_out.content
+
+        return {
+            "sender": message.sender,
+            "receiver": message.receiver,
+            "model": message.model_name,
+            "markdown": view_info,
+            "resource": message.resource_info if message.resource_info else None,
+        }
+
     async def _messages_to_plan_vis(self, messages: List[Dict]):
         if messages is None or len(messages) <= 0:
             return ""
@@ -0,0 +1,219 @@
+import json
+from typing import List, Optional
+
+import pytest
+
+from ....action.base import ActionOutput
+from ..base import GptsMessage
+from ..gpts_memory import GptsMemory, apply_vis_diff
+
+CONV_ID = "test_conv"
+
+
+def _message(
+    sender: str,
+    receiver: str,
+    content: str,
+    current_goal: Optional[str] = None,
+    is_exe_success: bool = True,
+) -> GptsMessage:
+    action_output = ActionOutput(
+        content=content, view=f"view of {content}", is_exe_success=is_exe_success
+    )
+    return GptsMessage(
+        conv_id=CONV_ID,
+        sender=sender,
+        receiver=receiver,
+        role="assistant",
+        content=content,
+        rounds=0,
+        current_goal=current_goal,
+        action_report=json.dumps(action_output.to_dict()),
+        model_name="test_model",
+    )
+
+
+async def _drain(memory: GptsMemory) -> List:
+    queue = memory.queue(CONV_ID)
+    items = []
+    while not queue.empty():
+        items.append(await queue.get())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_incremental_vis_matches_full_render():
+    memory = GptsMemory()
+    memory.init(CONV_ID, incremental=True)
+    messages = [
+        _message("Human", "Planner", "query"),
+        _message(
+            "App Link", "AppLauncher", json.dumps({"app_code": "a", "app_name": "b"})
+        ),
+        _message("AppLauncher", "Human", "launched"),
+        _message("Planner", "DataScientist", "step 1", current_goal="goal 1"),
+        _message("DataScientist", "Planner", "result 1", current_goal="goal 1"),
+        _message("Planner", "Reporter", "step 2", current_goal="goal 2"),
+        _message("Reporter", "Human", "summary"),
+        _message("Planner", "Coder", "step 3", current_goal="goal 3"),
+        _message("Coder", "Planner", "failed", "goal 3", is_exe_success=False),
+        _message("Planner", "Coder", "retry goal 1", current_goal="goal 1"),
+        _message("Coder", "Human", "done"),
+    ]
+    items: List[List] = []
+    for i, message in enumerate(messages):
+        await memory.append_message(CONV_ID, message)
+        for diff in await _drain(memory):
+            apply_vis_diff(items, diff)
+        expected = await memory.app_link_chat_message(CONV_ID)
+        assert "\n".join(item[1] for item in items) == expected
+
+        temp_msg = f"streaming {i}"
+        await memory.push_message(CONV_ID, temp_msg)
+        for diff in await _drain(memory):
+            apply_vis_diff(items, diff)
+        temp_view = await memory.agent_stream_message(temp_msg)
+        assert "\n".join(item[1] for item in items) == "\n".join([expected, temp_view])
+
+
+@pytest.mark.asyncio
+async def test_incremental_simple_matches_full_render():
+    memory = GptsMemory()
+    memory.init(CONV_ID, enable_vis_message=False, incremental=True)
+    items: List[List] = []
+    for i in range(5):
+        await memory.append_message(CONV_ID, _message("Human", "Planner", f"q {i}"))
+        await memory.append_message(CONV_ID, _message("Planner", "Human", f"a {i}"))
+        await memory.push_message(CONV_ID, f"streaming {i}")
+        for diff in await _drain(memory):
+            apply_vis_diff(items, diff)
+        expected = await memory.simple_message(CONV_ID)
+        expected.extend(await memory.agent_stream_message(f"streaming {i}", False))
+        assert [item[1] for item in items] == expected
+
+
+@pytest.mark.asyncio
+async def test_incremental_vis_cost_per_message_is_constant(mocker):
+    memory = GptsMemory()
+    memory.init(CONV_ID, incremental=True)
+    render_spy = mocker.spy(GptsMemory, "_message_to_view")
+
+    costs = []
+    for i in range(200):
+        render_spy.reset_mock()
+        await memory.append_message(
+            CONV_ID, _message("Planner", "Human", f"answer {i}")
+        )
+        diffs = await _drain(memory)
+        costs.append(
+            (render_spy.call_count, sum(len(json.dumps(diff)) for diff in diffs))
+        )
+
+    assert all(calls == 1 for calls, _ in costs)
+    # Only the item ids grow with the number of messages
+    assert costs[-1][1] <= costs[10][1] + 8
+
+
+async def _assert_matches_full_render(memory: GptsMemory, items: List[List]):
+    for diff in await _drain(memory):
+        apply_vis_diff(items, diff)
+    expected = await memory.app_link_chat_message(CONV_ID)
+    assert "\n".join(item[1] for item in items) == expected
+
+
+@pytest.mark.asyncio
+async def test_incremental_vis_updated_messages():
+    memory = GptsMemory()
+    memory.init(CONV_ID, incremental=True)
+    items: List[List] = []
+    messages = [
+        _message("Planner", "Coder", "step 1", current_goal="goal 1"),
+        _message("Coder", "Planner", "failed", "goal 1", is_exe_success=False),
+        _message("Planner", "Reporter", "step 2", current_goal="goal 2"),
+        _message("Reporter", "Human", "summary"),
+    ]
+    for message in messages:
+        await memory.append_message(CONV_ID, message)
+    await _assert_matches_full_render(memory, items)
+
+    # Update the status of an earlier message in place
+    updated = ActionOutput(content="fixed", view="view of fixed", is_exe_success=True)
+    messages[1].action_report = json.dumps(updated.to_dict())
+    await memory.update_message(CONV_ID, messages[1])
+    diffs = await _drain(memory)
+    # Only the plan item of the goal of the message is sent
+    assert diffs and len(diffs[0]["ops"]) == 1
+    patch = diffs[0]["ops"][0]
+    assert patch["op"] == "patch" and patch["id"] == "plan:0"
+    assert [key for key, _ in patch["set"]] == ["goal 1"] and not patch["remove"]
+    apply_vis_diff(items, diffs[0])
+    assert "\n".join(item[1] for item in items) == await memory.app_link_chat_message(
+        CONV_ID
+    )
+
+    # Replace an earlier message with a new one
+    memory.messages_cache[CONV_ID][3] = _message("Reporter", "Human", "new summary")
+    await memory.push_message(CONV_ID)
+    await _assert_matches_full_render(memory, items)
+
+    # Move a message to another goal, the conversation is grouped again
+    memory.messages_cache[CONV_ID][2] = _message(
+        "Planner", "Reporter", "step 2", current_goal="goal 1"
+    )
+    await memory.push_message(CONV_ID)
+    await _assert_matches_full_render(memory, items)
+
+    # Remove a message
+    del memory.messages_cache[CONV_ID][0]
+    await memory.push_message(CONV_ID)
+    await _assert_matches_full_render(memory, items)
+    # The views of the replaced and removed messages are dropped
+    cursor = memory.render_cursors[CONV_ID]
+    assert set(cursor.message_views) <= set(cursor.fingerprints)
+
+
+@pytest.mark.asyncio
+async def test_incremental_simple_updated_messages():
+    memory = GptsMemory()
+    memory.init(CONV_ID, enable_vis_message=False, incremental=True)
+    items: List[List] = []
+    messages = [_message("Planner", "Human", f"a {i}") for i in range(3)]
+    for message in messages:
+        await memory.append_message(CONV_ID, message)
+    messages[0].content = "updated"
+    messages[0].action_report = None
+    await memory.update_message(CONV_ID, messages[0])
+    for diff in await _drain(memory):
+        apply_vis_diff(items, diff)
+    assert [item[1] for item in items] == await memory.simple_message(CONV_ID)
+    assert items[0][1]["markdown"] == "updated"
+
+
+@pytest.mark.asyncio
+async def test_incremental_vis_plans_cost_per_message_is_constant(mocker):
+    memory = GptsMemory()
+    memory.init(CONV_ID, incremental=True)
+    view_spy = mocker.spy(GptsMemory, "_message_to_view")
+    json_spy = mocker.spy(GptsMemory, "_to_vis_json")
+    items: List[List] = []
+
+    costs, sizes = [], []
+    for i in range(100):
+        view_spy.reset_mock()
+        json_spy.reset_mock()
+        goal = f"goal {i // 2}"
+        await memory.append_message(
+            CONV_ID, _message("Planner", "Coder", f"step {i}", current_goal=goal)
+        )
+        diffs = await _drain(memory)
+        for diff in diffs:
+            apply_vis_diff(items, diff)
+        costs.append((view_spy.call_count, json_spy.call_count))
+        sizes.append(sum(len(json.dumps(diff)) for diff in diffs))
+
+    # The new message, the last goal message and the plan item of the goal
+    assert all(cost == (2, 3) for cost in costs)
+    # Only the changed plan item is sent, not the whole plan
+    assert max(sizes[10:]) <= max(sizes[2:10]) + 64
+    expected = await memory.app_link_chat_message(CONV_ID)
+    assert "\n".join(item[1] for item in items) == expected
@@ -2,7 +2,7 @@
 
 from concurrent.futures import Executor
 from datetime import datetime
-from typing import Generic, List, Optional
+from typing import Dict, Generic, List, Optional
 
 from gptdb.core import Chunk
 from gptdb.rag.retriever.time_weighted import TimeWeightedEmbeddingRetriever
@@ -34,31 +34,28 @@ class LongTermRetriever(TimeWeightedEmbeddingRetriever):
     ) -> List[Chunk]:
         """Retrieve memories."""
         current_time = self.now
-        docs_and_scores = {
-            doc.metadata[_METADATA_BUFFER_IDX]: (doc, self.default_salience)
-            # Calculate for all memories.
-            for doc in self.memory_stream
-        }
         # If a doc is considered salient, update the salience score
-        docs_and_scores.update(self.get_salient_docs(query))
-        rescored_docs = [
-            (doc, self._get_combined_score(doc, relevance, current_time))
-            for doc, relevance in docs_and_scores.values()
-        ]
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+        relevances: Dict[int, Optional[float]] = {
+            idx: score for idx, (_, score) in self.get_salient_docs(query).items()
+        }
+        # Calculate for all memories.
+        ranked = self._rank_memories(
+            range(len(self.memory_stream)),
+            relevances,
+            current_time,
+            default_relevance=self.default_salience,
+        )
         result = []
         # Ensure frequently accessed memories aren't forgotten
-        retrieved_num = 0
-        for doc, _ in rescored_docs:
+        for buffer_idx in ranked:
+            if len(result) >= self._k:
+                break
+            doc = self.memory_stream[buffer_idx]
             if (
-                retrieved_num < self._k
-                and doc.content.find(_FORGET_PLACEHOLDER) == -1
+                doc.content.find(_FORGET_PLACEHOLDER) == -1
                 and doc.content.find(_MERGE_PLACEHOLDER) == -1
             ):
-                retrieved_num += 1
-                buffered_doc = self.memory_stream[doc.metadata[_METADATA_BUFFER_IDX]]
-                buffered_doc.metadata[_METADATA_LAST_ACCESSED_AT] = current_time
-                result.append(buffered_doc)
+                result.append(self._touch(buffer_idx, current_time))
         return result
 
 
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional, Tuple
 from gptdb.core import Embeddings
 from gptdb.util.annotations import immutable, mutable
 from gptdb.util.executor_utils import blocking_func_to_async
-from gptdb.util.similarity_util import cosine_similarity, sigmoid_function
+from gptdb.util.similarity_util import NormalizedEmbeddingMatrix, sigmoid_function
 
 from .base import (
     DiscardedMemoryFragments,
@@ -34,7 +34,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         super().__init__(buffer_size=buffer_size)
         self._executor = executor
         self._embeddings = embeddings
-        self.short_embeddings: List[List[float]] = []
+        self._embedding_matrix = NormalizedEmbeddingMatrix()
         self.enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
         self.enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
         self.enhance_similarity_threshold = enhance_similarity_threshold
@@ -55,6 +55,19 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         m._copy_from(self)
         return m
 
+    @property
+    def short_embeddings(self) -> List[List[float]]:
+        """Return the embeddings of the short term memories."""
+        return self._embedding_matrix.to_list()
+
+    def _enhance_probabilities(self, embeddings: List[float]) -> List[float]:
+        """Return the sigmoid similarity to every short term memory.
+
+        All the memories are scored by one matrix-vector product.
+        """
+        similarities = self._embedding_matrix.similarities(embeddings)
+        return sigmoid_function(similarities).tolist()
+
     @mutable
     async def write(
         self,
@@ -73,17 +86,11 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             self._embeddings.embed_documents,
         )
         memory_fragment.update_embeddings(memory_fragment_embeddings)
-        for idx, memory_embedding in enumerate(self.short_embeddings):
-            similarity = await blocking_func_to_async(
-                self._executor,
-                cosine_similarity,
-                memory_embedding,
-                memory_fragment_embeddings,
-            )
-            # Sigmoid probability, transform similarity to [0, 1]
-            sigmoid_prob: float = await blocking_func_to_async(
-                self._executor, sigmoid_function, similarity
-            )
+        # Sigmoid probability, transform similarity to [0, 1]
+        sigmoid_probs: List[float] = await blocking_func_to_async(
+            self._executor, self._enhance_probabilities, memory_fragment_embeddings
+        )
+        for idx, sigmoid_prob in enumerate(sigmoid_probs):
             if (
                 sigmoid_prob >= self.enhance_similarity_threshold
                 and random.random() < sigmoid_prob
@@ -93,7 +100,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         discard_memories = await self.transfer_to_long_term(memory_fragment)
         if op == WriteOperation.ADD:
             self._fragments.append(memory_fragment)
-            self.short_embeddings.append(memory_fragment_embeddings)
+            self._embedding_matrix.append(memory_fragment_embeddings)
             await self.handle_overflow(self._fragments)
         return discard_memories
 
@@ -138,7 +145,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             # re-construct the indexes of short-term memories after removing summarized
             # memories
             new_memories: List[T] = []
-            new_embeddings: List[List[float]] = []
+            new_embedding_indexes: List[int] = []
             new_enhance_memories: List[List[T]] = [[] for _ in range(self._buffer_size)]
             new_enhance_cnt: List[int] = [0 for _ in range(self._buffer_size)]
             for idx, memory in enumerate(self.short_term_memories):
@@ -147,9 +154,9 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
                     new_enhance_memories[len(new_memories)] = self.enhance_memories[idx]
                     new_enhance_cnt[len(new_memories)] = self.enhance_cnt[idx]
                     new_memories.append(memory)
-                    new_embeddings.append(self.short_embeddings[idx])
+                    new_embedding_indexes.append(idx)
             self._fragments = new_memories
-            self.short_embeddings = new_embeddings
+            self._embedding_matrix.select(new_embedding_indexes)
             self.enhance_memories = new_enhance_memories
             self.enhance_cnt = new_enhance_cnt
         return DiscardedMemoryFragments(enhance_memories, enhance_insights)
@@ -187,7 +194,7 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
             self.enhance_memories.append([])
 
             discard_memory = self._fragments.pop(pop_id)
-            self.short_embeddings.pop(pop_id)
+            self._embedding_matrix.pop(pop_id)
 
             # remove the discard_memory from other short-term memory's enhanced list
             for idx in range(len(self.short_term_memories)):
@@ -135,6 +135,10 @@ class AWELBaseManager(ManagerAgent, ABC):
     def get_dag(self) -> DAG:
         """Get the DAG of the manager."""
 
+    async def aget_dag(self) -> DAG:
+        """Get the DAG of the manager asynchronously."""
+        return self.get_dag()
+
     async def act(
         self,
         message: AgentMessage,
@@ -146,7 +150,7 @@ class AWELBaseManager(ManagerAgent, ABC):
     ) -> ActionOutput:
         """Perform the action."""
         try:
-            agent_dag = self.get_dag()
+            agent_dag = await self.aget_dag()
             last_node: AWELAgentOperator = cast(
                 AWELAgentOperator, agent_dag.leaf_nodes[0]
             )
@@ -250,7 +254,7 @@ class WrappedAWELLayoutManager(AWELBaseManager):
     ) -> ActionOutput:
         """Perform the action."""
         try:
-            dag = self.get_dag()
+            dag = await self.aget_dag()
             last_node: WrappedAgentOperator = cast(
                 WrappedAgentOperator, dag.leaf_nodes[0]
             )
@@ -333,6 +337,27 @@ class DefaultAWELLayoutManager(AWELBaseManager):
         cfg = Config()
         _dag_manager = DAGManager.get_instance(cfg.SYSTEM_APP)  # type: ignore
         agent_dag: Optional[DAG] = _dag_manager.get_dag(alias_name=self.dag.uid)
+        if agent_dag is None:
+            # The flow may wait for its first call in lazy load mode
+            flow_service = self._get_flow_service()
+            if flow_service:
+                flow_service.materialize_flow(self.dag.uid)
+                agent_dag = _dag_manager.get_dag(alias_name=self.dag.uid)
         if agent_dag is None:
             raise ValueError(f"The configured flow cannot be found![{self.dag.name}]")
         return agent_dag
+
+    async def aget_dag(self) -> DAG:
+        """Get the DAG of the manager, build it first if it waits in lazy load mode."""
+        flow_service = self._get_flow_service()
+        if flow_service:
+            await flow_service.amaterialize_flow(self.dag.uid)
+        return self.get_dag()
+
+    @staticmethod
+    def _get_flow_service():
+        from gptdb.serve.flow.service.service import Service as FlowService
+
+        return FlowService.get_instance(
+            Config().SYSTEM_APP, default_component=None  # type: ignore
+        )
@@ -80,7 +80,7 @@ class ChartAction(Action[SqlInput]):
                 raise ValueError("The database resource is not found！")
 
             db = db_resources[0]
-            data_df = await db.query_to_df(param.sql)
+            data_df = await db.query_to_result(param.sql)
             view = await self.render_protocol.display(
                 chart=json.loads(model_to_json(param)), data_df=data_df
             )
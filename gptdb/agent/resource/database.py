@@ -7,6 +7,11 @@ from typing import Any, Dict, Generic, List, Optional, Tuple, Union
 
 import cachetools
 
+from gptdb.datasource.base import (
+    DEFAULT_MAX_RESULT_BYTES,
+    DEFAULT_MAX_RESULT_ROWS,
+    QueryResult,
+)
 from gptdb.datasource.rdbms.base import RDBMSConnector
 from gptdb.util.cache_utils import cached
 from gptdb.util.executor_utils import blocking_func_to_async
@@ -128,6 +133,24 @@ class DBResource(Resource[P], Generic[P]):
         field_names, result = await self.query(sql, db=db)
         return pd.DataFrame(result, columns=field_names)
 
+    async def query_to_result(
+        self,
+        sql: str,
+        db: Optional[str] = None,
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+    ) -> QueryResult:
+        """Return the query result capped by rows and bytes."""
+        db_name = db or self._db_name
+        return await blocking_func_to_async(
+            self._executor,
+            self._sync_query_to_result,
+            db=db_name,
+            sql=sql,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+        )
+
     async def query(self, sql: str, db: Optional[str] = None):
         """Return the query result."""
         db_name = db or self._db_name
@@ -139,6 +162,17 @@ class DBResource(Resource[P], Generic[P]):
         """Return the query result."""
         raise NotImplementedError("The run method should be implemented in a subclass.")
 
+    def _sync_query_to_result(
+        self,
+        db: str,
+        sql: str,
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+    ) -> QueryResult:
+        """Return the query result capped by rows and bytes."""
+        field_names, result = self._sync_query(db=db, sql=sql)
+        return QueryResult.from_batches(field_names, [result], max_rows, max_bytes)
+
 
 class RDBMSConnectorResource(DBResource[DBParameters]):
     """Connector resource class."""
@@ -192,6 +226,16 @@ class RDBMSConnectorResource(DBResource[DBParameters]):
         values = result_lst[1:]
         return columns, values
 
+    def _sync_query_to_result(
+        self,
+        db: str,
+        sql: str,
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+    ) -> QueryResult:
+        """Return the query result capped by rows and bytes."""
+        return self.connector.run_to_result(sql, max_rows=max_rows, max_bytes=max_bytes)
+
 
 class SQLiteDBResource(RDBMSConnectorResource):
     """SQLite database resource class."""
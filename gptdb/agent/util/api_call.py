@@ -3,12 +3,13 @@
 import json
 import logging
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from gptdb._private.pydantic import BaseModel
 from gptdb.agent.core.schema import Status
-from gptdb.util.json_utils import serialize
+from gptdb.util.json_utils import df_to_json_records, serialize
 from gptdb.util.string_utils import extract_content, extract_content_open_ending
 
 logger = logging.getLogger(__name__)
@@ -26,10 +27,123 @@ class PluginStatus(BaseModel):
     err_msg: Optional[str] = None
     start_time: float = datetime.now().timestamp() * 1000
     end_time: Optional[str] = None
+    truncated: bool = False
 
     df: Any = None
 
 
+def _to_records(data: Any) -> List[Dict[str, Any]]:
+    """Convert a query result or a DataFrame to JSON serializable records."""
+    from gptdb.datasource.base import QueryResult
+
+    if isinstance(data, QueryResult):
+        return data.to_records()
+    return df_to_json_records(data)
+
+
+def _is_truncated(data: Any) -> bool:
+    from gptdb.datasource.base import QueryResult
+
+    return isinstance(data, QueryResult) and data.truncated
+
+
+_MD_CODE_TAGS = ["```python", "```xml", "```json", "```markdown", "```sql", "```"]
+# The chars compared to check whether the new text continues the consumed text
+_CONTINUATION_CHECK_LEN = 32
+
+
+class ApiCallStreamParser:
+    """Find the tagged spans in a growing text, scanning only the new chars.
+
+    The streamed LLM output is cumulative, each chunk contains the text of the
+    previous chunks. The parser remembers where it stopped, so feeding the whole
+    stream costs O(n) instead of rescanning the text for every chunk.
+
+    Args:
+        start_tag (str): The start tag of a span.
+        end_tag (str): The end tag of a span.
+    """
+
+    def __init__(self, start_tag: str = "<api-call>", end_tag: str = "</api-call>"):
+        """Create a new stream parser."""
+        self._start_tag = start_tag
+        self._end_tag = end_tag
+        self.generation = -1
+        self.reset()
+
+    def reset(self):
+        """Forget the consumed text."""
+        self._text = ""
+        self._scan_pos = 0
+        self.open_start: Optional[int] = None
+        self.spans: List[Tuple[int, int]] = []
+        # The number of chars scanned, to check the parse cost
+        self.scanned_chars = 0
+        self.generation += 1
+
+    def _is_continuation(self, text: str) -> bool:
+        old_len = len(self._text)
+        if len(text) < old_len:
+            return False
+        check_start = max(0, old_len - _CONTINUATION_CHECK_LEN)
+        return text[check_start:old_len] == self._text[check_start:]
+
+    def feed(self, text: str) -> List[Tuple[int, int]]:
+        """Consume the cumulative text, return the spans closed by the new chars.
+
+        If the text does not continue the consumed text, the parser is reset and
+        the text is parsed from the beginning.
+
+        Args:
+            text (str): The whole text received so far.
+
+        Returns:
+            List[Tuple[int, int]]: The (start, end) of the closed spans, including
+                the tags.
+        """
+        if not self._is_continuation(text):
+            self.reset()
+        self._text = text
+        self.scanned_chars += len(text) - max(
+            0, self._scan_pos - max(len(self._start_tag), len(self._end_tag)) + 1
+        )
+        closed = []
+        while True:
+            if self.open_start is None:
+                # The tag may be split across the chunks
+                scan_from = max(0, self._scan_pos - len(self._start_tag) + 1)
+                start = text.find(self._start_tag, scan_from)
+                if start == -1:
+                    break
+                self.open_start = start
+                self._scan_pos = start + len(self._start_tag)
+            content_start = self.open_start + len(self._start_tag)
+            scan_from = max(content_start, self._scan_pos - len(self._end_tag) + 1)
+            end = text.find(self._end_tag, scan_from)
+            if end == -1:
+                break
+            end += len(self._end_tag)
+            span = (self.open_start, end)
+            self.spans.append(span)
+            closed.append(span)
+            self.open_start = None
+            self._scan_pos = end
+        self._scan_pos = len(text)
+        return closed
+
+
+@dataclass
+class _StreamApiCall:
+    """A closed api call in the streamed text."""
+
+    start: int
+    end: int
+    # The start of the markdown code tag which wraps the api call
+    view_start: int
+    wrapped: bool
+    status: PluginStatus
+
+
 class ApiCall:
     """A class representing an API call."""
 
@@ -52,6 +166,14 @@ class ApiCall:
         self.start_time = datetime.now().timestamp() * 1000
         self.backend_rendering: bool = backend_rendering
 
+        self._stream_parser = ApiCallStreamParser(self.agent_prefix, self.agent_end)
+        self._stream_generation = self._stream_parser.generation
+        self._stream_calls: List[_StreamApiCall] = []
+        self._stream_rendered_calls = 0
+        # The rendered view of the text before ``_stream_view_end``
+        self._stream_view = ""
+        self._stream_view_end = 0
+
     def _is_need_wait_plugin_call(self, api_call_context):
         start_agent_count = api_call_context.count(self.agent_prefix)
 
@@ -156,14 +278,7 @@ class ApiCall:
         )
         for api_index, api_context in api_context_map.items():
             api_context = api_context.replace("\\n", "").replace("\n", "")
-            api_call_element = ET.fromstring(api_context)
-            api_name = api_call_element.find("name").text
-            if api_name.find("[") >= 0 or api_name.find("]") >= 0:
-                api_name = api_name.replace("[", "").replace("]", "")
-            api_args = {}
-            args_elements = api_call_element.find("args")
-            for child_element in args_elements.iter():
-                api_args[child_element.tag] = child_element.text
+            api_name, api_args = self._parse_api_call(api_context)
 
             api_status = self.plugin_status_map.get(api_context)
             if api_status is None:
@@ -174,6 +289,19 @@ class ApiCall:
             else:
                 api_status.location.append(api_index)
 
+    @staticmethod
+    def _parse_api_call(api_context: str) -> Tuple[str, Dict[str, Any]]:
+        """Return the name and the args of an api call."""
+        api_call_element = ET.fromstring(api_context)
+        api_name = api_call_element.find("name").text
+        if api_name.find("[") >= 0 or api_name.find("]") >= 0:
+            api_name = api_name.replace("[", "").replace("]", "")
+        api_args = {}
+        args_elements = api_call_element.find("args")
+        for child_element in args_elements.iter():
+            api_args[child_element.tag] = child_element.text
+        return api_name, api_args
+
     def _to_view_param_str(self, api_status):
         param = {}
         if api_status.name:
@@ -200,9 +328,10 @@ class ApiCall:
     def to_view_antv_vis(self, api_status: PluginStatus):
         """Return the vis content."""
         if self.backend_rendering:
-            html_table = api_status.df.to_html(
-                index=False, escape=False, sparsify=False
-            )
+            df = api_status.df
+            if hasattr(df, "to_df"):
+                df = df.to_df()
+            html_table = df.to_html(index=False, escape=False, sparsify=False)
             table_str = "".join(html_table.split())
             table_str = table_str.replace("\n", " ")
             sql = api_status.args["sql"]
@@ -229,6 +358,8 @@ class ApiCall:
         if api_status.api_result:
             data = api_status.api_result
         param["data"] = data
+        if api_status.truncated:
+            param["truncated"] = True
         return json.dumps(param, ensure_ascii=False)
 
     def run_display_sql(self, llm_text, sql_run_func):
@@ -265,9 +396,33 @@ class ApiCall:
                     value.end_time = datetime.now().timestamp() * 1000
         return self.api_view_context(llm_text, True)
 
+    def _run_sql_vis(self, value: PluginStatus, sql_run_func):
+        value.status = Status.RUNNING.value
+        logger.info(f"SQL execution:{value.name},{value.args}")
+        try:
+            sql = value.args["sql"]
+            if sql is not None and len(sql) > 0:
+                data_df = sql_run_func(sql)
+                value.df = data_df
+                value.api_result = _to_records(data_df)
+                value.truncated = _is_truncated(data_df)
+                value.status = Status.COMPLETE.value
+            else:
+                value.status = Status.FAILED.value
+                value.err_msg = "No executable sql！"
+
+        except Exception as e:
+            logger.error(f"data prepare exception！{str(e)}")
+            value.status = Status.FAILED.value
+            value.err_msg = str(e)
+        value.end_time = datetime.now().timestamp() * 1000
+
     def display_sql_llmvis(self, llm_text, sql_run_func):
         """Render charts using the Antv standard protocol.
 
+        It is called with the cumulative text of every streamed chunk, only the new
+        text is parsed. Each api call runs its SQL once, when its end tag arrives.
+
         Args:
             llm_text: LLM response text
             sql_run_func: sql run  function
@@ -276,42 +431,93 @@ class ApiCall:
            ChartView protocol text
         """
         try:
-            if self._is_need_wait_plugin_call(
-                llm_text
-            ) and self.check_last_plugin_call_ready(llm_text):
-                # wait api call generate complete
-                self.update_from_context(llm_text)
-                for key, value in self.plugin_status_map.items():
-                    if value.status == Status.TODO.value:
-                        value.status = Status.RUNNING.value
-                        logger.info(f"SQL execution:{value.name},{value.args}")
-                        try:
-                            sql = value.args["sql"]
-                            if sql is not None and len(sql) > 0:
-                                data_df = sql_run_func(sql)
-                                value.df = data_df
-                                value.api_result = json.loads(
-                                    data_df.to_json(
-                                        orient="records",
-                                        date_format="iso",
-                                        date_unit="s",
-                                    )
-                                )
-                                value.status = Status.COMPLETE.value
-                            else:
-                                value.status = Status.FAILED.value
-                                value.err_msg = "No executable sql！"
-
-                        except Exception as e:
-                            logger.error(f"data prepare exception！{str(e)}")
-                            value.status = Status.FAILED.value
-                            value.err_msg = str(e)
-                        value.end_time = datetime.now().timestamp() * 1000
+            closed_spans = self._stream_parser.feed(llm_text)
+            if self._stream_generation != self._stream_parser.generation:
+                # The text is not a continuation, render it from the beginning
+                self._stream_generation = self._stream_parser.generation
+                self._stream_calls = []
+                self._stream_rendered_calls = 0
+                self._stream_view = ""
+                self._stream_view_end = 0
+                closed_spans = list(self._stream_parser.spans)
+            for start, end in closed_spans:
+                self._on_stream_api_call(llm_text, start, end, sql_run_func)
         except Exception as e:
             logger.error("Api parsing exception", e)
             raise ValueError("Api parsing exception," + str(e))
 
-        return self.api_view_context(llm_text, True)
+        return self._render_stream_view(llm_text)
+
+    def _on_stream_api_call(self, llm_text: str, start: int, end: int, sql_run_func):
+        api_context = llm_text[start:end]
+        api_status = self.plugin_status_map.get(api_context)
+        if api_status is None:
+            api_name, api_args = self._parse_api_call(
+                api_context.replace("\\n", "").replace("\n", "")
+            )
+            api_status = PluginStatus(name=api_name, location=[start], args=api_args)
+            self.plugin_status_map[api_context] = api_status
+            self._run_sql_vis(api_status, sql_run_func)
+        else:
+            api_status.location.append(start)
+        view_start, wrapped = self._md_code_tag_start(llm_text, start)
+        self._stream_calls.append(
+            _StreamApiCall(
+                start=start,
+                end=end,
+                view_start=view_start,
+                wrapped=wrapped,
+                status=api_status,
+            )
+        )
+
+    def _md_code_tag_start(self, llm_text: str, start: int) -> Tuple[int, bool]:
+        """Return the start of the markdown code tag before the api call."""
+        prev_end = self._stream_calls[-1].end if self._stream_calls else 0
+        lookback = llm_text[max(prev_end, start - 16) : start]
+        stripped = lookback.rstrip(" \n")
+        for tag in _MD_CODE_TAGS:
+            if stripped.endswith(tag):
+                return start - (len(lookback) - len(stripped)) - len(tag), True
+        return start, False
+
+    def _render_stream_view(self, llm_text: str) -> str:
+        """Render the text, each closed api call is rendered once."""
+        view, pos = self._stream_view, self._stream_view_end
+        for call in self._stream_calls[self._stream_rendered_calls :]:
+            view += llm_text[pos : call.view_start] + self._api_call_view(call.status)
+            pos = call.end
+            if call.wrapped:
+                # Drop the markdown code tag which closes the wrapped api call
+                after = llm_text[call.end : call.end + 8]
+                stripped = after.lstrip(" \n")
+                if stripped.startswith("```"):
+                    pos = call.end + len(after) - len(stripped) + 3
+                elif call.end + len(after) == len(llm_text) and "```".startswith(
+                    stripped
+                ):
+                    # The closing tag may be on the way, hide the chars for now
+                    return view
+            self._stream_view, self._stream_view_end = view, pos
+            self._stream_rendered_calls += 1
+        open_start = self._stream_parser.open_start
+        if open_start is None:
+            return view + llm_text[pos:]
+        view_start, _ = self._md_code_tag_start(llm_text, open_start)
+        cost = (datetime.now().timestamp() * 1000 - self.start_time) / 1000
+        return (
+            view
+            + llm_text[pos:view_start]
+            + f'\n<span style="color:green">Waiting...{cost:.2f}S</span>\n'
+        )
+
+    def _api_call_view(self, api_status: PluginStatus) -> str:
+        if Status.FAILED.value == api_status.status:
+            return (
+                f'\n<span style="color:red">Error:</span>{api_status.err_msg}\n'
+                + self.to_view_antv_vis(api_status)
+            )
+        return self.to_view_antv_vis(api_status)
 
     def display_only_sql_vis(self, chart: dict, sql_2_df_func):
         """Display the chart using the vis standard protocol."""
@@ -328,9 +534,9 @@ class ApiCall:
             param["title"] = chart.get("title", "")
             param["describe"] = chart.get("thought", "")
 
-            param["data"] = json.loads(
-                df.to_json(orient="records", date_format="iso", date_unit="s")
-            )
+            param["data"] = _to_records(df)
+            if _is_truncated(df):
+                param["truncated"] = True
             view_json_str = json.dumps(param, default=serialize, ensure_ascii=False)
         except Exception as e:
             logger.error("parse_view_response error!" + str(e))
@@ -365,9 +571,9 @@ class ApiCall:
                 param["describe"] = chart.get("thought", "")
                 try:
                     df = sql_2_df_func(sql)
-                    param["data"] = json.loads(
-                        df.to_json(orient="records", date_format="iso", date_unit="s")
-                    )
+                    param["data"] = _to_records(df)
+                    if _is_truncated(df):
+                        param["truncated"] = True
                 except Exception as e:
                     param["data"] = []
                     param["err_msg"] = str(e)
@@ -1,5 +1,6 @@
 """AIWrapper for LLM."""
 
+import functools
 import json
 import logging
 import traceback
@@ -189,7 +190,7 @@ class AIWrapper:
         logger.info(f"Request: \n{payload}")
         span = root_tracer.start_span(
             "Agent.llm_client.no_streaming_call",
-            metadata=self._get_span_metadata(payload),
+            metadata=functools.partial(self._get_span_metadata, dict(payload)),
         )
         payload["span_id"] = span.span_id
         payload["model_cache_enable"] = self.model_cache_enable
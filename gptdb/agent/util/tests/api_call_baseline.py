@@ -0,0 +1,258 @@
+"""The views of the streamed api calls rendered by the previous ``ApiCall``.
+
+They were recorded with the ``display_sql_llmvis`` of ``ApiCall`` before the
+incremental stream parser, for the texts streamed in chunks of ``CHUNK_SIZE`` chars,
+with the SQL runner of ``test_api_call.py``. The elapsed time of the waiting views is
+removed. Only the final view is kept for the text wrapped in a markdown code tag, the
+parser hides the code tag while the api call is being generated.
+"""
+
+CHUNK_SIZE = 7
+
+BASELINE_VIEWS = {
+    "plain": {
+        "text": "before <api-call><name>response_table</name><args><sql>SELECT "
+        "1</sql></args></api-call> after",
+        "views": [
+            "before ",
+            "before <api-ca",
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before \n<span style="color:green">Waiting...</span>\n',
+            'before <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> aft",
+            'before <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> after",
+        ],
+    },
+    "two_calls": {
+        "text": "a <api-call><name>response_table</name><args><sql>SELECT "
+        "1</sql></args></api-call> b "
+        "<api-call><name>response_table</name><args><sql>SELECT "
+        "2</sql></args></api-call> c",
+        "views": [
+            "a <api-",
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a \n<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b",
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b <api-c",
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> b \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'a <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            '</chart-view> b <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '2&quot;, &quot;data&quot;: [{&quot;value&quot;: 2}]}">\n'
+            "</chart-view> c",
+        ],
+    },
+    "repeated": {
+        "text": "x <api-call><name>response_table</name><args><sql>SELECT "
+        "1</sql></args></api-call> y "
+        "<api-call><name>response_table</name><args><sql>SELECT "
+        "1</sql></args></api-call> z",
+        "views": [
+            "x <api-",
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x \n<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y",
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y <api-c",
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> y \n"
+            '<span style="color:green">Waiting...</span>\n',
+            'x <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            '</chart-view> y <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> z",
+        ],
+    },
+    "failed": {
+        "text": "oops <api-call><name>response_table</name><args><sql>SELECT "
+        "FAIL</sql></args></api-call> end",
+        "views": [
+            "oops <a",
+            "oops <api-call",
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            'oops \n<span style="color:green">Waiting...</span>\n',
+            "oops \n"
+            '<span style="color:red">Error:</span>bad sql\n'
+            '<chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            'FAIL&quot;, &quot;data&quot;: []}">\n'
+            "</chart-view> en",
+            "oops \n"
+            '<span style="color:red">Error:</span>bad sql\n'
+            '<chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            'FAIL&quot;, &quot;data&quot;: []}">\n'
+            "</chart-view> end",
+        ],
+    },
+    "fenced": {
+        "text": "Here ```sql\n"
+        "<api-call><name>response_table</name><args><sql>SELECT "
+        "1</sql></args></api-call>\n"
+        "``` done",
+        "views": [
+            'Here <chart-view content="{&quot;type&quot;: '
+            "&quot;response_table&quot;, &quot;sql&quot;: &quot;SELECT "
+            '1&quot;, &quot;data&quot;: [{&quot;value&quot;: 1}]}">\n'
+            "</chart-view> done"
+        ],
+    },
+    "no_call": {
+        "text": "just some text without calls",
+        "views": [
+            "just so",
+            "just some text",
+            "just some text withou",
+            "just some text without calls",
+        ],
+    },
+}
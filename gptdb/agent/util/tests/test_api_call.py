@@ -0,0 +1,126 @@
+import re
+from typing import List
+
+import pandas as pd
+import pytest
+
+from gptdb.agent.util.api_call import ApiCall, ApiCallStreamParser
+
+from .api_call_baseline import BASELINE_VIEWS, CHUNK_SIZE
+
+
+def _api_call(sql: str) -> str:
+    return (
+        "<api-call><name>response_table</name><args>"
+        f"<sql>{sql}</sql></args></api-call>"
+    )
+
+
+def _stream(text: str, chunk_size: int) -> List[str]:
+    return [text[:end] for end in range(chunk_size, len(text), chunk_size)] + [text]
+
+
+class FakeSqlRunner:
+    def __init__(self):
+        self.sqls: List[str] = []
+
+    def __call__(self, sql: str):
+        self.sqls.append(sql)
+        if "FAIL" in sql:
+            raise ValueError("bad sql")
+        return pd.DataFrame({"value": [len(self.sqls)]})
+
+
+def test_parser_finds_spans_split_across_chunks():
+    text = "a<api-call>x</api-call>b<api-call>y</api-call>c<api-call>z"
+    parser = ApiCallStreamParser()
+    closed = []
+    for chunk in _stream(text, 3):
+        closed.extend(parser.feed(chunk))
+    assert [text[start:end] for start, end in closed] == [
+        "<api-call>x</api-call>",
+        "<api-call>y</api-call>",
+    ]
+    assert parser.open_start == text.rindex("<api-call>")
+
+
+def test_parser_restarts_on_rewritten_text():
+    parser = ApiCallStreamParser()
+    parser.feed("hello <api-call>x</api-call>")
+    closed = parser.feed("other <api-call>y</api-call>")
+    assert closed == [(6, 28)]
+    assert parser.spans == [(6, 28)]
+
+
+def test_stream_runs_each_sql_once():
+    text = (
+        "Here is the result ```sql\n"
+        + _api_call("SELECT 1")
+        + "\n``` and the same query "
+        + _api_call("SELECT 1")
+        + " and another "
+        + _api_call("SELECT 2")
+        + " done"
+    )
+    api_call = ApiCall()
+    runner = FakeSqlRunner()
+    views = [api_call.display_sql_llmvis(chunk, runner) for chunk in _stream(text, 4)]
+
+    assert runner.sqls == ["SELECT 1", "SELECT 2"]
+    assert any("Waiting..." in view for view in views)
+    final = views[-1]
+    assert final.startswith("Here is the result <chart-view")
+    assert final.count("<chart-view") == 3
+    assert "```" not in final
+    assert "<api-call>" not in final
+    assert final.endswith(" done")
+
+
+def test_stream_view_matches_full_text_view():
+    text = "before " + _api_call("SELECT 1") + " after"
+    streamed = ApiCall()
+    for chunk in _stream(text, 5):
+        view = streamed.display_sql_llmvis(chunk, FakeSqlRunner())
+    assert view == ApiCall().display_sql_llmvis(text, FakeSqlRunner())
+
+
+@pytest.mark.parametrize("case", list(BASELINE_VIEWS))
+def test_stream_views_match_baseline(case):
+    text, expected = BASELINE_VIEWS[case]["text"], BASELINE_VIEWS[case]["views"]
+    api_call = ApiCall()
+    runner = FakeSqlRunner()
+    views = [
+        re.sub(r"Waiting\.\.\.[0-9.]+S", "Waiting...", view)
+        for view in (
+            api_call.display_sql_llmvis(chunk, runner)
+            for chunk in _stream(text, CHUNK_SIZE)
+        )
+    ]
+    assert views[-len(expected) :] == expected
+
+
+def test_parse_cost_is_linear():
+    tokens = []
+    for i in range(50000):
+        if i % 5000 == 100:
+            tokens.append(_api_call(f"SELECT {i}"))
+        else:
+            tokens.append(f"tok{i % 10} ")
+    text = "".join(tokens)
+    parser = ApiCallStreamParser()
+    api_call = ApiCall()
+    runner = FakeSqlRunner()
+    chunks = 0
+    end = 0
+    for i in range(0, len(tokens), 10):
+        end += sum(len(t) for t in tokens[i : i + 10])
+        chunk = text[:end]
+        parser.feed(chunk)
+        api_call.display_sql_llmvis(chunk, runner)
+        chunks += 1
+
+    assert len(parser.spans) == 10
+    assert len(runner.sqls) == 10
+    # Every char is scanned once, plus a few chars of the tags for every chunk
+    assert parser.scanned_chars <= len(text) + chunks * len("</api-call>")
+    assert api_call._stream_parser.scanned_chars == parser.scanned_chars
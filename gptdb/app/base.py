@@ -93,6 +93,14 @@ def _migration_db_storage(param: "WebServerParameters"):
                 and manually make the columns changes in the MySQL database instance."""
             logger.warning(warn_msg)
 
+    if Config().KNOWLEDGE_CHUNK_CONTENT_INDEX:
+        from gptdb.app.knowledge.chunk_db import DocumentChunkDao
+
+        try:
+            DocumentChunkDao().create_content_index()
+        except Exception as e:
+            logger.warning(f"Create the content index of the chunks error: {str(e)}")
+
 
 def _initialize_db(
     try_to_create_db: Optional[bool] = False, system_app: Optional[SystemApp] = None
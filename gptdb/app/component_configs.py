@@ -38,7 +38,13 @@ def initialize_components(
     )
     system_app.register(DefaultScheduler)
     system_app.register_instance(controller)
-    system_app.register(ConnectorManager)
+    system_app.register(
+        ConnectorManager,
+        pool_size=CFG.DATASOURCE_POOL_SIZE,
+        max_overflow=CFG.DATASOURCE_POOL_OVERFLOW,
+        pool_recycle=CFG.DATASOURCE_POOL_RECYCLE,
+        idle_timeout=CFG.DATASOURCE_IDLE_TIMEOUT,
+    )
 
     from gptdb.serve.agent.hub.controller import module_plugin
 
@@ -263,6 +263,13 @@ def run_webserver(param: WebServerParameters = None):
         otlp_endpoint=param.otel_exporter_otlp_traces_endpoint,
         otlp_insecure=param.otel_exporter_otlp_traces_insecure,
         otlp_timeout=param.otel_exporter_otlp_traces_timeout,
+        sample_rate=param.tracer_sample_rate,
+        slow_span_ms=param.tracer_slow_span_ms,
+        max_metadata_bytes=param.tracer_max_metadata_bytes,
+        max_queue_size=param.tracer_max_queue_size,
+        tracer_db_file=(
+            os.path.join(LOGDIR, param.tracer_db_file) if param.tracer_db_file else None
+        ),
     )
 
     with root_tracer.start_span(
@@ -445,6 +445,17 @@ def chunk_list(
             "doc_type": query_request.doc_type,
             "content": query_request.content,
         }
+        if query_request.cursor is not None:
+            # Keyset pagination, the total is only counted for the first page
+            cursor_res = service.get_chunk_list_by_cursor(
+                query, query_request.cursor, query_request.page_size
+            )
+            res = ChunkQueryResponse(
+                data=cursor_res.items,
+                total=cursor_res.total_count,
+                next_cursor=cursor_res.next_cursor,
+            )
+            return Result.succ(res)
         chunk_res = service.get_chunk_list(
             query, query_request.page, query_request.page_size
         )
@@ -1,17 +1,94 @@
+import logging
+import threading
+import weakref
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, func, not_
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Engine,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    func,
+    not_,
+    table,
+    text,
+)
+from sqlalchemy.orm import Query, Session
 
 from gptdb._private.config import Config
+from gptdb._private.pydantic import model_to_dict
 from gptdb.serve.rag.api.schemas import ChunkServeRequest, ChunkServeResponse
 from gptdb.storage.metadata import BaseDao, Model
+from gptdb.storage.metadata._base_dao import QUERY_SPEC
+from gptdb.util.pagination_utils import CursorPaginationResult, PaginationResult
 
 CFG = Config()
 
+logger = logging.getLogger(__name__)
+
+# The FTS5 table of the chunk content in SQLite, an external content table of
+# document_chunk kept in sync by the triggers below.
+_SQLITE_FTS_TABLE = "document_chunk_fts"
+_SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {_SQLITE_FTS_TABLE} USING fts5("
+    "content, content='document_chunk', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {_SQLITE_FTS_TABLE}_ai AFTER INSERT ON "
+    f"document_chunk BEGIN INSERT INTO {_SQLITE_FTS_TABLE}(rowid, content) "
+    "VALUES (new.id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS {_SQLITE_FTS_TABLE}_ad AFTER DELETE ON "
+    f"document_chunk BEGIN INSERT INTO {_SQLITE_FTS_TABLE}"
+    f"({_SQLITE_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);"
+    " END",
+    f"CREATE TRIGGER IF NOT EXISTS {_SQLITE_FTS_TABLE}_au AFTER UPDATE OF content ON "
+    f"document_chunk BEGIN INSERT INTO {_SQLITE_FTS_TABLE}"
+    f"({_SQLITE_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);"
+    f" INSERT INTO {_SQLITE_FTS_TABLE}(rowid, content) VALUES (new.id, new.content);"
+    " END",
+]
+_sqlite_fts_table = table(_SQLITE_FTS_TABLE, column("rowid"))
+# The FULLTEXT index of the chunk content in MySQL, maintained by MySQL itself.
+_MYSQL_FULLTEXT_INDEX = "ft_document_chunk_content"
+# The trigram tokenizer can't match shorter queries
+_MIN_INDEXED_QUERY_LENGTH = 3
+
+_content_index_lock = threading.Lock()
+_content_index_cache: "weakref.WeakKeyDictionary[Engine, bool]" = (
+    weakref.WeakKeyDictionary()
+)
+# The ngram token size and the stopwords of the MySQL FULLTEXT index
+_mysql_ngram_cache: (
+    "weakref.WeakKeyDictionary[Engine, Optional[Tuple[int, FrozenSet[str]]]]"
+) = weakref.WeakKeyDictionary()
+
+
+def _ngram_indexable(content: str, token_size: int, stopwords: FrozenSet[str]) -> bool:
+    """Whether all the ngrams of the content are in the MySQL FULLTEXT index.
+
+    The ngram parser skips the whitespace and does not index the ngrams which
+    contain a stopword, a phrase with such ngrams may miss the chunks which contain
+    it.
+    """
+    if len(content) < token_size or '"' in content:
+        return False
+    if any(c.isspace() for c in content):
+        return False
+    content = content.lower()
+    short_stopwords = [word for word in stopwords if len(word) <= token_size]
+    for i in range(len(content) - token_size + 1):
+        ngram = content[i : i + token_size]
+        if any(word in ngram for word in short_stopwords):
+            return False
+    return True
+
 
 class DocumentChunkEntity(Model):
     __tablename__ = "document_chunk"
+    __table_args__ = (Index("idx_document_id", "document_id"),)
     id = Column(Integer, primary_key=True)
     document_id = Column(Integer)
     doc_name = Column(String(100))
@@ -59,10 +136,57 @@ class DocumentChunkDao(BaseDao):
         session.close()
 
     def get_document_chunks(
-        self, query: DocumentChunkEntity, page=1, page_size=20, document_ids=None
+        self,
+        query: DocumentChunkEntity,
+        page=1,
+        page_size=20,
+        document_ids=None,
+        after_id: Optional[int] = None,
     ):
+        """Get the chunks of the query ordered by id.
+
+        Args:
+            query (DocumentChunkEntity): The query, the content is searched as a
+                substring, the other fields must be equal.
+            page (int): The page number, from 1, ignored if ``after_id`` is set.
+            page_size (int): The page size.
+            document_ids (Optional[List[int]]): The ids of the documents.
+            after_id (Optional[int]): Return the chunks after this id (keyset
+                pagination), it is the id of the last chunk of the previous page.
+
+        Returns:
+            List[DocumentChunkEntity]: The chunks.
+        """
         session = self.get_raw_session()
         document_chunks = session.query(DocumentChunkEntity)
+        document_chunks, id_column = self._filter_chunks(
+            session, document_chunks, query, document_ids
+        )
+        document_chunks = document_chunks.order_by(id_column.asc())
+        if after_id is not None:
+            document_chunks = document_chunks.filter(id_column > after_id)
+            document_chunks = document_chunks.limit(page_size)
+        else:
+            document_chunks = document_chunks.offset((page - 1) * page_size).limit(
+                page_size
+            )
+        result = document_chunks.all()
+        session.close()
+        return result
+
+    def _filter_chunks(
+        self,
+        session: Session,
+        document_chunks: Query,
+        query: DocumentChunkEntity,
+        document_ids=None,
+    ) -> Tuple[Query, Any]:
+        """Filter the chunks of the query.
+
+        Returns:
+            Tuple[Query, Any]: The query and the id column to order and seek by.
+        """
+        id_column = DocumentChunkEntity.id
         if query.id is not None:
             document_chunks = document_chunks.filter(DocumentChunkEntity.id == query.id)
         if query.document_id is not None:
@@ -74,8 +198,8 @@ class DocumentChunkDao(BaseDao):
                 DocumentChunkEntity.doc_type == query.doc_type
             )
         if query.content is not None:
-            document_chunks = document_chunks.filter(
-                DocumentChunkEntity.content.like(f"%{query.content}%")
+            document_chunks, id_column = self._filter_content(
+                session, document_chunks, query.content
             )
         if query.doc_name is not None:
             document_chunks = document_chunks.filter(
@@ -89,14 +213,165 @@ class DocumentChunkDao(BaseDao):
             document_chunks = document_chunks.filter(
                 DocumentChunkEntity.document_id.in_(document_ids)
             )
+        return document_chunks, id_column
 
-        document_chunks = document_chunks.order_by(DocumentChunkEntity.id.asc())
-        document_chunks = document_chunks.offset((page - 1) * page_size).limit(
-            page_size
-        )
-        result = document_chunks.all()
-        session.close()
-        return result
+    def _filter_content(
+        self, session: Session, document_chunks: Query, content: str
+    ) -> Tuple[Query, Any]:
+        """Filter the chunks whose content contains the query.
+
+        With the content index, the candidates are found by the index and checked
+        with ``LIKE``, so the result is the same as a plain ``LIKE`` scan. In MySQL the
+        index is used only if all the ngrams of the query are indexed.
+
+        Returns:
+            Tuple[Query, Any]: The query and the id column to order and seek by. In
+            SQLite it is the rowid of the FTS table, ordering by it reads the
+            matched chunks in order instead of sorting all of them.
+        """
+        like = DocumentChunkEntity.content.like(f"%{content}%")
+        if (
+            len(content) < _MIN_INDEXED_QUERY_LENGTH
+            # The wildcards of LIKE can't be searched in the index
+            or "%" in content
+            or "_" in content
+            or not self.has_content_index()
+        ):
+            return document_chunks.filter(like), DocumentChunkEntity.id
+        dialect = session.get_bind().dialect.name
+        if dialect != "sqlite":
+            ngram_settings = self._mysql_ngram_settings()
+            if ngram_settings is None or not _ngram_indexable(content, *ngram_settings):
+                return document_chunks.filter(like), DocumentChunkEntity.id
+        # Search the content as a phrase
+        phrase = '"' + content.replace('"', '""') + '"'
+        if dialect == "sqlite":
+            matched = text(f"{_SQLITE_FTS_TABLE} MATCH :content_phrase")
+            document_chunks = document_chunks.join(
+                _sqlite_fts_table, _sqlite_fts_table.c.rowid == DocumentChunkEntity.id
+            )
+            id_column = _sqlite_fts_table.c.rowid
+        else:
+            matched = text(
+                "MATCH (document_chunk.content) "
+                "AGAINST (:content_phrase IN BOOLEAN MODE)"
+            )
+            id_column = DocumentChunkEntity.id
+        document_chunks = document_chunks.filter(
+            matched.bindparams(content_phrase=phrase)
+        ).filter(like)
+        return document_chunks, id_column
+
+    def has_content_index(self) -> bool:
+        """Whether the content index of the chunks exists, it is checked once."""
+        engine = self._db_manager.engine
+        exists = _content_index_cache.get(engine)
+        if exists is not None:
+            return exists
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            sql = text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                f"AND name = '{_SQLITE_FTS_TABLE}'"
+            )
+        elif dialect == "mysql":
+            sql = text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'document_chunk' "
+                f"AND index_name = '{_MYSQL_FULLTEXT_INDEX}'"
+            )
+        else:
+            sql = None
+        exists = False
+        if sql is not None:
+            with engine.connect() as conn:
+                exists = conn.execute(sql).first() is not None
+        with _content_index_lock:
+            _content_index_cache[engine] = exists
+        return exists
+
+    def _mysql_ngram_settings(self) -> Optional[Tuple[int, FrozenSet[str]]]:
+        """Return the ngram token size and the stopwords of MySQL, read once.
+
+        The stopwords are the ones of the server now, the FULLTEXT index uses the
+        ones of the time it was built. None if they can't be read, the index is not
+        used then.
+        """
+        engine = self._db_manager.engine
+        if engine in _mysql_ngram_cache:
+            return _mysql_ngram_cache[engine]
+        settings: Optional[Tuple[int, FrozenSet[str]]] = None
+        try:
+            with engine.connect() as conn:
+                token_size, enabled, stopword_table = conn.execute(
+                    text(
+                        "SELECT @@ngram_token_size, @@innodb_ft_enable_stopword, "
+                        "@@innodb_ft_server_stopword_table"
+                    )
+                ).one()
+                stopwords: FrozenSet[str] = frozenset()
+                if enabled:
+                    if stopword_table:
+                        # The table is set as db_name/table_name
+                        db_name, table_name = stopword_table.split("/", 1)
+                        sql = text(f"SELECT value FROM `{db_name}`.`{table_name}`")
+                    else:
+                        sql = text(
+                            "SELECT value FROM "
+                            "information_schema.INNODB_FT_DEFAULT_STOPWORD"
+                        )
+                    stopwords = frozenset(
+                        row[0].lower() for row in conn.execute(sql) if row[0]
+                    )
+                settings = (int(token_size), stopwords)
+        except Exception as e:
+            logger.warning(f"Can't read the ngram settings of MySQL: {e}")
+        with _content_index_lock:
+            _mysql_ngram_cache[engine] = settings
+        return settings
+
+    def create_content_index(self) -> bool:
+        """Create the content index of the chunks if it does not exist.
+
+        SQLite uses an FTS5 table with the trigram tokenizer, it is kept in sync
+        by triggers on insert, update and delete of the chunks. MySQL uses a
+        FULLTEXT index with the ngram parser. Other databases are not supported.
+
+        Returns:
+            bool: Whether the content index exists.
+        """
+        engine = self._db_manager.engine
+        dialect = engine.dialect.name
+        if dialect not in ("sqlite", "mysql"):
+            logger.warning(f"The chunk content index is not supported by {dialect}")
+            return False
+        _content_index_cache.pop(engine, None)
+        exists = self.has_content_index()
+        with engine.begin() as conn:
+            for index in DocumentChunkEntity.__table__.indexes:
+                index.create(conn, checkfirst=True)
+            if dialect == "sqlite":
+                for ddl in _SQLITE_FTS_DDL:
+                    conn.execute(text(ddl))
+                if not exists:
+                    logger.info("Build the content index of the document chunks")
+                    conn.execute(
+                        text(
+                            f"INSERT INTO {_SQLITE_FTS_TABLE}({_SQLITE_FTS_TABLE}) "
+                            "VALUES ('rebuild')"
+                        )
+                    )
+            elif not exists:
+                logger.info("Build the content index of the document chunks")
+                conn.execute(
+                    text(
+                        "ALTER TABLE document_chunk ADD FULLTEXT INDEX "
+                        f"{_MYSQL_FULLTEXT_INDEX} (content) WITH PARSER ngram"
+                    )
+                )
+        with _content_index_lock:
+            _content_index_cache[engine] = True
+        return True
 
     def get_chunks_with_questions(self, query: DocumentChunkEntity, document_ids=None):
         session = self.get_raw_session()
@@ -135,24 +410,7 @@ class DocumentChunkDao(BaseDao):
     def get_document_chunks_count(self, query: DocumentChunkEntity):
         session = self.get_raw_session()
         document_chunks = session.query(func.count(DocumentChunkEntity.id))
-        if query.id is not None:
-            document_chunks = document_chunks.filter(DocumentChunkEntity.id == query.id)
-        if query.document_id is not None:
-            document_chunks = document_chunks.filter(
-                DocumentChunkEntity.document_id == query.document_id
-            )
-        if query.doc_type is not None:
-            document_chunks = document_chunks.filter(
-                DocumentChunkEntity.doc_type == query.doc_type
-            )
-        if query.doc_name is not None:
-            document_chunks = document_chunks.filter(
-                DocumentChunkEntity.doc_name == query.doc_name
-            )
-        if query.meta_info is not None:
-            document_chunks = document_chunks.filter(
-                DocumentChunkEntity.meta_info == query.meta_info
-            )
+        document_chunks, _ = self._filter_chunks(session, document_chunks, query)
         count = document_chunks.scalar()
         session.close()
         return count
@@ -171,6 +429,97 @@ class DocumentChunkDao(BaseDao):
         session.commit()
         session.close()
 
+    def _create_search_query_object(
+        self,
+        session: Session,
+        query_request: QUERY_SPEC,
+        desc_order_column: Optional[str] = None,
+    ) -> Tuple[Query, Any]:
+        """Create a query object of the chunk search, the content is a substring.
+
+        The other methods of the DAO, e.g. ``get_one``, ``update`` and ``delete``,
+        still match the content exactly.
+
+        Returns:
+            Tuple[Query, Any]: The query and the id column to order and seek by.
+        """
+        query_dict = (
+            dict(query_request)
+            if isinstance(query_request, dict)
+            else model_to_dict(query_request)
+        )
+        content = query_dict.pop("content", None)
+        query = self._create_query_object(session, query_dict, desc_order_column)
+        id_column = DocumentChunkEntity.id
+        if content:
+            query, id_column = self._filter_content(session, query, content)
+        if not desc_order_column:
+            query = query.order_by(id_column.asc())
+        return query, id_column
+
+    def get_list(self, query_request: QUERY_SPEC) -> List[ChunkServeResponse]:
+        """Get the chunks of the query, the content is searched as a substring."""
+        with self.session() as session:
+            query, _ = self._create_search_query_object(session, query_request)
+            return [self.to_response(item) for item in query.all()]
+
+    def get_list_page(
+        self,
+        query_request: QUERY_SPEC,
+        page: int,
+        page_size: int,
+        desc_order_column: Optional[str] = None,
+    ) -> PaginationResult[ChunkServeResponse]:
+        """Get a page of chunks, the content is searched as a substring."""
+        with self.session() as session:
+            query, _ = self._create_search_query_object(
+                session, query_request, desc_order_column
+            )
+            total_count = query.order_by(None).count()
+            items = query.offset((page - 1) * page_size).limit(page_size)
+            return PaginationResult(
+                items=[self.to_response(item) for item in items],
+                total_count=total_count,
+                total_pages=(total_count + page_size - 1) // page_size,
+                page=page,
+                page_size=page_size,
+            )
+
+    def get_list_by_cursor(
+        self,
+        query_request: QUERY_SPEC,
+        cursor: Optional[int],
+        page_size: int,
+        cursor_column: str = "id",
+        with_total: bool = False,
+        descending: bool = False,
+    ) -> CursorPaginationResult[ChunkServeResponse]:
+        """Get a page of chunks after the cursor, the content is searched."""
+        with self.session() as session:
+            query, id_column = self._create_search_query_object(session, query_request)
+            # The rowid of the FTS table is the id of the chunk
+            column = (
+                id_column
+                if cursor_column == "id"
+                else getattr(DocumentChunkEntity, cursor_column)
+            )
+            total_count = query.order_by(None).count() if with_total else None
+            if cursor:
+                query = query.filter(column < cursor if descending else column > cursor)
+            order = column.desc() if descending else column.asc()
+            # Read one more chunk to know whether there is a next page
+            items = query.order_by(None).order_by(order).limit(page_size + 1).all()
+            next_cursor = None
+            if len(items) > page_size:
+                items = items[:page_size]
+                next_cursor = getattr(items[-1], cursor_column)
+            return CursorPaginationResult(
+                items=[self.to_response(item) for item in items],
+                next_cursor=next_cursor,
+                page_size=page_size,
+                total_count=total_count,
+            )
+
     def from_request(
         self, request: Union[ChunkServeRequest, Dict[str, Any]]
     ) -> DocumentChunkEntity:
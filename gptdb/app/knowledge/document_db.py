@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from sqlalchemy import Column, DateTime, Integer, String, Text, func
 
@@ -211,6 +211,23 @@ class KnowledgeDocumentDao(BaseDao):
         session.close()
         return docs_count
 
+    def get_space_documents_version(self, space_name: str) -> Tuple[int, Optional[int]]:
+        """Return the number and the max id of the documents of the space.
+
+        They change when a document is added to or deleted from the space, so they
+        tell whether the cached document list of the space is stale.
+        """
+        with self.session(commit=False) as session:
+            count, max_id = (
+                session.query(
+                    func.count(KnowledgeDocumentEntity.id),
+                    func.max(KnowledgeDocumentEntity.id),
+                )
+                .filter(KnowledgeDocumentEntity.space == space_name)
+                .one()
+            )
+            return count, max_id
+
     def get_knowledge_documents_count_bulk_by_ids(self, spaces):
         session = self.get_raw_session()
         """
@@ -80,6 +80,9 @@ class DocumentQueryRequest(BaseModel):
     page: int = 1
     """page_size: page size"""
     page_size: int = 20
+    """cursor: the next_cursor of the previous page, 0 for the first page, the page
+    is ignored if it is set"""
+    cursor: Optional[int] = None
 
 
 class GraphVisRequest(BaseModel):
@@ -154,6 +157,9 @@ class ChunkQueryRequest(BaseModel):
     page: int = 1
     """page_size: page size"""
     page_size: int = 20
+    """cursor: the next_cursor of the previous page, 0 for the first page, the page
+    is ignored if it is set"""
+    cursor: Optional[int] = None
 
 
 class ChunkEditRequest(BaseModel):
@@ -21,6 +21,10 @@ class ChunkQueryResponse(BaseModel):
     total: Optional[int] = Field(None, description="total size")
     """page: current page"""
     page: Optional[int] = Field(None, description="current page")
+    """next_cursor: the cursor of the next page"""
+    next_cursor: Optional[int] = Field(
+        None, description="the cursor of the next page, null if it is the last page"
+    )
 
 
 class DocumentResponse(BaseModel):
@@ -149,3 +153,7 @@ class DocumentQueryResponse(BaseModel):
     total: Optional[int] = Field(None, description="total size")
     """page: current page"""
     page: Optional[int] = Field(None, description="current page")
+    """next_cursor: the cursor of the next page"""
+    next_cursor: Optional[int] = Field(
+        None, description="the cursor of the next page, null if it is the last page"
+    )
@@ -218,6 +218,20 @@ class KnowledgeService:
                     for doc in docs
                     if doc.doc_name and request.doc_name in doc.doc_name
                 ]
+            elif request.cursor is not None:
+                # Keyset pagination, the total is only counted for the first page
+                result = knowledge_document_dao.get_list_by_cursor(
+                    query,
+                    request.cursor,
+                    request.page_size,
+                    with_total=not request.cursor,
+                    descending=True,
+                )
+                docs = result.items
+                docs = [DocumentResponse.serve_to_response(doc) for doc in docs]
+                res.data = docs
+                res.total = result.total_count
+                res.next_cursor = result.next_cursor
             else:
                 result = knowledge_document_dao.get_list_page(
                     query, page=request.page, page_size=request.page_size
@@ -0,0 +1,171 @@
+import pytest
+
+from gptdb.storage.metadata import db
+
+from ..chunk_db import DocumentChunkDao, DocumentChunkEntity
+
+_CONTENTS = [
+    "The quick brown fox jumps over the lazy dog",
+    "Keyset pagination reads the next page with the index",
+    "A full-text index finds the chunks without a table scan",
+    "数据库的全文索引",
+    'He said "hello" to the FOX',
+    "100% of the chunks, snake_case names",
+]
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+
+    yield
+
+
+@pytest.fixture
+def dao():
+    return DocumentChunkDao()
+
+
+def _create_chunks(dao: DocumentChunkDao, rounds: int = 3):
+    for i in range(rounds):
+        dao.create_documents_chunks(
+            [
+                DocumentChunkEntity(
+                    doc_name=f"doc_{i}",
+                    doc_type="TEXT",
+                    document_id=i,
+                    content=content,
+                    meta_info="",
+                )
+                for content in _CONTENTS
+            ]
+        )
+
+
+def _search(dao: DocumentChunkDao, content: str):
+    chunks = dao.get_document_chunks(
+        DocumentChunkEntity(content=content), page_size=1000
+    )
+    return [chunk.id for chunk in chunks]
+
+
+_QUERIES = ["fox", "FOX", "the", "index", "全文索", '"hello"', "100%", "e_c", "ab", "x"]
+
+
+def test_content_index_returns_the_same_chunks(dao: DocumentChunkDao):
+    _create_chunks(dao)
+    expected = {q: _search(dao, q) for q in _QUERIES}
+    assert not dao.has_content_index()
+
+    assert dao.create_content_index()
+    assert dao.has_content_index()
+    for q in _QUERIES:
+        assert _search(dao, q) == expected[q], q
+        assert dao.get_document_chunks_count(DocumentChunkEntity(content=q)) == len(
+            expected[q]
+        )
+    # Created again, nothing changes
+    assert dao.create_content_index()
+    assert _search(dao, "fox") == expected["fox"]
+
+
+def test_content_index_is_kept_in_sync(dao: DocumentChunkDao):
+    dao.create_content_index()
+    _create_chunks(dao, rounds=2)
+    fox_ids = _search(dao, "fox")
+    assert len(fox_ids) == 4
+
+    chunk = dao.get_document_chunks(DocumentChunkEntity(id=fox_ids[0]))[0]
+    chunk.content = "A red panda"
+    dao.update_chunk(chunk)
+    assert _search(dao, "fox") == fox_ids[1:]
+    assert _search(dao, "red panda") == [fox_ids[0]]
+
+    dao.raw_delete(document_id=1)
+    assert _search(dao, "fox") == [fox_ids[1]]
+    assert _search(dao, "red panda") == [fox_ids[0]]
+
+
+def test_keyset_pagination(dao: DocumentChunkDao):
+    _create_chunks(dao, rounds=4)
+    all_ids = [c.id for c in dao.get_document_chunks(DocumentChunkEntity(), 1, 100)]
+    ids, after_id = [], 0
+    while True:
+        chunks = dao.get_document_chunks(
+            DocumentChunkEntity(), page_size=5, after_id=after_id
+        )
+        if not chunks:
+            break
+        ids.extend(c.id for c in chunks)
+        after_id = chunks[-1].id
+    assert ids == all_ids
+
+
+def test_list_by_cursor_searches_content(dao: DocumentChunkDao):
+    dao.create_content_index()
+    _create_chunks(dao, rounds=5)
+    expected = _search(dao, "index")
+    assert len(expected) == 10
+
+    ids, cursor = [], 0
+    while True:
+        result = dao.get_list_by_cursor(
+            {"content": "index"}, cursor, page_size=3, with_total=not cursor
+        )
+        if not cursor:
+            assert result.total_count == 10
+        ids.extend(item.id for item in result.items)
+        cursor = result.next_cursor
+        if cursor is None:
+            break
+    assert ids == expected
+    page = dao.get_list_page({"content": "index", "document_id": 2}, 1, 20)
+    assert page.total_count == 2
+
+
+def test_search_only_in_list_methods(dao: DocumentChunkDao):
+    dao.create_content_index()
+    _create_chunks(dao, rounds=1)
+    fox_ids = _search(dao, "fox")
+    assert [item.id for item in dao.get_list({"content": "fox"})] == fox_ids
+
+    # The other methods match the content exactly
+    assert dao.get_one({"content": "fox"}) is None
+    chunk = dao.get_one({"content": _CONTENTS[0]})
+    assert chunk.id == fox_ids[0]
+    with pytest.raises(Exception):
+        dao.update({"content": "fox"}, {"meta_info": "updated"})
+    with pytest.raises(ValueError):
+        dao.delete({"content": "fox"})
+    assert _search(dao, "fox") == fox_ids
+
+
+def _mysql_sql(dao: DocumentChunkDao, mocker, content: str) -> str:
+    from sqlalchemy.dialects import mysql
+
+    mocker.patch.object(dao, "has_content_index", return_value=True)
+    mocker.patch.object(
+        dao, "_mysql_ngram_settings", return_value=(2, frozenset({"a", "i", "the"}))
+    )
+    session = dao.get_raw_session()
+    mocker.patch.object(
+        session, "get_bind", return_value=mocker.Mock(dialect=mysql.dialect())
+    )
+    query, _ = dao._filter_content(session, session.query(DocumentChunkEntity), content)
+    session.close()
+    return str(query.statement.compile(dialect=mysql.dialect()))
+
+
+def test_mysql_fulltext_prefilter(dao: DocumentChunkDao, mocker):
+    sql = _mysql_sql(dao, mocker, "全文索")
+    assert "MATCH (document_chunk.content) AGAINST" in sql
+    assert "LIKE" in sql
+
+
+@pytest.mark.parametrize("content", ["fox jumps", "index", '"hello"', "the fox"])
+def test_mysql_unindexed_terms_use_like(dao: DocumentChunkDao, mocker, content):
+    # Whitespace, a quote or an ngram with a stopword can't be matched in the index
+    sql = _mysql_sql(dao, mocker, content)
+    assert "MATCH" not in sql
+    assert "LIKE" in sql
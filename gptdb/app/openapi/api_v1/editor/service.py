@@ -46,6 +46,7 @@ class EditorService(BaseComponent):
             conv_uid,
             conv_storage=conv_serve.conv_storage,
             message_storage=conv_serve.message_storage,
+            conv_cache=conv_serve.conv_cache,
         )
 
     def get_editor_sql_rounds(self, conv_uid: str) -> List[ChatDbRounds]:
@@ -127,6 +128,8 @@ class EditorService(BaseComponent):
                     #     )
                 if to_update_messages:
                     conv_serve.message_storage.save_or_update_list(to_update_messages)
+                    # The messages are updated without the conversation
+                    conv_serve.conv_cache.invalidate(storage_conv.conv_uid)
                 return
 
     def get_editor_chart_list(self, conv_uid: str) -> Optional[ChartList]:
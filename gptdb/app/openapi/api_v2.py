@@ -1,14 +1,12 @@
-import json
-import re
-import time
 import uuid
 from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Body, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.background import BackgroundTask
 from starlette.responses import JSONResponse, StreamingResponse
 
-from gptdb._private.pydantic import model_to_dict, model_to_json
+from gptdb._private.pydantic import model_to_dict
 from gptdb.app.openapi.api_v1.api_v1 import (
     CHAT_FACTORY,
     __new_conversation,
@@ -21,17 +19,20 @@ from gptdb.app.scene import BaseChat, ChatScene
 from gptdb.client.schema import ChatCompletionRequestBody, ChatMode
 from gptdb.component import logger
 from gptdb.core.awel import CommonLLMHttpRequestBody
+from gptdb.core.awel.trigger.admission import (
+    AdmissionRejectedError,
+    AdmissionTicket,
+    release_after_stream,
+)
 from gptdb.core.schema.api import (
     ChatCompletionResponse,
     ChatCompletionResponseChoice,
-    ChatCompletionResponseStreamChoice,
-    ChatCompletionStreamResponse,
     ChatMessage,
-    DeltaMessage,
     ErrorResponse,
     UsageInfo,
 )
 from gptdb.model.cluster.apiserver.api import APISettings
+from gptdb.serve.agent.agents.chat_events import OpenAIStreamEncoder
 from gptdb.serve.agent.agents.controller import multi_agents
 from gptdb.serve.flow.api.endpoints import get_service
 from gptdb.serve.flow.service.service import Service as FlowService
@@ -116,13 +117,18 @@ async def chat_completions(
             media_type="text/event-stream",
         )
     elif request.chat_mode == ChatMode.CHAT_AWEL_FLOW.value:
+        ticket = await admit_flow(request.chat_param)
         if not request.stream:
-            return await chat_flow_wrapper(request)
+            try:
+                return await chat_flow_wrapper(request)
+            finally:
+                ticket.release()
         else:
             return StreamingResponse(
-                chat_flow_stream_wrapper(request),
+                release_after_stream(chat_flow_stream_wrapper(request), ticket),
                 headers=headers,
                 media_type="text/event-stream",
+                background=BackgroundTask(ticket.release),
             )
     elif (
         request.chat_mode is None
@@ -223,35 +229,39 @@ async def chat_app_stream_wrapper(request: ChatCompletionRequestBody = None):
         request (OpenAPIChatCompletionRequest): request
         token (APIToken): token
     """
-    async for output in multi_agents.app_agent_chat(
+    encoder = OpenAIStreamEncoder(request.conv_uid, request.model)
+    async for event in multi_agents.app_agent_chat_events(
         conv_uid=request.conv_uid,
         gpts_name=request.chat_param,
         user_query=request.messages,
         user_code=request.user_name,
         sys_code=request.sys_code,
     ):
-        match = re.search(r"data:\s*({.*})", output)
-        if match:
-            json_str = match.group(1)
-            vis = json.loads(json_str)
-            vis_content = vis.get("vis", None)
-            if vis_content != "[DONE]":
-                choice_data = ChatCompletionResponseStreamChoice(
-                    index=0,
-                    delta=DeltaMessage(role="assistant", content=vis.get("vis", None)),
-                )
-                chunk = ChatCompletionStreamResponse(
-                    id=request.conv_uid,
-                    choices=[choice_data],
-                    model=request.model,
-                    created=int(time.time()),
-                )
-                json_content = model_to_json(
-                    chunk, exclude_unset=True, ensure_ascii=False
-                )
-                content = f"data: {json_content}\n\n"
-                yield content
-    yield "data: [DONE]\n\n"
+        content = encoder.encode(event)
+        if content:
+            yield content
+    yield encoder.finish()
+
+
+async def admit_flow(flow_uid: str) -> AdmissionTicket:
+    """Take a slot of the flow, reject the request with 429 if it is overloaded."""
+    flow_service = get_chat_flow()
+    try:
+        ticket = await flow_service.admit_flow(flow_uid)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail={
+                "error": {
+                    "message": str(e),
+                    "type": "rate_limit_error",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+            },
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return ticket or AdmissionTicket([])
 
 
 async def chat_flow_wrapper(request: ChatCompletionRequestBody):
@@ -1,13 +1,17 @@
 import asyncio
+import copy
 import datetime
+import functools
 import logging
+import threading
 import traceback
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
 from gptdb._private.config import Config
 from gptdb._private.pydantic import EXTRA_FORBID
 from gptdb.app.scene.base import AppScenePromptTemplateAdapter, ChatScene
+from gptdb.app.scene.chat_components import get_chat_component_cache
 from gptdb.app.scene.operators.app_operator import (
     AppChatComposerOperator,
     ChatComposerInput,
@@ -21,7 +25,7 @@ from gptdb.model.cluster import WorkerManagerFactory
 from gptdb.serve.conversation.serve import Serve as ConversationServe
 from gptdb.util import get_or_create_event_loop
 from gptdb.util.executor_utils import ExecutorFactory, blocking_func_to_async
-from gptdb.util.retry import async_retry
+from gptdb.util.retry import HedgePolicy, async_retry
 from gptdb.util.tracer import root_tracer, trace
 
 from .exceptions import BaseAppException
@@ -35,6 +39,7 @@ def _build_conversation(
     chat_param: Dict[str, Any],
     model_name: str,
     conv_serve: ConversationServe,
+    history_rounds: Optional[int] = None,
 ) -> StorageConversation:
     param_type = ""
     param_value = ""
@@ -52,9 +57,23 @@ def _build_conversation(
         param_value=param_value,
         conv_storage=conv_serve.conv_storage,
         message_storage=conv_serve.message_storage,
+        history_rounds=history_rounds,
+        conv_cache=conv_serve.conv_cache,
     )
 
 
+def _lazy_span_metadata(payload: ModelRequest) -> Callable[[], Dict[str, Any]]:
+    """Return the span metadata of the model request, built only if it is recorded.
+
+    The request is copied now, the later changes of the request, e.g. its span id,
+    do not race with the writer thread of the spans.
+    """
+    snapshot = copy.copy(payload)
+    snapshot.messages = list(payload.messages)
+    snapshot.context = copy.copy(payload.context)
+    return functools.partial(ModelRequest.to_dict, snapshot)
+
+
 class BaseChat(ABC):
     """GPT-DB Chat Service Base Module
     Include:
@@ -72,6 +91,11 @@ class BaseChat(ABC):
     # convert system message to human message
     auto_convert_message: bool = True
 
+    # Load the conversation history while the input values are generated (e.g. the
+    # retrieval) instead of in the constructor. Only for the scenes which don't read
+    # the conversation in the constructor or in generate_input_values.
+    prefetch_history: bool = False
+
     @trace("BaseChat.__init__")
     def __init__(self, chat_param: Dict):
         """Chat Module Initialization
@@ -107,6 +131,7 @@ class BaseChat(ABC):
             )
         )
         self._conv_serve = ConversationServe.get_instance(CFG.SYSTEM_APP)
+        self._chat_param = chat_param
         # chat_history_fac = ChatHistory()
         ### can configurable storage methods
         # self.memory = chat_history_fac.get_store_instance(chat_param["chat_session_id"])
@@ -117,10 +142,11 @@ class BaseChat(ABC):
         #     user_name=chat_param.get("user_name"),
         #     sys_code=chat_param.get("sys_code"),
         # )
-        self.current_message: StorageConversation = _build_conversation(
-            self.chat_mode, chat_param, self.llm_model, self._conv_serve
-        )
-        self.history_messages = self.current_message.get_history_message()
+        self._current_message: Optional[StorageConversation] = None
+        self._conversation_lock = threading.Lock()
+        self.history_messages = []
+        if not self.prefetch_history:
+            self._load_conversation()
         self.current_tokens_used: int = 0
         # The executor to submit blocking function
         self._executor = CFG.SYSTEM_APP.get_component(
@@ -135,7 +161,28 @@ class BaseChat(ABC):
         # In v1, we will transform the message to compatible format of specific model
         # In the future, we will upgrade the message version to v2, and the message will be compatible with all models
         self._message_version = chat_param.get("message_version", "v2")
-        self._chat_param = chat_param
+
+    @property
+    def current_message(self) -> StorageConversation:
+        """Return the conversation, it is loaded on the first access if prefetched."""
+        if self._current_message is None:
+            return self._load_conversation()
+        return self._current_message
+
+    def _load_conversation(self) -> StorageConversation:
+        """Load the conversation and its history messages from the storage."""
+        with self._conversation_lock:
+            if self._current_message is None:
+                conversation = _build_conversation(
+                    self.chat_mode,
+                    self._chat_param,
+                    self.llm_model,
+                    self._conv_serve,
+                    history_rounds=self._history_rounds(),
+                )
+                self.history_messages = conversation.get_history_message()
+                self._current_message = conversation
+            return self._current_message
 
     @property
     def chat_type(self) -> str:
@@ -161,14 +208,24 @@ class BaseChat(ABC):
             worker_manager, auto_convert_message=self.auto_convert_message
         )
 
+    def _get_llm_operator(self, is_streaming: bool):
+        """Return the model operator, it is shared by the chats of the same kind."""
+        return get_chat_component_cache().get_or_build(
+            ("llm_operator", is_streaming, self.auto_convert_message),
+            lambda: build_cached_chat_operator(
+                self.llm_client, is_streaming, CFG.SYSTEM_APP
+            ),
+            version=CFG.SYSTEM_APP,
+        )
+
     async def call_llm_operator(self, request: ModelRequest) -> ModelOutput:
-        llm_task = build_cached_chat_operator(self.llm_client, False, CFG.SYSTEM_APP)
+        llm_task = self._get_llm_operator(False)
         return await llm_task.call(call_data=request)
 
     async def call_streaming_operator(
         self, request: ModelRequest
     ) -> AsyncIterator[ModelOutput]:
-        llm_task = build_cached_chat_operator(self.llm_client, True, CFG.SYSTEM_APP)
+        llm_task = self._get_llm_operator(True)
         async for out in await llm_task.call_stream(call_data=request):
             yield out
 
@@ -178,13 +235,27 @@ class BaseChat(ABC):
     def message_adjust(self):
         pass
 
+    def _history_rounds(self) -> Optional[int]:
+        """Return the number of the latest rounds to load, all the rounds if None.
+
+        Only the rounds passed to the model are loaded, the first rounds are kept
+        by ``keep_start_rounds`` so all the rounds are loaded then.
+        """
+        if not self.prompt_template.need_historical_messages:
+            return 0
+        if self.keep_start_rounds:
+            return None
+        return self.keep_end_rounds
+
     def has_history_messages(self) -> bool:
         """Whether there is a history messages
 
         Returns:
             bool: True if there is a history message, False otherwise
         """
-        return len(self.history_messages) > 0
+        return (
+            len(self.history_messages) > 0 or self.current_message.has_earlier_messages
+        )
 
     def get_llm_speak(self, prompt_define_response):
         if hasattr(prompt_define_response, "thoughts"):
@@ -205,7 +276,14 @@ class BaseChat(ABC):
         return speak_to_user
 
     async def _build_model_request(self) -> ModelRequest:
-        input_values = await self.generate_input_values()
+        if self._current_message is None:
+            # Load the history while the input values are generated
+            input_values, _ = await asyncio.gather(
+                self.generate_input_values(),
+                blocking_func_to_async(self._executor, self._load_conversation),
+            )
+        else:
+            input_values = await self.generate_input_values()
         # Load history
         self.history_messages = self.current_message.get_history_message()
         self.current_message.start_new_round()
@@ -272,7 +350,7 @@ class BaseChat(ABC):
         logger.info(f"payload request: \n{payload}")
         ai_response_text = ""
         span = root_tracer.start_span(
-            "BaseChat.stream_call", metadata=payload.to_dict()
+            "BaseChat.stream_call", metadata=_lazy_span_metadata(payload)
         )
         payload.span_id = span.span_id
         try:
@@ -303,7 +381,7 @@ class BaseChat(ABC):
     async def nostream_call(self):
         payload = await self._build_model_request()
         span = root_tracer.start_span(
-            "BaseChat.nostream_call", metadata=payload.to_dict()
+            "BaseChat.nostream_call", metadata=_lazy_span_metadata(payload)
         )
         logger.info(f"Request: \n{payload}")
         payload.span_id = span.span_id
@@ -333,6 +411,14 @@ class BaseChat(ABC):
         retries=CFG.GPTDB_APP_SCENE_NON_STREAMING_RETRIES_BASE,
         parallel_executions=CFG.GPTDB_APP_SCENE_NON_STREAMING_PARALLELISM_BASE,
         catch_exceptions=(Exception, BaseAppException),
+        hedge=(
+            HedgePolicy(
+                percentile=CFG.GPTDB_APP_SCENE_NON_STREAMING_HEDGE_PERCENTILE,
+                key_func=lambda chat, payload: payload.model,
+            )
+            if CFG.GPTDB_APP_SCENE_NON_STREAMING_HEDGE_PERCENTILE is not None
+            else None
+        ),
     )
     async def _no_streaming_call_with_retry(self, payload):
         with root_tracer.start_span("BaseChat.invoke_worker_manager.generate"):
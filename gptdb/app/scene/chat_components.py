@@ -0,0 +1,154 @@
+"""The cache of the chat components shared by the requests of an app or a space.
+
+Building a chat scene loads the prompt template, the retrievers, the connectors
+and the model operators of its app or knowledge space before the first token can
+be produced. They don't change between the requests, so they are built once and
+cached here, only the per-request state (the conversation and the user input) is
+built for every request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from gptdb._private.config import Config
+
+T = TypeVar("T")
+
+
+@dataclass
+class _CachedComponent:
+    value: Any
+    version: Hashable
+    expires_at: float
+
+
+class ChatComponentCache:
+    """A versioned TTL cache of the chat components.
+
+    A component is rebuilt when its version is changed, e.g. the config of the
+    knowledge space, or when it is older than ``ttl`` seconds. The concurrent
+    requests of the same key wait for one build instead of building the component
+    in parallel. The components are shared by the concurrent requests, they must
+    not keep any per-request state.
+
+    Examples:
+        .. code-block:: python
+
+            cache = ChatComponentCache(ttl=300)
+            retriever = cache.get_or_build(
+                ("chat_knowledge", space_name),
+                lambda: build_retriever(space_name),
+                version=space.gmt_modified,
+            )
+
+    Args:
+        ttl (float): The seconds a component is reused, 0 disables the cache.
+        max_size (int): The max number of cached components, the least recently
+            used ones are removed first.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 256):
+        """Create a chat component cache."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._components: "OrderedDict[Hashable, _CachedComponent]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the components are cached."""
+        return self._ttl > 0 and self._max_size > 0
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], T], version: Hashable = None
+    ) -> T:
+        """Return the cached component of the key, build it if missing or stale.
+
+        Args:
+            key (Hashable): The key of the component, e.g. the scene and the space.
+            build (Callable[[], T]): Build the component, it may block.
+            version (Hashable): The version of the component, it is rebuilt when
+                the version is changed.
+
+        Returns:
+            T: The component.
+        """
+        if not self.enabled:
+            return build()
+        cached = self._get(key, version)
+        if cached is not None:
+            return cached.value
+        with self._lock:
+            self.misses += 1
+        with self._get_build_lock(key):
+            # Another request may have built it while we were waiting for the lock
+            cached = self._get(key, version, count_hit=False)
+            if cached is not None:
+                return cached.value
+            value = build()
+            with self._lock:
+                self._components[key] = _CachedComponent(
+                    value, version, time.monotonic() + self._ttl
+                )
+                self._components.move_to_end(key)
+                while len(self._components) > self._max_size:
+                    evicted, _ = self._components.popitem(last=False)
+                    self._build_locks.pop(evicted, None)
+            return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the cached component of the key."""
+        with self._lock:
+            self._components.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all the cached components."""
+        with self._lock:
+            self._components.clear()
+            self._build_locks.clear()
+
+    def _get(
+        self, key: Hashable, version: Hashable, count_hit: bool = True
+    ) -> Optional[_CachedComponent]:
+        with self._lock:
+            cached = self._components.get(key)
+            if cached is None:
+                return None
+            if cached.version != version or cached.expires_at < time.monotonic():
+                del self._components[key]
+                return None
+            self._components.move_to_end(key)
+            if count_hit:
+                self.hits += 1
+            return cached
+
+    def _get_build_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            lock = self._build_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._build_locks[key] = lock
+            return lock
+
+
+_cache: Optional[ChatComponentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_chat_component_cache() -> ChatComponentCache:
+    """Return the process-wide chat component cache.
+
+    Its TTL is ``CHAT_COMPONENT_CACHE_TTL`` seconds, 0 disables the cache.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ChatComponentCache(ttl=Config().CHAT_COMPONENT_CACHE_TTL)
+    return _cache
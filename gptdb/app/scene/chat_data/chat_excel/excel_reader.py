@@ -1,7 +1,11 @@
+import hashlib
 import io
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Union
 
 import chardet
 import duckdb
@@ -19,12 +23,22 @@ from pyparsing import (
     delimitedList,
 )
 
+from gptdb.configs.model_config import DATA_DIR
 from gptdb.util.file_client import FileClient
 from gptdb.util.pd_utils import csv_colunm_foramt
 from gptdb.util.string_utils import is_chinese_include_number
 
 logger = logging.getLogger(__name__)
 
+# Bump it when the conversion of the file changes to invalidate the cached files
+_EXCEL_CACHE_VERSION = "1"
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+_MAX_POOLED_CONNECTIONS = 32
+
+_connection_lock = threading.Lock()
+_connections: "OrderedDict[str, duckdb.DuckDBPyConnection]" = OrderedDict()
+_build_locks: Dict[str, threading.Lock] = {}
+
 
 def excel_colunm_format(old_name: str) -> str:
     new_column = old_name.strip()
@@ -32,17 +46,148 @@ def excel_colunm_format(old_name: str) -> str:
     return new_column
 
 
-def detect_encoding(file_path):
-    # 读取文件的二进制数据
+def detect_encoding(file_path, sample_size: int = _ENCODING_SAMPLE_SIZE):
+    # 读取文件开头的二进制数据
     with open(file_path, "rb") as f:
-        data = f.read()
-    # 使用 chardet 来检测文件编码
-    result = chardet.detect(data)
+        data = f.read(sample_size)
+    return detect_bytes_encoding(data, sample_size)
+
+
+def detect_bytes_encoding(data: bytes, sample_size: int = _ENCODING_SAMPLE_SIZE):
+    # 使用 chardet 检测文件开头部分的编码
+    result = chardet.detect(data[:sample_size])
     encoding = result["encoding"]
     confidence = result["confidence"]
     return encoding, confidence
 
 
+def file_content_hash(file_info) -> str:
+    """Return the md5 hash of the file path or file content."""
+    hasher = hashlib.md5()
+    if isinstance(file_info, str):
+        with open(file_info, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                hasher.update(chunk)
+    else:
+        hasher.update(file_info)
+    return hasher.hexdigest()
+
+
+def read_excel_dataframe(file_name: str, file_info, encoding=None) -> pd.DataFrame:
+    """Read the excel or csv file and normalize its columns.
+
+    Only the header is read to build the converters, the data is read once.
+    """
+    if file_name.endswith(".xlsx") or file_name.endswith(".xls"):
+        columns = pd.read_excel(file_info, index_col=False, nrows=0).columns
+        df = pd.read_excel(
+            file_info,
+            index_col=False,
+            converters={i: csv_colunm_foramt for i in range(len(columns))},
+        )
+    elif file_name.endswith(".csv"):
+
+        def _source():
+            return file_info if isinstance(file_info, str) else io.BytesIO(file_info)
+
+        columns = pd.read_csv(
+            _source(), index_col=False, encoding=encoding, nrows=0
+        ).columns
+        df = pd.read_csv(
+            _source(),
+            index_col=False,
+            encoding=encoding,
+            converters={i: csv_colunm_foramt for i in range(len(columns))},
+        )
+    else:
+        raise ValueError("Unsupported file format.")
+
+    df.replace("", np.nan, inplace=True)
+
+    unnamed_columns = [
+        col
+        for col in df.columns
+        if str(col).startswith("Unnamed") and df[col].isnull().all()
+    ]
+    df.drop(columns=unnamed_columns, inplace=True)
+
+    for column_name in df.columns:
+        df[column_name] = df[column_name].astype(str)
+        try:
+            df[column_name] = pd.to_datetime(df[column_name]).dt.strftime("%Y-%m-%d")
+        except ValueError:
+            try:
+                df[column_name] = pd.to_numeric(df[column_name])
+            except ValueError:
+                try:
+                    df[column_name] = df[column_name].astype(str)
+                except Exception:
+                    print("Can't transform column: " + column_name)
+
+    return df.rename(columns=lambda x: x.strip().replace(" ", "_"))
+
+
+def get_excel_connection(
+    cache_dir: str, cache_key: str, file_name: str, file_info
+) -> duckdb.DuckDBPyConnection:
+    """Get the pooled duckdb connection of the file.
+
+    The file is converted once into a duckdb database file named by its content
+    hash, the connection is shared by all the readers of the same file across chat
+    turns and sessions.
+    """
+    db_path = os.path.join(cache_dir, f"{cache_key}.duckdb")
+    with _connection_lock:
+        conn = _connections.get(db_path)
+        if conn is not None:
+            _connections.move_to_end(db_path)
+            return conn
+        build_lock = _build_locks.setdefault(db_path, threading.Lock())
+
+    with build_lock:
+        with _connection_lock:
+            conn = _connections.get(db_path)
+        if conn is None:
+            if not os.path.exists(db_path):
+                _build_excel_cache(db_path, file_name, file_info)
+            conn = duckdb.connect(database=db_path, read_only=True)
+        with _connection_lock:
+            _connections[db_path] = conn
+            _connections.move_to_end(db_path)
+            _build_locks.pop(db_path, None)
+            while len(_connections) > _MAX_POOLED_CONNECTIONS:
+                # The connection is closed when its readers are released
+                _connections.popitem(last=False)
+    return conn
+
+
+def _build_excel_cache(db_path: str, file_name: str, file_info):
+    encoding, confidence = None, None
+    if file_name.endswith(".csv"):
+        if isinstance(file_info, str):
+            encoding, confidence = detect_encoding(file_info)
+        else:
+            encoding, confidence = detect_bytes_encoding(file_info)
+    logger.info(
+        f"Convert file {file_name} to {db_path}, "
+        f"Detected Encoding: {encoding} (Confidence: {confidence})"
+    )
+    df = read_excel_dataframe(file_name, file_info, encoding)
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    tmp_path = f"{db_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = duckdb.connect(database=tmp_path, read_only=False)
+    try:
+        db.register("excel_data_df", df)
+        db.execute("CREATE TABLE excel_data AS SELECT * FROM excel_data_df")
+        db.unregister("excel_data_df")
+    finally:
+        db.close()
+    os.replace(tmp_path, db_path)
+
+
 def add_quotes_ex(sql: str, column_names):
     sql = sql.replace("`", '"')
     for column_name in column_names:
@@ -230,13 +375,13 @@ def is_chinese(text):
 
 
 class ExcelReader:
-    def __init__(self, conv_uid, file_param):
+    # Optional is the one of pyparsing in this module
+    def __init__(self, conv_uid, file_param, cache_dir: Union[str, None] = None):
         self.conv_uid = conv_uid
         self.file_param = file_param
         if isinstance(file_param, str) and os.path.isabs(file_param):
             file_name = os.path.basename(file_param)
             self.file_name_without_extension = os.path.splitext(file_name)[0]
-            encoding, confidence = detect_encoding(file_param)
 
             self.excel_file_name = file_name
             self.extension = os.path.splitext(file_name)[1]
@@ -265,82 +410,34 @@ class ExcelReader:
                 conv_uid=self.conv_uid, file_key=file_path
             )
 
-            result = chardet.detect(file_info)
-            encoding = result["encoding"]
-            confidence = result["confidence"]
-
-        logger.info(
-            f"File Info:{len(file_info)},Detected Encoding: {encoding} (Confidence: {confidence})"
-        )
-
-        # read excel file
-        if file_name.endswith(".xlsx") or file_name.endswith(".xls"):
-            df_tmp = pd.read_excel(file_info, index_col=False)
-            self.df = pd.read_excel(
-                file_info,
-                index_col=False,
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
-        elif file_name.endswith(".csv"):
-            df_tmp = pd.read_csv(
-                file_info if isinstance(file_info, str) else io.BytesIO(file_info),
-                index_col=False,
-                encoding=encoding,
-            )
-            self.df = pd.read_csv(
-                file_info if isinstance(file_info, str) else io.BytesIO(file_info),
-                index_col=False,
-                encoding=encoding,
-                converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-            )
-        else:
+        if not (
+            file_name.endswith(".xlsx")
+            or file_name.endswith(".xls")
+            or file_name.endswith(".csv")
+        ):
             raise ValueError("Unsupported file format.")
 
-        self.df.replace("", np.nan, inplace=True)
-
-        # 修改的部分
-
-        unnamed_columns_tmp = [
-            col
-            for col in df_tmp.columns
-            if col.startswith("Unnamed") and df_tmp[col].isnull().all()
-        ]
-        df_tmp.drop(columns=unnamed_columns_tmp, inplace=True)
-
-        self.df = self.df[df_tmp.columns.values]
-        #
-
-        self.columns_map = {}
-        for column_name in df_tmp.columns:
-            self.df[column_name] = self.df[column_name].astype(str)
-            self.columns_map.update({column_name: excel_colunm_format(column_name)})
-            try:
-                self.df[column_name] = pd.to_datetime(self.df[column_name]).dt.strftime(
-                    "%Y-%m-%d"
-                )
-            except ValueError:
-                try:
-                    self.df[column_name] = pd.to_numeric(self.df[column_name])
-                except ValueError:
-                    try:
-                        self.df[column_name] = self.df[column_name].astype(str)
-                    except Exception:
-                        print("Can't transform column: " + column_name)
-
-        self.df = self.df.rename(columns=lambda x: x.strip().replace(" ", "_"))
-
-        # connect DuckDB
-        self.db = duckdb.connect(database=":memory:", read_only=False)
+        # The converted file is cached by the content hash
+        self.file_hash = file_content_hash(file_info)
+        cache_key = (
+            f"{self.file_hash}_{self.extension.lstrip('.')}_v{_EXCEL_CACHE_VERSION}"
+        )
+        self.cache_dir = cache_dir or os.path.join(DATA_DIR, "excel_cache")
+        connection = get_excel_connection(
+            self.cache_dir, cache_key, file_name, file_info
+        )
+        # Each reader has its own cursor of the pooled connection
+        self.db = connection.cursor()
 
         self.table_name = "excel_data"
-        # write data in duckdb
-        self.db.register(self.table_name, self.df)
 
         # 获取结果并打印表结构信息
         result = self.db.execute(f"DESCRIBE {self.table_name}")
         columns = result.fetchall()
+        self.columns_map = {}
         for column in columns:
             print(column)
+            self.columns_map.update({column[0]: excel_colunm_format(column[0])})
 
     def run(self, sql):
         try:
@@ -0,0 +1,67 @@
+from unittest import mock
+
+import pytest
+
+from .. import excel_reader
+from ..excel_reader import ExcelReader
+
+CSV_CONTENT = """name,amount,date,Unnamed: 3
+Alice,$1200,2024-01-02,
+Bob,$300,2024-02-03,
+Carol,50,2024-03-04,
+"""
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    file_path = tmp_path / "sales.csv"
+    file_path.write_text(CSV_CONTENT, encoding="utf-8")
+    return str(file_path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "excel_cache")
+
+
+def test_excel_reader_query(csv_file, cache_dir):
+    reader = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    columns, rows = reader.get_sample_data()
+    assert columns == ["name", "amount", "date"]
+    assert rows[0] == ("Alice", 1200.0, "2024-01-02")
+    assert rows[1][1] == 300.0
+
+    columns, rows = reader.run("SELECT SUM(amount) AS total FROM excel_data")
+    assert columns == ["total"]
+    assert rows == [(1550.0,)]
+
+
+def test_excel_reader_converts_once(csv_file, cache_dir, tmp_path):
+    with mock.patch.object(
+        excel_reader,
+        "read_excel_dataframe",
+        wraps=excel_reader.read_excel_dataframe,
+    ) as read_spy:
+        reader1 = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+        reader2 = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+        # The same content uploaded in another session
+        other_file = tmp_path / "other.csv"
+        other_file.write_text(CSV_CONTENT, encoding="utf-8")
+        reader3 = ExcelReader(
+            "conv_2", {"file_path": str(other_file)}, cache_dir=cache_dir
+        )
+    assert read_spy.call_count == 1
+    sql = "SELECT name FROM excel_data ORDER BY name"
+    assert reader1.run(sql) == reader2.run(sql) == reader3.run(sql)
+
+    # A changed file is converted again
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write("Dave,$5,2024-04-05,\n")
+    with mock.patch.object(
+        excel_reader,
+        "read_excel_dataframe",
+        wraps=excel_reader.read_excel_dataframe,
+    ) as read_spy:
+        reader4 = ExcelReader("conv_1", csv_file, cache_dir=cache_dir)
+    assert read_spy.call_count == 1
+    assert len(reader4.run(sql)[1]) == 4
@@ -3,6 +3,7 @@ from typing import Dict
 from gptdb._private.config import Config
 from gptdb.agent.util.api_call import ApiCall
 from gptdb.app.scene import BaseChat, ChatScene
+from gptdb.app.scene.chat_components import get_chat_component_cache
 from gptdb.util.executor_utils import blocking_func_to_async
 from gptdb.util.tracer import root_tracer, trace
 
@@ -11,6 +12,7 @@ CFG = Config()
 
 class ChatWithDbAutoExecute(BaseChat):
     chat_scene: str = ChatScene.ChatWithDbExecute.value()
+    prefetch_history: bool = True
 
     """Number of results to return from the query"""
 
@@ -51,18 +53,34 @@ class ChatWithDbAutoExecute(BaseChat):
             from gptdb.rag.summary.db_summary_client import DBSummaryClient
         except ImportError:
             raise ValueError("Could not import DBSummaryClient. ")
-        client = DBSummaryClient(system_app=CFG.SYSTEM_APP)
+        topk = CFG.KNOWLEDGE_SEARCH_TOP_SIZE
+        # The retriever of the table profiles is shared by the chats of the database
+        retriever_key = ("chat_with_db_summary", self.db_name, topk)
+
+        def _get_db_summary():
+            cache = get_chat_component_cache()
+            client = cache.get_or_build(
+                ("db_summary_client",),
+                lambda: DBSummaryClient(system_app=CFG.SYSTEM_APP),
+            )
+            # The retriever is rebuilt when the profiles are synchronized again
+            retriever = cache.get_or_build(
+                retriever_key,
+                lambda: client.get_db_summary_retriever(self.db_name, topk),
+                version=client.get_db_profile_version(self.db_name),
+            )
+            table_docs = retriever.retrieve(self.current_user_input)
+            return [d.content for d in table_docs]
+
         table_infos = None
         try:
             with root_tracer.start_span("ChatWithDbAutoExecute.get_db_summary"):
                 table_infos = await blocking_func_to_async(
-                    self._executor,
-                    client.get_db_summary,
-                    self.db_name,
-                    self.current_user_input,
-                    CFG.KNOWLEDGE_SEARCH_TOP_SIZE,
+                    self._executor, _get_db_summary
                 )
         except Exception as e:
+            # The profiles may be rebuilt, build the retriever again next time
+            get_chat_component_cache().invalidate(retriever_key)
             print("db summary find error!" + str(e))
         if not table_infos:
             table_infos = await blocking_func_to_async(
@@ -81,8 +99,14 @@ class ChatWithDbAutoExecute(BaseChat):
 
     def stream_plugin_call(self, text):
         text = text.replace("\n", " ")
-        print(f"stream_plugin_call:{text}")
-        return self.api_call.display_sql_llmvis(text, self.database.run_to_df)
+        return self.api_call.display_sql_llmvis(text, self._run_to_result)
+
+    def _run_to_result(self, sql: str):
+        return self.database.run_to_result(
+            sql,
+            max_rows=CFG.SQL_RESULT_MAX_ROWS,
+            max_bytes=CFG.SQL_RESULT_MAX_BYTES,
+        )
 
     def do_action(self, prompt_response):
         print(f"do_action:{prompt_response}")
@@ -1,7 +1,8 @@
 import json
 import os
+from dataclasses import dataclass
 from functools import reduce
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from gptdb._private.config import Config
 from gptdb.app.knowledge.chunk_db import DocumentChunkDao, DocumentChunkEntity
@@ -11,7 +12,8 @@ from gptdb.app.knowledge.document_db import (
 )
 from gptdb.app.knowledge.request.request import KnowledgeSpaceRequest
 from gptdb.app.knowledge.service import KnowledgeService
-from gptdb.app.scene import BaseChat, ChatScene
+from gptdb.app.scene import AppScenePromptTemplateAdapter, BaseChat, ChatScene
+from gptdb.app.scene.chat_components import get_chat_component_cache
 from gptdb.configs.model_config import EMBEDDING_MODEL_CONFIG
 from gptdb.core import (
     ChatPromptTemplate,
@@ -27,10 +29,25 @@ from gptdb.util.tracer import root_tracer, trace
 CFG = Config()
 
 
+@dataclass
+class _SpaceComponents:
+    """The components of a knowledge space shared by its chats."""
+
+    space_context: Optional[Dict]
+    top_k: int
+    recall_score: float
+    max_token: int
+    retriever: KnowledgeSpaceRetriever
+    document_ids: List[int]
+    prompt_template: AppScenePromptTemplateAdapter
+
+
 class ChatKnowledge(BaseChat):
     chat_scene: str = ChatScene.ChatKnowledge.value()
     """KBQA Chat Module"""
 
+    prefetch_history: bool = True
+
     def __init__(self, chat_param: Dict):
         """Chat Knowledge Module Initialization
         Args:
@@ -40,29 +57,11 @@ class ChatKnowledge(BaseChat):
             - model_name:(str) llm model name
             - select_param:(str) space name
         """
-        from gptdb.rag.embedding.embedding_factory import RerankEmbeddingFactory
-
         self.knowledge_space = chat_param["select_param"]
         chat_param["chat_mode"] = ChatScene.ChatKnowledge
         super().__init__(
             chat_param=chat_param,
         )
-        self.space_context = self.get_space_context(self.knowledge_space)
-        self.top_k = (
-            self.get_knowledge_search_top_size(self.knowledge_space)
-            if self.space_context is None
-            else int(self.space_context["embedding"]["topk"])
-        )
-        self.recall_score = (
-            CFG.KNOWLEDGE_SEARCH_RECALL_SCORE
-            if self.space_context is None
-            else float(self.space_context["embedding"]["recall_score"])
-        )
-        self.max_token = (
-            CFG.KNOWLEDGE_SEARCH_MAX_TOKEN
-            if self.space_context is None or self.space_context.get("prompt") is None
-            else int(self.space_context["prompt"]["max_token"])
-        )
         from gptdb.serve.rag.models.models import (
             KnowledgeSpaceDao,
             KnowledgeSpaceEntity,
@@ -74,6 +73,49 @@ class ChatKnowledge(BaseChat):
         if len(spaces) != 1:
             raise Exception(f"invalid space name:{self.knowledge_space}")
         space = spaces[0]
+        # The components are rebuilt when the space or its documents are changed
+        version = (
+            space.id,
+            space.vector_type,
+            space.context,
+            str(space.gmt_modified),
+            KnowledgeDocumentDao().get_space_documents_version(space.name),
+        )
+        components: _SpaceComponents = get_chat_component_cache().get_or_build(
+            ("chat_knowledge", space.name, self.llm_model),
+            lambda: self._build_space_components(space),
+            version=version,
+        )
+        self.space_context = components.space_context
+        self.top_k = components.top_k
+        self.recall_score = components.recall_score
+        self.max_token = components.max_token
+        self._space_retriever = components.retriever
+        self.document_ids = components.document_ids
+        self.prompt_template = components.prompt_template
+        self.relations = None
+        self.chunk_dao = DocumentChunkDao()
+
+    def _build_space_components(self, space) -> _SpaceComponents:
+        """Build the components of the space, they don't keep any request state."""
+        from gptdb.rag.embedding.embedding_factory import RerankEmbeddingFactory
+
+        space_context = json.loads(space.context) if space.context else None
+        top_k = (
+            self.get_knowledge_search_top_size(space.name)
+            if space_context is None
+            else int(space_context["embedding"]["topk"])
+        )
+        recall_score = (
+            CFG.KNOWLEDGE_SEARCH_RECALL_SCORE
+            if space_context is None
+            else float(space_context["embedding"]["recall_score"])
+        )
+        max_token = (
+            CFG.KNOWLEDGE_SEARCH_MAX_TOKEN
+            if space_context is None or space_context.get("prompt") is None
+            else int(space_context["prompt"]["max_token"])
+        )
 
         query_rewrite = None
         if CFG.KNOWLEDGE_SEARCH_REWRITE:
@@ -83,7 +125,7 @@ class ChatKnowledge(BaseChat):
                 language=CFG.LANGUAGE,
             )
         reranker = None
-        retriever_top_k = self.top_k
+        retriever_top_k = top_k
         if CFG.RERANK_MODEL:
             rerank_embeddings = RerankEmbeddingFactory.get_instance(
                 CFG.SYSTEM_APP
@@ -93,22 +135,40 @@ class ChatKnowledge(BaseChat):
                 # We use reranker, so if the top_k is less than 20,
                 # we need to set it to 20
                 retriever_top_k = max(CFG.RERANK_TOP_K, 20)
-        self._space_retriever = KnowledgeSpaceRetriever(
+        retriever = KnowledgeSpaceRetriever(
             space_id=space.id,
             top_k=retriever_top_k,
             query_rewrite=query_rewrite,
             rerank=reranker,
         )
 
-        self.prompt_template.template_is_strict = False
-        self.relations = None
-        self.chunk_dao = DocumentChunkDao()
-        document_dao = KnowledgeDocumentDao()
-        documents = document_dao.get_documents(
+        # The template of the space, the shared template of the scene is not changed
+        prompt_template = self.prompt_template.model_copy()
+        prompt_template.template_is_strict = False
+        if space_context and space_context.get("prompt"):
+            # Replace the template with the prompt template of the space
+            prompt_template.prompt = ChatPromptTemplate(
+                messages=[
+                    SystemPromptTemplate.from_template(
+                        space_context["prompt"]["template"]
+                    ),
+                    MessagesPlaceholder(variable_name="chat_history"),
+                    HumanPromptTemplate.from_template("{question}"),
+                ]
+            )
+
+        documents = KnowledgeDocumentDao().get_documents(
             query=KnowledgeDocumentEntity(space=space.name)
         )
-        if len(documents) > 0:
-            self.document_ids = [document.id for document in documents]
+        return _SpaceComponents(
+            space_context=space_context,
+            top_k=top_k,
+            recall_score=recall_score,
+            max_token=max_token,
+            retriever=retriever,
+            document_ids=[document.id for document in documents],
+            prompt_template=prompt_template,
+        )
 
     async def stream_call(self):
         last_output = None
@@ -136,20 +196,6 @@ class ChatKnowledge(BaseChat):
 
     @trace()
     async def generate_input_values(self) -> Dict:
-        if self.space_context and self.space_context.get("prompt"):
-            # Not use template_define
-            # self.prompt_template.template_define = self.space_context["prompt"]["scene"]
-            # self.prompt_template.template = self.space_context["prompt"]["template"]
-            # Replace the template with the prompt template
-            self.prompt_template.prompt = ChatPromptTemplate(
-                messages=[
-                    SystemPromptTemplate.from_template(
-                        self.space_context["prompt"]["template"]
-                    ),
-                    MessagesPlaceholder(variable_name="chat_history"),
-                    HumanPromptTemplate.from_template("{question}"),
-                ]
-            )
         from gptdb.util.chat_util import run_async_tasks
 
         tasks = [self.execute_similar_search(self.current_user_input)]
@@ -11,6 +11,7 @@ class ChatNormal(BaseChat):
     chat_scene: str = ChatScene.ChatNormal.value()
 
     keep_end_rounds: int = 10
+    prefetch_history: bool = True
 
     """Number of results to return from the query"""
 
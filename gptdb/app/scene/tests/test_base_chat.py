@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from gptdb.core import ModelMessage, ModelRequest, ModelRequestContext
+
+from .. import BaseChat, ChatScene, base_chat
+from ..base_chat import _lazy_span_metadata
+
+
+def test_lazy_span_metadata_is_a_snapshot():
+    payload = ModelRequest.build_request(
+        "fake",
+        [ModelMessage(role="human", content="hello")],
+        context=ModelRequestContext(stream=True, user_name="a"),
+    )
+    metadata = _lazy_span_metadata(payload)
+    # The request is changed after the span is started
+    payload.span_id = "span_1"
+    payload.messages.append(ModelMessage(role="ai", content="hi"))
+    payload.context.user_name = "b"
+
+    built = metadata()
+    assert "span_id" not in built
+    assert [m["content"] for m in built["messages"]] == ["hello"]
+    assert built["context"]["user_name"] == "a"
+
+
+class _Conversation:
+    def __init__(self, history):
+        self._history = history
+        self.user_messages = []
+
+    def get_history_message(self):
+        return list(self._history)
+
+    def start_new_round(self):
+        pass
+
+    def add_user_message(self, message):
+        self.user_messages.append(message)
+
+
+class _PrefetchChat(BaseChat):
+    prefetch_history = True
+
+    def __init__(self, loaded: threading.Event):
+        self._loaded = loaded
+        self.chat_mode = ChatScene.ChatNormal
+        self._chat_param = {}
+        self.llm_model = "fake"
+        self._conv_serve = None
+        self.current_user_input = "hi"
+        self.model_cache_enable = False
+        self.llm_echo = False
+        self._message_version = "v2"
+        self.prompt_template = SimpleNamespace(
+            need_historical_messages=True,
+            stream_out=True,
+            temperature=0.5,
+            max_new_tokens=32,
+            prompt=None,
+            str_history=False,
+        )
+        self._current_message = None
+        self._conversation_lock = threading.Lock()
+        self.history_messages = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def generate_input_values(self):
+        # The history is not loaded in the constructor
+        assert self._current_message is None
+        await asyncio.get_running_loop().run_in_executor(None, self._loaded.wait, 5)
+        return {"question": self.current_user_input}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_loads_history_before_building_request(mocker):
+    history = [ModelMessage(role="human", content="earlier question")]
+    conversation = _Conversation(history)
+    loaded = threading.Event()
+
+    def _build_conversation(*args, **kwargs):
+        loaded.set()
+        return conversation
+
+    mocker.patch.object(base_chat, "_build_conversation", _build_conversation)
+    composer = mocker.patch.object(base_chat, "AppChatComposerOperator")
+    composer.return_value.call = mocker.AsyncMock(
+        return_value=SimpleNamespace(context=SimpleNamespace())
+    )
+
+    chat = _PrefetchChat(loaded)
+    await chat._build_model_request()
+    # The conversation is loaded while the input values are generated
+    assert loaded.is_set()
+    node_input = composer.return_value.call.call_args.kwargs["call_data"]
+    assert node_input.messages == history
+    assert node_input.prompt_dict == {"question": "hi"}
+    assert conversation.user_messages == ["hi"]
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from ..chat_components import ChatComponentCache
+
+
+class _Builder:
+    def __init__(self, delay: float = 0.0):
+        self.builds = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.builds += 1
+            return object()
+
+
+def test_component_is_reused():
+    cache = ChatComponentCache(ttl=60)
+    build = _Builder()
+    first = cache.get_or_build(("chat_knowledge", "space"), build)
+    assert cache.get_or_build(("chat_knowledge", "space"), build) is first
+    assert build.builds == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    other = cache.get_or_build(("chat_knowledge", "other_space"), build)
+    assert other is not first
+    assert build.builds == 2
+
+
+def test_component_is_rebuilt_when_version_changes():
+    cache = ChatComponentCache(ttl=60)
+    build = _Builder()
+    first = cache.get_or_build("space", build, version=1)
+    assert cache.get_or_build("space", build, version=1) is first
+    second = cache.get_or_build("space", build, version=2)
+    assert second is not first
+    assert cache.get_or_build("space", build, version=2) is second
+    assert build.builds == 2
+
+
+def test_component_expires():
+    cache = ChatComponentCache(ttl=0.05)
+    build = _Builder()
+    first = cache.get_or_build("space", build)
+    time.sleep(0.1)
+    assert cache.get_or_build("space", build) is not first
+    assert build.builds == 2
+
+
+def test_disabled_cache_always_builds():
+    cache = ChatComponentCache(ttl=0)
+    build = _Builder()
+    assert not cache.enabled
+    cache.get_or_build("space", build)
+    cache.get_or_build("space", build)
+    assert build.builds == 2
+
+
+def test_invalidate_and_evict():
+    cache = ChatComponentCache(ttl=60, max_size=2)
+    build = _Builder()
+    first = cache.get_or_build("a", build)
+    cache.get_or_build("b", build)
+    cache.invalidate("b")
+    cache.get_or_build("b", build)
+    assert build.builds == 3
+    # "a" is used more recently than "b", so "b" is evicted
+    assert cache.get_or_build("a", build) is first
+    cache.get_or_build("c", build)
+    cache.get_or_build("b", build)
+    assert build.builds == 5
+    cache.clear()
+    cache.get_or_build("a", build)
+    assert build.builds == 6
+
+
+def test_concurrent_requests_build_once():
+    cache = ChatComponentCache(ttl=60)
+    build = _Builder(delay=0.05)
+    results = []
+
+    def _get():
+        results.append(cache.get_or_build("space", build))
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert build.builds == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+
+
+def test_requests_waiting_for_the_build_are_misses():
+    all_missed = threading.Event()
+    waiting = []
+
+    class _Cache(ChatComponentCache):
+        def _get_build_lock(self, key):
+            waiting.append(key)
+            if len(waiting) == 4:
+                all_missed.set()
+            return super()._get_build_lock(key)
+
+    def _build():
+        all_missed.wait(5)
+        return object()
+
+    cache = _Cache(ttl=60)
+    threads = [
+        threading.Thread(target=cache.get_or_build, args=("space", _build))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One request builds the component, the others wait for it but missed too
+    assert cache.hits == 0
+    assert cache.misses == 4
+    cache.get_or_build("space", _build)
+    assert cache.hits == 1
@@ -0,0 +1,87 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from gptdb.app.knowledge.document_db import (
+    KnowledgeDocumentDao,
+    KnowledgeDocumentEntity,
+)
+from gptdb.serve.rag.models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from gptdb.storage.metadata import db
+
+from .. import BaseChat
+from ..chat_components import ChatComponentCache
+from ..chat_knowledge.v1 import chat as chat_knowledge
+from ..chat_knowledge.v1.chat import ChatKnowledge
+
+SPACE_NAME = "test_space"
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+    KnowledgeSpaceDao().create_knowledge_space(
+        KnowledgeSpaceEntity(
+            name=SPACE_NAME, vector_type="Chroma", desc="test", owner="test"
+        )
+    )
+
+    yield
+
+
+@pytest.fixture
+def builds(mocker):
+    def _init(self, chat_param):
+        self.llm_model = chat_param["model_name"]
+
+    mocker.patch.object(BaseChat, "__init__", _init)
+    mocker.patch.object(
+        chat_knowledge,
+        "get_chat_component_cache",
+        return_value=ChatComponentCache(ttl=60),
+    )
+    return mocker.patch.object(
+        ChatKnowledge,
+        "_build_space_components",
+        side_effect=lambda space: MagicMock(),
+    )
+
+
+def _chat() -> ChatKnowledge:
+    return ChatKnowledge({"select_param": SPACE_NAME, "model_name": "fake"})
+
+
+def _add_document(name: str) -> int:
+    return KnowledgeDocumentDao().create_knowledge_document(
+        KnowledgeDocumentEntity(
+            doc_name=name,
+            doc_type="TEXT",
+            space=SPACE_NAME,
+            chunk_size=0,
+            status="FINISHED",
+            content="",
+            result="",
+            gmt_created=datetime.now(),
+            gmt_modified=datetime.now(),
+        )
+    )
+
+
+def test_space_components_are_rebuilt_on_document_change(builds):
+    _add_document("doc_1.md")
+    first = _chat()
+    assert _chat()._space_retriever is first._space_retriever
+    assert builds.call_count == 1
+
+    _add_document("doc_2.md")
+    second = _chat()
+    assert second._space_retriever is not first._space_retriever
+    assert builds.call_count == 2
+
+    KnowledgeDocumentDao().raw_delete(
+        KnowledgeDocumentEntity(doc_name="doc_2.md", space=SPACE_NAME)
+    )
+    assert _chat()._space_retriever is not second._space_retriever
+    assert builds.call_count == 3
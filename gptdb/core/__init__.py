@@ -23,6 +23,7 @@ from gptdb.core.interface.llm import (  # noqa: F401
 from gptdb.core.interface.message import (  # noqa: F401
     AIMessage,
     BaseMessage,
+    ConversationCache,
     ConversationIdentifier,
     HumanMessage,
     MessageIdentifier,
@@ -73,6 +74,7 @@ __ALL__ = [
     "DefaultMessageConverter",
     "OnceConversation",
     "StorageConversation",
+    "ConversationCache",
     "BaseMessage",
     "SystemMessage",
     "AIMessage",
@@ -40,6 +40,7 @@ from .task.base import (
     TaskState,
     is_empty_data,
 )
+from .task.stream_broadcaster import StreamBackpressure, StreamBroadcaster
 from .task.task_impl import (
     BaseInputSource,
     DefaultInputContext,
@@ -99,6 +100,8 @@ __all__ = [
     "DefaultInputContext",
     "SimpleTaskOutput",
     "SimpleStreamTaskOutput",
+    "StreamBackpressure",
+    "StreamBroadcaster",
     "StreamifyAbsOperator",
     "UnstreamifyAbsOperator",
     "TransformStreamAbsOperator",
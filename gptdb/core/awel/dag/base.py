@@ -31,6 +31,11 @@ from gptdb.component import SystemApp
 from ..flow.base import ViewMixin
 from ..resource.base import ResourceGroup
 from ..task.base import TaskContext, TaskOutput
+from ..trigger.admission import (
+    AdmissionLimiter,
+    AdmissionPolicy,
+    get_admission_registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -753,11 +758,13 @@ class DAG:
         tags: Optional[Dict[str, str]] = None,
         description: Optional[str] = None,
         default_dag_variables: Optional[DAGVariables] = None,
+        admission_policy: Optional[AdmissionPolicy] = None,
     ) -> None:
         """Initialize a DAG."""
         self._dag_id = dag_id
         self._tags: Dict[str, str] = tags or {}
         self._description = description
+        self._admission_policy = admission_policy
         self.node_map: Dict[str, DAGNode] = {}
         self.node_name_to_node: Dict[str, DAGNode] = {}
         self._root_nodes: List[DAGNode] = []
@@ -803,6 +810,29 @@ class DAG:
         """Return the description of current DAG."""
         return self._description
 
+    @property
+    def admission_policy(self) -> Optional[AdmissionPolicy]:
+        """Return the admission policy of current DAG."""
+        return self._admission_policy
+
+    @admission_policy.setter
+    def admission_policy(self, policy: Optional[AdmissionPolicy]) -> None:
+        """Set the admission policy of current DAG."""
+        self._admission_policy = policy
+
+    @property
+    def admission_limiter(self) -> Optional[AdmissionLimiter]:
+        """Return the limiter of the concurrent runs of current DAG.
+
+        The policy of the DAG is used, or the default DAG policy of the admission
+        registry. Return None if the DAG is not limited.
+        """
+        registry = get_admission_registry()
+        policy = self._admission_policy or registry.default_dag_policy
+        if not policy:
+            return None
+        return registry.limiter(f"dag:{self._dag_id}", policy)
+
     @property
     def dev_mode(self) -> bool:
         """Whether the current DAG is in dev mode.
@@ -13,6 +13,7 @@ from gptdb._private.pydantic import BaseModel, Field, model_to_dict
 from gptdb.component import BaseComponent, ComponentType, SystemApp
 
 from .. import BaseOperator
+from ..trigger.admission import get_admission_registry
 from ..trigger.base import TriggerMetadata
 from .base import DAG
 from .loader import LocalFileDAGLoader
@@ -66,6 +67,7 @@ class DAGManager(BaseComponent):
         self.system_app = system_app
         self.dag_map: Dict[str, DAG] = {}
         self.dag_alias_map: Dict[str, str] = {}
+        self._dag_id_to_aliases: Dict[str, Set[str]] = defaultdict(set)
         self._dag_metadata_map: Dict[str, DAGMetadata] = {}
         self._tags_to_dag_ids: Dict[str, Dict[str, Set[str]]] = {}
         self._trigger_manager: Optional["DefaultTriggerManager"] = None
@@ -105,6 +107,7 @@ class DAGManager(BaseComponent):
             self.dag_map[dag_id] = dag
             if alias_name:
                 self.dag_alias_map[alias_name] = dag_id
+                self._dag_id_to_aliases[dag_id].add(alias_name)
 
             trigger_metadata: List["TriggerMetadata"] = []
             dag_metadata = _parse_metadata(dag)
@@ -136,20 +139,15 @@ class DAGManager(BaseComponent):
                 )
             dag = self.dag_map[dag_id]
 
-            # Collect aliases to remove
-            # TODO(fangyinc): It can be faster if we maintain a reverse map
-            aliases_to_remove = [
-                alias_name
-                for alias_name, _dag_id in self.dag_alias_map.items()
-                if _dag_id == dag_id
-            ]
-            # Remove collected aliases
-            for alias_name in aliases_to_remove:
-                del self.dag_alias_map[alias_name]
+            # Remove aliases by the reverse map
+            for alias_name in self._dag_id_to_aliases.pop(dag_id, set()):
+                if self.dag_alias_map.get(alias_name) == dag_id:
+                    del self.dag_alias_map[alias_name]
 
             if self._trigger_manager:
                 for trigger in dag.trigger_nodes:
                     self._trigger_manager.unregister_trigger(trigger, self.system_app)
+            get_admission_registry().remove(f"dag:{dag_id}")
             # Finally remove the DAG from the map
             metadata = self._dag_metadata_map[dag_id]
             del self.dag_map[dag_id]
@@ -6,7 +6,7 @@ This runner will run the workflow in the current process.
 import asyncio
 import logging
 import traceback
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from gptdb.component import SystemApp
 from gptdb.util.tracer import root_tracer
@@ -15,17 +15,45 @@ from ..dag.base import DAGContext, DAGVar, DAGVariables
 from ..operators.base import CALL_DATA, BaseOperator, WorkflowRunner
 from ..operators.common_operator import BranchOperator
 from ..task.base import SKIP_DATA, TaskContext, TaskState
-from ..task.task_impl import DefaultInputContext, DefaultTaskContext, SimpleTaskOutput
+from ..task.stream_broadcaster import StreamBackpressure, StreamBroadcaster
+from ..task.task_impl import (
+    DefaultInputContext,
+    DefaultTaskContext,
+    SimpleStreamTaskOutput,
+    SimpleTaskOutput,
+)
 from .job_manager import JobManager
 
 logger = logging.getLogger(__name__)
 
 
+# The output of a streaming node read by one of its downstream nodes, keyed by
+# (upstream node id, downstream node id)
+_StreamViews = Dict[Tuple[str, str], TaskContext]
+
+
 class DefaultWorkflowRunner(WorkflowRunner):
-    """The default workflow runner."""
+    """The default workflow runner.
+
+    When the output of a node is a stream and more than one downstream node runs in
+    the workflow, the stream is broadcast by a :class:`StreamBroadcaster`, every
+    downstream node reads all the items.
+
+    Args:
+        stream_buffer_size (int): The max number of unread items of a downstream
+            node of a broadcast stream.
+        stream_backpressure (StreamBackpressure): What to do when the buffer of a
+            downstream node is full.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        stream_buffer_size: int = 256,
+        stream_backpressure: StreamBackpressure = StreamBackpressure.BLOCK,
+    ):
         """Init the default workflow runner."""
+        self._stream_buffer_size = stream_buffer_size
+        self._stream_backpressure = stream_backpressure
         self._running_dag_ctx: Dict[str, DAGContext] = {}
         self._task_log_index_map: Dict[str, int] = {}
         self._lock = asyncio.Lock()
@@ -94,6 +122,7 @@ class DefaultWorkflowRunner(WorkflowRunner):
         )
         logger.debug(f"Node id {node.node_id}, call_data: {call_data}")
         skip_node_ids: Set[str] = set()
+        stream_views: _StreamViews = {}
         system_app: Optional[SystemApp] = DAGVar.get_current_system_app()
 
         if node.dag:
@@ -112,7 +141,13 @@ class DefaultWorkflowRunner(WorkflowRunner):
             },
         ):
             await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+                job_manager,
+                node,
+                dag_ctx,
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                stream_views,
             )
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
@@ -130,6 +165,7 @@ class DefaultWorkflowRunner(WorkflowRunner):
         node_outputs: Dict[str, TaskContext],
         skip_node_ids: Set[str],
         system_app: Optional[SystemApp],
+        stream_views: _StreamViews,
     ):
         # Skip run node
         if node.node_id in node_outputs:
@@ -147,10 +183,15 @@ class DefaultWorkflowRunner(WorkflowRunner):
                     node_outputs,
                     skip_node_ids,
                     system_app,
+                    stream_views,
                 )
 
         inputs = [
-            node_outputs[upstream_node.node_id] for upstream_node in node.upstream
+            stream_views.get(
+                (upstream_node.node_id, node.node_id),
+                node_outputs[upstream_node.node_id],
+            )
+            for upstream_node in node.upstream
         ]
         input_ctx = DefaultInputContext(inputs)
         # Log task, get log index(plus 1 every time)
@@ -170,6 +211,10 @@ class DefaultWorkflowRunner(WorkflowRunner):
             task_ctx.set_current_state(TaskState.SKIP)
             task_ctx.set_task_output(SimpleTaskOutput(SKIP_DATA))
             node_outputs[node.node_id] = task_ctx
+            for upstream_ctx in inputs:
+                # Don't keep the broadcast items for the skipped node
+                if isinstance(upstream_ctx, _BroadcastTaskContext):
+                    upstream_ctx.close()
             return
         try:
             logger.debug(
@@ -192,6 +237,9 @@ class DefaultWorkflowRunner(WorkflowRunner):
                 await node._run(dag_ctx, task_ctx.log_id)
                 node_outputs[node.node_id] = dag_ctx.current_task_context
                 task_ctx.set_current_state(TaskState.SUCCESS)
+                self._broadcast_stream(
+                    job_manager, node, dag_ctx.current_task_context, stream_views
+                )
 
                 run_metadata["skip_node_ids"] = ",".join(skip_node_ids)
                 run_metadata["state"] = TaskState.SUCCESS.value
@@ -212,6 +260,64 @@ class DefaultWorkflowRunner(WorkflowRunner):
             task_ctx.set_current_state(TaskState.FAILED)
             raise e
 
+    def _broadcast_stream(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        task_ctx: TaskContext,
+        stream_views: _StreamViews,
+    ):
+        """Broadcast the output stream of the node to its downstream nodes."""
+        task_output = task_ctx.task_output
+        if not task_output.is_stream or task_output.is_empty:
+            return
+        downstream = job_manager.get_downstream_in_job(node)
+        if len(downstream) < 2:
+            return
+        broadcaster: StreamBroadcaster = StreamBroadcaster(
+            task_output.output_stream,
+            len(downstream),
+            max_buffer_size=self._stream_buffer_size,
+            backpressure=self._stream_backpressure,
+        )
+        for i, (child, consumer) in enumerate(zip(downstream, broadcaster.consumers())):
+            stream_views[(node.node_id, child.node_id)] = _BroadcastTaskContext(
+                task_ctx, consumer, broadcaster, i
+            )
+        logger.debug(
+            f"Broadcast the output stream of node {node.node_id} to "
+            f"{len(downstream)} downstream nodes"
+        )
+
+
+class _BroadcastTaskContext(DefaultTaskContext):
+    """The task context of a node with one consumer of its broadcast stream."""
+
+    def __init__(
+        self,
+        task_ctx: TaskContext,
+        consumer: Any,
+        broadcaster: StreamBroadcaster,
+        index: int,
+    ):
+        super().__init__(
+            task_ctx.task_id,
+            task_ctx.current_state,
+            SimpleStreamTaskOutput(consumer),
+        )
+        # Keep the log id of the node
+        self._log_id = task_ctx.log_id
+        self._metadata = task_ctx.metadata
+        self._broadcaster = broadcaster
+        self._index = index
+
+    @property
+    def log_id(self) -> str:
+        return self._log_id
+
+    def close(self):
+        self._broadcaster.close(self._index)
+
 
 def _skip_current_downstream_by_node_name(
     branch_node: BranchOperator, skip_nodes: List[str], skip_node_ids: Set[str]
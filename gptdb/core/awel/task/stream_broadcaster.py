@@ -0,0 +1,229 @@
+"""Broadcast one stream to several consumers.
+
+The output stream of a task is a single async iterator, it can only be read once.
+When a streaming node has more than one downstream node, a
+:class:`StreamBroadcaster` reads the upstream stream once and gives every
+downstream node its own iterator over all the items.
+
+Every consumer has a bounded buffer of the items it has not read yet. When the
+buffer of a slow consumer is full, the faster consumers either wait for it
+(:attr:`StreamBackpressure.BLOCK`) or the oldest items of the slow consumer are
+dropped (:attr:`StreamBackpressure.DROP`).
+"""
+
+import asyncio
+import logging
+import weakref
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Callable, Deque, Generic, List, Optional
+
+from .base import T
+
+logger = logging.getLogger(__name__)
+
+
+class StreamBackpressure(str, Enum):
+    """What to do when the buffer of a consumer is full."""
+
+    # Wait until the slowest consumer reads its buffer, no item is lost
+    BLOCK = "block"
+    # Drop the oldest items of the slow consumer, the others never wait
+    DROP = "drop"
+
+
+class _ConsumerState(Generic[T]):
+    def __init__(self, index: int):
+        self.index = index
+        self.buffer: Deque[T] = deque()
+        self.started = False
+        self.closed = False
+        self.dropped = 0
+
+
+class StreamBroadcaster(Generic[T]):
+    """Read a stream once and broadcast its items to several consumers.
+
+    All the consumers must be read in one event loop. The source stream is read on
+    demand by the consumer which runs out of items, nothing is read in the
+    background.
+
+    A consumer which has not started reading does not block the others, its
+    buffer keeps all the items until it starts. So a downstream node can consume
+    the whole stream before its sibling starts, e.g. a reduce node and a streaming
+    node of the same upstream node.
+
+    Cancelling a consumer closes it, the other consumers keep reading. The source
+    stream is closed when all the consumers are closed.
+
+    Examples:
+        .. code-block:: python
+
+            broadcaster = StreamBroadcaster(stream, num_consumers=2)
+            first, second = broadcaster.consumers()
+
+    Args:
+        source (AsyncIterator[T]): The stream to broadcast.
+        num_consumers (int): The number of consumers.
+        max_buffer_size (int): The max number of unread items of a consumer.
+        backpressure (StreamBackpressure): What to do when the buffer of a consumer
+            is full.
+        on_drop (Optional[Callable[[int, int], None]]): Called with the consumer
+            index and the total number of its dropped items when an item is
+            dropped, only in the ``DROP`` mode.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[T],
+        num_consumers: int,
+        max_buffer_size: int = 256,
+        backpressure: StreamBackpressure = StreamBackpressure.BLOCK,
+        on_drop: Optional[Callable[[int, int], None]] = None,
+    ):
+        """Create a stream broadcaster."""
+        if num_consumers < 1:
+            raise ValueError("num_consumers must be greater than 0")
+        if max_buffer_size < 1:
+            raise ValueError("max_buffer_size must be greater than 0")
+        self._source = source
+        self._max_buffer_size = max_buffer_size
+        self._backpressure = StreamBackpressure(backpressure)
+        self._on_drop = on_drop
+        self._states = [_ConsumerState(i) for i in range(num_consumers)]
+        self._consumers_created = False
+        self._pull_lock = asyncio.Lock()
+        # Set when a consumer reads from its buffer or is closed
+        self._space = asyncio.Event()
+        self._pull_task: Optional[asyncio.Future] = None
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+    def consumers(self) -> List[AsyncIterator[T]]:
+        """Return the iterators of the consumers, it can only be called once."""
+        if self._consumers_created:
+            raise RuntimeError("The consumers of the stream are already created")
+        self._consumers_created = True
+        consumers = []
+        for state in self._states:
+            consumer = self._iterate(state)
+            # Release the buffer of a consumer which is dropped without reading
+            weakref.finalize(consumer, self.close, state.index)
+            consumers.append(consumer)
+        return consumers
+
+    def buffered(self, index: int) -> int:
+        """Return the number of unread items of the consumer."""
+        return len(self._states[index].buffer)
+
+    def dropped(self, index: int) -> int:
+        """Return the number of dropped items of the consumer."""
+        return self._states[index].dropped
+
+    def close(self, index: int):
+        """Close the consumer, e.g. its downstream node is skipped.
+
+        The source stream is closed when all the consumers are closed.
+        """
+        state = self._states[index]
+        if state.closed:
+            return
+        state.closed = True
+        state.buffer.clear()
+        self._space.set()
+        if all(s.closed for s in self._states):
+            self._close_source()
+
+    def _close_source(self):
+        self._done = True
+        if self._pull_task is not None and not self._pull_task.done():
+            self._pull_task.cancel()
+            return
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop, the source is finalized by the garbage collector
+            return
+        loop.create_task(aclose())
+
+    async def _iterate(self, state: _ConsumerState[T]) -> AsyncIterator[T]:
+        state.started = True
+        try:
+            while not state.closed:
+                if state.buffer:
+                    item = state.buffer.popleft()
+                    self._space.set()
+                    yield item
+                    continue
+                if self._done:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._fill(state)
+        finally:
+            self.close(state.index)
+
+    def _blocking_consumer(self, reader: _ConsumerState[T]) -> bool:
+        if self._backpressure != StreamBackpressure.BLOCK:
+            return False
+        return any(
+            s is not reader
+            and s.started
+            and not s.closed
+            and len(s.buffer) >= self._max_buffer_size
+            for s in self._states
+        )
+
+    async def _fill(self, reader: _ConsumerState[T]):
+        """Read the next item of the source for all the consumers."""
+        async with self._pull_lock:
+            # The buffer may be filled while waiting for the lock
+            if reader.buffer or self._done:
+                return
+            while self._blocking_consumer(reader):
+                self._space.clear()
+                await self._space.wait()
+            if self._pull_task is None:
+                self._pull_task = asyncio.ensure_future(self._source.__anext__())
+            try:
+                # Shield the read, cancelling a consumer must not break the source
+                item = await asyncio.shield(self._pull_task)
+            except asyncio.CancelledError:
+                if not self._pull_task.cancelled():
+                    # The reader is cancelled, the next reader awaits the same read
+                    raise
+                # All the consumers are closed
+                self._pull_task = None
+                return
+            except StopAsyncIteration:
+                self._pull_task = None
+                self._done = True
+                return
+            except Exception as e:
+                self._pull_task = None
+                self._done = True
+                self._error = e
+                return
+            self._pull_task = None
+            for state in self._states:
+                if not state.closed:
+                    self._put(state, item)
+
+    def _put(self, state: _ConsumerState[T], item: T):
+        if (
+            self._backpressure == StreamBackpressure.DROP
+            and len(state.buffer) >= self._max_buffer_size
+        ):
+            state.buffer.popleft()
+            state.dropped += 1
+            if state.dropped == 1:
+                logger.warning(
+                    f"The stream consumer {state.index} is too slow, drop its "
+                    f"oldest items, max buffer size: {self._max_buffer_size}"
+                )
+            if self._on_drop:
+                self._on_drop(state.index, state.dropped)
+        state.buffer.append(item)
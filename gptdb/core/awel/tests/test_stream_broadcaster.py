@@ -0,0 +1,194 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from .. import (
+    DAG,
+    DefaultWorkflowRunner,
+    InputOperator,
+    JoinOperator,
+    MapOperator,
+    ReduceStreamOperator,
+    SimpleInputSource,
+    StreamBackpressure,
+    StreamBroadcaster,
+)
+
+
+class _CountingStream:
+    def __init__(self, n: int):
+        self.n = n
+        self.produced = 0
+        self.closed = False
+
+    async def __call__(self):
+        try:
+            for i in range(self.n):
+                self.produced += 1
+                yield i
+        finally:
+            self.closed = True
+
+
+async def _read_all(stream, delay: float = 0.0) -> List[int]:
+    items = []
+    async for item in stream:
+        items.append(item)
+        if delay:
+            await asyncio.sleep(delay)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_all_consumers_read_all_items_in_order():
+    source = _CountingStream(50)
+    broadcaster = StreamBroadcaster(source(), 3, max_buffer_size=4)
+    results = await asyncio.gather(
+        *[
+            _read_all(consumer, delay=0.001 * i)
+            for i, consumer in enumerate(broadcaster.consumers())
+        ]
+    )
+    assert results == [list(range(50))] * 3
+    # The source is read only once
+    assert source.produced == 50
+
+
+@pytest.mark.asyncio
+async def test_block_bounds_the_buffer_of_the_slow_consumer():
+    source = _CountingStream(20)
+    broadcaster = StreamBroadcaster(source(), 2, max_buffer_size=4)
+    fast, slow = broadcaster.consumers()
+    assert await slow.__anext__() == 0
+
+    fast_task = asyncio.create_task(_read_all(fast))
+    await asyncio.sleep(0.05)
+    # The fast consumer waits for the slow one
+    assert not fast_task.done()
+    assert broadcaster.buffered(1) == 4
+    assert source.produced == 5
+
+    assert await _read_all(slow) == list(range(1, 20))
+    assert await fast_task == list(range(20))
+    assert broadcaster.dropped(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_signals_the_slow_consumer():
+    drops = []
+    source = _CountingStream(20)
+    broadcaster = StreamBroadcaster(
+        source(),
+        2,
+        max_buffer_size=4,
+        backpressure=StreamBackpressure.DROP,
+        on_drop=lambda index, dropped: drops.append((index, dropped)),
+    )
+    fast, slow = broadcaster.consumers()
+    assert await slow.__anext__() == 0
+    assert await _read_all(fast) == list(range(20))
+    assert broadcaster.buffered(1) == 4
+    # The oldest items are dropped, the latest ones are kept
+    assert await _read_all(slow) == [16, 17, 18, 19]
+    assert broadcaster.dropped(1) == 15
+    assert drops[-1] == (1, 15)
+    assert {index for index, _ in drops} == {1}
+
+
+@pytest.mark.asyncio
+async def test_unstarted_consumer_does_not_block():
+    source = _CountingStream(100)
+    broadcaster = StreamBroadcaster(source(), 2, max_buffer_size=4)
+    first, second = broadcaster.consumers()
+    assert await _read_all(first) == list(range(100))
+    assert await _read_all(second) == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_cancel_one_consumer():
+    source = _CountingStream(30)
+    broadcaster = StreamBroadcaster(source(), 2, max_buffer_size=2)
+    cancelled, other = broadcaster.consumers()
+
+    async def _read_slowly():
+        async for _ in cancelled:
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(_read_slowly())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await cancelled.aclose()
+
+    # The other consumer is not blocked by the cancelled one
+    assert await asyncio.wait_for(_read_all(other), timeout=5) == list(range(30))
+    assert broadcaster.buffered(0) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_reader_waiting_for_the_source():
+    release = asyncio.Event()
+
+    async def _source():
+        for i in range(3):
+            await release.wait()
+            yield i
+
+    broadcaster = StreamBroadcaster(_source(), 2)
+    first, second = broadcaster.consumers()
+    task = asyncio.create_task(first.__anext__())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    release.set()
+    # The pending read of the source is kept for the other consumer
+    assert await _read_all(second) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_close_all_consumers_closes_the_source():
+    source = _CountingStream(10)
+    broadcaster = StreamBroadcaster(source(), 2)
+    first, second = broadcaster.consumers()
+    assert await first.__anext__() == 0
+    await first.aclose()
+    broadcaster.close(1)
+    await asyncio.sleep(0.01)
+    assert source.closed
+
+
+@pytest.mark.asyncio
+async def test_source_error_is_raised_to_all_consumers():
+    async def _source():
+        yield 1
+        raise ValueError("broken stream")
+
+    broadcaster = StreamBroadcaster(_source(), 2)
+    for consumer in broadcaster.consumers():
+        assert await consumer.__anext__() == 1
+        with pytest.raises(ValueError, match="broken stream"):
+            await consumer.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_runner_broadcasts_stream_to_downstream_nodes():
+    async def _stream():
+        for i in range(10):
+            yield i
+
+    runner = DefaultWorkflowRunner(stream_buffer_size=2)
+    with DAG("test_broadcast_stream"):
+        input_node = InputOperator(SimpleInputSource(_stream()))
+        sum_node = ReduceStreamOperator(lambda x, y: x + y)
+        double_node = MapOperator(lambda x: x * 2)
+        double_sum_node = ReduceStreamOperator(lambda x, y: x + y)
+        join_node = JoinOperator(lambda a, b: (a, b))
+        input_node >> sum_node >> join_node
+        input_node >> double_node >> double_sum_node >> join_node
+
+    res = await runner.execute_workflow(join_node)
+    assert res.current_task_context.task_output.output == (45, 90)
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from gptdb.core.awel.trigger.admission import (
+    AdmissionLimiter,
+    AdmissionPolicy,
+    AdmissionRegistry,
+    AdmissionRejectedError,
+    admit,
+)
+
+
+async def _hold(limiter: AdmissionLimiter, seconds: float, order: list, name: str):
+    async with await admit(limiter):
+        order.append(name)
+        await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_limit_concurrency_in_fifo_order():
+    limiter = AdmissionLimiter("test", AdmissionPolicy(max_concurrency=2))
+    order = []
+    tasks = [asyncio.create_task(_hold(limiter, 0.05, order, str(i))) for i in range(5)]
+    await asyncio.sleep(0.01)
+    assert limiter.in_flight == 2
+    assert limiter.queue_depth == 3
+
+    await asyncio.gather(*tasks)
+    assert order == ["0", "1", "2", "3", "4"]
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+    metrics = limiter.metrics()
+    assert metrics["admitted"] == 5
+    assert metrics["rejected"] == 0
+    assert metrics["wait_time_p95_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_reject_when_queue_full():
+    limiter = AdmissionLimiter("test", AdmissionPolicy(1, max_queue_size=1))
+    ticket = await admit(limiter)
+    waiting = asyncio.create_task(admit(limiter))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await admit(limiter)
+    assert exc_info.value.reason == "queue_full"
+    assert exc_info.value.retry_after >= 1
+
+    ticket.release()
+    (await waiting).release()
+    assert limiter.in_flight == 0
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_reject_after_deadline():
+    limiter = AdmissionLimiter("test", AdmissionPolicy(1, max_wait_time=0.05))
+    ticket = await admit(limiter)
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await admit(limiter)
+    assert exc_info.value.reason == "timeout"
+    assert limiter.queue_depth == 0
+
+    ticket.release()
+    # released twice by mistake
+    ticket.release()
+    assert limiter.in_flight == 0
+    (await admit(limiter)).release()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place():
+    limiter = AdmissionLimiter("test", AdmissionPolicy(1))
+    ticket = await admit(limiter)
+    waiting = asyncio.create_task(admit(limiter))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert limiter.queue_depth == 0
+
+    ticket.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_at_timeout_is_taken(mocker):
+    limiter = AdmissionLimiter("test", AdmissionPolicy(1, max_wait_time=0.05))
+    ticket = await admit(limiter)
+
+    async def _wait_for(fut, timeout):
+        # The slot is handed over just as the wait times out
+        ticket.release()
+        assert fut.done()
+        raise asyncio.TimeoutError()
+
+    mocker.patch(
+        "gptdb.core.awel.trigger.admission.asyncio.wait_for", side_effect=_wait_for
+    )
+    second = await admit(limiter)
+    assert limiter.in_flight == 1
+    assert limiter.rejected == 0
+    second.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_admit_releases_taken_slots_on_rejection():
+    free = AdmissionLimiter("free", AdmissionPolicy(1))
+    busy = AdmissionLimiter("busy", AdmissionPolicy(1, max_queue_size=0))
+    ticket = await admit(busy)
+    with pytest.raises(AdmissionRejectedError):
+        await admit(free, None, busy)
+    assert free.in_flight == 0
+    ticket.release()
+
+
+def test_registry_replaces_limiter_on_policy_change():
+    registry = AdmissionRegistry()
+    limiter = registry.limiter("dag:a", AdmissionPolicy(1))
+    assert registry.limiter("dag:a", AdmissionPolicy(1)) is limiter
+    assert registry.limiter("dag:a", AdmissionPolicy(2)) is not limiter
+    assert [m["max_concurrency"] for m in registry.metrics()] == [2]
+    registry.remove("dag:a")
+    assert registry.metrics() == []
@@ -0,0 +1,110 @@
+import asyncio
+from typing import AsyncIterator, Dict
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from gptdb.core.awel import DAG, MapOperator, StreamifyAbsOperator
+from gptdb.core.awel.trigger.admission import AdmissionPolicy
+from gptdb.core.awel.trigger.http_trigger import DictHttpTrigger
+
+_DELAY = 0.2
+
+
+class SlowMapOperator(MapOperator[Dict, Dict]):
+    async def map(self, body: Dict) -> Dict:
+        await asyncio.sleep(_DELAY)
+        return {"echo": body["n"]}
+
+
+class SlowStreamOperator(StreamifyAbsOperator[Dict, str]):
+    async def streamify(self, body: Dict) -> AsyncIterator[str]:
+        for i in range(2):
+            await asyncio.sleep(_DELAY / 2)
+            yield f"{body['n']}-{i}\n"
+
+
+def _create_client(dag_id: str, endpoint: str, streaming: bool = False, **kwargs):
+    dag_policy = kwargs.pop("dag_policy", None)
+    with DAG(dag_id, admission_policy=dag_policy) as dag:
+        trigger = DictHttpTrigger(endpoint, streaming_response=streaming, **kwargs)
+        task = SlowStreamOperator() if streaming else SlowMapOperator()
+        trigger >> task
+    router = APIRouter()
+    trigger.mount_to_router(router)
+    app = FastAPI()
+    app.include_router(router)
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    return client, trigger, dag
+
+
+@pytest.mark.asyncio
+async def test_trigger_rejects_burst_with_429():
+    client, trigger, _ = _create_client(
+        "test_trigger_rejects_burst", "/slow", max_concurrency=1, max_queue_size=1
+    )
+    async with client:
+        responses = await asyncio.gather(
+            *[client.post("/slow", json={"n": i}) for i in range(3)]
+        )
+    status_codes = sorted(r.status_code for r in responses)
+    assert status_codes == [200, 200, 429]
+    rejected = next(r for r in responses if r.status_code == 429)
+    assert int(rejected.headers["Retry-After"]) >= 1
+
+    metrics = trigger.admission_limiter.metrics()
+    assert metrics["admitted"] == 2
+    assert metrics["rejected"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["wait_time_p95_ms"] >= _DELAY * 1000 * 0.5
+
+
+@pytest.mark.asyncio
+async def test_trigger_rejects_after_wait_time():
+    client, _, _ = _create_client(
+        "test_trigger_rejects_after_wait_time",
+        "/slow",
+        max_concurrency=1,
+        max_wait_time=_DELAY / 4,
+    )
+    async with client:
+        responses = await asyncio.gather(
+            *[client.post("/slow", json={"n": i}) for i in range(2)]
+        )
+    assert sorted(r.status_code for r in responses) == [200, 429]
+
+
+@pytest.mark.asyncio
+async def test_dag_limit_shared_by_triggers():
+    client, trigger, dag = _create_client(
+        "test_dag_limit",
+        "/slow",
+        dag_policy=AdmissionPolicy(max_concurrency=1, max_queue_size=0),
+    )
+    assert trigger.admission_limiter is None
+    async with client:
+        responses = await asyncio.gather(
+            *[client.post("/slow", json={"n": i}) for i in range(2)]
+        )
+    assert sorted(r.status_code for r in responses) == [200, 429]
+    assert dag.admission_limiter.metrics()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_holds_slot_until_stream_ends():
+    client, trigger, _ = _create_client(
+        "test_streaming_holds_slot",
+        "/stream",
+        streaming=True,
+        max_concurrency=1,
+    )
+    async with client:
+        responses = await asyncio.gather(
+            *[client.post("/stream", json={"n": i}) for i in range(2)]
+        )
+    assert sorted(r.text for r in responses) == ["0-0\n0-1\n", "1-0\n1-1\n"]
+    limiter = trigger.admission_limiter
+    assert limiter.in_flight == 0
+    # the second request waited for the whole stream of the first one
+    assert limiter.metrics()["wait_time_p95_ms"] >= _DELAY * 1000 * 0.5
@@ -1,3 +1,4 @@
+import asyncio
 from typing import AsyncIterator
 
 import pytest
@@ -138,3 +139,58 @@ async def test_parallel_safe():
         trigger_task >> number_task >> task
     stream_results = await trigger_task.trigger(parallel_num=3)
     await _check_stream_results(stream_results, 4)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_trigger_stream_bounded(ordered: bool):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_square(x: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later items finish earlier
+        await asyncio.sleep(0.001 * (x % 3))
+        in_flight -= 1
+        return x * x
+
+    with DAG("test_trigger_stream_bounded"):
+        trigger_task = IteratorTrigger(data=range(100), show_progress=False)
+        task = MapOperator(slow_square)
+        trigger_task >> task
+
+    results = []
+    async for index, data, output in trigger_task.trigger_stream(
+        parallel_num=4, ordered=ordered
+    ):
+        assert index == data
+        assert output == data * data
+        results.append(index)
+    assert max_in_flight <= 4
+    assert sorted(results) == list(range(100))
+    if ordered:
+        assert results == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_trigger_stream_resume():
+    with DAG("test_trigger_stream_resume"):
+        trigger_task = IteratorTrigger(data=range(10), show_progress=False)
+        task = MapOperator(lambda x: x * x)
+        trigger_task >> task
+
+    checkpoint = 0
+    async for index, _, _ in trigger_task.trigger_stream(parallel_num=2):
+        checkpoint = index + 1
+        if index == 4:
+            break
+
+    resumed = [
+        (index, output)
+        async for index, _, output in trigger_task.trigger_stream(
+            parallel_num=2, start_index=checkpoint
+        )
+    ]
+    assert resumed == [(i, i * i) for i in range(5, 10)]
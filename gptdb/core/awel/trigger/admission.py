@@ -0,0 +1,289 @@
+"""Admission control of the AWEL triggers.
+
+A burst of requests on one DAG should not take all the executors and model workers
+of the other DAGs. An :class:`AdmissionLimiter` bounds the number of concurrent
+runs, the extra requests wait in a bounded queue and are rejected when the queue is
+full or their deadline has passed, the caller should answer them with a
+``429 Too Many Requests`` and the ``Retry-After`` of the error.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from gptdb.util.retry import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejectedError(RuntimeError):
+    """The request is rejected by the admission control.
+
+    Args:
+        limiter_name (str): The name of the limiter which rejects the request.
+        reason (str): Why the request is rejected, "queue_full" or "timeout".
+        retry_after (int): Seconds the caller should wait before retrying.
+    """
+
+    def __init__(self, limiter_name: str, reason: str, retry_after: int):
+        """Create an admission rejected error."""
+        super().__init__(
+            f"Too many requests for {limiter_name}, {reason}, retry after "
+            f"{retry_after}s"
+        )
+        self.limiter_name = limiter_name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """The limits of an admission limiter.
+
+    Args:
+        max_concurrency (int): The max number of concurrent runs.
+        max_queue_size (int): The max number of requests waiting for a run, the
+            requests beyond it are rejected immediately.
+        max_wait_time (Optional[float]): The max seconds a request waits in the
+            queue, it waits until admitted if None.
+    """
+
+    max_concurrency: int
+    max_queue_size: int = 100
+    max_wait_time: Optional[float] = 30.0
+
+    def __post_init__(self):
+        """Check the limits."""
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+        if self.max_queue_size < 0:
+            raise ValueError("max_queue_size can't be negative")
+
+
+class AdmissionTicket:
+    """The slots held by an admitted request, release them when the run ends.
+
+    :meth:`release` can be called more than once, so it is safe to call it from
+    both the end of a stream and a background task.
+    """
+
+    def __init__(self, limiters: List["AdmissionLimiter"], wait_time: float = 0.0):
+        """Create a ticket, use :func:`admit` instead."""
+        self._limiters = limiters
+        self._start = time.monotonic()
+        self._released = False
+        self.wait_time = wait_time
+
+    def release(self):
+        """Release the slots."""
+        if self._released:
+            return
+        self._released = True
+        hold_time = time.monotonic() - self._start
+        for limiter in reversed(self._limiters):
+            limiter._release(hold_time)
+
+    async def __aenter__(self) -> "AdmissionTicket":
+        """Return self."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Release the slots."""
+        self.release()
+
+
+class AdmissionLimiter:
+    """Limit the concurrent runs with a bounded FIFO wait queue.
+
+    The limiter must be used in one event loop.
+
+    Args:
+        name (str): The name of the limiter, e.g. the DAG or the endpoint.
+        policy (AdmissionPolicy): The limits.
+    """
+
+    def __init__(self, name: str, policy: AdmissionPolicy):
+        """Create an admission limiter."""
+        self.name = name
+        self.policy = policy
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._wait_times = LatencyHistogram()
+        self._hold_times = LatencyHistogram()
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of running requests."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of waiting requests."""
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimate the seconds until a new request can be admitted."""
+        hold_time = self._hold_times.percentile(50) or 1.0
+        rounds = (self.queue_depth + 1) / self.policy.max_concurrency
+        return max(1, math.ceil(hold_time * rounds))
+
+    def _reject(self, reason: str) -> AdmissionRejectedError:
+        self.rejected += 1
+        retry_after = self.retry_after()
+        logger.warning(
+            f"Reject the request of {self.name}, {reason}, in flight: "
+            f"{self._in_flight}, queue depth: {self.queue_depth}"
+        )
+        return AdmissionRejectedError(self.name, reason, retry_after)
+
+    async def _acquire(self) -> float:
+        """Take a slot, return the seconds waited in the queue."""
+        if self._in_flight < self.policy.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            self.admitted += 1
+            self._wait_times.record(0.0)
+            return 0.0
+        if len(self._waiters) >= self.policy.max_queue_size:
+            raise self._reject("queue_full")
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # The slot is handed over by _release, _in_flight is not changed
+            await asyncio.wait_for(waiter, timeout=self.policy.max_wait_time)
+        except asyncio.TimeoutError:
+            if not waiter.done() or waiter.cancelled():
+                self._remove_waiter(waiter)
+                raise self._reject("timeout")
+            # The slot was handed over right when the wait timed out, take it
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation
+                self._release(None)
+            else:
+                self._remove_waiter(waiter)
+            raise
+        wait_time = time.monotonic() - start
+        self.admitted += 1
+        self._wait_times.record(wait_time)
+        return wait_time
+
+    def _remove_waiter(self, waiter: asyncio.Future):
+        with contextlib.suppress(ValueError):
+            self._waiters.remove(waiter)
+
+    def _release(self, hold_time: Optional[float]):
+        if hold_time is not None:
+            self._hold_times.record(hold_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight = max(self._in_flight - 1, 0)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the metrics of the limiter, the times are in milliseconds."""
+
+        def _ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "name": self.name,
+            "max_concurrency": self.policy.max_concurrency,
+            "max_queue_size": self.policy.max_queue_size,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_time_p50_ms": _ms(self._wait_times.percentile(50)),
+            "wait_time_p95_ms": _ms(self._wait_times.percentile(95)),
+        }
+
+
+async def admit(*limiters: Optional[AdmissionLimiter]) -> AdmissionTicket:
+    """Take a slot of every limiter in order, None limiters are skipped.
+
+    Raises:
+        AdmissionRejectedError: If any limiter rejects the request, the slots
+            already taken are released.
+    """
+    acquired: List[AdmissionLimiter] = []
+    wait_time = 0.0
+    try:
+        for limiter in limiters:
+            if limiter is None:
+                continue
+            wait_time += await limiter._acquire()
+            acquired.append(limiter)
+    except BaseException:
+        for limiter in reversed(acquired):
+            limiter._release(None)
+        raise
+    return AdmissionTicket(acquired, wait_time)
+
+
+async def release_after_stream(
+    stream: AsyncIterator[Any], ticket: AdmissionTicket
+) -> AsyncIterator[Any]:
+    """Yield the stream and release the ticket when it ends or fails."""
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        ticket.release()
+
+
+class AdmissionRegistry:
+    """The process-wide limiters by name, used to export the metrics.
+
+    Args:
+        default_dag_policy (Optional[AdmissionPolicy]): The policy of the DAGs
+            without their own policy, not limited if None.
+    """
+
+    def __init__(self, default_dag_policy: Optional[AdmissionPolicy] = None):
+        """Create an admission registry."""
+        self.default_dag_policy = default_dag_policy
+        self._limiters: Dict[str, AdmissionLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, name: str, policy: AdmissionPolicy) -> AdmissionLimiter:
+        """Return the limiter of the name, create it if the policy is changed.
+
+        The requests admitted by a replaced limiter still release to it.
+        """
+        with self._lock:
+            limiter = self._limiters.get(name)
+            if limiter is None or limiter.policy != policy:
+                limiter = AdmissionLimiter(name, policy)
+                self._limiters[name] = limiter
+            return limiter
+
+    def remove(self, name: str):
+        """Remove the limiter of the name."""
+        with self._lock:
+            self._limiters.pop(name, None)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Return the metrics of all the limiters."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.metrics() for limiter in limiters]
+
+
+_registry = AdmissionRegistry()
+
+
+def get_admission_registry() -> AdmissionRegistry:
+    """Return the process-wide admission registry."""
+    return _registry
@@ -43,6 +43,15 @@ from ..operators.base import BaseOperator
 from ..operators.common_operator import MapOperator
 from ..util._typing_util import _parse_bool
 from ..util.http_util import join_paths
+from .admission import (
+    AdmissionLimiter,
+    AdmissionPolicy,
+    AdmissionRejectedError,
+    AdmissionTicket,
+    admit,
+    get_admission_registry,
+    release_after_stream,
+)
 from .base import Trigger, TriggerMetadata
 
 if TYPE_CHECKING:
@@ -400,6 +409,33 @@ class HttpTrigger(Trigger):
                 default=200,
                 description="The http status code",
             ),
+            Parameter.build_from(
+                "Max Concurrency",
+                "max_concurrency",
+                int,
+                optional=True,
+                default=None,
+                description="The max number of concurrent requests of the endpoint, "
+                "not limited if not set",
+            ),
+            Parameter.build_from(
+                "Max Queue Size",
+                "max_queue_size",
+                int,
+                optional=True,
+                default=100,
+                description="The max number of requests waiting to run, the others "
+                "are rejected with 429",
+            ),
+            Parameter.build_from(
+                "Max Wait Time",
+                "max_wait_time",
+                float,
+                optional=True,
+                default=30.0,
+                description="The max seconds a request waits to run before it is "
+                "rejected with 429",
+            ),
         ],
     )
 
@@ -418,9 +454,17 @@ class HttpTrigger(Trigger):
         status_code: Optional[int] = 200,
         router_tags: Optional[List[str | Enum]] = None,
         register_to_app: bool = False,
+        max_concurrency: Optional[int] = None,
+        max_queue_size: int = 100,
+        max_wait_time: Optional[float] = 30.0,
         **kwargs,
     ) -> None:
-        """Initialize a HttpTrigger."""
+        """Initialize a HttpTrigger.
+
+        Requests beyond ``max_concurrency`` wait in a queue of ``max_queue_size``
+        for at most ``max_wait_time`` seconds, the others are rejected with
+        ``429 Too Many Requests``. The limit of the DAG, if any, is applied too.
+        """
         super().__init__(**kwargs)
         if not endpoint.startswith("/"):
             endpoint = "/" + endpoint
@@ -441,6 +485,21 @@ class HttpTrigger(Trigger):
         self._response_media_type = response_media_type
         self._end_node: Optional[BaseOperator] = None
         self._register_to_app = register_to_app
+        self._admission_policy = (
+            AdmissionPolicy(max_concurrency, max_queue_size, max_wait_time)
+            if max_concurrency
+            else None
+        )
+
+    @property
+    def admission_limiter(self) -> Optional[AdmissionLimiter]:
+        """Return the limiter of the concurrent requests of the endpoint."""
+        if not self._admission_policy:
+            return None
+        methods = ",".join(self._methods or [])
+        return get_admission_registry().limiter(
+            f"http_trigger:{methods}:{self._endpoint}", self._admission_policy
+        )
 
     async def trigger(self, **kwargs) -> Any:
         """Trigger the DAG. Not used in HttpTrigger."""
@@ -595,12 +654,17 @@ class HttpTrigger(Trigger):
             dag = self.dag
             if not dag:
                 raise AWELHttpError("DAG is not set")
+            try:
+                ticket = await admit(self.admission_limiter, dag.admission_limiter)
+            except AdmissionRejectedError as e:
+                raise too_many_requests_exception(e)
             return await _trigger_dag(
                 body,
                 dag,
                 streaming_response,
                 self._response_headers,
                 self._response_media_type,
+                ticket=ticket,
             )
 
         def create_route_function(name, req_body_cls: Optional["RequestBody"]):
@@ -693,31 +757,49 @@ class HttpTrigger(Trigger):
         return dynamic_route_function
 
 
+def too_many_requests_exception(e: AdmissionRejectedError):
+    """Return the 429 HTTPException of a rejected request."""
+    from fastapi import HTTPException
+
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 async def _trigger_dag(
     body: Any,
     dag: DAG,
     streaming_response: Optional[bool] = False,
     response_headers: Optional[Dict[str, str]] = None,
     response_media_type: Optional[str] = None,
+    ticket: Optional[AdmissionTicket] = None,
 ) -> Any:
     from fastapi import BackgroundTasks
     from fastapi.responses import StreamingResponse
 
+    ticket = ticket or AdmissionTicket([])
     span_id = root_tracer._parse_span_id(body)
 
     leaf_nodes = dag.leaf_nodes
     if len(leaf_nodes) != 1:
+        ticket.release()
         raise ValueError("HttpTrigger just support one leaf node in dag")
     end_node = cast(BaseOperator, leaf_nodes[0])
     metadata = {
         "awel_node_id": end_node.node_id,
         "awel_node_name": end_node.node_name,
+        "admission_wait_ms": round(ticket.wait_time * 1000, 3),
     }
     if not streaming_response:
-        with root_tracer.start_span(
-            "gptdb.core.trigger.http.run_dag", span_id, metadata=metadata
-        ):
-            return await end_node.call(call_data=body)
+        try:
+            with root_tracer.start_span(
+                "gptdb.core.trigger.http.run_dag", span_id, metadata=metadata
+            ):
+                return await end_node.call(call_data=body)
+        finally:
+            ticket.release()
     else:
         headers = response_headers
         media_type = response_media_type if response_media_type else "text/event-stream"
@@ -728,18 +810,23 @@ async def _trigger_dag(
                 "Connection": "keep-alive",
                 "Transfer-Encoding": "chunked",
             }
-        _generator = await end_node.call_stream(call_data=body)
+        try:
+            _generator = await end_node.call_stream(call_data=body)
+        except BaseException:
+            ticket.release()
+            raise
         trace_generator = root_tracer.wrapper_async_stream(
             _generator, "gptdb.core.trigger.http.run_dag", span_id, metadata=metadata
         )
 
         async def _after_dag_end():
+            ticket.release()
             await dag._after_dag_end(end_node.current_event_loop_task_id)
 
         background_tasks = BackgroundTasks()
         background_tasks.add_task(_after_dag_end)
         return StreamingResponse(
-            trace_generator,
+            release_after_stream(trace_generator, ticket),
             headers=headers,
             media_type=media_type,
             background=background_tasks,
@@ -808,6 +895,37 @@ _PARAMETER_STATUS_CODE = Parameter.build_from(
     default=200,
     description=_("The http status code"),
 )
+_PARAMETER_MAX_CONCURRENCY = Parameter.build_from(
+    _("Max Concurrency"),
+    "max_concurrency",
+    int,
+    optional=True,
+    default=None,
+    description=_(
+        "The max number of concurrent requests of the endpoint, not limited if not "
+        "set"
+    ),
+)
+_PARAMETER_MAX_QUEUE_SIZE = Parameter.build_from(
+    _("Max Queue Size"),
+    "max_queue_size",
+    int,
+    optional=True,
+    default=100,
+    description=_(
+        "The max number of requests waiting to run, the others are rejected with 429"
+    ),
+)
+_PARAMETER_MAX_WAIT_TIME = Parameter.build_from(
+    _("Max Wait Time"),
+    "max_wait_time",
+    float,
+    optional=True,
+    default=30.0,
+    description=_(
+        "The max seconds a request waits to run before it is rejected with 429"
+    ),
+)
 
 
 class DictHttpTrigger(HttpTrigger):
@@ -841,6 +959,9 @@ class DictHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_MAX_WAIT_TIME.new(),
         ],
     )
 
@@ -902,6 +1023,9 @@ class StringHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_MAX_WAIT_TIME.new(),
         ],
     )
 
@@ -964,6 +1088,9 @@ class CommonLLMHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_MAX_WAIT_TIME.new(),
         ],
     )
 
@@ -1,7 +1,18 @@
 """Trigger for iterator data."""
 
 import asyncio
-from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple, Union, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from ..operators.base import BaseOperator
 from ..task.base import InputSource, TaskState
@@ -120,6 +131,59 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
                 The first element of the tuple is the input data, the second element is
                 the output data of the leaf node.
         """
+        results: List[Tuple[Any, Any]] = []
+        async for _, call_data, task_output in self.trigger_stream(
+            parallel_num=parallel_num, ordered=True
+        ):
+            results.append((call_data, task_output))
+        return results
+
+    async def trigger_stream(
+        self,
+        parallel_num: Optional[int] = None,
+        ordered: bool = True,
+        start_index: int = 0,
+        **kwargs
+    ) -> AsyncIterator[Tuple[int, Any, Any]]:
+        """Trigger the dag with iterator data and yield the results as they complete.
+
+        At most `parallel_num` input items are in flight (or, in ordered mode,
+        completed but waiting for an earlier item) at any time, so the memory does
+        not grow with the size of the input data.
+
+        Examples:
+            .. code-block:: python
+
+                import asyncio
+                from gptdb.core.awel import DAG, IteratorTrigger, MapOperator
+
+                with DAG("test_dag") as dag:
+                    trigger_task = IteratorTrigger(range(100_000), show_progress=False)
+                    task = MapOperator(lambda x: x * x)
+                    trigger_task >> task
+
+
+                async def run():
+                    async for index, data, output in trigger_task.trigger_stream(
+                        parallel_num=8, start_index=10
+                    ):
+                        # Save the index as the checkpoint to resume from
+                        print(index, data, output)
+
+        Args:
+            parallel_num (Optional[int], optional): The parallel number of the dag
+                running. Defaults to None.
+            ordered (bool, optional): Whether to yield the results in the order of
+                the input data, otherwise yield them in the order of completion.
+                Defaults to True.
+            start_index (int, optional): The index of the first input item to run,
+                the items before it are skipped, used to resume from a checkpoint.
+                Defaults to 0.
+
+        Returns:
+            AsyncIterator[Tuple[int, Any, Any]]: The index of the input data, the input
+                data and the output data of the leaf node.
+        """
         dag = self.dag
         if not dag:
             raise ValueError("DAG is not set for IteratorTrigger")
@@ -128,7 +192,7 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
             raise ValueError("IteratorTrigger just support one leaf node in dag")
         end_node = cast(BaseOperator, leaf_nodes[0])
         streaming_call = self._streaming_call
-        semaphore = asyncio.Semaphore(parallel_num or self._parallel_num)
+        max_in_flight = max(parallel_num or self._parallel_num, 1)
         task_id = self.node_id
 
         async def call_stream(call_data: Any):
@@ -138,26 +202,59 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
             finally:
                 await dag._after_dag_end(end_node.current_event_loop_task_id)
 
-        async def run_node(call_data: Any) -> Tuple[Any, Any]:
-            async with semaphore:
-                if streaming_call:
-                    task_output = call_stream(call_data)
-                else:
-                    task_output = await end_node.call(call_data)
-                    # No streaming call, not need call dag._after_dag_end(), it will be
-                    # called in workflow runner
-                return call_data, task_output
-
-        tasks = []
+        async def run_node(index: int, call_data: Any) -> Tuple[int, Any, Any]:
+            if streaming_call:
+                task_output = call_stream(call_data)
+            else:
+                task_output = await end_node.call(call_data)
+                # No streaming call, not need call dag._after_dag_end(), it will be
+                # called in workflow runner
+            return index, call_data, task_output
 
+        progress = None
         if self._show_progress:
-            from tqdm.asyncio import tqdm_asyncio
+            from tqdm import tqdm
 
-            async_module = tqdm_asyncio
-        else:
-            async_module = asyncio  # type: ignore
+            progress = tqdm(initial=start_index)
 
-        async for data in _to_async_iterator(self._iter_data, task_id):
-            tasks.append(run_node(data))
-        results: List[Tuple[Any, Any]] = await async_module.gather(*tasks)
-        return results
+        data_iter = _to_async_iterator(self._iter_data, task_id).__aiter__()
+        exhausted = False
+        index = 0
+        next_index = start_index
+        running: Set[asyncio.Task] = set()
+        # Completed results waiting for the earlier items in ordered mode
+        completed: Dict[int, Tuple[int, Any, Any]] = {}
+        try:
+            while True:
+                while not exhausted and len(running) + len(completed) < max_in_flight:
+                    try:
+                        call_data = await data_iter.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    if index >= start_index:
+                        running.add(asyncio.create_task(run_node(index, call_data)))
+                    index += 1
+                if not running:
+                    break
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if ordered:
+                        completed[result[0]] = result
+                        continue
+                    if progress is not None:
+                        progress.update(1)
+                    yield result
+                while next_index in completed:
+                    if progress is not None:
+                        progress.update(1)
+                    yield completed.pop(next_index)
+                    next_index += 1
+        finally:
+            for task in running:
+                task.cancel()
+            if progress is not None:
+                progress.close()
@@ -71,6 +71,11 @@ class HttpTriggerManager(TriggerManager):
         self._trigger_map: Dict[str, Tuple[Trigger, TriggerMetadata]] = {}
         self._router_tables: Dict[str, Set[str]] = defaultdict(set)
 
+    @property
+    def router_prefix(self) -> str:
+        """Return the prefix of the routes of the http triggers."""
+        return self._router_prefix
+
     def register_trigger(
         self, trigger: Any, system_app: SystemApp
     ) -> Optional[TriggerMetadata]:
@@ -216,6 +221,16 @@ class DefaultTriggerManager(TriggerManager, BaseComponent):
                 raise ValueError("Http trigger manager not initialized")
             self._http_trigger.unregister_trigger(trigger, system_app)
 
+    @property
+    def http_router_prefix(self) -> Optional[str]:
+        """Return the prefix of the routes of the http triggers.
+
+        None if the http trigger manager is not initialized.
+        """
+        if not self._http_trigger:
+            return None
+        return self._http_trigger.router_prefix
+
     def after_register(self) -> None:
         """After register, init the trigger manager."""
         if self.system_app and self._http_trigger:
@@ -1,14 +1,20 @@
 """File storage interface."""
 
+import contextlib
 import dataclasses
 import hashlib
 import io
 import logging
 import os
+import re
+import shutil
+import tempfile
+import threading
 import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from io import BytesIO
-from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse
 
 import requests
@@ -27,6 +33,61 @@ from .storage import (
 
 logger = logging.getLogger(__name__)
 _SCHEMA = "gptdb-fs"
+_MD5_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _is_md5_hash(file_hash: Optional[str]) -> bool:
+    return bool(file_hash) and bool(_MD5_PATTERN.match(file_hash))  # type: ignore
+
+
+class HashingReader(io.RawIOBase):
+    """A file wrapper that calculates the MD5 hash and size of the data read.
+
+    The storage system passes it to the storage backend, so the file is hashed
+    while the backend streams it to the storage, without a second pass over the data.
+    """
+
+    def __init__(self, file_data: BinaryIO):
+        """Create a hashing reader of the file data."""
+        super().__init__()
+        self._file_data = file_data
+        self._hasher = hashlib.md5()
+        self._size = 0
+        self._eof = False
+
+    def readable(self) -> bool:
+        """Return whether the reader is readable."""
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        """Read the data and update the hash."""
+        chunk = self._file_data.read(size if size is not None else -1)
+        if chunk:
+            self._hasher.update(chunk)
+            self._size += len(chunk)
+        if not chunk or size is None or size < 0:
+            self._eof = True
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        """Read the data into the buffer and update the hash."""
+        chunk = self.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    @property
+    def eof(self) -> bool:
+        """Return whether all the data has been read."""
+        return self._eof
+
+    @property
+    def size(self) -> int:
+        """Return the number of bytes read."""
+        return self._size
+
+    def hexdigest(self) -> str:
+        """Return the MD5 hash of the data read."""
+        return self._hasher.hexdigest()
 
 
 @dataclasses.dataclass
@@ -309,6 +370,7 @@ class FileStorageSystem:
         if not backend:
             raise ValueError(f"Unsupported storage type: {storage_type}")
 
+        reader = HashingReader(file_data)
         with root_tracer.start_span(
             "file_storage_system.save_file.backend_save",
             metadata={
@@ -318,10 +380,8 @@ class FileStorageSystem:
                 "storage_type": storage_type,
             },
         ):
-            storage_path = backend.save(bucket, file_id, file_data)
-        file_data.seek(0, 2)  # Move to the end of the file
-        file_size = file_data.tell()  # Get the file size
-        file_data.seek(0)  # Reset file pointer
+            # The file is hashed while the backend reads it
+            storage_path = backend.save(bucket, file_id, reader)  # type: ignore
 
         # filter None value
         custom_metadata = (
@@ -330,10 +390,19 @@ class FileStorageSystem:
             else {}
         )
 
-        with root_tracer.start_span(
-            "file_storage_system.save_file.calculate_hash",
-        ):
-            file_hash = self._calculate_file_hash(file_data)
+        if reader.eof:
+            file_size = reader.size
+            file_hash = reader.hexdigest() if self.check_hash else "-1"
+            file_data.seek(0)  # Reset file pointer
+        else:
+            # The backend did not read the whole file, hash it in a second pass
+            with root_tracer.start_span(
+                "file_storage_system.save_file.calculate_hash",
+            ):
+                file_data.seek(0, 2)  # Move to the end of the file
+                file_size = file_data.tell()  # Get the file size
+                file_data.seek(0)  # Reset file pointer
+                file_hash = self._calculate_file_hash(file_data)
         uri = FileStorageURI(
             storage_type, bucket, file_id, custom_params=custom_metadata
         )
@@ -631,8 +700,103 @@ class FileStorageClient(BaseComponent):
         return self.storage_system.list_files(bucket, filters)
 
 
+class _HashedFileCache:
+    """A size-bounded LRU cache of files on the local disk, keyed by MD5 hash.
+
+    A file is only added to the cache when its content matches its hash, so a cached
+    file can be served for any file with the same hash.
+    """
+
+    def __init__(self, cache_path: str, max_size: int):
+        self._cache_path = cache_path
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_size = 0
+        os.makedirs(self._cache_path, exist_ok=True)
+        files = []
+        for name in os.listdir(self._cache_path):
+            path = os.path.join(self._cache_path, name)
+            if _is_md5_hash(name) and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name, stat.st_size))
+        # Restore the least recently used order from the modification time
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_size += size
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self._cache_path, file_hash)
+
+    def get(self, file_hash: str) -> Optional[str]:
+        """Return the path of the cached file, None if the file is not cached."""
+        with self._lock:
+            if file_hash not in self._entries:
+                return None
+            path = self._path(file_hash)
+            if not os.path.exists(path):
+                self._total_size -= self._entries.pop(file_hash)
+                return None
+            self._entries.move_to_end(file_hash)
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return path
+
+    def put(self, file_hash: str, chunks: Iterable[bytes]) -> Optional[str]:
+        """Write the chunks to the cache.
+
+        Returns:
+            Optional[str]: The path of the cached file, None if the content does not
+                match the hash or the file is larger than the cache.
+        """
+        hasher = hashlib.md5()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            if hasher.hexdigest() != file_hash:
+                logger.warning(f"Hash mismatch of file {file_hash}, skip caching it")
+                return None
+            if size > self._max_size:
+                return None
+            path = self._path(file_hash)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            if file_hash in self._entries:
+                self._total_size -= self._entries.pop(file_hash)
+            self._entries[file_hash] = size
+            self._total_size += size
+            self._evict(keep=file_hash)
+        return path
+
+    def _evict(self, keep: str):
+        while self._total_size > self._max_size and len(self._entries) > 1:
+            file_hash = next(iter(self._entries))
+            if file_hash == keep:
+                break
+            self._total_size -= self._entries.pop(file_hash)
+            with contextlib.suppress(OSError):
+                os.remove(self._path(file_hash))
+
+
 class SimpleDistributedStorage(StorageBackend):
-    """Simple distributed storage backend."""
+    """Simple distributed storage backend.
+
+    The files saved on the node are stored once per content in a content-addressed
+    blob store, and the files loaded from other nodes are cached on the local disk.
+    """
 
     storage_type: str = "distributed"
 
@@ -644,8 +808,20 @@ class SimpleDistributedStorage(StorageBackend):
         transfer_chunk_size: int = 1024 * 1024,
         transfer_timeout: int = 360,
         api_prefix: str = "/api/v2/serve/file/files",
+        cache_max_size: int = 1024 * 1024 * 1024,
     ):
-        """Initialize the simple distributed storage backend."""
+        """Initialize the simple distributed storage backend.
+
+        Args:
+            node_address (str): The address of the current node
+            local_storage_path (str): The local storage path
+            save_chunk_size (int): The chunk size when saving the file
+            transfer_chunk_size (int): The chunk size when transferring the file
+            transfer_timeout (int): The timeout when transferring the file
+            api_prefix (str): The api prefix of the file server
+            cache_max_size (int): The max size in bytes of the local cache of the files
+                loaded from other nodes, 0 to disable the cache
+        """
         self.node_address = node_address
         self.local_storage_path = local_storage_path
         os.makedirs(self.local_storage_path, exist_ok=True)
@@ -653,6 +829,12 @@ class SimpleDistributedStorage(StorageBackend):
         self._transfer_chunk_size = transfer_chunk_size
         self._transfer_timeout = transfer_timeout
         self._api_prefix = api_prefix
+        self._blob_path = os.path.join(self.local_storage_path, "_blobs")
+        os.makedirs(self._blob_path, exist_ok=True)
+        self._blob_lock = threading.Lock()
+        self._cache = _HashedFileCache(
+            os.path.join(self.local_storage_path, "_cache"), cache_max_size
+        )
 
     @property
     def save_chunk_size(self) -> int:
@@ -663,6 +845,29 @@ class SimpleDistributedStorage(StorageBackend):
         node_id = hashlib.md5(node_address.encode()).hexdigest()
         return os.path.join(self.local_storage_path, bucket, f"{file_id}_{node_id}")
 
+    def _get_blob_path(self, file_hash: str) -> str:
+        return os.path.join(self._blob_path, file_hash[:2], file_hash)
+
+    def _remove_file(self, file_path: str, file_hash: Optional[str] = None):
+        """Remove a file, and its blob when no other file links to it.
+
+        The caller must hold the blob lock.
+        """
+        if os.stat(file_path).st_nlink > 1:
+            if not _is_md5_hash(file_hash):
+                # The hash is not in the metadata, e.g. the hash check is disabled
+                hasher = hashlib.md5()
+                with open(file_path, "rb") as f:
+                    while chunk := f.read(self.save_chunk_size):
+                        hasher.update(chunk)
+                file_hash = hasher.hexdigest()
+            blob_path = self._get_blob_path(file_hash)  # type: ignore
+            os.remove(file_path)
+            if os.path.exists(blob_path) and os.stat(blob_path).st_nlink <= 1:
+                os.remove(blob_path)
+        else:
+            os.remove(file_path)
+
     def _parse_node_address(self, fm: FileMetadata) -> str:
         storage_path = fm.storage_path
         if not storage_path.startswith("distributed://"):
@@ -672,7 +877,8 @@ class SimpleDistributedStorage(StorageBackend):
     def save(self, bucket: str, file_id: str, file_data: BinaryIO) -> str:
         """Save the file data to the distributed storage backend.
 
-        Just save the file locally.
+        Just save the file locally. The content is written to the blob store once per
+        hash, the file path is a hard link to the blob.
 
         Args:
             bucket (str): The bucket name
@@ -684,12 +890,43 @@ class SimpleDistributedStorage(StorageBackend):
         """
         file_path = self._get_file_path(bucket, file_id, self.node_address)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as f:
-            while True:
-                chunk = file_data.read(self.save_chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
+        reader = (
+            file_data
+            if isinstance(file_data, HashingReader)
+            else HashingReader(file_data)
+        )
+        fd, tmp_path = tempfile.mkstemp(dir=self._blob_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = reader.read(self.save_chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            blob_path = self._get_blob_path(reader.hexdigest())
+            with self._blob_lock:
+                created = not os.path.exists(blob_path)
+                if created:
+                    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                    os.replace(tmp_path, blob_path)
+                else:
+                    # The same content is already stored
+                    os.remove(tmp_path)
+                tmp_path = None
+                if os.path.exists(file_path):
+                    self._remove_file(file_path)
+                try:
+                    os.link(blob_path, file_path)
+                except OSError:
+                    # The file system does not support hard links, the content is
+                    # kept in the file only, a blob is only kept with its links
+                    if created:
+                        os.replace(blob_path, file_path)
+                    else:
+                        shutil.copyfile(blob_path, file_path)
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
         return f"distributed://{self.node_address}/{bucket}/{file_id}"
 
@@ -697,6 +934,8 @@ class SimpleDistributedStorage(StorageBackend):
         """Load the file data from the distributed storage backend.
 
         If the file is stored on the local node, load it from the local storage.
+        Otherwise, load it from the local blob store or the local cache if a file with
+        the same hash is there, or download it from the remote node and cache it.
 
         Args:
             fm (FileMetadata): The file metadata
@@ -709,23 +948,43 @@ class SimpleDistributedStorage(StorageBackend):
         node_address = self._parse_node_address(fm)
         file_path = self._get_file_path(bucket, file_id, node_address)
 
-        # TODO: check if the file is cached in local storage
         if node_address == self.node_address:
             if os.path.exists(file_path):
                 return open(file_path, "rb")  # noqa: SIM115
             else:
                 raise FileNotFoundError(f"File {file_id} not found on the local node")
-        else:
+
+        use_cache = self._cache.enabled and _is_md5_hash(fm.file_hash)
+        if use_cache:
+            blob_path = self._get_blob_path(fm.file_hash)
+            if os.path.exists(blob_path):
+                return open(blob_path, "rb")  # noqa: SIM115
+            cached_path = self._cache.get(fm.file_hash)
+            if cached_path:
+                # The file may be evicted by another thread
+                with contextlib.suppress(FileNotFoundError):
+                    return open(cached_path, "rb")  # noqa: SIM115
+
+        response = requests.get(
+            f"http://{node_address}{self._api_prefix}/{bucket}/{file_id}",
+            timeout=self._transfer_timeout,
+            stream=True,
+        )
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=self._transfer_chunk_size)
+        if use_cache:
+            cached_path = self._cache.put(fm.file_hash, chunks)
+            if cached_path:
+                return open(cached_path, "rb")  # noqa: SIM115
+            # The content does not match the hash, download it again without caching
             response = requests.get(
                 f"http://{node_address}{self._api_prefix}/{bucket}/{file_id}",
                 timeout=self._transfer_timeout,
                 stream=True,
             )
             response.raise_for_status()
-            # TODO: cache the file in local storage
-            return StreamedBytesIO(
-                response.iter_content(chunk_size=self._transfer_chunk_size)
-            )
+            chunks = response.iter_content(chunk_size=self._transfer_chunk_size)
+        return StreamedBytesIO(chunks)
 
     def delete(self, fm: FileMetadata) -> bool:
         """Delete the file data from the distributed storage backend.
@@ -745,10 +1004,11 @@ class SimpleDistributedStorage(StorageBackend):
         node_address = self._parse_node_address(fm)
         file_path = self._get_file_path(bucket, file_id, node_address)
         if node_address == self.node_address:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                return True
-            return False
+            with self._blob_lock:
+                if not os.path.exists(file_path):
+                    return False
+                self._remove_file(file_path, fm.file_hash)
+            return True
         else:
             try:
                 response = requests.delete(
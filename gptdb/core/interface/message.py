@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Dict, List, Optional, Tuple, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 from gptdb._private.pydantic import BaseModel, Field, model_to_dict
 from gptdb.core.interface.storage import (
@@ -925,12 +928,90 @@ class MessageStorageItem(StorageItem):
         self.message_detail = other.message_detail
 
 
+@dataclass
+class _CachedConversation:
+    """The stored state of a conversation in the :class:`ConversationCache`."""
+
+    fields: Dict[str, Any]
+    save_message_independent: bool
+    message_ids: List[str]
+    # The stored details of the loaded messages, the latest messages of the
+    # conversation
+    message_details: List[Dict]
+    unloaded_message_count: int
+
+
+class ConversationCache:
+    """A bounded in-process cache of the recently active conversations.
+
+    It keeps the stored state of a conversation after it is loaded or saved, so the
+    next turn of the conversation is loaded without reading the storage. Every
+    :class:`StorageConversation` which writes the conversation must share the same
+    cache, the entry is replaced when the conversation is saved and removed when it
+    is deleted.
+
+    Args:
+        max_size (int): The max number of cached conversations.
+        max_messages (int): The max number of messages cached for a conversation,
+            the conversation is not cached if more messages are loaded.
+    """
+
+    def __init__(self, max_size: int = 256, max_messages: int = 1000):
+        """Create a conversation cache."""
+        self._max_size = max_size
+        self._max_messages = max_messages
+        self._entries: OrderedDict[str, _CachedConversation] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, conv_uid: str) -> Optional[_CachedConversation]:
+        """Return the cached conversation."""
+        with self._lock:
+            entry = self._entries.get(conv_uid)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(conv_uid)
+            self.hits += 1
+            return entry
+
+    def put(self, conv_uid: str, entry: _CachedConversation) -> None:
+        """Cache the conversation, replace the old entry."""
+        with self._lock:
+            if len(entry.message_details) > self._max_messages:
+                self._entries.pop(conv_uid, None)
+                return
+            self._entries[conv_uid] = entry
+            self._entries.move_to_end(conv_uid)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, conv_uid: str) -> None:
+        """Remove the conversation from the cache."""
+        with self._lock:
+            self._entries.pop(conv_uid, None)
+
+    def clear(self) -> None:
+        """Remove all the conversations."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached conversations."""
+        return len(self._entries)
+
+
 class StorageConversation(OnceConversation, StorageItem):
     """The storage conversation.
 
     All the information of a conversation, the current single service in memory,
     can expand cache and database support distributed services.
 
+    Set ``history_rounds`` to load only the messages of the latest rounds, the
+    earlier rounds are loaded by :meth:`load_earlier_rounds` on demand. With a
+    :class:`ConversationCache`, the recently active conversations are loaded
+    without reading the storage.
     """
 
     @property
@@ -942,7 +1023,8 @@ class StorageConversation(OnceConversation, StorageItem):
         """Convert to dict."""
         dict_data = self._to_dict()
         messages: Dict = dict_data.pop("messages")
-        message_ids = []
+        # The unloaded messages are only known by their ids
+        message_ids = self.message_ids[: self._unloaded_message_count]
         index = 0
         for message in messages:
             if "index" in message:
@@ -982,12 +1064,31 @@ class StorageConversation(OnceConversation, StorageItem):
         conv_storage: Optional[StorageInterface] = None,
         message_storage: Optional[StorageInterface] = None,
         load_message: bool = True,
+        history_rounds: Optional[int] = None,
+        conv_cache: Optional[ConversationCache] = None,
         **kwargs,
     ):
-        """Create a conversation."""
+        """Create a conversation.
+
+        Args:
+            history_rounds (Optional[int]): Only load the messages of the latest
+                rounds, load all the messages if None.
+            conv_cache (Optional[ConversationCache]): The cache of the recently
+                active conversations.
+        """
         super().__init__(chat_mode, user_name, sys_code, summary, app_code, **kwargs)
         self.conv_uid = conv_uid
         self._message_ids = message_ids
+        self._history_rounds = history_rounds
+        self._conv_cache = conv_cache
+        # The number of the stored messages before the loaded messages
+        self._unloaded_message_count = 0
+        # The number of message ids in the stored conversation, and the ids appended
+        # since it was stored, None if the whole id list must be rewritten
+        self._stored_message_id_count = 0
+        self._appended_message_ids: Optional[List[str]] = None
+        # The stored details of the loaded messages, only kept for the cache
+        self._message_details: List[Dict] = []
         # Record the message index last time saved to the storage,
         # next time save messages which index is _has_stored_message_index + 1
         self._has_stored_message_index = (
@@ -1015,6 +1116,20 @@ class StorageConversation(OnceConversation, StorageItem):
         """
         return self._message_ids if self._message_ids else []
 
+    @property
+    def appended_message_ids(self) -> Optional[List[str]]:
+        """Return the message ids appended since the conversation was stored.
+
+        The storage can append them to the stored message ids instead of rewriting
+        all of them. None if the whole message id list must be written.
+        """
+        return self._appended_message_ids
+
+    @property
+    def has_earlier_messages(self) -> bool:
+        """Whether the earlier messages of the conversation are not loaded."""
+        return self._unloaded_message_count > 0
+
     def end_current_round(self) -> None:
         """End the current round of conversation.
 
@@ -1022,21 +1137,46 @@ class StorageConversation(OnceConversation, StorageItem):
         """
         self.save_to_storage()
 
-    def _get_message_items(self) -> List[MessageStorageItem]:
-        return [
-            MessageStorageItem(self.conv_uid, message.index, message.to_dict())
-            for message in self.messages
+    def _all_message_identifiers(self) -> List[MessageIdentifier]:
+        identifiers = [
+            MessageIdentifier.from_str_identifier(message_id)
+            for message_id in self.message_ids[: self._unloaded_message_count]
         ]
+        identifiers.extend(
+            MessageIdentifier(self.conv_uid, message.index) for message in self.messages
+        )
+        return identifiers
 
     def save_to_storage(self) -> None:
         """Save the conversation to the storage."""
-        # Save messages first
-        message_list = self._get_message_items()
-        self._message_ids = [
-            message.identifier.str_identifier for message in message_list
+        # Save messages first, only the new messages are converted
+        stored_count = self._has_stored_message_index + 1
+        messages_to_save = [
+            MessageStorageItem(self.conv_uid, message.index, message.to_dict())
+            for message in self.messages[stored_count:]
         ]
-        messages_to_save = message_list[self._has_stored_message_index + 1 :]
-        self._has_stored_message_index = len(message_list) - 1
+        new_message_ids = [
+            message.identifier.str_identifier for message in messages_to_save
+        ]
+        if self._unloaded_message_count:
+            # The unloaded messages are only known by their ids
+            stored_message_ids = self.message_ids
+        else:
+            stored_message_ids = [
+                MessageIdentifier(self.conv_uid, message.index).str_identifier
+                for message in self.messages[:stored_count]
+            ]
+        old_message_ids = self.message_ids
+        self._message_ids = stored_message_ids + new_message_ids
+        stored_id_count = self._stored_message_id_count
+        if stored_id_count and (
+            self._unloaded_message_count
+            or self._message_ids[:stored_id_count] == old_message_ids[:stored_id_count]
+        ):
+            self._appended_message_ids = self._message_ids[stored_id_count:]
+        else:
+            self._appended_message_ids = None
+        self._has_stored_message_index = len(self.messages) - 1
         if self.save_message_independent:
             # Save messages independently
             self.message_storage.save_list(messages_to_save)
@@ -1044,6 +1184,17 @@ class StorageConversation(OnceConversation, StorageItem):
         if self.summary is not None and len(self.summary) > 4000:
             self.summary = self.summary[0:4000]
         self.conv_storage.save_or_update(self)
+        self._stored_message_id_count = len(self._message_ids)
+        self._appended_message_ids = None
+        if self._conv_cache is not None:
+            if len(self._message_details) == stored_count:
+                self._message_details.extend(
+                    item.message_detail for item in messages_to_save
+                )
+                self._cache_state()
+            else:
+                # The stored details of the messages are unknown
+                self._conv_cache.invalidate(self.conv_uid)
 
     def load_from_storage(
         self, conv_storage: StorageInterface, message_storage: StorageInterface
@@ -1056,6 +1207,8 @@ class StorageConversation(OnceConversation, StorageItem):
             conv_storage (StorageInterface): The storage interface
             message_storage (StorageInterface): The storage interface
         """
+        if self._load_message and self._load_from_cache():
+            return
         # Load conversation first
         conversation: Optional[StorageConversation] = conv_storage.load(
             self._id, StorageConversation
@@ -1064,7 +1217,22 @@ class StorageConversation(OnceConversation, StorageItem):
             return
         message_ids = conversation._message_ids or []
 
-        if self._load_message:
+        unloaded_count = 0
+        message_details: List[Dict] = []
+        if not self._load_message:
+            messages = []
+        elif self._history_rounds is not None and conversation.save_message_independent:
+            # Load the latest rounds only
+            items, unloaded_count, latest = _load_rounds_before(
+                message_storage, message_ids, len(message_ids), self._history_rounds
+            )
+            messages = [item.to_message() for item in items]
+            message_details = [item.message_detail for item in items]
+            conversation.chat_order = (
+                max(m.round_index for m in latest) if latest else 0
+            )
+            self._append_additional_kwargs(conversation, latest)
+        else:
             # Load messages
             message_list = message_storage.load_list(
                 [
@@ -1074,21 +1242,117 @@ class StorageConversation(OnceConversation, StorageItem):
                 MessageStorageItem,
             )
             messages = [message.to_message() for message in message_list]
-        else:
-            messages = []
+            message_details = [message.message_detail for message in message_list]
         real_messages = messages or conversation.messages
         conversation.messages = real_messages
         # This index is used to save the message to the storage(Has not been saved)
-        # The new message append to the messages, so the index is len(messages)
-        conversation._message_index = len(real_messages)
-        conversation.chat_order = (
-            max(m.round_index for m in real_messages) if real_messages else 0
-        )
-        self._append_additional_kwargs(conversation, real_messages)
+        # The new message append to the messages, so the index is the number of the
+        # stored messages
+        conversation._message_index = len(real_messages) + unloaded_count
+        if not unloaded_count:
+            conversation.chat_order = (
+                max(m.round_index for m in real_messages) if real_messages else 0
+            )
+            self._append_additional_kwargs(conversation, real_messages)
         self._message_ids = message_ids
+        self._unloaded_message_count = unloaded_count
+        self._stored_message_id_count = len(message_ids)
         self._has_stored_message_index = len(real_messages) - 1
         self.save_message_independent = conversation.save_message_independent
         self.from_conversation(conversation)
+        if self._conv_cache is not None and len(message_details) == len(real_messages):
+            self._message_details = message_details
+            self._cache_state()
+
+    def load_earlier_rounds(self, rounds: int) -> List[BaseMessage]:
+        """Load the messages of the earlier rounds which are not loaded.
+
+        Args:
+            rounds (int): The number of the rounds to load.
+
+        Returns:
+            List[BaseMessage]: The loaded messages, they are inserted before the
+                messages of the conversation.
+        """
+        if not self._unloaded_message_count:
+            return []
+        items, unloaded_count, _ = _load_rounds_before(
+            self.message_storage,
+            self.message_ids,
+            self._unloaded_message_count,
+            rounds,
+        )
+        messages = [item.to_message() for item in items]
+        self.messages = messages + self.messages
+        self._unloaded_message_count = unloaded_count
+        self._has_stored_message_index += len(messages)
+        if self._conv_cache is not None:
+            self._message_details = [
+                item.message_detail for item in items
+            ] + self._message_details
+        return messages
+
+    def _cache_state(self) -> None:
+        if self._conv_cache is None:
+            return
+        self._conv_cache.put(
+            self.conv_uid,
+            _CachedConversation(
+                fields={
+                    "chat_mode": self.chat_mode,
+                    "user_name": self.user_name,
+                    "sys_code": self.sys_code,
+                    "summary": self.summary,
+                    "app_code": self.app_code,
+                    "start_date": self.start_date,
+                    "chat_order": self.chat_order,
+                    "model_name": self.model_name,
+                    "param_type": self.param_type,
+                    "param_value": self.param_value,
+                    "cost": self.cost,
+                    "tokens": self.tokens,
+                },
+                save_message_independent=self.save_message_independent,
+                message_ids=list(self.message_ids),
+                message_details=list(self._message_details),
+                unloaded_message_count=self._unloaded_message_count,
+            ),
+        )
+
+    def _load_from_cache(self) -> bool:
+        if self._conv_cache is None:
+            return False
+        entry = self._conv_cache.get(self.conv_uid)
+        if entry is None:
+            return False
+        details = entry.message_details
+        rounds = self._history_rounds
+        if entry.unloaded_message_count and (
+            rounds is None or _count_rounds(details) < rounds
+        ):
+            # The cached messages do not cover the requested rounds
+            return False
+        if rounds is not None:
+            details = _latest_round_details(details, rounds)
+        messages = _messages_from_dict(details)
+        unloaded_count = (
+            entry.unloaded_message_count + len(entry.message_details) - len(details)
+        )
+        conversation = OnceConversation(
+            messages=messages,
+            message_index=len(messages) + unloaded_count,
+            **entry.fields,
+        )
+        self._message_ids = list(entry.message_ids)
+        self._unloaded_message_count = unloaded_count
+        self._stored_message_id_count = len(entry.message_ids)
+        self._has_stored_message_index = len(messages) - 1
+        self._message_details = list(details)
+        self.save_message_independent = entry.save_message_independent
+        if self.summary is None:
+            self.summary = entry.fields["summary"]
+        self.from_conversation(conversation)
+        return True
 
     def _append_additional_kwargs(
         self, conversation: StorageConversation, messages: List[BaseMessage]
@@ -1114,11 +1378,11 @@ class StorageConversation(OnceConversation, StorageItem):
     def delete(self) -> None:
         """Delete all the messages and conversation."""
         # Delete messages first
-        message_list = self._get_message_items()
-        message_ids = [message.identifier for message in message_list]
-        self.message_storage.delete_list(message_ids)
+        self.message_storage.delete_list(self._all_message_identifiers())
         # Delete conversation
         self.conv_storage.delete(self.identifier)
+        if self._conv_cache is not None:
+            self._conv_cache.invalidate(self.conv_uid)
         # Overwrite the current conversation with empty conversation
         self.from_conversation(
             StorageConversation(
@@ -1128,15 +1392,20 @@ class StorageConversation(OnceConversation, StorageItem):
                 message_storage=self.message_storage,
             )
         )
+        self._message_ids = []
+        self._unloaded_message_count = 0
+        self._stored_message_id_count = 0
+        self._has_stored_message_index = -1
+        self._message_details = []
 
     def clear(self) -> None:
         """Clear all the messages and conversation."""
         # Clear messages first
-        message_list = self._get_message_items()
-        message_ids = [message.identifier for message in message_list]
-        self.message_storage.delete_list(message_ids)
+        self.message_storage.delete_list(self._all_message_identifiers())
         # Clear conversation
         self.conv_storage.delete(self.identifier)
+        if self._conv_cache is not None:
+            self._conv_cache.invalidate(self.conv_uid)
         # Overwrite the current conversation with empty conversation
         self.from_conversation(
             StorageConversation(
@@ -1146,6 +1415,74 @@ class StorageConversation(OnceConversation, StorageItem):
                 message_storage=self.message_storage,
             )
         )
+        self._message_ids = []
+        self._unloaded_message_count = 0
+        self._stored_message_id_count = 0
+        self._has_stored_message_index = -1
+        self._message_details = []
+
+
+def _count_rounds(message_details: List[Dict]) -> int:
+    return len({detail.get("round_index", 0) for detail in message_details})
+
+
+def _latest_round_details(message_details: List[Dict], rounds: int) -> List[Dict]:
+    """Return the message details of the latest rounds."""
+    if rounds <= 0:
+        return []
+    seen_rounds = set()
+    for i in range(len(message_details) - 1, -1, -1):
+        seen_rounds.add(message_details[i].get("round_index", 0))
+        if len(seen_rounds) > rounds:
+            return message_details[i + 1 :]
+    return message_details
+
+
+def _load_rounds_before(
+    message_storage: StorageInterface,
+    message_ids: List[str],
+    end: int,
+    rounds: int,
+) -> Tuple[List[MessageStorageItem], int, List[BaseMessage]]:
+    """Load the messages of the latest rounds before the ``end`` message.
+
+    The messages are loaded backwards in pages which double in size, until a
+    message of an earlier round is found.
+
+    Args:
+        message_storage (StorageInterface): The message storage.
+        message_ids (List[str]): The ids of all the messages of the conversation.
+        end (int): The index of the message id to stop at, exclusive.
+        rounds (int): The number of the rounds to load.
+
+    Returns:
+        Tuple[List[MessageStorageItem], int, List[BaseMessage]]: The message items
+            of the rounds, the number of the messages before them and the messages
+            of the last loaded page.
+    """
+    page_size = max(rounds * 4, 16)
+    start = end
+    items: List[MessageStorageItem] = []
+    latest: List[BaseMessage] = []
+    while start > 0:
+        page_start = max(0, start - page_size)
+        page = message_storage.load_list(
+            [
+                MessageIdentifier.from_str_identifier(message_id)
+                for message_id in message_ids[page_start:start]
+            ],
+            MessageStorageItem,
+        )
+        if not latest:
+            latest = [item.to_message() for item in page]
+        items = page + items
+        start = page_start
+        if _count_rounds([item.message_detail for item in items]) > rounds:
+            break
+        page_size *= 2
+    details = _latest_round_details([item.message_detail for item in items], rounds)
+    items = items[len(items) - len(details) :]
+    return items, end - len(items), latest
 
 
 def _conversation_to_dict(once: OnceConversation) -> Dict:
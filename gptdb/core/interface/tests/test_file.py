@@ -504,3 +504,194 @@ def test_simple_distributed_storage_delete_file_remote(
         f"http://{remote_node_address}/api/v2/serve/file/files/{bucket}/{file_id}",
         timeout=360,
     )
+
+
+class _CountingBytesIO(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.fixture
+def remote_node(tmpdir):
+    """A distributed storage node served by a stub file server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+
+    state = {"bytes_transferred": 0, "requests": 0}
+    prefix = "/api/v2/serve/file/files/"
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            bucket, file_id = self.path[len(prefix) :].split("/")
+            file_path = backend._get_file_path(bucket, file_id, backend.node_address)
+            with open(file_path, "rb") as f:
+                data = f.read()
+            state["requests"] += 1
+            state["bytes_transferred"] += len(data)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    node_address = f"127.0.0.1:{server.server_address[1]}"
+    backend = SimpleDistributedStorage(node_address, str(tmpdir.join("remote")))
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield backend, state
+    server.shutdown()
+    server.server_close()
+
+
+def test_save_file_hashes_in_single_pass(temp_storage_path):
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    storage_system = FileStorageSystem({"distributed": backend}, InMemoryStorage())
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    file_data = _CountingBytesIO(content)
+
+    uri = storage_system.save_file("test-bucket", "a.bin", file_data, "distributed")
+
+    assert file_data.bytes_read == len(content)
+    _, metadata = storage_system.get_file(uri)
+    assert metadata.file_size == len(content)
+    assert metadata.file_hash == hashlib.md5(content).hexdigest()
+
+
+def test_simple_distributed_storage_dedup(temp_storage_path):
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    storage_system = FileStorageSystem({"distributed": backend}, InMemoryStorage())
+    content = b"Same content uploaded twice"
+
+    uri1 = storage_system.save_file(
+        "bucket1", "a.txt", io.BytesIO(content), "distributed"
+    )
+    uri2 = storage_system.save_file(
+        "bucket2", "b.txt", io.BytesIO(content), "distributed"
+    )
+    blob_path = backend._get_blob_path(hashlib.md5(content).hexdigest())
+    blobs = [files for _, _, files in os.walk(backend._blob_path) if files]
+    assert len(blobs) == 1 and len(blobs[0]) == 1
+    assert os.stat(blob_path).st_nlink == 3
+
+    assert storage_system.delete_file(uri1)
+    assert storage_system.get_file(uri2)[0].read() == content
+    assert storage_system.delete_file(uri2)
+    assert not os.path.exists(blob_path)
+
+
+def test_save_file_without_hash_check(temp_storage_path):
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    storage_system = FileStorageSystem(
+        {"distributed": backend}, InMemoryStorage(), check_hash=False
+    )
+    content = b"Content without hash check"
+    file_data = io.BytesIO(content)
+
+    uri1 = storage_system.save_file("bucket1", "a.txt", file_data, "distributed")
+    # The file pointer of the caller is reset
+    assert file_data.tell() == 0
+    uri2 = storage_system.save_file("bucket2", "b.txt", file_data, "distributed")
+    file_data, metadata = storage_system.get_file(uri1)
+    assert metadata.file_hash == "-1"
+    assert file_data.read() == content
+
+    # The blob is found without the hash in the metadata
+    blob_path = backend._get_blob_path(hashlib.md5(content).hexdigest())
+    assert storage_system.delete_file(uri1)
+    assert os.path.exists(blob_path)
+    assert storage_system.delete_file(uri2)
+    assert not os.path.exists(blob_path)
+
+
+def test_simple_distributed_storage_without_hard_links(temp_storage_path):
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    storage_system = FileStorageSystem({"distributed": backend}, InMemoryStorage())
+    content = b"Content on a file system without hard links"
+
+    with mock.patch("os.link", side_effect=OSError("not supported")):
+        uris = [
+            storage_system.save_file(
+                "test-bucket", f"{i}.txt", io.BytesIO(content), "distributed"
+            )
+            for i in range(2)
+        ]
+    # The content is kept in the files only, no blob is left behind
+    assert not [files for _, _, files in os.walk(backend._blob_path) if files]
+    for uri in uris:
+        assert storage_system.get_file(uri)[0].read() == content
+        assert storage_system.delete_file(uri)
+
+
+def test_simple_distributed_storage_remote_cache(remote_node, temp_storage_path):
+    remote_backend, state = remote_node
+    remote_system = FileStorageSystem(
+        {"distributed": remote_backend}, InMemoryStorage()
+    )
+    content = os.urandom(256 * 1024)
+    uri = remote_system.save_file(
+        "test-bucket", "a.bin", io.BytesIO(content), "distributed"
+    )
+    metadata = remote_system.get_file(uri)[1]
+
+    local_backend = SimpleDistributedStorage(
+        "127.0.0.1:8000", os.path.join(temp_storage_path, "local")
+    )
+    for _ in range(3):
+        with local_backend.load(metadata) as file_data:
+            assert file_data.read() == content
+    assert state["requests"] == 1
+    assert state["bytes_transferred"] == len(content)
+
+    # The cache is persisted on the local disk
+    local_backend = SimpleDistributedStorage(
+        "127.0.0.1:8000", os.path.join(temp_storage_path, "local")
+    )
+    with local_backend.load(metadata) as file_data:
+        assert file_data.read() == content
+    assert state["bytes_transferred"] == len(content)
+
+
+def test_simple_distributed_storage_remote_cache_eviction(
+    remote_node, temp_storage_path
+):
+    remote_backend, state = remote_node
+    remote_system = FileStorageSystem(
+        {"distributed": remote_backend}, InMemoryStorage()
+    )
+    contents = [os.urandom(1024) for _ in range(3)]
+    metadata_list = [
+        remote_system.get_file(
+            remote_system.save_file(
+                "test-bucket", f"{i}.bin", io.BytesIO(content), "distributed"
+            )
+        )[1]
+        for i, content in enumerate(contents)
+    ]
+    local_backend = SimpleDistributedStorage(
+        "127.0.0.1:8000", temp_storage_path, cache_max_size=2048
+    )
+    for metadata in metadata_list:
+        local_backend.load(metadata).close()
+    assert state["requests"] == 3
+
+    # The least recently used file is evicted
+    local_backend.load(metadata_list[2]).close()
+    assert state["requests"] == 3
+    assert local_backend.load(metadata_list[0]).read() == contents[0]
+    assert state["requests"] == 4
+
+    # A corrupted download is not cached
+    bad_metadata = FileMetadata(
+        **{**metadata_list[1].to_dict(), "file_hash": hashlib.md5(b"x").hexdigest()}
+    )
+    assert local_backend.load(bad_metadata).read() == contents[1]
+    assert local_backend._cache.get(bad_metadata.file_hash) is None
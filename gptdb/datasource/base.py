@@ -1,6 +1,87 @@
 """Base class for all connectors."""
+import dataclasses
 from abc import ABC, abstractmethod
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_RESULT_ROWS = 10000
+DEFAULT_MAX_RESULT_BYTES = 16 * 1024 * 1024
+DEFAULT_FETCH_BATCH_SIZE = 1000
+
+
+def _estimate_row_size(row: Sequence[Any]) -> int:
+    size = 0
+    for value in row:
+        if value is None:
+            size += 4
+        elif isinstance(value, (str, bytes)):
+            size += len(value) + 2
+        else:
+            size += len(str(value))
+    return size
+
+
+@dataclasses.dataclass
+class QueryResult:
+    """The result of a query, capped by rows and bytes.
+
+    Attributes:
+        columns (List[str]): The column names
+        rows (List[Sequence[Any]]): The rows
+        truncated (bool): Whether the result is truncated by the caps
+        size (int): The estimated serialized size of the rows in bytes
+    """
+
+    columns: List[str]
+    rows: List[Sequence[Any]] = dataclasses.field(default_factory=list)
+    truncated: bool = False
+    size: int = 0
+
+    @classmethod
+    def from_batches(
+        cls,
+        columns: Sequence[str],
+        batches: Iterable[Sequence[Sequence[Any]]],
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+    ) -> "QueryResult":
+        """Collect the batches of rows until a cap is reached.
+
+        The batches are not consumed after a cap is reached and are closed if they are
+        a generator.
+        """
+        result = cls(columns=[str(column) for column in columns])
+        column_size = sum(len(column) + 4 for column in result.columns)
+        try:
+            for batch in batches:
+                for row in batch:
+                    if max_rows is not None and len(result.rows) >= max_rows:
+                        result.truncated = True
+                        break
+                    row_size = column_size + _estimate_row_size(row)
+                    if max_bytes is not None and result.size + row_size > max_bytes:
+                        result.truncated = True
+                        break
+                    result.rows.append(tuple(row))
+                    result.size += row_size
+                if result.truncated:
+                    break
+        finally:
+            close = getattr(batches, "close", None)
+            if close:
+                close()
+        return result
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Return the rows as JSON serializable records."""
+        from gptdb.util.json_utils import rows_to_json_records
+
+        return rows_to_json_records(self.columns, self.rows)
+
+    def to_df(self):
+        """Return the rows as a DataFrame."""
+        import pandas as pd
+
+        return pd.DataFrame(self.rows, columns=self.columns)
 
 
 class BaseConnector(ABC):
@@ -132,6 +213,35 @@ class BaseConnector(ABC):
         """
         raise NotImplementedError("Current connector does not support run_to_df")
 
+    def run_to_result(
+        self,
+        command: str,
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    ) -> QueryResult:
+        """Execute sql command and return the result capped by rows and bytes.
+
+        Connectors which can stream the result should override it to stop fetching
+        rows once a cap is reached.
+
+        Args:
+            command (str): sql command
+            max_rows (Optional[int]): The max number of rows, None for no limit
+            max_bytes (Optional[int]): The max estimated size of the rows in bytes,
+                None for no limit
+            batch_size (int): The number of rows fetched at a time
+
+        Returns:
+            QueryResult: The query result
+        """
+        result_lst = self.run(command)
+        if not result_lst:
+            return QueryResult(columns=[])
+        return QueryResult.from_batches(
+            result_lst[0], [result_lst[1:]], max_rows, max_bytes
+        )
+
     def get_users(self) -> List[Tuple[str, str]]:
         """Return user information.
 
@@ -212,6 +322,38 @@ class BaseConnector(ABC):
         """
         raise NotImplementedError("Current connector does not support get_indexes")
 
+    def get_table_schemas(
+        self, table_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return the columns, indexes and comment of the tables.
+
+        The default implementation queries table by table, connectors which can
+        read the schema of many tables in a few queries should override it.
+
+        Args:
+            table_names (Optional[List[str]]): table names, all tables if None
+
+        Returns:
+            Dict[str, Dict[str, Any]]: table name to its schema, the schema
+                contains columns: List[Dict], indexes: List[Dict] and comment: Dict
+        """
+        if table_names is None:
+            table_names = list(self.get_table_names())
+        return {
+            table_name: {
+                "columns": self.get_columns(table_name),
+                "indexes": self.get_indexes(table_name),
+                "comment": self._get_table_comment_or_empty(table_name),
+            }
+            for table_name in table_names
+        }
+
+    def _get_table_comment_or_empty(self, table_name: str) -> Dict:
+        try:
+            return self.get_table_comment(table_name)
+        except Exception:
+            return {"text": None}
+
     @classmethod
     def is_normal_type(cls) -> bool:
         """Return whether the connector is a normal type."""
@@ -1,6 +1,10 @@
 """Connection manager."""
+import hashlib
 import logging
-from typing import TYPE_CHECKING, List, Optional, Type
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 
 from gptdb.component import BaseComponent, ComponentType, SystemApp
 from gptdb.storage.schema import DBType
@@ -16,17 +20,99 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_CONFIG_VERSION_KEYS = (
+    "id",
+    "db_name",
+    "db_type",
+    "db_path",
+    "db_host",
+    "db_port",
+    "db_user",
+    "db_pwd",
+)
+
+
+@dataclass
+class _CachedConnector:
+    """A connector cached by the connector manager."""
+
+    connector: BaseConnector
+    version: str
+    last_used: float
+
+
+def _config_version(db_config: Dict[str, Any]) -> str:
+    """Return the version of the datasource config.
+
+    The version changes when any field which is used to build the connector is
+    changed, so the cached connector of the old config will not be reused.
+    """
+    values = "\x00".join(str(db_config.get(key)) for key in _CONFIG_VERSION_KEYS)
+    return hashlib.md5(values.encode("utf-8")).hexdigest()
+
+
+def _close_connector(connector: BaseConnector) -> None:
+    """Close the connector and release its connection pool."""
+    from sqlalchemy.engine import Engine
+
+    try:
+        close = getattr(connector, "close", None)
+        if callable(close):
+            close()
+            return
+        engine = getattr(connector, "_engine", None)
+        if isinstance(engine, Engine):
+            engine.dispose()
+    except Exception as e:
+        logger.warning(f"Close connector {connector} error: {str(e)}")
+
 
 class ConnectorManager(BaseComponent):
-    """Connector manager."""
+    """Connector manager.
+
+    The connectors are cached by the datasource name and reused across requests,
+    so the connection pool and the reflected table metadata of the same datasource
+    are shared. A cached connector is rebuilt when its config is changed, and
+    disposed when it is idle longer than ``idle_timeout`` seconds.
+    """
 
     name = ComponentType.CONNECTOR_MANAGER
 
-    def __init__(self, system_app: SystemApp):
-        """Create a new ConnectorManager."""
+    def __init__(
+        self,
+        system_app: SystemApp,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_recycle: int = 3600,
+        pool_timeout: int = 30,
+        idle_timeout: int = 1800,
+        enable_cache: bool = True,
+    ):
+        """Create a new ConnectorManager.
+
+        Args:
+            system_app (SystemApp): The system app.
+            pool_size (int): The size of the connection pool of each datasource.
+            max_overflow (int): The max overflow of the connection pool.
+            pool_recycle (int): Recycle the connections after this many seconds.
+            pool_timeout (int): Seconds to wait before giving up on getting a
+                connection from the pool.
+            idle_timeout (int): Seconds, dispose the cached connector which is not
+                used longer than it.
+            enable_cache (bool): Whether to cache the connectors.
+        """
         self.storage = ConnectConfigDao()
         self.system_app = system_app
         self._db_summary_client: Optional["DBSummaryClient"] = None
+        self._pool_size = pool_size
+        self._max_overflow = max_overflow
+        self._pool_recycle = pool_recycle
+        self._pool_timeout = pool_timeout
+        self._idle_timeout = idle_timeout
+        self._enable_cache = enable_cache
+        self._connectors: Dict[str, _CachedConnector] = {}
+        self._connectors_lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
@@ -109,26 +195,136 @@ class ConnectorManager(BaseComponent):
         return result
 
     def get_connector(self, db_name: str):
-        """Create a new connection instance.
+        """Get the connector of the datasource.
+
+        The connector is reused if its config is not changed.
 
         Args:
             db_name (str): database name
         """
         db_config = self.storage.get_db_config(db_name)
+        if not self._enable_cache:
+            return self._create_connector(db_name, db_config)
+
+        version = _config_version(db_config)
+        self._evict_idle_connectors()
+        cached = self._get_cached_connector(db_name, version)
+        if cached:
+            return cached
+        with self._get_build_lock(db_name):
+            # Another thread may have built it while we were waiting for the lock
+            cached = self._get_cached_connector(db_name, version)
+            if cached:
+                return cached
+            connector = self._create_connector(db_name, db_config)
+            with self._connectors_lock:
+                old = self._connectors.pop(db_name, None)
+                self._connectors[db_name] = _CachedConnector(
+                    connector, version, time.monotonic()
+                )
+        if old:
+            logger.info(f"Datasource {db_name} config changed, close the old connector")
+            _close_connector(old.connector)
+        return connector
+
+    def invalidate(self, db_name: str) -> None:
+        """Remove the cached connector of the datasource and close it.
+
+        Args:
+            db_name (str): database name
+        """
+        with self._connectors_lock:
+            cached = self._connectors.pop(db_name, None)
+        if cached:
+            _close_connector(cached.connector)
+
+    def close(self) -> None:
+        """Close all the cached connectors."""
+        with self._connectors_lock:
+            cached_list = list(self._connectors.values())
+            self._connectors.clear()
+        for cached in cached_list:
+            _close_connector(cached.connector)
+
+    def before_stop(self):
+        """Execute before stop."""
+        self.close()
+
+    def _get_cached_connector(
+        self, db_name: str, version: str
+    ) -> Optional[BaseConnector]:
+        with self._connectors_lock:
+            cached = self._connectors.get(db_name)
+            if cached and cached.version == version:
+                cached.last_used = time.monotonic()
+                return cached.connector
+        return None
+
+    def _get_build_lock(self, db_name: str) -> threading.Lock:
+        with self._connectors_lock:
+            lock = self._build_locks.get(db_name)
+            if lock is None:
+                lock = threading.Lock()
+                self._build_locks[db_name] = lock
+            return lock
+
+    def _evict_idle_connectors(self) -> None:
+        """Close the connectors which are idle longer than the idle timeout."""
+        if self._idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        with self._connectors_lock:
+            expired = [
+                name
+                for name, cached in self._connectors.items()
+                if now - cached.last_used > self._idle_timeout
+            ]
+            expired_connectors = [self._connectors.pop(name) for name in expired]
+        for name, cached in zip(expired, expired_connectors):
+            logger.info(f"Datasource {name} connector is idle, close it")
+            _close_connector(cached.connector)
+
+    def _engine_args(self, connect_cls: Type[BaseConnector], is_file_db: bool):
+        """Return the engine arguments of the connector class."""
+        from gptdb.datasource.rdbms.base import RDBMSConnector
+
+        if not issubclass(connect_cls, RDBMSConnector):
+            return None
+        if is_file_db:
+            return {"pool_pre_ping": True}
+        return {
+            "pool_size": self._pool_size,
+            "max_overflow": self._max_overflow,
+            "pool_recycle": self._pool_recycle,
+            "pool_timeout": self._pool_timeout,
+            "pool_pre_ping": True,
+        }
+
+    def _create_connector(
+        self, db_name: str, db_config: Dict[str, Any]
+    ) -> BaseConnector:
+        """Create a new connector instance."""
         db_type = DBType.of_db_type(db_config.get("db_type"))
         if not db_type:
             raise ValueError("Unsupported Db Type！" + db_config.get("db_type"))
         connect_instance = self.get_cls_by_dbtype(db_type.value())
+        engine_args = self._engine_args(connect_instance, db_type.is_file_db())
+        kwargs = {"engine_args": engine_args} if engine_args else {}
         if db_type.is_file_db():
             db_path = db_config.get("db_path")
-            return connect_instance.from_file_path(db_path)  # type: ignore
+            return connect_instance.from_file_path(db_path, **kwargs)  # type: ignore
         else:
             db_host = db_config.get("db_host")
             db_port = db_config.get("db_port")
             db_user = db_config.get("db_user")
             db_pwd = db_config.get("db_pwd")
             return connect_instance.from_uri_db(  # type: ignore
-                host=db_host, port=db_port, user=db_user, pwd=db_pwd, db_name=db_name
+                host=db_host,
+                port=db_port,
+                user=db_user,
+                pwd=db_pwd,
+                db_name=db_name,
+                **kwargs,
             )
 
     def test_connect(self, db_info: DBConfig) -> BaseConnector:
@@ -174,10 +370,12 @@ class ConnectorManager(BaseComponent):
 
     def delete_db(self, db_name: str):
         """Delete db connect info."""
+        self.invalidate(db_name)
         return self.storage.delete_db(db_name)
 
     def edit_db(self, db_info: DBConfig):
         """Edit db connect info."""
+        self.invalidate(db_info.db_name)
         return self.storage.update_db_info(
             db_info.db_name,
             db_info.db_type,
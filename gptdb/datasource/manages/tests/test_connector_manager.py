@@ -0,0 +1,134 @@
+"""
+Run unit test with command: pytest gptdb/datasource/manages/tests/test_connector_manager.py
+"""
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from gptdb.component import SystemApp
+from gptdb.datasource.db_conn_info import DBConfig
+from gptdb.datasource.manages.connector_manager import ConnectorManager
+from gptdb.datasource.rdbms.conn_sqlite import SQLiteConnector
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, "test.db")
+
+
+@pytest.fixture
+def db_config(db_path):
+    return {
+        "id": 1,
+        "db_name": "test_db",
+        "db_type": "sqlite",
+        "db_path": db_path,
+        "db_host": "",
+        "db_port": 0,
+        "db_user": "",
+        "db_pwd": "",
+        "comment": "",
+    }
+
+
+@pytest.fixture
+def manager(db_config):
+    manager = ConnectorManager(SystemApp(), idle_timeout=1800)
+    manager.storage = MagicMock()
+    manager.storage.get_db_config.side_effect = lambda db_name: dict(db_config)
+    yield manager
+    manager.close()
+
+
+def test_reuse_connector(manager):
+    conn1 = manager.get_connector("test_db")
+    conn2 = manager.get_connector("test_db")
+    assert isinstance(conn1, SQLiteConnector)
+    assert conn1 is conn2
+    assert conn1._engine.pool._pre_ping
+
+
+def test_config_changed(manager, db_config, db_path):
+    conn1 = manager.get_connector("test_db")
+    db_config["db_path"] = db_path + ".new"
+    conn2 = manager.get_connector("test_db")
+    assert conn1 is not conn2
+    assert manager.get_connector("test_db") is conn2
+
+
+def test_edit_db_invalidate(manager):
+    conn1 = manager.get_connector("test_db")
+    manager.edit_db(DBConfig(db_name="test_db", db_type="sqlite"))
+    manager.storage.update_db_info.assert_called_once()
+    assert manager.get_connector("test_db") is not conn1
+
+
+def test_disable_cache(db_config):
+    manager = ConnectorManager(SystemApp(), enable_cache=False)
+    manager.storage = MagicMock()
+    manager.storage.get_db_config.return_value = db_config
+    assert manager.get_connector("test_db") is not manager.get_connector("test_db")
+
+
+def test_idle_eviction(manager, mocker):
+    conn1 = manager.get_connector("test_db")
+    manager._idle_timeout = 10
+    monotonic = mocker.patch(
+        "gptdb.datasource.manages.connector_manager.time.monotonic"
+    )
+    monotonic.return_value = manager._connectors["test_db"].last_used + 11
+    dispose = mocker.spy(conn1._engine, "dispose")
+    conn2 = manager.get_connector("test_db")
+    assert conn1 is not conn2
+    dispose.assert_called_once()
+
+
+def test_concurrent_checkout(manager, mocker):
+    create = mocker.spy(manager, "_create_connector")
+    # More threads than the pool size plus the max overflow (5 + 10), every thread
+    # must return its connection to the pool after its query
+    threads = 20
+    barrier = threading.Barrier(threads)
+
+    def _checkout(i):
+        barrier.wait()
+        conn = manager.get_connector("test_db")
+        return conn, conn.run(f"SELECT {i}")[1][0]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(_checkout, range(threads)))
+        # The sessions of the idle threads do not hold connections
+        assert results[0][0]._engine.pool.checkedout() == 0
+        results += list(executor.map(_checkout, range(threads)))
+
+    assert create.call_count == 1
+    assert len({id(conn) for conn, _ in results}) == 1
+    assert [value for _, value in results] == list(range(threads)) * 2
+
+
+def test_query_sees_committed_writes(manager):
+    conn = manager.get_connector("test_db")
+    conn.run("CREATE TABLE user (id INTEGER, name TEXT);")
+    assert conn.query_ex("SELECT COUNT(*) FROM user")[1] == [(0,)]
+    other = SQLiteConnector.from_file_path(conn._engine.url.database)
+    other.run("INSERT INTO user (id, name) VALUES (1, 'a');")
+    # No stale transaction is left open in the session of this thread
+    assert conn.query_ex("SELECT COUNT(*) FROM user")[1] == [(1,)]
+    assert conn._engine.pool.checkedout() == 0
+
+
+def test_lazy_reflect_tables(manager):
+    conn = manager.get_connector("test_db")
+    conn.run("CREATE TABLE user (id INTEGER, name TEXT);")
+    conn.run("CREATE TABLE item (id INTEGER);")
+    conn._sync_tables_from_db()
+    assert not conn._metadata.tables
+
+    table_info = conn.get_table_info(["user"])
+    assert "CREATE TABLE user" in table_info
+    assert set(conn._metadata.tables.keys()) == {"user"}
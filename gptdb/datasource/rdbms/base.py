@@ -4,7 +4,20 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+)
 from urllib.parse import quote
 from urllib.parse import quote_plus as urlquote
 
@@ -12,11 +25,18 @@ import sqlalchemy
 import sqlparse
 from sqlalchemy import MetaData, Table, create_engine, inspect, select, text
 from sqlalchemy.engine import CursorResult
+from sqlalchemy.engine.reflection import ObjectKind
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 from sqlalchemy.schema import CreateTable
 
-from gptdb.datasource.base import BaseConnector
+from gptdb.datasource.base import (
+    DEFAULT_FETCH_BATCH_SIZE,
+    DEFAULT_MAX_RESULT_BYTES,
+    DEFAULT_MAX_RESULT_ROWS,
+    BaseConnector,
+    QueryResult,
+)
 from gptdb.storage.schema import DBType
 
 logger = logging.getLogger(__name__)
@@ -69,7 +89,6 @@ class RDBMSConnector(BaseConnector):
         session_factory = sessionmaker(bind=engine)
         Session_Manages = scoped_session(session_factory)
         self._db_sessions = Session_Manages
-        self.session = self.get_session()
 
         self.view_support = view_support
         self._usable_tables: Set[str] = set()
@@ -79,8 +98,9 @@ class RDBMSConnector(BaseConnector):
         self._sample_rows_in_table_info = sample_rows_in_table_info
         self._indexes_in_table_info = indexes_in_table_info
 
+        # The tables are reflected lazily when their information is needed
         self._metadata = metadata or MetaData()
-        self._metadata.reflect(bind=self._engine)
+        self._reflect_lock = threading.Lock()
 
         self._all_tables: Set[str] = cast(Set[str], self._sync_tables_from_db())
 
@@ -159,13 +179,45 @@ class RDBMSConnector(BaseConnector):
 
         return session
 
+    @property
+    def session(self):
+        """Return the session of the current thread.
+
+        The connector can be shared by threads, each thread has its own session.
+        """
+        return self._db_sessions()
+
+    @contextmanager
+    def _session_scope(self) -> Iterator[Session]:
+        """Return the session of the current thread and remove it after use.
+
+        Removing the session returns its connection to the pool, so the idle threads
+        of a shared connector do not hold connections, and the next query of the
+        thread starts a new transaction instead of reading a stale snapshot.
+        """
+        try:
+            yield self._db_sessions()
+        finally:
+            self._db_sessions.remove()
+
+    def _reflect_tables(self, table_names: Iterable[str]) -> None:
+        """Reflect the tables which are not reflected yet."""
+        with self._reflect_lock:
+            missing_tables = set(table_names) - set(self._metadata.tables.keys())
+            if missing_tables:
+                self._metadata.reflect(
+                    bind=self._engine,
+                    only=lambda table_name, _: table_name in missing_tables,
+                )
+
     def get_current_db_name(self) -> str:
         """Get current database name.
 
         Returns:
             str: database name
         """
-        return self.session.execute(text("SELECT DATABASE()")).scalar()
+        with self._session_scope() as session:
+            return session.execute(text("SELECT DATABASE()")).scalar()
 
     def table_simple_info(self):
         """Return table simple info."""
@@ -174,8 +226,9 @@ class RDBMSConnector(BaseConnector):
                 as schema_info from information_schema.COLUMNS where
                 table_schema="{self.get_current_db_name()}" group by TABLE_NAME;
             """
-        cursor = self.session.execute(text(_sql))
-        results = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text(_sql))
+            results = cursor.fetchall()
         return results
 
     @property
@@ -200,6 +253,7 @@ class RDBMSConnector(BaseConnector):
                 raise ValueError(f"table_names {missing_tables} not found in database")
             all_table_names = table_names
 
+        self._reflect_tables(all_table_names)
         meta_tables = [
             tbl
             for tbl in self._metadata.sorted_tables
@@ -296,11 +350,12 @@ class RDBMSConnector(BaseConnector):
         """
         logger.info(f"Write[{write_sql}]")
         db_cache = self._engine.url.database
-        result = self.session.execute(text(write_sql))
-        self.session.commit()
-        # TODO  Subsequent optimization of dynamically specified database submission
-        #  loss target problem
-        self.session.execute(text(f"use `{db_cache}`"))
+        with self._session_scope() as session:
+            result = session.execute(text(write_sql))
+            session.commit()
+            # TODO  Subsequent optimization of dynamically specified database
+            #  submission loss target problem
+            session.execute(text(f"use `{db_cache}`"))
         logger.info(f"SQL[{write_sql}], result:{result.rowcount}")
         return result.rowcount
 
@@ -316,18 +371,19 @@ class RDBMSConnector(BaseConnector):
         logger.info(f"Query[{query}]")
         if not query:
             return result
-        cursor = self.session.execute(text(query))
-        if cursor.returns_rows:
-            if fetch == "all":
-                result = cursor.fetchall()
-            elif fetch == "one":
-                result = [cursor.fetchone()]
-            else:
-                raise ValueError("Fetch parameter must be either 'one' or 'all'")
-            field_names = tuple(i[0:] for i in cursor.keys())
+        with self._session_scope() as session:
+            cursor = session.execute(text(query))
+            if cursor.returns_rows:
+                if fetch == "all":
+                    result = cursor.fetchall()
+                elif fetch == "one":
+                    result = [cursor.fetchone()]
+                else:
+                    raise ValueError("Fetch parameter must be either 'one' or 'all'")
+                field_names = tuple(i[0:] for i in cursor.keys())
 
-            result.insert(0, field_names)
-            return result
+                result.insert(0, field_names)
+                return result
 
     def query_table_schema(self, table_name: str):
         """Query table schema.
@@ -353,18 +409,19 @@ class RDBMSConnector(BaseConnector):
         logger.info(f"Query[{query}]")
         if not query:
             return [], None
-        cursor = self.session.execute(text(query))
-        if cursor.returns_rows:
-            if fetch == "all":
-                result = cursor.fetchall()
-            elif fetch == "one":
-                result = cursor.fetchone()  # type: ignore
-            else:
-                raise ValueError("Fetch parameter must be either 'one' or 'all'")
-            field_names = list(cursor.keys())
+        with self._session_scope() as session:
+            cursor = session.execute(text(query))
+            if cursor.returns_rows:
+                if fetch == "all":
+                    result = cursor.fetchall()
+                elif fetch == "one":
+                    result = cursor.fetchone()  # type: ignore
+                else:
+                    raise ValueError("Fetch parameter must be either 'one' or 'all'")
+                field_names = list(cursor.keys())
 
-            result = list(result)
-            return field_names, result
+                result = list(result)
+                return field_names, result
         return [], None
 
     def run(self, command: str, fetch: str = "all") -> List:
@@ -386,20 +443,20 @@ class RDBMSConnector(BaseConnector):
             logger.info(
                 "DDL execution determines whether to enable through configuration "
             )
-            cursor = self.session.execute(text(command))
-            self.session.commit()
-            if cursor.returns_rows:
-                result = cursor.fetchall()
-                field_names = tuple(i[0:] for i in cursor.keys())
-                result = list(result)
-                result.insert(0, field_names)
-                logger.info("DDL Result:" + str(result))
-                if not result:
-                    # return self._query(f"SHOW COLUMNS FROM {table_name}")
-                    return self.get_simple_fields(table_name)
-                return result
-            else:
+            with self._session_scope() as session:
+                cursor = session.execute(text(command))
+                session.commit()
+                result = None
+                if cursor.returns_rows:
+                    result = cursor.fetchall()
+                    field_names = tuple(i[0:] for i in cursor.keys())
+                    result = list(result)
+                    result.insert(0, field_names)
+                    logger.info("DDL Result:" + str(result))
+            if not result:
+                # return self._query(f"SHOW COLUMNS FROM {table_name}")
                 return self.get_simple_fields(table_name)
+            return result
 
     def run_to_df(self, command: str, fetch: str = "all"):
         """Execute sql command and return result as dataframe."""
@@ -412,6 +469,71 @@ class RDBMSConnector(BaseConnector):
         values = result_lst[1:]
         return pd.DataFrame(values, columns=colunms)
 
+    def run_to_result(
+        self,
+        command: str,
+        max_rows: Optional[int] = DEFAULT_MAX_RESULT_ROWS,
+        max_bytes: Optional[int] = DEFAULT_MAX_RESULT_BYTES,
+        batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+    ) -> QueryResult:
+        """Execute sql command and return the result capped by rows and bytes.
+
+        The rows of a query are fetched in batches from a server-side cursor, and no
+        more rows are fetched once a cap is reached.
+        """
+        if not command:
+            return QueryResult(columns=[])
+        _, ttype, sql_type, _ = self.__sql_parse(command)
+        if ttype != sqlparse.tokens.DML or sql_type != "SELECT":
+            return super().run_to_result(command, max_rows, max_bytes, batch_size)
+        logger.info(f"Query[{command}]")
+        columns, batches = self._query_batches(command, batch_size)
+        result = QueryResult.from_batches(columns, batches, max_rows, max_bytes)
+        if result.truncated:
+            logger.info(
+                f"Query result truncated to {len(result.rows)} rows, "
+                f"{result.size} bytes"
+            )
+        return result
+
+    def _query_batches(
+        self, query: str, batch_size: int = DEFAULT_FETCH_BATCH_SIZE
+    ) -> Tuple[List[str], Iterator[List[Any]]]:
+        """Run a SQL query and return the column names and the batches of rows.
+
+        Args:
+            query (str): SQL query to run
+            batch_size (int): The number of rows fetched at a time
+        """
+        # The batches may be consumed by another thread, use a session of its own
+        # instead of the session of the current thread, it is closed with the cursor
+        session = self._db_sessions.session_factory()
+        try:
+            cursor = session.execute(
+                text(query),
+                execution_options={
+                    "stream_results": True,
+                    "max_row_buffer": batch_size,
+                },
+            )
+        except Exception:
+            session.close()
+            raise
+        if not cursor.returns_rows:
+            cursor.close()
+            session.close()
+            return [], iter([])
+
+        def _batches() -> Iterator[List[Any]]:
+            try:
+                while batch := cursor.fetchmany(batch_size):
+                    yield batch
+            finally:
+                cursor.close()
+                session.close()
+
+        return list(cursor.keys()), _batches()
+
     def run_no_throw(self, command: str, fetch: str = "all") -> List:
         """Execute a SQL command and return a string representing the results.
 
@@ -525,16 +647,83 @@ class RDBMSConnector(BaseConnector):
         """
         return self._inspector.get_indexes(table_name)
 
+    def get_table_schemas(
+        self, table_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return the columns, indexes and comment of the tables in bulk.
+
+        The tables are read again from the database instead of the cache, so the
+        result reflects the latest schema.
+
+        Args:
+            table_names (Optional[List[str]]): table names, all tables if None
+
+        Returns:
+            Dict[str, Dict[str, Any]]: table name to its schema, the schema
+                contains columns: List[Dict], indexes: List[Dict] and comment: Dict
+        """
+        self._inspector.clear_cache()
+        if table_names is None:
+            self._sync_tables_from_db()
+            table_names = list(self.get_table_names())
+        if not table_names:
+            return {}
+        return self._get_table_schemas(list(table_names))
+
+    def _get_table_schemas(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read the table schemas with the bulk methods of the inspector.
+
+        The dialects which support it read all tables in one query, the others
+        fall back to per-table reflection inside SQLAlchemy. The methods which are
+        overridden by the subclass are still called table by table.
+        """
+        columns = self._multi_reflect(
+            table_names, "get_columns", "get_multi_columns", self.get_columns
+        )
+        indexes = self._multi_reflect(
+            table_names, "get_indexes", "get_multi_indexes", self.get_indexes
+        )
+        comments = self._multi_reflect(
+            table_names,
+            "get_table_comment",
+            "get_multi_table_comment",
+            self._get_table_comment_or_empty,
+        )
+        return {
+            name: {
+                "columns": columns.get(name, []),
+                "indexes": indexes.get(name, []),
+                "comment": comments.get(name) or {"text": None},
+            }
+            for name in table_names
+        }
+
+    def _multi_reflect(
+        self,
+        table_names: List[str],
+        method_name: str,
+        multi_method_name: str,
+        per_table_method: Callable[[str], Any],
+    ) -> Dict[str, Any]:
+        if getattr(type(self), method_name) is not getattr(RDBMSConnector, method_name):
+            return {name: per_table_method(name) for name in table_names}
+        try:
+            values = getattr(self._inspector, multi_method_name)(
+                filter_names=table_names, kind=ObjectKind.ANY
+            )
+        except NotImplementedError:
+            return {name: per_table_method(name) for name in table_names}
+        return {name: value for (_, name), value in values.items()}
+
     def get_show_create_table(self, table_name):
         """Get table show create table about specified table."""
-        session = self._db_sessions()
-        cursor = session.execute(text(f"SHOW CREATE TABLE  {table_name}"))
-        ans = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text(f"SHOW CREATE TABLE  {table_name}"))
+            ans = cursor.fetchall()
         return ans[0][1]
 
     def get_fields(self, table_name, db_name=None) -> List[Tuple]:
         """Get column fields about specified table."""
-        session = self._db_sessions()
         query = (
             "SELECT COLUMN_NAME, COLUMN_TYPE, COLUMN_DEFAULT, IS_NULLABLE, "
             "COLUMN_COMMENT  from information_schema.COLUMNS where "
@@ -542,8 +731,9 @@ class RDBMSConnector(BaseConnector):
         )
         if db_name is not None:
             query += f" AND table_schema='{db_name}'"
-        cursor = session.execute(text(query))
-        fields = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text(query))
+            fields = cursor.fetchall()
         return [(field[0], field[1], field[2], field[3], field[4]) for field in fields]
 
     def get_simple_fields(self, table_name):
@@ -552,45 +742,47 @@ class RDBMSConnector(BaseConnector):
 
     def get_charset(self) -> str:
         """Get character_set."""
-        session = self._db_sessions()
-        cursor = session.execute(text("SELECT @@character_set_database"))
-        character_set = cursor.fetchone()[0]  # type: ignore
+        with self._session_scope() as session:
+            cursor = session.execute(text("SELECT @@character_set_database"))
+            character_set = cursor.fetchone()[0]  # type: ignore
         return character_set
 
     def get_collation(self):
         """Get collation."""
-        session = self._db_sessions()
-        cursor = session.execute(text("SELECT @@collation_database"))
-        collation = cursor.fetchone()[0]
+        with self._session_scope() as session:
+            cursor = session.execute(text("SELECT @@collation_database"))
+            collation = cursor.fetchone()[0]
         return collation
 
     def get_grants(self):
         """Get grant info."""
-        session = self._db_sessions()
-        cursor = session.execute(text("SHOW GRANTS"))
-        grants = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text("SHOW GRANTS"))
+            grants = cursor.fetchall()
         return grants
 
     def get_users(self):
         """Get user info."""
         try:
-            cursor = self.session.execute(text("SELECT user, host FROM mysql.user"))
-            users = cursor.fetchall()
+            with self._session_scope() as session:
+                cursor = session.execute(text("SELECT user, host FROM mysql.user"))
+                users = cursor.fetchall()
             return [(user[0], user[1]) for user in users]
         except Exception:
             return []
 
     def get_table_comments(self, db_name: str):
         """Return table comments."""
-        cursor = self.session.execute(
-            text(
-                f"""SELECT table_name, table_comment    FROM information_schema.tables
-                    WHERE table_schema = '{db_name}'""".format(
-                    db_name
+        with self._session_scope() as session:
+            cursor = session.execute(
+                text(
+                    f"""SELECT table_name, table_comment    FROM information_schema.tables
+                        WHERE table_schema = '{db_name}'""".format(
+                        db_name
+                    )
                 )
             )
-        )
-        table_comments = cursor.fetchall()
+            table_comments = cursor.fetchall()
         return [
             (table_comment[0], table_comment[1]) for table_comment in table_comments
         ]
@@ -607,16 +799,17 @@ class RDBMSConnector(BaseConnector):
 
     def get_column_comments(self, db_name: str, table_name: str):
         """Return column comments."""
-        cursor = self.session.execute(
-            text(
-                f"""SELECT column_name, column_comment FROM information_schema.columns
-                    WHERE table_schema = '{db_name}' and table_name = '{table_name}'
-                """.format(
-                    db_name, table_name
+        with self._session_scope() as session:
+            cursor = session.execute(
+                text(
+                    f"""SELECT column_name, column_comment FROM information_schema.columns
+                        WHERE table_schema = '{db_name}' and table_name = '{table_name}'
+                    """.format(
+                        db_name, table_name
+                    )
                 )
             )
-        )
-        column_comments = cursor.fetchall()
+            column_comments = cursor.fetchall()
         return [
             (column_comment[0], column_comment[1]) for column_comment in column_comments
         ]
@@ -627,9 +820,9 @@ class RDBMSConnector(BaseConnector):
         Returns:
             List[str]: database list
         """
-        session = self._db_sessions()
-        cursor = session.execute(text(" show databases;"))
-        results = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text(" show databases;"))
+            results = cursor.fetchall()
         return [
             d[0]
             for d in results
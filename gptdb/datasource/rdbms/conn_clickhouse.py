@@ -319,6 +319,13 @@ class ClickhouseConnector(RDBMSConnector):
         result = self.client.command(write_sql)
         logger.info(f"SQL[{write_sql}], result:{result.written_rows}")
 
+    def _query_batches(self, query: str, batch_size: int = 1000):
+        """Query data from clickhouse in batches."""
+        result = self._query(query)
+        if not result:
+            return [], iter([])
+        return list(result[0]), iter([result[1:]])
+
     def _query(self, query: str, fetch: str = "all"):
         """Query data from clickhouse.
 
@@ -41,7 +41,6 @@ class DorisConnector(RDBMSConnector):
         )
         table_results = set(row[0] for row in table_results)  # noqa: C401
         self._all_tables = table_results
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
     def get_grants(self):
@@ -1,5 +1,9 @@
 """MySQL connector."""
 
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+
 from .base import RDBMSConnector
 
 
@@ -11,3 +15,56 @@ class MySQLConnector(RDBMSConnector):
     driver: str = "mysql+pymysql"
 
     default_db = ["information_schema", "performance_schema", "sys", "mysql"]
+
+    def _get_table_schemas(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read the schema of all tables with information_schema queries."""
+        schemas: Dict[str, Dict[str, Any]] = {
+            table_name: {"columns": [], "indexes": [], "comment": {"text": None}}
+            for table_name in table_names
+        }
+        with self._session_scope() as session:
+            column_rows = session.execute(
+                text(
+                    "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, "
+                    "COLUMN_DEFAULT, COLUMN_COMMENT FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() "
+                    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+                )
+            )
+            for table_name, name, col_type, nullable, default, comment in column_rows:
+                if table_name in schemas:
+                    schemas[table_name]["columns"].append(
+                        {
+                            "name": name,
+                            "type": col_type,
+                            "nullable": nullable == "YES",
+                            "default": default,
+                            "comment": comment or None,
+                        }
+                    )
+            index_rows = session.execute(
+                text(
+                    "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME "
+                    "FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME <> 'PRIMARY' "
+                    "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+                )
+            )
+            indexes: Dict[Tuple[str, str], List[str]] = {}
+            for table_name, index_name, column_name in index_rows:
+                if table_name in schemas:
+                    indexes.setdefault((table_name, index_name), []).append(column_name)
+            for (table_name, index_name), column_names in indexes.items():
+                schemas[table_name]["indexes"].append(
+                    {"name": index_name, "column_names": column_names}
+                )
+            comment_rows = session.execute(
+                text(
+                    "SELECT TABLE_NAME, TABLE_COMMENT FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE()"
+                )
+            )
+            for table_name, comment in comment_rows:
+                if table_name in schemas:
+                    schemas[table_name]["comment"] = {"text": comment or None}
+        return schemas
@@ -3,7 +3,7 @@
 import logging
 import os
 import tempfile
-from typing import Any, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy import create_engine, text
 
@@ -33,32 +33,78 @@ class SQLiteConnector(RDBMSConnector):
 
     def get_indexes(self, table_name):
         """Get table indexes about specified table."""
-        cursor = self.session.execute(text(f"PRAGMA index_list({table_name})"))
-        indexes = cursor.fetchall()
-        result = []
-        for idx in indexes:
-            index_name = idx[1]
-            cursor = self.session.execute(text(f"PRAGMA index_info({index_name})"))
-            index_infos = cursor.fetchall()
-            column_names = [index_info[2] for index_info in index_infos]
-            result.append({"name": index_name, "column_names": column_names})
+        with self._session_scope() as session:
+            cursor = session.execute(text(f"PRAGMA index_list({table_name})"))
+            indexes = cursor.fetchall()
+            result = []
+            for idx in indexes:
+                index_name = idx[1]
+                cursor = session.execute(text(f"PRAGMA index_info({index_name})"))
+                index_infos = cursor.fetchall()
+                column_names = [index_info[2] for index_info in index_infos]
+                result.append({"name": index_name, "column_names": column_names})
         return result
 
+    def _get_table_schemas(self, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read the columns and indexes of all tables with two pragma queries."""
+        schemas: Dict[str, Dict[str, Any]] = {
+            table_name: {"columns": [], "indexes": [], "comment": {"text": None}}
+            for table_name in table_names
+        }
+        with self._session_scope() as session:
+            column_rows = session.execute(
+                text(
+                    'SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk '
+                    "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+                    "WHERE m.type IN ('table', 'view') ORDER BY m.name, p.cid"
+                )
+            ).fetchall()
+            index_rows = session.execute(
+                text(
+                    "SELECT m.name, il.name, ii.name FROM sqlite_master AS m "
+                    "JOIN pragma_index_list(m.name) AS il "
+                    "JOIN pragma_index_info(il.name) AS ii "
+                    "WHERE m.type = 'table' ORDER BY m.name, il.seq, ii.seqno"
+                )
+            ).fetchall()
+        for table_name, name, col_type, not_null, default, pk in column_rows:
+            if table_name in schemas:
+                schemas[table_name]["columns"].append(
+                    {
+                        "name": name,
+                        "type": col_type,
+                        "nullable": not not_null,
+                        "default": default,
+                        "primary_key": pk,
+                    }
+                )
+        indexes: Dict[Tuple[str, str], List[str]] = {}
+        for table_name, index_name, column_name in index_rows:
+            if table_name in schemas:
+                indexes.setdefault((table_name, index_name), []).append(column_name)
+        for (table_name, index_name), column_names in indexes.items():
+            schemas[table_name]["indexes"].append(
+                {"name": index_name, "column_names": column_names}
+            )
+        return schemas
+
     def get_show_create_table(self, table_name):
         """Get table show create table about specified table."""
-        cursor = self.session.execute(
-            text(
-                "SELECT sql FROM sqlite_master WHERE type='table' "
-                f"AND name='{table_name}'"
+        with self._session_scope() as session:
+            cursor = session.execute(
+                text(
+                    "SELECT sql FROM sqlite_master WHERE type='table' "
+                    f"AND name='{table_name}'"
+                )
             )
-        )
-        ans = cursor.fetchall()
+            ans = cursor.fetchall()
         return ans[0][0]
 
     def get_fields(self, table_name, db_name=None) -> List[Tuple]:
         """Get column fields about specified table."""
-        cursor = self.session.execute(text(f"PRAGMA table_info('{table_name}')"))
-        fields = cursor.fetchall()
+        with self._session_scope() as session:
+            cursor = session.execute(text(f"PRAGMA table_info('{table_name}')"))
+            fields = cursor.fetchall()
         logger.info(fields)
         return [(field[1], field[2], field[3], field[4], field[5]) for field in fields]
 
@@ -87,23 +133,23 @@ class SQLiteConnector(RDBMSConnector):
         return []
 
     def _sync_tables_from_db(self) -> Iterable[str]:
-        table_results = self.session.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table'")
-        )
-        view_results = self.session.execute(
-            text("SELECT name FROM sqlite_master WHERE type='view'")
-        )
-        table_results = set(row[0] for row in table_results)  # noqa
-        view_results = set(row[0] for row in view_results)  # noqa
+        with self._session_scope() as session:
+            table_results = session.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table'")
+            )
+            table_results = set(row[0] for row in table_results)  # noqa
+            view_results = session.execute(
+                text("SELECT name FROM sqlite_master WHERE type='view'")
+            )
+            view_results = set(row[0] for row in view_results)  # noqa
         self._all_tables = table_results.union(view_results)
-        self._metadata.reflect(bind=self._engine)
         return self._all_tables
 
     def _write(self, write_sql):
         logger.info(f"Write[{write_sql}]")
-        session = self.session
-        result = session.execute(text(write_sql))
-        session.commit()
+        with self._session_scope() as session:
+            result = session.execute(text(write_sql))
+            session.commit()
         # TODO  Subsequent optimization of dynamically specified database submission
         #  loss target problem
         logger.info(f"SQL[{write_sql}], result:{result.rowcount}")
@@ -111,14 +157,15 @@ class SQLiteConnector(RDBMSConnector):
 
     def get_table_comments(self, db_name=None):
         """Get table comments."""
-        cursor = self.session.execute(
-            text(
-                """
-                SELECT name, sql FROM sqlite_master WHERE type='table'
-                """
+        with self._session_scope() as session:
+            cursor = session.execute(
+                text(
+                    """
+                    SELECT name, sql FROM sqlite_master WHERE type='table'
+                    """
+                )
             )
-        )
-        table_comments = cursor.fetchall()
+            table_comments = cursor.fetchall()
         return [
             (table_comment[0], table_comment[1]) for table_comment in table_comments
         ]
@@ -140,22 +187,23 @@ class SQLiteConnector(RDBMSConnector):
         _tables_sql = """
                 SELECT name FROM sqlite_master WHERE type='table'
             """
-        cursor = self.session.execute(text(_tables_sql))
-        tables_results = cursor.fetchall()
-        results = []
-        for row in tables_results:
-            table_name = row[0]
-            _sql = f"""
-                PRAGMA  table_info({table_name})
-            """
-            cursor_colums = self.session.execute(text(_sql))
-            colum_results = cursor_colums.fetchall()
-            table_colums = []
-            for row_col in colum_results:
-                field_info = list(row_col)
-                table_colums.append(field_info[1])
-
-            results.append(f"{table_name}({','.join(table_colums)});")
+        with self._session_scope() as session:
+            cursor = session.execute(text(_tables_sql))
+            tables_results = cursor.fetchall()
+            results = []
+            for row in tables_results:
+                table_name = row[0]
+                _sql = f"""
+                    PRAGMA  table_info({table_name})
+                """
+                cursor_colums = session.execute(text(_sql))
+                colum_results = cursor_colums.fetchall()
+                table_colums = []
+                for row_col in colum_results:
+                    field_info = list(row_col)
+                    table_colums.append(field_info[1])
+
+                results.append(f"{table_name}({','.join(table_colums)});")
         return results
 
 
@@ -250,18 +298,19 @@ class SQLiteTempConnector(SQLiteConnector):
                 [f"{col} {dtype}" for col, dtype in table_data["columns"].items()]
             )
             create_sql = f"CREATE TABLE {table_name} ({columns});"
-            self.session.execute(text(create_sql))
-            for row in table_data.get("data", []):
-                placeholders = ", ".join(
-                    [":param" + str(index) for index, _ in enumerate(row)]
-                )
-                insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders});"
-
-                param_dict = {
-                    "param" + str(index): value for index, value in enumerate(row)
-                }
-                self.session.execute(text(insert_sql), param_dict)
-            self.session.commit()
+            with self._session_scope() as session:
+                session.execute(text(create_sql))
+                for row in table_data.get("data", []):
+                    placeholders = ", ".join(
+                        [":param" + str(index) for index, _ in enumerate(row)]
+                    )
+                    insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders});"
+
+                    param_dict = {
+                        "param" + str(index): value for index, value in enumerate(row)
+                    }
+                    session.execute(text(insert_sql), param_dict)
+                session.commit()
         self._sync_tables_from_db()
 
     def __enter__(self):
@@ -1,11 +1,16 @@
 """
 Run unit test with command: pytest gptdb/datasource/rdbms/tests/test_conn_sqlite.py
 """
+import json
 import os
 import tempfile
+import time
+import tracemalloc
 
 import pytest
+from sqlalchemy import text
 
+from gptdb.datasource.rdbms.base import RDBMSConnector
 from gptdb.datasource.rdbms.conn_sqlite import SQLiteConnector
 
 
@@ -58,6 +63,41 @@ def test_get_indexes_empty(db):
     assert db.get_indexes("test") == []
 
 
+def test_get_table_schemas(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    db.run("CREATE INDEX idx_name ON test(name, id);")
+    db.run("CREATE TABLE other (id INTEGER);")
+    schemas = db.get_table_schemas()
+    assert set(schemas.keys()) == {"test", "other"}
+    assert [c["name"] for c in schemas["test"]["columns"]] == [
+        c["name"] for c in db.get_columns("test")
+    ]
+    assert schemas["test"]["indexes"] == db.get_indexes("test")
+    assert schemas["test"]["comment"] == {"text": None}
+    assert list(db.get_table_schemas(["other"]).keys()) == ["other"]
+
+
+def test_get_table_schemas_without_bulk_reflection(db, mocker):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    mocker.patch.object(
+        db._inspector, "get_multi_columns", side_effect=NotImplementedError
+    )
+    # The generic reflection falls back to the per-table methods
+    schemas = RDBMSConnector._get_table_schemas(db, ["test"])
+    assert [c["name"] for c in schemas["test"]["columns"]] == ["id", "name"]
+
+
+def test_dialect_queries_release_the_session(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    db.get_table_schemas()
+    db.get_indexes("test")
+    db.get_fields("test")
+    db.get_table_comments()
+    db.table_simple_info()
+    # The session of the thread is removed, its connection is back in the pool
+    assert not db._db_sessions.registry.has()
+
+
 def test_get_show_create_table(db):
     db.run("CREATE TABLE test (id INTEGER PRIMARY KEY);")
     assert (
@@ -138,3 +178,61 @@ def test_db_dir_exist_dir():
         db = SQLiteConnector.from_file_path(file_path)
         assert os.path.exists(existing_dir) == True
         assert list(db.get_table_names()) == []
+
+
+@pytest.fixture
+def million_rows_db(db):
+    db.run("CREATE TABLE big_table (id INTEGER PRIMARY KEY, name TEXT, amount REAL);")
+    db.session.execute(
+        text(
+            "WITH RECURSIVE cnt(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM cnt "
+            "LIMIT 1000000) INSERT INTO big_table SELECT x, 'name_' || x, x * 0.5 "
+            "FROM cnt"
+        )
+    )
+    db.session.commit()
+    return db
+
+
+def test_run_to_result_caps_rows(million_rows_db):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = million_rows_db.run_to_result("SELECT * FROM big_table", max_rows=1000)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert result.columns == ["id", "name", "amount"]
+    assert len(result.rows) == 1000
+    assert result.truncated
+    assert result.rows[0] == (1, "name_1", 0.5)
+    # The remaining rows are never fetched
+    assert peak < 5 * 1024 * 1024
+    assert elapsed < 1
+
+
+def test_run_to_result_caps_bytes(million_rows_db):
+    result = million_rows_db.run_to_result(
+        "SELECT * FROM big_table", max_rows=None, max_bytes=64 * 1024
+    )
+    assert result.truncated
+    assert 0 < result.size <= 64 * 1024
+    assert 0 < len(result.rows) < 1000000
+
+
+def test_run_to_result_not_truncated(db):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT, created DATE);")
+    db.run("insert into test(id, name, created) values (1, 'a', '2024-01-02')")
+    db.run("insert into test(id, name, created) values (2, NULL, NULL)")
+    result = db.run_to_result("select * from test", max_rows=2)
+    assert not result.truncated
+    assert result.rows == [(1, "a", "2024-01-02"), (2, None, None)]
+
+    df = db.run_to_df("select * from test")
+    expected = json.loads(
+        df.to_json(orient="records", date_format="iso", date_unit="s")
+    )
+    assert result.to_records() == expected
+
+    result = db.run_to_result("insert into test(id, name) values (3, 'c')")
+    assert result.columns == ["id", "name", "created"]
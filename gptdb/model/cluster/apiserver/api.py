@@ -607,6 +607,15 @@ def initialize_apiserver(
             otlp_endpoint=apiserver_params.otel_exporter_otlp_traces_endpoint,
             otlp_insecure=apiserver_params.otel_exporter_otlp_traces_insecure,
             otlp_timeout=apiserver_params.otel_exporter_otlp_traces_timeout,
+            sample_rate=apiserver_params.tracer_sample_rate,
+            slow_span_ms=apiserver_params.tracer_slow_span_ms,
+            max_metadata_bytes=apiserver_params.tracer_max_metadata_bytes,
+            max_queue_size=apiserver_params.tracer_max_queue_size,
+            tracer_db_file=(
+                os.path.join(LOGDIR, apiserver_params.tracer_db_file)
+                if apiserver_params.tracer_db_file
+                else None
+            ),
         )
 
     if api_keys:
@@ -194,6 +194,15 @@ def initialize_controller(
             otlp_endpoint=controller_params.otel_exporter_otlp_traces_endpoint,
             otlp_insecure=controller_params.otel_exporter_otlp_traces_insecure,
             otlp_timeout=controller_params.otel_exporter_otlp_traces_timeout,
+            sample_rate=controller_params.tracer_sample_rate,
+            slow_span_ms=controller_params.tracer_slow_span_ms,
+            max_metadata_bytes=controller_params.tracer_max_metadata_bytes,
+            max_queue_size=controller_params.tracer_max_queue_size,
+            tracer_db_file=(
+                os.path.join(LOGDIR, controller_params.tracer_db_file)
+                if controller_params.tracer_db_file
+                else None
+            ),
         )
 
         app.include_router(router, prefix="/api", tags=["Model"])
@@ -315,21 +315,28 @@ class DefaultModelWorker(ModelWorker):
         )
 
         span_params = {k: v for k, v in params.items()}
-        if "messages" in span_params:
-            span_params["messages"] = list(
-                map(lambda m: m.dict(), span_params["messages"])
-            )
-
-        metadata = {
-            "is_async_func": self.support_async(),
-            "llm_adapter": str(self.llm_adapter),
-            "generate_stream_func": generate_stream_func_str_name,
-        }
-        metadata.update(span_params)
-        metadata.update(model_context)
-        metadata["prompt"] = str_prompt
-
-        model_span = root_tracer.start_span(span_operation_name, metadata=metadata)
+        span_context = dict(model_context)
+        is_async_func = self.support_async()
+
+        def _span_metadata() -> Dict:
+            # Built only when the span is recorded
+            if "messages" in span_params:
+                span_params["messages"] = list(
+                    map(lambda m: m.dict(), span_params["messages"])
+                )
+            metadata = {
+                "is_async_func": is_async_func,
+                "llm_adapter": str(self.llm_adapter),
+                "generate_stream_func": generate_stream_func_str_name,
+            }
+            metadata.update(span_params)
+            metadata.update(span_context)
+            metadata["prompt"] = str_prompt
+            return metadata
+
+        model_span = root_tracer.start_span(
+            span_operation_name, metadata=_span_metadata
+        )
 
         return params, model_context, generate_stream_func, model_span
 
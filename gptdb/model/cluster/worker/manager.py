@@ -1164,6 +1164,15 @@ def run_worker_manager(
         otlp_endpoint=worker_params.otel_exporter_otlp_traces_endpoint,
         otlp_insecure=worker_params.otel_exporter_otlp_traces_insecure,
         otlp_timeout=worker_params.otel_exporter_otlp_traces_timeout,
+        sample_rate=worker_params.tracer_sample_rate,
+        slow_span_ms=worker_params.tracer_slow_span_ms,
+        max_metadata_bytes=worker_params.tracer_max_metadata_bytes,
+        max_queue_size=worker_params.tracer_max_queue_size,
+        tracer_db_file=(
+            os.path.join(LOGDIR, worker_params.tracer_db_file)
+            if worker_params.tracer_db_file
+            else None
+        ),
     )
 
     _start_local_worker(worker_manager, worker_params)
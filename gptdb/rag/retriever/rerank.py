@@ -1,5 +1,6 @@
 """Rerank module for RAG retriever."""
 
+import weakref
 from abc import ABC, abstractmethod
 from typing import Callable, List, Optional
 
@@ -8,6 +9,8 @@ from gptdb.core.awel.flow import Parameter, ResourceCategory, register_resource
 from gptdb.util.executor_utils import blocking_func_to_async_no_executor
 from gptdb.util.i18n_utils import _
 
+from .rerank_registry import RerankModelRegistry, get_rerank_model_registry
+
 RANK_FUNC = Callable[[List[Chunk]], List[Chunk]]
 
 
@@ -209,23 +212,35 @@ class CrossEncoderRanker(Ranker):
         model: str = "BAAI/bge-reranker-base",
         device: str = "cpu",
         rank_fn: Optional[RANK_FUNC] = None,
+        registry: Optional[RerankModelRegistry] = None,
     ):
         """Cross Encoder rank algorithm implementation.
 
+        The model is shared by the rankers with the same model and device in the
+        process, it is unloaded after the last ranker is released and the model is
+        idle for a while.
+
         Args:
             topk: int - The number of top k documents.
             model: str - rerank model name, e.g., 'BAAI/bge-reranker-base'.
             device: str - device name, e.g., 'cpu'.
             rank_fn: Optional[callable] - The rank function.
+            registry: Optional[RerankModelRegistry] - The registry of the loaded
+                models, the process-wide registry if None.
         Refer: https://www.sbert.net/examples/applications/cross-encoder/README.html
         """
-        try:
-            from sentence_transformers import CrossEncoder
-        except ImportError:
-            raise ImportError(
-                "please `pip install sentence-transformers`",
+
+        def _load_model() -> RerankEmbeddings:
+            from gptdb.rag.embedding.rerank import CrossEncoderRerankEmbeddings
+
+            return CrossEncoderRerankEmbeddings(
+                model_name=model, max_length=512, model_kwargs={"device": device}
             )
-        self._model = CrossEncoder(model, max_length=512, device=device)
+
+        registry = registry or get_rerank_model_registry()
+        self._model = registry.acquire(f"cross_encoder:{model}:{device}", _load_model)
+        # Release the shared model when the ranker is garbage collected
+        self._finalizer = weakref.finalize(self, self._model.release)
         super().__init__(topk, rank_fn)
 
     def rank(
@@ -241,24 +256,43 @@ class CrossEncoderRanker(Ranker):
         """
         if len(candidates_with_scores) <= 1:
             return candidates_with_scores
-        contents = [candidate.content for candidate in candidates_with_scores]
-        query_content_pairs = [
-            [
-                query if query is not None else "",
-                content if content is not None else "",
-            ]
-            for content in contents
+        contents = [
+            candidate.content if candidate.content is not None else ""
+            for candidate in candidates_with_scores
         ]
-        rank_scores = self._model.predict(sentences=query_content_pairs)
+        rank_scores = self._model.predict(query or "", contents)
+        new_candidates_with_scores = self._rerank_with_scores(
+            candidates_with_scores, rank_scores
+        )
+        return new_candidates_with_scores[: self.topk]
 
-        for candidate, score in zip(candidates_with_scores, rank_scores):
-            candidate.score = float(score)
+    async def arank(
+        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
+    ) -> List[Chunk]:
+        """Cross Encoder rank algorithm implementation in the model executor.
 
-        new_candidates_with_scores = sorted(
-            candidates_with_scores, key=lambda x: x.score, reverse=True
+        Args:
+            candidates_with_scores: List[Chunk], candidates with scores
+            query: Optional[str], query text
+        Returns:
+            List[Chunk], reranked candidates
+        """
+        if len(candidates_with_scores) <= 1:
+            return candidates_with_scores
+        contents = [
+            candidate.content if candidate.content is not None else ""
+            for candidate in candidates_with_scores
+        ]
+        rank_scores = await self._model.apredict(query or "", contents)
+        new_candidates_with_scores = self._rerank_with_scores(
+            candidates_with_scores, rank_scores
         )
         return new_candidates_with_scores[: self.topk]
 
+    def release(self):
+        """Release the shared rerank model."""
+        self._finalizer()
+
 
 class RerankEmbeddingsRanker(Ranker):
     """Rerank Embeddings Ranker."""
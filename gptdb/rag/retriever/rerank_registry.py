@@ -0,0 +1,292 @@
+"""Process-wide registry of the loaded rerank models."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gptdb.core import RerankEmbeddings
+from gptdb.util.executor_utils import blocking_func_to_async
+
+logger = logging.getLogger(__name__)
+
+_CacheKey = Tuple[str, str, str]
+
+
+class RerankScoreCache:
+    """A thread-safe LRU cache of the rerank scores.
+
+    The scores are keyed by the model key, the query and the hash of the candidate
+    content, so the cache holds no candidate text.
+
+    Args:
+        max_size (int): The max number of cached scores.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """Create a rerank score cache."""
+        self._max_size = max_size
+        self._cache: "OrderedDict[_CacheKey, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model_key: str, query: str, content: str) -> _CacheKey:
+        content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return model_key, query, content_hash
+
+    def get_many(
+        self, model_key: str, query: str, contents: List[str]
+    ) -> List[Optional[float]]:
+        """Return the cached scores, None for the missing ones."""
+        keys = [self._key(model_key, query, content) for content in contents]
+        scores: List[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                score = self._cache.get(key)
+                if score is None:
+                    self.misses += 1
+                else:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                scores.append(score)
+        return scores
+
+    def put_many(
+        self, model_key: str, query: str, contents: List[str], scores: List[float]
+    ):
+        """Cache the scores of the contents."""
+        keys = [self._key(model_key, query, content) for content in contents]
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._cache[key] = score
+                self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached scores."""
+        return len(self._cache)
+
+
+@dataclass
+class _ModelEntry:
+    model: RerankEmbeddings
+    refcount: int = 0
+    idle_since: Optional[float] = None
+    unload_timer: Optional[threading.Timer] = None
+
+
+class SharedRerankModel(RerankEmbeddings):
+    """A reference to a rerank model in the :class:`RerankModelRegistry`.
+
+    The scores are read from the score cache first, the missing ones are predicted
+    in batches. :meth:`apredict` runs in the executor of the registry, so the event
+    loop is not blocked by the model.
+    """
+
+    def __init__(self, registry: "RerankModelRegistry", key: str):
+        """Create a reference, use :meth:`RerankModelRegistry.acquire` instead."""
+        self._registry = registry
+        self._key = key
+        self._released = False
+
+    @property
+    def key(self) -> str:
+        """Return the key of the model in the registry."""
+        return self._key
+
+    def predict(self, query: str, candidates: List[str]) -> List[float]:
+        """Predict the rank scores of the candidates."""
+        return self._registry._score(self._key, query, candidates)
+
+    async def apredict(self, query: str, candidates: List[str]) -> List[float]:
+        """Predict the rank scores of the candidates in the registry executor."""
+        return await blocking_func_to_async(
+            self._registry.executor, self.predict, query, candidates
+        )
+
+    def release(self):
+        """Release the reference, it can be called more than once."""
+        if not self._released:
+            self._released = True
+            self._registry.release(self._key)
+
+
+class RerankModelRegistry:
+    """Share the loaded rerank models in the process.
+
+    A model is loaded on the first :meth:`acquire` of its key and unloaded after
+    it has not been referenced for ``idle_timeout`` seconds.
+
+    Args:
+        idle_timeout (Optional[float]): Seconds to keep an unreferenced model, the
+            model is kept until :meth:`unload_idle` is called if None.
+        max_workers (int): The number of threads to run the models.
+        batch_size (int): The max number of candidates scored by one model call.
+        cache_size (int): The max number of cached scores, 0 to disable the cache.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = 600,
+        max_workers: int = 1,
+        batch_size: int = 32,
+        cache_size: int = 10000,
+    ):
+        """Create a rerank model registry."""
+        self._idle_timeout = idle_timeout
+        self._batch_size = batch_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rerank"
+        )
+        self._cache = RerankScoreCache(cache_size) if cache_size > 0 else None
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Return the executor to run the models."""
+        return self._executor
+
+    @property
+    def cache(self) -> Optional[RerankScoreCache]:
+        """Return the score cache."""
+        return self._cache
+
+    def acquire(
+        self, key: str, loader: Callable[[], RerankEmbeddings]
+    ) -> SharedRerankModel:
+        """Return a reference to the model, load it if it is not loaded.
+
+        Args:
+            key (str): The key of the model, e.g. the model name and the device.
+            loader (Callable[[], RerankEmbeddings]): Load the model.
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # Only one thread loads the model, the others wait for it
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                start = time.time()
+                model = loader()
+                logger.info(f"Loaded rerank model {key} in {time.time() - start}s")
+                entry = _ModelEntry(model=model)
+            with self._lock:
+                self._entries[key] = entry
+                entry.refcount += 1
+                entry.idle_since = None
+                if entry.unload_timer:
+                    entry.unload_timer.cancel()
+                    entry.unload_timer = None
+        return SharedRerankModel(self, key)
+
+    def release(self, key: str):
+        """Release a reference to the model."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refcount <= 0:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            entry.idle_since = time.monotonic()
+            if self._idle_timeout is not None:
+                timer = threading.Timer(self._idle_timeout, self.unload_idle)
+                timer.daemon = True
+                entry.unload_timer = timer
+                timer.start()
+
+    def unload_idle(self, force: bool = False) -> List[str]:
+        """Unload the unreferenced models which are idle for ``idle_timeout``.
+
+        Args:
+            force (bool): Unload all the unreferenced models.
+
+        Returns:
+            List[str]: The keys of the unloaded models.
+        """
+        now = time.monotonic()
+        unloaded = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.refcount > 0 or entry.idle_since is None:
+                    continue
+                if (
+                    force
+                    or self._idle_timeout is not None
+                    and now - entry.idle_since >= self._idle_timeout
+                ):
+                    if entry.unload_timer:
+                        entry.unload_timer.cancel()
+                    del self._entries[key]
+                    unloaded.append(key)
+        for key in unloaded:
+            logger.info(f"Unloaded idle rerank model {key}")
+        return unloaded
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether the model is loaded."""
+        return key in self._entries
+
+    def refcount(self, key: str) -> int:
+        """Return the number of references to the model."""
+        entry = self._entries.get(key)
+        return entry.refcount if entry else 0
+
+    def close(self):
+        """Unload all the models and shutdown the executor."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.unload_timer:
+                    entry.unload_timer.cancel()
+            self._entries.clear()
+        self._executor.shutdown(wait=False)
+
+    def _score(self, key: str, query: str, candidates: List[str]) -> List[float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise ValueError(f"Rerank model {key} is not loaded")
+        if self._cache is not None:
+            scores = self._cache.get_many(key, query, candidates)
+        else:
+            scores = [None] * len(candidates)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        for i in range(0, len(missing), self._batch_size):
+            batch = missing[i : i + self._batch_size]
+            contents = [candidates[j] for j in batch]
+            batch_scores = [float(s) for s in entry.model.predict(query, contents)]
+            for j, score in zip(batch, batch_scores):
+                scores[j] = score
+            if self._cache is not None:
+                self._cache.put_many(key, query, contents, batch_scores)
+        return scores  # type: ignore
+
+
+_registry: Optional[RerankModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_rerank_model_registry() -> RerankModelRegistry:
+    """Return the process-wide rerank model registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = RerankModelRegistry()
+    return _registry
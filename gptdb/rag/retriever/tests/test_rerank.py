@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from gptdb.core import Chunk, RerankEmbeddings
+from gptdb.rag.retriever.rerank import CrossEncoderRanker, RerankEmbeddingsRanker
+from gptdb.rag.retriever.rerank_registry import RerankModelRegistry
+
+
+class StubRerankModel(RerankEmbeddings):
+    loads = 0
+
+    def __init__(self, delay: float = 0.0):
+        StubRerankModel.loads += 1
+        self.delay = delay
+        self.calls: List[List[str]] = []
+
+    def predict(self, query: str, candidates: List[str]) -> List[float]:
+        self.calls.append(candidates)
+        time.sleep(self.delay)
+        return [float(len(candidate)) for candidate in candidates]
+
+
+@pytest.fixture
+def registry():
+    StubRerankModel.loads = 0
+    registry = RerankModelRegistry(idle_timeout=None, batch_size=2)
+    yield registry
+    registry.close()
+
+
+def _chunks(*contents: str) -> List[Chunk]:
+    return [Chunk(content=content) for content in contents]
+
+
+def test_model_is_loaded_once(registry):
+    first = registry.acquire("stub", StubRerankModel)
+    second = registry.acquire("stub", StubRerankModel)
+    assert StubRerankModel.loads == 1
+    assert registry.refcount("stub") == 2
+
+    first.release()
+    first.release()
+    assert registry.refcount("stub") == 1
+    assert registry.unload_idle(force=True) == []
+
+    second.release()
+    assert registry.unload_idle(force=True) == ["stub"]
+    assert not registry.is_loaded("stub")
+    registry.acquire("stub", StubRerankModel)
+    assert StubRerankModel.loads == 2
+
+
+def test_idle_model_is_unloaded_after_timeout():
+    registry = RerankModelRegistry(idle_timeout=0.05)
+    registry.acquire("stub", StubRerankModel).release()
+    assert registry.is_loaded("stub")
+    time.sleep(0.2)
+    assert not registry.is_loaded("stub")
+    registry.close()
+
+
+def test_scores_are_batched_and_cached(registry):
+    shared = registry.acquire("stub", StubRerankModel)
+    model = registry._entries["stub"].model
+    ranker = RerankEmbeddingsRanker(shared, topk=3)
+
+    chunks = ranker.rank(_chunks("a", "bbbbb", "ccc", "dd", "eeee"), query="q")
+    assert [c.content for c in chunks] == ["bbbbb", "eeee", "ccc"]
+    assert [len(call) for call in model.calls] == [2, 2, 1]
+
+    chunks = ranker.rank(_chunks("a", "bbbbb", "ccc", "ffffff"), query="q")
+    assert [c.content for c in chunks] == ["ffffff", "bbbbb", "ccc"]
+    # Only the new candidate is scored
+    assert model.calls[-1] == ["ffffff"]
+    assert registry.cache.hits == 3
+
+    ranker.rank(_chunks("a"), query="another query")
+    assert model.calls[-1] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_arank_does_not_block_event_loop(registry):
+    shared = registry.acquire("slow", lambda: StubRerankModel(delay=0.3))
+    ranker = RerankEmbeddingsRanker(shared, topk=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    chunks = await ranker.arank(_chunks("a", "bb"), query="q")
+    task.cancel()
+    assert [c.content for c in chunks] == ["bb", "a"]
+    assert ticks >= 10
+
+
+def test_cross_encoder_rankers_share_model(registry, mocker):
+    mocker.patch(
+        "gptdb.rag.embedding.rerank.CrossEncoderRerankEmbeddings",
+        side_effect=lambda **kwargs: StubRerankModel(),
+    )
+    first = CrossEncoderRanker(topk=2, registry=registry)
+    second = CrossEncoderRanker(topk=2, registry=registry)
+    assert StubRerankModel.loads == 1
+    key = "cross_encoder:BAAI/bge-reranker-base:cpu"
+    assert registry.refcount(key) == 2
+
+    chunks = second.rank(_chunks("a", "ccc", "bb"), query="q")
+    assert [c.content for c in chunks] == ["ccc", "bb"]
+
+    first.release()
+    del second
+    assert registry.refcount(key) == 0
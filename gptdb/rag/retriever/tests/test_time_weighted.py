@@ -0,0 +1,82 @@
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from gptdb.core import Chunk
+from gptdb.rag.retriever.time_weighted import TimeWeightedEmbeddingRetriever
+
+
+@pytest.fixture
+def mock_index_store():
+    return MagicMock()
+
+
+@pytest.fixture
+def retriever(mock_index_store):
+    return TimeWeightedEmbeddingRetriever(index_store=mock_index_store, decay_rate=0.5)
+
+
+def test_load_document_not_mutate_input(retriever):
+    chunk = Chunk(content="hello", metadata={"source": "test"})
+    retriever.load_document([chunk])
+    assert chunk.metadata == {"source": "test"}
+    assert retriever.memory_stream[0].metadata["buffer_idx"] == 0
+    assert retriever.memory_stream[0].metadata["source"] == "test"
+
+
+def test_retrieve_combines_recency_and_relevance(retriever, mock_index_store):
+    now = datetime.datetime.now()
+    chunks = [
+        Chunk(
+            content="old",
+            metadata={"last_accessed_at": now - datetime.timedelta(hours=10)},
+        ),
+        Chunk(content="recent", metadata={"last_accessed_at": now}),
+        Chunk(
+            content="relevant",
+            metadata={"last_accessed_at": now - datetime.timedelta(hours=10)},
+        ),
+    ]
+    retriever.load_document(chunks)
+    mock_index_store.similar_search_with_scores.return_value = [
+        Chunk(content="relevant", score=0.9, metadata={"buffer_idx": 2})
+    ]
+
+    results = retriever._retrieve("query")
+    assert [c.content for c in results] == ["recent", "relevant", "old"]
+    # Retrieved memories are marked as accessed
+    assert (
+        results[2].metadata["last_accessed_at"] > chunks[0].metadata["last_accessed_at"]
+    )
+
+
+def test_update_memory_refreshes_static_scores(retriever, mock_index_store):
+    now = datetime.datetime.now()
+    retriever.other_score_keys = ["importance"]
+    retriever.load_document(
+        [
+            Chunk(content="a", metadata={"last_accessed_at": now, "importance": 0.5}),
+            Chunk(content="b", metadata={"last_accessed_at": now, "importance": 0.1}),
+        ]
+    )
+    mock_index_store.similar_search_with_scores.return_value = []
+    ranked = retriever._rank_memories([0, 1], {}, now)
+    assert ranked == [0, 1]
+
+    retriever.update_memory(1, {"importance": 0.9})
+    assert retriever._rank_memories([0, 1], {}, now) == [1, 0]
+
+
+def test_rank_memories_after_memory_stream_changed(retriever):
+    now = datetime.datetime.now()
+    retriever.other_score_keys = ["importance"]
+    retriever.load_document(
+        [Chunk(content="a", metadata={"last_accessed_at": now, "importance": 0.1})]
+    )
+    # The memory stream is replaced without load_document
+    retriever.memory_stream = [
+        Chunk(content="x", metadata={"last_accessed_at": now, "importance": 0.1}),
+        Chunk(content="y", metadata={"last_accessed_at": now, "importance": 0.7}),
+    ]
+    assert retriever._rank_memories([0, 1], {}, now) == [1, 0]
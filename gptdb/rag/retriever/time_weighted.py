@@ -1,8 +1,7 @@
 """Time weighted retriever."""
 
 import datetime
-from copy import deepcopy
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from gptdb.core import Chunk
 from gptdb.rag.retriever.rerank import Ranker
@@ -13,11 +12,6 @@ from ..index.base import IndexStoreBase
 from .embedding import EmbeddingRetriever
 
 
-def _get_hours_passed(time: datetime.datetime, ref_time: datetime.datetime) -> float:
-    """Get the hours passed between two datetime objects."""
-    return (time - ref_time).total_seconds() / 3600
-
-
 class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
     """Time weighted embedding retriever."""
 
@@ -49,6 +43,11 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
         self.default_salience: Optional[float] = None
         self._top_k = top_k
         self._k = 4
+        # The columns of the memory stream used by the vectorized scoring, indexed by
+        # buffer_idx
+        self._last_accessed_ts: List[float] = []
+        self._static_scores: List[float] = []
+        self._static_score_keys: Tuple[str, ...] = ()
 
     def load_document(self, chunks: List[Chunk], **kwargs: Dict[str, Any]) -> List[str]:
         """Load document in vector database.
@@ -60,17 +59,121 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
         current_time: Optional[datetime.datetime] = kwargs.get("current_time")  # type: ignore # noqa
         if current_time is None:
             current_time = datetime.datetime.now()
-        # Avoid mutating input documents
-        dup_docs = [deepcopy(d) for d in chunks]
+        self._sync_columns()
+        # Avoid mutating input documents, only the metadata is changed here
+        dup_docs = [d.model_copy(update={"metadata": dict(d.metadata)}) for d in chunks]
         for i, doc in enumerate(dup_docs):
             if doc.metadata.get("last_accessed_at") is None:
                 doc.metadata["last_accessed_at"] = current_time
             if "created_at" not in doc.metadata:
                 doc.metadata["created_at"] = current_time
             doc.metadata["buffer_idx"] = len(self.memory_stream) + i
+            self._last_accessed_ts.append(doc.metadata["last_accessed_at"].timestamp())
+            self._static_scores.append(self._get_static_score(doc))
         self.memory_stream.extend(dup_docs)
         return self._index_store.load_document(dup_docs)
 
+    def _get_static_score(self, chunk: Chunk) -> float:
+        return sum(
+            chunk.metadata[key]
+            for key in self.other_score_keys
+            if key in chunk.metadata
+        )
+
+    def update_memory(self, buffer_idx: int, metadata: Dict[str, Any]) -> Chunk:
+        """Update the metadata of a memory and refresh its scores.
+
+        The scoring columns are cached, update the memories with this method instead
+        of changing their metadata in place.
+
+        Args:
+            buffer_idx (int): The buffer index of the memory.
+            metadata (Dict[str, Any]): The metadata to update, e.g. the importance or
+                the last accessed time.
+
+        Returns:
+            Chunk: The updated memory.
+        """
+        self._sync_columns()
+        doc = self.memory_stream[buffer_idx]
+        doc.metadata.update(metadata)
+        self._last_accessed_ts[buffer_idx] = doc.metadata[
+            "last_accessed_at"
+        ].timestamp()
+        self._static_scores[buffer_idx] = self._get_static_score(doc)
+        return doc
+
+    def _sync_columns(self) -> None:
+        """Rebuild the scoring columns if they are stale.
+
+        They are stale when the score keys are changed or the memory stream is
+        changed without :meth:`load_document`.
+        """
+        if tuple(self.other_score_keys) == self._static_score_keys and len(
+            self._static_scores
+        ) == len(self.memory_stream):
+            return
+        self._static_score_keys = tuple(self.other_score_keys)
+        self._last_accessed_ts = [
+            doc.metadata["last_accessed_at"].timestamp() for doc in self.memory_stream
+        ]
+        self._static_scores = [
+            self._get_static_score(doc) for doc in self.memory_stream
+        ]
+
+    def _touch(self, buffer_idx: int, current_time: datetime.datetime) -> Chunk:
+        """Mark the memory as accessed and return it."""
+        buffered_doc = self.memory_stream[buffer_idx]
+        buffered_doc.metadata["last_accessed_at"] = current_time
+        self._last_accessed_ts[buffer_idx] = current_time.timestamp()
+        return buffered_doc
+
+    def _rank_memories(
+        self,
+        buffer_idxes: Sequence[int],
+        relevances: Dict[int, Optional[float]],
+        current_time: datetime.datetime,
+        default_relevance: Optional[float] = None,
+    ) -> List[int]:
+        """Rank the memories by the combined score in one vectorized pass.
+
+        Args:
+            buffer_idxes (Sequence[int]): The buffer indexes of the memories to rank.
+            relevances (Dict[int, Optional[float]]): The vector relevance of the
+                memories by buffer index.
+            current_time (datetime.datetime): The current time.
+            default_relevance (Optional[float]): The relevance of the memories not
+                in `relevances`, None means no relevance.
+
+        Returns:
+            List[int]: The buffer indexes sorted by the combined score, descending.
+        """
+        import numpy as np
+
+        self._sync_columns()
+        idxes = np.asarray(buffer_idxes, dtype=np.int64)
+        relevance = np.full(
+            len(idxes),
+            np.nan if default_relevance is None else default_relevance,
+            dtype=np.float64,
+        )
+        positions = np.full(len(self.memory_stream), -1, dtype=np.int64)
+        positions[idxes] = np.arange(len(idxes))
+        for buffer_idx, value in relevances.items():
+            position = positions[buffer_idx]
+            if position >= 0:
+                relevance[position] = np.nan if value is None else value
+        hours_passed = (
+            current_time.timestamp() - np.asarray(self._last_accessed_ts)[idxes]
+        ) / 3600
+        scores = (
+            (1.0 - self.decay_rate) ** hours_passed
+            + np.asarray(self._static_scores)[idxes]
+            + np.nan_to_num(relevance, nan=0.0)
+        )
+        # Stable sort keeps the input order for the same scores
+        return idxes[np.argsort(-scores, kind="stable")].tolist()
+
     def _retrieve(
         self, query: str, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -83,44 +186,18 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
             List[Chunk]: list of chunks
         """
         current_time = datetime.datetime.now()
-        docs_and_scores = {
-            doc.metadata["buffer_idx"]: (doc, self.default_salience)
+        relevances: Dict[int, Optional[float]] = {
+            doc.metadata["buffer_idx"]: self.default_salience
             for doc in self.memory_stream[-self._k :]
         }
         # If a doc is considered salient, update the salience score
-        docs_and_scores.update(self.get_salient_docs(query))
-        rescored_docs = [
-            (doc, self._get_combined_score(doc, relevance, current_time))
-            for doc, relevance in docs_and_scores.values()
-        ]
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
-        result = []
-        # Ensure frequently accessed memories aren't forgotten
-        for doc, _ in rescored_docs[: self._k]:
-            # TODO: Update vector store doc once `update` method is exposed.
-            buffered_doc = self.memory_stream[doc.metadata["buffer_idx"]]
-            buffered_doc.metadata["last_accessed_at"] = current_time
-            result.append(buffered_doc)
-        return result
-
-    def _get_combined_score(
-        self,
-        chunk: Chunk,
-        vector_relevance: Optional[float],
-        current_time: datetime.datetime,
-    ) -> float:
-        """Return the combined score for a document."""
-        hours_passed = _get_hours_passed(
-            current_time,
-            chunk.metadata["last_accessed_at"],
+        relevances.update(
+            {idx: score for idx, (_, score) in self.get_salient_docs(query).items()}
         )
-        score = (1.0 - self.decay_rate) ** hours_passed
-        for key in self.other_score_keys:
-            if key in chunk.metadata:
-                score += chunk.metadata[key]
-        if vector_relevance is not None:
-            score += vector_relevance
-        return score
+        ranked = self._rank_memories(list(relevances.keys()), relevances, current_time)
+        # Ensure frequently accessed memories aren't forgotten
+        # TODO: Update vector store doc once `update` method is exposed.
+        return [self._touch(idx, current_time) for idx in ranked[: self._k]]
 
     def get_salient_docs(self, query: str) -> Dict[int, Tuple[Chunk, float]]:
         """Return documents that are salient to the query."""
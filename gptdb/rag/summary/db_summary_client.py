@@ -1,13 +1,23 @@
 """DBSummaryClient class."""
 
+import json
 import logging
+import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Tuple
 
 from gptdb._private.config import Config
 from gptdb.component import SystemApp
-from gptdb.configs.model_config import EMBEDDING_MODEL_CONFIG
+from gptdb.configs.model_config import DATA_DIR, EMBEDDING_MODEL_CONFIG
+from gptdb.core import Chunk
+from gptdb.datasource import BaseConnector
 from gptdb.rag.summary.gdbms_db_summary import GdbmsSummary
-from gptdb.rag.summary.rdbms_db_summary import RdbmsSummary
+from gptdb.rag.summary.rdbms_db_summary import (
+    RdbmsSummary,
+    _format_table_summary,
+    _table_schema_fingerprint,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +31,20 @@ class DBSummaryClient:
     summary into vector store), get_similar_tables method(get user query related tables
     info)
 
+    The table profiles of the relational databases are synchronized incrementally,
+    a fingerprint of each table schema is stored in the profile manifest, only the
+    tables whose schema changed are summarized and embedded again.
+
     Args:
         system_app (SystemApp): Main System Application class that manages the
             lifecycle and registration of components..
+        profile_dir (Optional[str]): The directory to store the profile manifests.
     """
 
-    def __init__(self, system_app: SystemApp):
+    def __init__(self, system_app: SystemApp, profile_dir: Optional[str] = None):
         """Create a new DBSummaryClient."""
         self.system_app = system_app
+        self._profile_dir = profile_dir or os.path.join(DATA_DIR, "db_profile")
         from gptdb.rag.embedding.embedding_factory import EmbeddingFactory
 
         embedding_factory: EmbeddingFactory = self.system_app.get_component(
@@ -48,37 +64,51 @@ class DBSummaryClient:
 
     def get_db_summary(self, dbname, query, topk):
         """Get user query related tables info."""
-        from gptdb.serve.rag.connector import VectorStoreConnector
-        from gptdb.storage.vector_store.base import VectorStoreConfig
-
-        vector_store_config = VectorStoreConfig(name=dbname + "_profile")
-        vector_connector = VectorStoreConnector.from_default(
-            CFG.VECTOR_STORE_TYPE,
-            embedding_fn=self.embeddings,
-            vector_store_config=vector_store_config,
-        )
-        from gptdb.rag.retriever.db_schema import DBSchemaRetriever
-
-        retriever = DBSchemaRetriever(
-            top_k=topk, index_store=vector_connector.index_client
-        )
+        retriever = self.get_db_summary_retriever(dbname, topk)
         table_docs = retriever.retrieve(query)
         ans = [d.content for d in table_docs]
         return ans
 
-    def init_db_summary(self):
-        """Initialize db summary profile."""
+    def get_db_summary_retriever(self, dbname: str, topk: int):
+        """Return the retriever of the table profiles of the database.
+
+        The retriever holds the vector store of the profiles, it can be reused
+        across the queries of the database.
+        """
+        vector_connector = self._get_vector_connector(dbname + "_profile")
+        from gptdb.rag.retriever.db_schema import DBSchemaRetriever
+
+        return DBSchemaRetriever(top_k=topk, index_store=vector_connector.index_client)
+
+    def init_db_summary(self, max_workers: int = 4):
+        """Initialize db summary profile.
+
+        The databases are profiled concurrently.
+
+        Args:
+            max_workers (int): The max number of databases profiled at the same time.
+        """
         db_mange = CFG.local_db_manager
         dbs = db_mange.get_db_list()
-        for item in dbs:
-            try:
-                self.db_summary_embedding(item["db_name"], item["db_type"])
-            except Exception as e:
-                message = traceback.format_exc()
-                logger.warn(
-                    f'{item["db_name"]}, {item["db_type"]} summary error!{str(e)}, '
-                    f"detail: {message}"
-                )
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="db_summary"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.db_summary_embedding, item["db_name"], item["db_type"]
+                ): item
+                for item in dbs
+            }
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    message = traceback.format_exc()
+                    logger.warn(
+                        f'{item["db_name"]}, {item["db_type"]} summary error!'
+                        f"{str(e)}, detail: {message}"
+                    )
 
     def init_db_profile(self, db_summary_client, dbname):
         """Initialize db summary profile.
@@ -88,16 +118,10 @@ class DBSummaryClient:
         dbname(str): dbname
         """
         vector_store_name = dbname + "_profile"
-        from gptdb.serve.rag.connector import VectorStoreConnector
-        from gptdb.storage.vector_store.base import VectorStoreConfig
-
-        vector_store_config = VectorStoreConfig(name=vector_store_name)
-        vector_connector = VectorStoreConnector.from_default(
-            CFG.VECTOR_STORE_TYPE,
-            self.embeddings,
-            vector_store_config=vector_store_config,
-        )
-        if not vector_connector.vector_name_exists():
+        vector_connector = self._get_vector_connector(vector_store_name)
+        if not db_summary_client.db.is_graph_type():
+            self._sync_db_profile(db_summary_client.db, dbname, vector_connector)
+        elif not vector_connector.vector_name_exists():
             from gptdb.rag.assembler.db_schema import DBSchemaAssembler
 
             db_assembler = DBSchemaAssembler.load_from_connection(
@@ -111,19 +135,130 @@ class DBSummaryClient:
             logger.info(f"Vector store name {vector_store_name} exist")
         logger.info("initialize db summary profile success...")
 
-    def delete_db_profile(self, dbname):
-        """Delete db profile."""
+    def _sync_db_profile(
+        self,
+        connector: BaseConnector,
+        dbname: str,
+        vector_connector,
+        summary_template: str = "{table_name}({columns})",
+    ):
+        """Embed the summaries of the tables whose schema changed.
+
+        Args:
+            connector (BaseConnector): The connector of the database.
+            dbname (str): The database name.
+            vector_connector (VectorStoreConnector): The vector store of the profile.
+            summary_template (str): The summary template.
+        """
         vector_store_name = dbname + "_profile"
+        manifest = self._load_manifest(dbname)
+        if not vector_connector.vector_name_exists():
+            manifest = {}
+        elif not manifest:
+            # The chunks can't be matched to the tables without the manifest,
+            # rebuild the whole profile.
+            vector_connector.delete_vector_name(vector_store_name)
+            vector_connector = self._get_vector_connector(vector_store_name)
+
+        table_schemas = connector.get_table_schemas()
+        fingerprints = {
+            table_name: _table_schema_fingerprint(schema, summary_template)
+            for table_name, schema in table_schemas.items()
+        }
+        tables: Dict[str, Dict[str, Any]] = manifest.get("tables", {})
+        changed_tables = [
+            table_name
+            for table_name, fingerprint in fingerprints.items()
+            if tables.get(table_name, {}).get("fingerprint") != fingerprint
+        ]
+        removed_tables = [name for name in tables if name not in fingerprints]
+        stale_ids = [
+            chunk_id
+            for table_name in changed_tables + removed_tables
+            for chunk_id in tables.get(table_name, {}).get("chunk_ids", [])
+        ]
+        if stale_ids:
+            vector_connector.delete_by_ids(",".join(stale_ids))
+        for table_name in removed_tables:
+            tables.pop(table_name)
+
+        chunks = [
+            Chunk(
+                content=_format_table_summary(
+                    summary_template, table_name, **table_schemas[table_name]
+                ),
+                metadata={"source": "database", "table_name": table_name},
+            )
+            for table_name in changed_tables
+        ]
+        if chunks:
+            chunk_ids = vector_connector.load_document(chunks)
+            for table_name, chunk_id in zip(changed_tables, chunk_ids):
+                tables[table_name] = {
+                    "fingerprint": fingerprints[table_name],
+                    "chunk_ids": [chunk_id],
+                }
+        self._save_manifest(dbname, {"tables": tables})
+        logger.info(
+            f"Sync db profile {dbname}: {len(changed_tables)} tables embedded, "
+            f"{len(removed_tables)} tables removed, "
+            f"{len(fingerprints) - len(changed_tables)} tables unchanged"
+        )
+
+    def get_db_profile_version(self, dbname: str) -> Optional[Tuple[int, int]]:
+        """Return the version of the table profiles of the database.
+
+        The manifest is replaced every time the profiles are synchronized and
+        removed with them, so its inode and modification time tell whether a
+        retriever of the profiles is stale. None if the profiles have no manifest.
+        """
+        try:
+            stat = os.stat(self._manifest_path(dbname))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _manifest_path(self, dbname: str) -> str:
+        return os.path.join(self._profile_dir, f"{dbname}_profile.json")
+
+    def _load_manifest(self, dbname: str) -> Dict[str, Any]:
+        path = self._manifest_path(dbname)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Load db profile manifest {path} error: {str(e)}")
+            return {}
+
+    def _save_manifest(self, dbname: str, manifest: Dict[str, Any]):
+        os.makedirs(self._profile_dir, exist_ok=True)
+        path = self._manifest_path(dbname)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _get_vector_connector(self, vector_store_name: str):
         from gptdb.serve.rag.connector import VectorStoreConnector
         from gptdb.storage.vector_store.base import VectorStoreConfig
 
         vector_store_config = VectorStoreConfig(name=vector_store_name)
-        vector_connector = VectorStoreConnector.from_default(
+        return VectorStoreConnector.from_default(
             CFG.VECTOR_STORE_TYPE,
             self.embeddings,
             vector_store_config=vector_store_config,
         )
+
+    def delete_db_profile(self, dbname):
+        """Delete db profile."""
+        vector_store_name = dbname + "_profile"
+        vector_connector = self._get_vector_connector(vector_store_name)
         vector_connector.delete_vector_name(vector_store_name)
+        manifest_path = self._manifest_path(dbname)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
         logger.info(f"delete db profile {dbname} success")
 
     @staticmethod
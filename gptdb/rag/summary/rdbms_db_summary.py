@@ -1,6 +1,8 @@
 """Summary for rdbms database."""
+import hashlib
+import json
 import re
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from gptdb._private.config import Config
 from gptdb.datasource import BaseConnector
@@ -44,10 +46,7 @@ class RdbmsSummary(DBSummary):
             charset=self.db.get_charset(),
             collation=self.db.get_collation(),
         )
-        tables = self.db.get_table_names()
-        self.table_info_summaries = [
-            self.get_table_summary(table_name) for table_name in tables
-        ]
+        self.table_info_summaries: Optional[List[str]] = None
 
     def get_table_summary(self, table_name):
         """Get table summary for table.
@@ -60,6 +59,11 @@ class RdbmsSummary(DBSummary):
 
     def table_summaries(self):
         """Get table summaries."""
+        if self.table_info_summaries is None:
+            self.table_info_summaries = [
+                self.get_table_summary(table_name)
+                for table_name in self.db.get_table_names()
+            ]
         return self.table_info_summaries
 
 
@@ -72,14 +76,33 @@ def _parse_db_summary(
         conn (BaseConnector): database connection
         summary_template (str): summary template
     """
-    tables = conn.get_table_names()
+    table_schemas = conn.get_table_schemas()
     table_info_summaries = [
-        _parse_table_summary(conn, summary_template, table_name)
-        for table_name in tables
+        _format_table_summary(summary_template, table_name, **schema)
+        for table_name, schema in table_schemas.items()
     ]
     return table_info_summaries
 
 
+def _table_schema_fingerprint(
+    schema: Dict[str, Any], summary_template: str = "{table_name}({columns})"
+) -> str:
+    """Return the fingerprint of the table schema.
+
+    The fingerprint changes when the columns, indexes, comment of the table or the
+    summary template are changed.
+
+    Args:
+        schema (Dict[str, Any]): table schema returned by
+            :meth:`BaseConnector.get_table_schemas`
+        summary_template (str): summary template
+    """
+    content = json.dumps(
+        {"template": summary_template, "schema": schema}, sort_keys=True, default=str
+    )
+    return hashlib.md5(content.encode("utf-8")).hexdigest()
+
+
 def _parse_table_summary(
     conn: BaseConnector, summary_template: str, table_name: str
 ) -> str:
@@ -94,18 +117,46 @@ def _parse_table_summary(
         table_name(column1(column1 comment),column2(column2 comment),
         column3(column3 comment) and index keys, and table comment: {table_comment})
     """
-    columns = []
-    for column in conn.get_columns(table_name):
+    try:
+        comment = conn.get_table_comment(table_name)
+    except Exception:
+        comment = dict(text=None)
+    return _format_table_summary(
+        summary_template,
+        table_name,
+        columns=conn.get_columns(table_name),
+        indexes=conn.get_indexes(table_name),
+        comment=comment,
+    )
+
+
+def _format_table_summary(
+    summary_template: str,
+    table_name: str,
+    columns: List[Dict],
+    indexes: List[Any],
+    comment: Dict,
+) -> str:
+    """Format the table summary with the table schema.
+
+    Args:
+        summary_template (str): summary template
+        table_name (str): table name
+        columns (List[Dict]): columns of the table
+        indexes (List[Any]): indexes of the table
+        comment (Dict): table comment, eg: {"text": "comment"}
+    """
+    column_names = []
+    for column in columns:
         if column.get("comment"):
-            columns.append(f"{column['name']} ({column.get('comment')})")
+            column_names.append(f"{column['name']} ({column.get('comment')})")
         else:
-            columns.append(f"{column['name']}")
+            column_names.append(f"{column['name']}")
 
-    column_str = ", ".join(columns)
+    column_str = ", ".join(column_names)
     # Obtain index information
     index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
-    for index in raw_indexes:
+    for index in indexes:
         if isinstance(index, tuple):  # Process tuple type index information
             index_name, index_creation_command = index
             # Extract column names using re
@@ -120,10 +171,6 @@ def _parse_table_summary(
     if len(index_keys) > 0:
         index_key_str = ", ".join(index_keys)
         table_str += f", and index keys: {index_key_str}"
-    try:
-        comment = conn.get_table_comment(table_name)
-    except Exception:
-        comment = dict(text=None)
-    if comment.get("text"):
+    if comment and comment.get("text"):
         table_str += f", and table comment: {comment.get('text')}"
     return table_str
@@ -0,0 +1,131 @@
+import os
+import tempfile
+from typing import Dict, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from gptdb.core import Chunk
+from gptdb.datasource.rdbms.conn_sqlite import SQLiteConnector
+from gptdb.rag.summary.db_summary_client import DBSummaryClient
+
+TABLE_COUNT = 2000
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.embedded_texts: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded_texts.extend(texts)
+        return [[1.0] for _ in texts]
+
+
+class FakeVectorConnector:
+    def __init__(self, store: Dict[str, Chunk], embeddings: FakeEmbeddings):
+        self._store = store
+        self._embeddings = embeddings
+
+    def vector_name_exists(self) -> bool:
+        return bool(self._store)
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        self._embeddings.embed_documents([chunk.content for chunk in chunks])
+        for chunk in chunks:
+            self._store[chunk.chunk_id] = chunk
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids: str):
+        for chunk_id in ids.split(","):
+            self._store.pop(chunk_id, None)
+
+    def delete_vector_name(self, vector_name: str):
+        self._store.clear()
+
+
+@pytest.fixture
+def db():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        conn = SQLiteConnector.from_file_path(os.path.join(temp_dir, "test.db"))
+        with conn._engine.begin() as connection:
+            for i in range(TABLE_COUNT):
+                connection.exec_driver_sql(
+                    f"CREATE TABLE table_{i} (id INTEGER PRIMARY KEY, name TEXT)"
+                )
+            connection.exec_driver_sql("CREATE INDEX idx_name ON table_0 (name)")
+        yield conn
+
+
+@pytest.fixture
+def client():
+    embeddings = FakeEmbeddings()
+    store: Dict[str, Chunk] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        client = DBSummaryClient.__new__(DBSummaryClient)
+        client.system_app = MagicMock()
+        client.embeddings = embeddings
+        client._profile_dir = temp_dir
+        client._get_vector_connector = lambda name: FakeVectorConnector(
+            store, embeddings
+        )
+        yield client, embeddings, store
+
+
+def test_sync_db_profile_incremental(db, client, mocker):
+    client, embeddings, store = client
+    summary_client = MagicMock(db=db)
+    get_columns = mocker.spy(db, "get_columns")
+    get_indexes = mocker.spy(db, "get_indexes")
+
+    client.init_db_profile(summary_client, "test_db")
+    assert len(embeddings.embedded_texts) == TABLE_COUNT
+    assert len(store) == TABLE_COUNT
+    assert (
+        "table_0(id, name), and index keys: idx_name(`name`) "
+        in embeddings.embedded_texts
+    )
+    # The schema is read in bulk, not table by table
+    assert get_columns.call_count == 0
+    assert get_indexes.call_count == 0
+
+    # Nothing changed, nothing is embedded again
+    embeddings.embedded_texts.clear()
+    client.init_db_profile(summary_client, "test_db")
+    assert embeddings.embedded_texts == []
+    assert len(store) == TABLE_COUNT
+
+    db.run("ALTER TABLE table_1 ADD COLUMN age INTEGER")
+    db.run("DROP TABLE table_2")
+    client.init_db_profile(summary_client, "test_db")
+    assert embeddings.embedded_texts == ["table_1(id, name, age)"]
+    assert len(store) == TABLE_COUNT - 1
+    contents = {chunk.content for chunk in store.values()}
+    assert "table_1(id, name)" not in contents
+    assert "table_2(id, name)" not in contents
+
+
+def test_rebuild_profile_without_manifest(db, client):
+    client, embeddings, store = client
+    summary_client = MagicMock(db=db)
+    client.init_db_profile(summary_client, "test_db")
+    os.remove(client._manifest_path("test_db"))
+
+    client.init_db_profile(summary_client, "test_db")
+    assert len(embeddings.embedded_texts) == 2 * TABLE_COUNT
+    assert len(store) == TABLE_COUNT
+
+
+def test_profile_version_changes_on_sync(db, client):
+    client, _, _ = client
+    summary_client = MagicMock(db=db)
+    assert client.get_db_profile_version("test_db") is None
+
+    client.init_db_profile(summary_client, "test_db")
+    version = client.get_db_profile_version("test_db")
+    assert version is not None
+    assert client.get_db_profile_version("test_db") == version
+
+    client.init_db_profile(summary_client, "test_db")
+    assert client.get_db_profile_version("test_db") != version
+    client.delete_db_profile("test_db")
+    assert client.get_db_profile_version("test_db") is None
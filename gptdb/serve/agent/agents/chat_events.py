@@ -0,0 +1,156 @@
+"""Typed events of the agent chat stream and the encoders of the outputs."""
+
+import json
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from gptdb._private.pydantic import model_to_json
+from gptdb.core.schema.api import (
+    ChatCompletionResponseStreamChoice,
+    ChatCompletionStreamResponse,
+    DeltaMessage,
+)
+
+_DONE = "[DONE]"
+
+
+class AgentChatEventType(str, Enum):
+    """The type of the agent chat event."""
+
+    # The vis text of the whole agent conversation
+    VIS = "vis"
+    # The plain text output of a chat flow app
+    TEXT = "text"
+    ERROR = "error"
+    DONE = "done"
+
+
+@dataclass
+class AgentChatEvent:
+    """An event of the agent chat stream.
+
+    Args:
+        type (AgentChatEventType): The type of the event.
+        content (str): The full content of the output so far.
+        delta (str): The content appended since the previous event.
+        reset (bool): Whether the content does not extend the previous content, the
+            consumers should replace the output with ``content``.
+        conv_id (Optional[str]): The id of the agent conversation.
+    """
+
+    type: AgentChatEventType
+    content: str = ""
+    delta: str = ""
+    reset: bool = False
+    conv_id: Optional[str] = None
+
+
+class AgentChatEventBuilder:
+    """Build the events of one agent chat, the deltas are computed here once.
+
+    The agents publish the full vis text of the conversation every time, the delta
+    is the suffix appended to the previous output.
+    """
+
+    def __init__(self, conv_id: Optional[str] = None):
+        """Create an event builder."""
+        self.conv_id = conv_id
+        self._last_content = ""
+
+    def output(
+        self, content: str, type: AgentChatEventType = AgentChatEventType.VIS
+    ) -> AgentChatEvent:
+        """Return the event of a new output."""
+        last = self._last_content
+        self._last_content = content
+        if content.startswith(last):
+            return AgentChatEvent(
+                type, content=content, delta=content[len(last) :], conv_id=self.conv_id
+            )
+        return AgentChatEvent(
+            type, content=content, delta=content, reset=True, conv_id=self.conv_id
+        )
+
+    def error(self, message: str) -> AgentChatEvent:
+        """Return the event of an error."""
+        return AgentChatEvent(
+            AgentChatEventType.ERROR,
+            content=message,
+            delta=message,
+            conv_id=self.conv_id,
+        )
+
+    def done(self) -> AgentChatEvent:
+        """Return the event of the end of the chat."""
+        return AgentChatEvent(AgentChatEventType.DONE, conv_id=self.conv_id)
+
+
+def encode_sse_event(event: AgentChatEvent) -> str:
+    """Encode the event to the server-sent event of the web app."""
+    if event.type == AgentChatEventType.TEXT:
+        text = event.content.replace("\n", "\\n")
+        return f"data:{text}\n\n"
+    if event.type == AgentChatEventType.DONE:
+        return f"data:{json.dumps({'vis': _DONE}, ensure_ascii=False)} \n\n"
+    data = json.dumps({"vis": event.content}, ensure_ascii=False)
+    if event.type == AgentChatEventType.ERROR:
+        return f"data:{data} \n\n"
+    return f"data:{data}\n\n"
+
+
+class OpenAIStreamEncoder:
+    """Encode the events to the chunks of the OpenAI-compatible stream.
+
+    The vis text rewrites its tail while a message streams, so each chunk of a vis
+    event is a full snapshot of the conversation, as before. The plain text only
+    appends, so only the delta of a text event is sent and the clients concatenate
+    the chunks of a choice. A text which does not extend the previous text starts a
+    new choice with its full content, so it is not appended to the shown text.
+
+    Args:
+        id (str): The id of the chunks.
+        model (str): The model of the chunks.
+    """
+
+    def __init__(self, id: str, model: str):
+        """Create an OpenAI stream encoder."""
+        self.id = id
+        self.model = model
+        self._choice_index = 0
+
+    def encode(self, event: AgentChatEvent) -> Optional[str]:
+        """Return the server-sent event of the chunk, None if nothing to send."""
+        if event.type == AgentChatEventType.DONE:
+            return None
+        if event.type == AgentChatEventType.TEXT:
+            if event.reset:
+                self._choice_index += 1
+                content = event.content
+            else:
+                content = event.delta
+        elif event.delta or event.reset:
+            content = event.content
+        else:
+            # The snapshot is unchanged
+            return None
+        if not content:
+            return None
+        choice_data = ChatCompletionResponseStreamChoice(
+            index=self._choice_index,
+            delta=DeltaMessage(role="assistant", content=content),
+        )
+        chunk = ChatCompletionStreamResponse(
+            id=self.id,
+            choices=[choice_data],
+            model=self.model,
+            created=int(time.time()),
+        )
+        json_content = model_to_json(chunk, exclude_unset=True, ensure_ascii=False)
+        return f"data: {json_content}\n\n"
+
+    @staticmethod
+    def finish() -> str:
+        """Return the server-sent event of the end of the stream."""
+        return f"data: {_DONE}\n\n"
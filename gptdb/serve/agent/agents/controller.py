@@ -6,7 +6,7 @@ import re
 import time
 import uuid
 from abc import ABC
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
 
 from fastapi import APIRouter, Body, Depends
 from fastapi.responses import StreamingResponse
@@ -26,6 +26,7 @@ from gptdb.agent import (
     get_agent_manager,
 )
 from gptdb.agent.core.memory.gpts import GptsMessage
+from gptdb.agent.core.memory.gpts.gpts_memory import apply_vis_diff
 from gptdb.agent.core.schema import Status
 from gptdb.agent.resource import get_resource_manager
 from gptdb.agent.util.llm.llm import LLMStrategyType
@@ -40,13 +41,18 @@ from gptdb.model.cluster.client import DefaultLLMClient
 from gptdb.serve.conversation.serve import Serve as ConversationServe
 from gptdb.serve.prompt.api.endpoints import get_service
 from gptdb.serve.prompt.service import service as PromptService
-from gptdb.util.json_utils import serialize
 from gptdb.util.tracer import TracerManager
 
 from ..db import GptsMessagesDao
 from ..db.gpts_app import GptsApp, GptsAppDao, GptsAppQuery
 from ..db.gpts_conversations_db import GptsConversationsDao, GptsConversationsEntity
 from ..team.base import TeamMode
+from .chat_events import (
+    AgentChatEvent,
+    AgentChatEventBuilder,
+    AgentChatEventType,
+    encode_sse_event,
+)
 from .gpt_dbs_memory import MetaGptDbsMessageMemory, MetaGptDbsPlansMemory
 
 CFG = Config()
@@ -78,6 +84,7 @@ def _build_conversation(
         app_code=app_code,
         conv_storage=conv_serve.conv_storage,
         message_storage=conv_serve.message_storage,
+        conv_cache=conv_serve.conv_cache,
     )
 
 
@@ -249,10 +256,21 @@ class MultiAgents(BaseComponent, ABC):
             from gptdb.app.openapi.api_v1.api_v1 import get_chat_flow
 
             flow_service = get_chat_flow()
-            async for chunk in flow_service.chat_stream_flow_str(
+            events = AgentChatEventBuilder(agent_conv_id)
+            # Must be non-incremental, the deltas are computed by the events
+            flow_req.incremental = False
+            async for output in flow_service.safe_chat_stream_flow(
                 team_context.uid, flow_req
             ):
-                yield None, chunk, agent_conv_id
+                if output.error_code != 0:
+                    yield None, events.output(
+                        f"[SERVER_ERROR]{output.text}", AgentChatEventType.TEXT
+                    ), agent_conv_id
+                    break
+                if output.text:
+                    yield None, events.output(
+                        output.text, AgentChatEventType.TEXT
+                    ), agent_conv_id
         else:
             # init gpts  memory
             self.memory.init(
@@ -260,9 +278,11 @@ class MultiAgents(BaseComponent, ABC):
                 enable_vis_message=enable_verbose,
                 history_messages=history_messages,
                 start_round=history_message_count,
+                incremental=True,
             )
             # init agent memory
             agent_memory = self.get_or_build_agent_memory(conv_id, gpts_name)
+            events = AgentChatEventBuilder(agent_conv_id)
 
             try:
                 task = asyncio.create_task(
@@ -280,23 +300,9 @@ class MultiAgents(BaseComponent, ABC):
                 if enable_verbose:
                     async for chunk in multi_agents.chat_messages(agent_conv_id):
                         if chunk:
-                            try:
-                                chunk = json.dumps(
-                                    {"vis": chunk},
-                                    default=serialize,
-                                    ensure_ascii=False,
-                                )
-                                if chunk is None or len(chunk) <= 0:
-                                    continue
-                                resp = f"data:{chunk}\n\n"
-                                yield task, resp, agent_conv_id
-                            except Exception as e:
-                                logger.exception(
-                                    f"get messages {gpts_name} Exception!" + str(e)
-                                )
-                                yield f"data: {str(e)}\n\n"
+                            yield task, events.output(chunk), agent_conv_id
 
-                    yield task, f'data:{json.dumps({"vis": "[DONE]"}, default=serialize, ensure_ascii=False)} \n\n', agent_conv_id
+                    yield task, events.done(), agent_conv_id
 
                 else:
                     logger.info(f"{agent_conv_id}开启简略消息模式，不进行vis协议封装，获取极简流式消息直接输出")
@@ -327,8 +333,8 @@ class MultiAgents(BaseComponent, ABC):
             except Exception as e:
                 logger.exception(f"Agent chat have error!{str(e)}")
                 if enable_verbose:
-                    yield task, f'data:{json.dumps({"vis": f"{str(e)}"}, default=serialize, ensure_ascii=False)} \n\n', agent_conv_id
-                    yield task, f'data:{json.dumps({"vis": "[DONE]"}, default=serialize, ensure_ascii=False)} \n\n', agent_conv_id
+                    yield task, events.error(str(e)), agent_conv_id
+                    yield task, events.done(), agent_conv_id
                 else:
                     yield task, str(e), agent_conv_id
 
@@ -345,6 +351,61 @@ class MultiAgents(BaseComponent, ABC):
         enable_verbose: bool = True,
         stream: Optional[bool] = True,
         **ext_info,
+    ):
+        """Chat with the app, yield the server-sent events of the web app.
+
+        The raw messages are yielded if ``enable_verbose`` is False.
+        """
+        async for chunk in self._app_agent_chat(
+            conv_uid,
+            gpts_name,
+            user_query,
+            user_code,
+            sys_code,
+            enable_verbose=enable_verbose,
+            stream=stream,
+            **ext_info,
+        ):
+            if isinstance(chunk, AgentChatEvent):
+                yield encode_sse_event(chunk)
+            else:
+                yield chunk
+
+    async def app_agent_chat_events(
+        self,
+        conv_uid: str,
+        gpts_name: str,
+        user_query: str,
+        user_code: str = None,
+        sys_code: str = None,
+        **ext_info,
+    ) -> AsyncIterator[AgentChatEvent]:
+        """Chat with the app, yield the typed events of the chat.
+
+        The outputs, e.g. the web app or the OpenAI-compatible API, encode the events
+        by themselves.
+        """
+        async for event in self._app_agent_chat(
+            conv_uid,
+            gpts_name,
+            user_query,
+            user_code,
+            sys_code,
+            enable_verbose=True,
+            **ext_info,
+        ):
+            yield event
+
+    async def _app_agent_chat(
+        self,
+        conv_uid: str,
+        gpts_name: str,
+        user_query: str,
+        user_code: str = None,
+        sys_code: str = None,
+        enable_verbose: bool = True,
+        stream: Optional[bool] = True,
+        **ext_info,
     ):
         # logger.info(f"app_agent_chat:{gpts_name},{user_query},{conv_uid}")
 
@@ -544,6 +605,8 @@ class MultiAgents(BaseComponent, ABC):
         user_code: str = None,
         system_app: str = None,
     ):
+        # The items of the conversation view, the memory pushes their diffs
+        items: List[List[Any]] = []
         while True:
             queue = self.memory.queue(conv_id)
             if not queue:
@@ -553,6 +616,13 @@ class MultiAgents(BaseComponent, ABC):
                 queue.task_done()
                 break
             else:
+                if isinstance(item, dict) and item.get("type") == "incremental":
+                    apply_vis_diff(items, item)
+                    contents = [item[1] for item in items]
+                    if self.memory.enable_vis_message(conv_id):
+                        item = "\n".join(contents)
+                    else:
+                        item = contents
                 yield item
                 await asyncio.sleep(0.005)
 
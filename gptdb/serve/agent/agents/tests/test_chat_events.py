@@ -0,0 +1,95 @@
+import json
+
+from gptdb.serve.agent.agents.chat_events import (
+    AgentChatEventBuilder,
+    AgentChatEventType,
+    OpenAIStreamEncoder,
+    encode_sse_event,
+)
+
+
+def _openai_content(sse: str) -> str:
+    assert sse.startswith("data: ") and sse.endswith("\n\n")
+    return json.loads(sse[len("data: ") :])["choices"][0]["delta"]["content"]
+
+
+def test_builder_computes_deltas():
+    events = AgentChatEventBuilder("conv_1")
+    first = events.output("Hello")
+    second = events.output("Hello, world")
+    assert (first.delta, second.delta) == ("Hello", ", world")
+    assert second.content == "Hello, world"
+    assert not second.reset
+    assert second.conv_id == "conv_1"
+
+    rewritten = events.output("Bye")
+    assert rewritten.reset
+    assert rewritten.delta == "Bye"
+
+
+def test_sse_encoder_keeps_web_format():
+    events = AgentChatEventBuilder()
+    event = events.output('```vis\n{"a": "中文"}\n```')
+    sse = encode_sse_event(event)
+    assert sse.startswith("data:{") and sse.endswith("\n\n")
+    assert json.loads(sse[len("data:") :])["vis"] == event.content
+    assert encode_sse_event(events.error("boom")) == 'data:{"vis": "boom"} \n\n'
+    assert encode_sse_event(events.done()) == 'data:{"vis": "[DONE]"} \n\n'
+
+    text = events.output("line1\nline2", AgentChatEventType.TEXT)
+    assert encode_sse_event(text) == "data:line1\\nline2\n\n"
+
+
+def test_openai_encoder_sends_vis_snapshots():
+    events = AgentChatEventBuilder()
+    encoder = OpenAIStreamEncoder("conv_1", "fake_model")
+    outputs = [encoder.encode(events.output(text)) for text in ["a", "ab", "ab", "abc"]]
+    assert outputs[2] is None
+    assert [_openai_content(o) for o in outputs if o] == ["a", "ab", "abc"]
+    assert json.loads(outputs[0][len("data: ") :])["model"] == "fake_model"
+
+    assert _openai_content(encoder.encode(events.output("xyz"))) == "xyz"
+    assert encoder.encode(events.done()) is None
+    assert encoder.finish() == "data: [DONE]\n\n"
+
+
+def test_openai_encoder_sends_text_deltas():
+    events = AgentChatEventBuilder()
+    encoder = OpenAIStreamEncoder("conv_1", "fake_model")
+    texts = ["Hello", "Hello, wor", "Hello, world"]
+    outputs = [
+        encoder.encode(events.output(text, AgentChatEventType.TEXT)) for text in texts
+    ]
+    assert "".join(_openai_content(o) for o in outputs) == "Hello, world"
+
+
+def test_openai_encoder_reset_after_deltas():
+    events = AgentChatEventBuilder()
+    encoder = OpenAIStreamEncoder("conv_1", "fake_model")
+    # The tail of the vis text is rewritten, every chunk is a full snapshot
+    vis_texts = ["```a\n1", "```a\n12", "```a\n12\n```", "```a\n2\n```"]
+    vis_events = [events.output(text) for text in vis_texts]
+    assert vis_events[-1].reset and not any(e.reset for e in vis_events[1:-1])
+    outputs = [_openai_content(encoder.encode(event)) for event in vis_events]
+    assert outputs == vis_texts
+
+    # The text after the vis snapshots is sent as deltas
+    text_events = AgentChatEventBuilder()
+    outputs = [
+        encoder.encode(text_events.output(text, AgentChatEventType.TEXT))
+        for text in ["ans", "answer"]
+    ]
+    assert "".join(_openai_content(o) for o in outputs) == "answer"
+
+
+def test_openai_encoder_text_reset_starts_a_choice():
+    events = AgentChatEventBuilder()
+    encoder = OpenAIStreamEncoder("conv_1", "fake_model")
+    texts = ["ans", "answer", "[SERVER_ERROR]boom", "[SERVER_ERROR]boom!"]
+    choices = {}
+    for text in texts:
+        sse = encoder.encode(events.output(text, AgentChatEventType.TEXT))
+        index = json.loads(sse[len("data: ") :])["choices"][0]["index"]
+        choices[index] = choices.get(index, "") + _openai_content(sse)
+    # The text which replaces the output is not appended to the previous one
+    assert list(choices.values()) == ["answer", "[SERVER_ERROR]boom!"]
@@ -4,7 +4,7 @@ from typing import List, Optional, Union
 from sqlalchemy import URL
 
 from gptdb.component import SystemApp
-from gptdb.core import StorageInterface
+from gptdb.core import ConversationCache, StorageInterface
 from gptdb.serve.core import BaseServe
 from gptdb.storage.metadata import DatabaseManager
 
@@ -47,6 +47,7 @@ class Serve(BaseServe):
         self._db_manager: Optional[DatabaseManager] = None
         self._conv_storage = None
         self._message_storage = None
+        self._conv_cache = ConversationCache()
 
     @property
     def conv_storage(self) -> StorageInterface:
@@ -56,6 +57,15 @@ class Serve(BaseServe):
     def message_storage(self) -> StorageInterface:
         return self._message_storage
 
+    @property
+    def conv_cache(self) -> ConversationCache:
+        """Return the cache of the recently active conversations.
+
+        Pass it to every conversation built on the storages of this serve, so the
+        cached conversations are replaced when they are written.
+        """
+        return self._conv_cache
+
     def init_app(self, system_app: SystemApp):
         if self._app_has_initiated:
             return
@@ -2,6 +2,7 @@ from typing import Any, Dict, List, Optional, Union
 
 from gptdb.component import BaseComponent, SystemApp
 from gptdb.core import (
+    ConversationCache,
     InMemoryStorage,
     MessageStorageItem,
     QuerySpec,
@@ -89,6 +90,17 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             lambda serve: serve.message_storage,
         )
 
+    @property
+    def conv_cache(self) -> Optional[ConversationCache]:
+        """Return the cache of the recently active conversations of the serve."""
+        if self._storage or self._message_storage:
+            return None
+        from ..serve import Serve
+
+        return Serve.call_on_current_serve(
+            self._system_app, lambda serve: serve.conv_cache
+        )
+
     def create_storage_conv(
         self, request: Union[ServeRequest, Dict[str, Any]], load_message: bool = True
     ) -> StorageConversation:
@@ -108,6 +120,7 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             conv_storage=conv_storage,
             message_storage=message_storage,
             load_message=load_message,
+            conv_cache=self.conv_cache,
         )
         return storage_conv
 
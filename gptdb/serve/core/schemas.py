@@ -39,7 +39,10 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         err_code=str(exc.status_code),
     )
     logger.error(f"http_exception_handler catch HTTPException: {res}")
-    return JSONResponse(status_code=exc.status_code, content=res.to_dict())
+    # Keep the headers, e.g. the Retry-After of 429
+    return JSONResponse(
+        status_code=exc.status_code, content=res.to_dict(), headers=exc.headers
+    )
 
 
 async def common_exception_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -46,6 +46,13 @@ class ServeConfig(BaseServeConfig):
     local_storage_path: Optional[str] = field(
         default=None, metadata={"help": "The local storage path"}
     )
+    file_server_cache_max_size: int = field(
+        default=1024 * 1024 * 1024,
+        metadata={
+            "help": "The max size in bytes of the local cache of the files loaded from "
+            "other nodes, 0 to disable the cache"
+        },
+    )
 
     def get_node_address(self) -> str:
         """Get the node address"""
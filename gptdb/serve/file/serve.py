@@ -92,6 +92,7 @@ class Serve(BaseServe):
             save_chunk_size=self._serve_config.file_server_save_chunk_size,
             transfer_chunk_size=self._serve_config.file_server_transfer_chunk_size,
             transfer_timeout=self._serve_config.file_server_transfer_timeout,
+            cache_max_size=self._serve_config.file_server_cache_max_size,
         )
         storage_backends = {
             simple_distributed_storage.storage_type: simple_distributed_storage,
@@ -10,6 +10,7 @@ from starlette.responses import JSONResponse, StreamingResponse
 from gptdb.component import SystemApp
 from gptdb.core.awel.flow import ResourceMetadata, ViewMetadata
 from gptdb.core.awel.flow.flow_factory import FlowCategory
+from gptdb.core.awel.trigger.admission import get_admission_registry
 from gptdb.serve.core import Result, blocking_func_to_async
 from gptdb.util import PaginationResult
 
@@ -256,6 +257,17 @@ async def query_page(
     )
 
 
+@router.get("/admission/metrics", dependencies=[Depends(check_api_key)])
+async def get_admission_metrics() -> Result[List[Dict]]:
+    """Get the metrics of the admission limiters of the DAGs and the triggers
+
+    Returns:
+        Result[List[Dict]]: The concurrency, queue depth, rejected count and wait
+            time of each limiter
+    """
+    return Result.succ(get_admission_registry().metrics())
+
+
 @router.get("/nodes", dependencies=[Depends(check_api_key)])
 async def get_nodes(
     user_name: Optional[str] = Query(default=None, description="user name"),
@@ -25,6 +25,41 @@ class ServeConfig(BaseServeConfig):
     load_gptdbs_interval: int = field(
         default=5, metadata={"help": "Interval to load gptdbs from installed packages"}
     )
+    load_dag_concurrency: int = field(
+        default=1,
+        metadata={
+            "help": "The max number of flows to build concurrently when loading DAGs "
+            "at startup, 1 means build them one by one"
+        },
+    )
+    lazy_load_dag: bool = field(
+        default=False,
+        metadata={
+            "help": "Whether to load the DAGs of stored flows lazily, a flow is built "
+            "on its first chat call or the first request of its HTTP trigger routes"
+        },
+    )
     encrypt_key: Optional[str] = field(
         default=None, metadata={"help": "The key to encrypt the data"}
     )
+    dag_max_concurrency: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": "The default max number of concurrent runs of each DAG, not "
+            "limited if None"
+        },
+    )
+    dag_max_queue_size: int = field(
+        default=100,
+        metadata={
+            "help": "The max number of requests waiting to run a DAG, the others are "
+            "rejected with 429"
+        },
+    )
+    dag_max_wait_time: Optional[float] = field(
+        default=30.0,
+        metadata={
+            "help": "The max seconds a request waits to run a DAG before it is "
+            "rejected with 429"
+        },
+    )
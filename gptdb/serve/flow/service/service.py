@@ -1,26 +1,41 @@
+import asyncio
+import hashlib
 import json
 import logging
-from typing import AsyncIterator, List, Optional, cast
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, cast
 
 import schedule
 from fastapi import HTTPException
 
-from gptdb._private.pydantic import model_to_json
+from gptdb._private.pydantic import model_to_dict, model_to_json
 from gptdb.agent import AgentDummyTrigger
-from gptdb.component import SystemApp
+from gptdb.component import ComponentType, SystemApp
 from gptdb.core.awel import DAG, BaseOperator, CommonLLMHttpRequestBody
+from gptdb.core.awel.flow.base import OperatorCategory, ViewMetadata
 from gptdb.core.awel.flow.flow_factory import (
     FlowCategory,
     FlowFactory,
     State,
     fill_flow_panel,
 )
+from gptdb.core.awel.trigger.admission import (
+    AdmissionPolicy,
+    AdmissionTicket,
+    admit,
+    get_admission_registry,
+)
 from gptdb.core.awel.trigger.http_trigger import CommonLLMHttpTrigger
 from gptdb.core.awel.util.chat_util import (
     is_chat_flow_type,
     safe_chat_stream_with_dag_task,
     safe_chat_with_dag_task,
 )
+from gptdb.core.awel.util.http_util import join_paths
 from gptdb.core.interface.llm import ModelOutput
 from gptdb.core.schema.api import (
     ChatCompletionResponseStreamChoice,
@@ -30,6 +45,7 @@ from gptdb.core.schema.api import (
 from gptdb.serve.core import BaseService
 from gptdb.storage.metadata import BaseDao
 from gptdb.storage.metadata._base_dao import QUERY_SPEC
+from gptdb.util.executor_utils import blocking_func_to_async_no_executor
 from gptdb.util.gptdbs.loader import GPTDBsLoader
 from gptdb.util.pagination_utils import PaginationResult
 
@@ -40,6 +56,111 @@ from ..models.models import ServeDao, ServeEntity
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _FlowCallable:
+    """The resolved callable of a running flow, indexed by flow uid."""
+
+    dag_id: str
+    dag: DAG
+    task: BaseOperator
+    flow_category: Optional[FlowCategory] = None
+
+
+@lru_cache(maxsize=256)
+def _package_version(package: str) -> str:
+    """Return the installed version of the top-level package, empty if unknown."""
+    import importlib.metadata as metadata
+
+    try:
+        return metadata.version(package)
+    except Exception:
+        return str(getattr(sys.modules.get(package), "__version__", ""))
+
+
+def _flow_fingerprint(flow: ServeRequest) -> Optional[str]:
+    """Fingerprint the flow definition and the versions of its dependencies.
+
+    Two flows with the same fingerprint build the same DAG. It is only used to skip
+    updating a flow of the installed gptdbs whose DAG is already running or pending
+    in this process, e.g. just loaded from the database. It is not a cache of the
+    built DAGs, every DAG is still built once when the process starts.
+
+    Returns:
+        Optional[str]: The fingerprint, None if the flow is not defined by json
+    """
+    if flow.define_type != "json" or not flow.flow_data:
+        return None
+    from gptdb._version import version
+
+    hasher = hashlib.sha256()
+    flow_data = model_to_dict(flow.flow_data)
+    hasher.update(json.dumps(flow_data, sort_keys=True, default=str).encode())
+    hasher.update(f"{flow.version}:{version}".encode())
+    packages = set()
+    for node in flow.flow_data.nodes:
+        if node.data.type_cls:
+            packages.add(node.data.type_cls.split(".")[0])
+    for package in sorted(packages):
+        hasher.update(f"{package}={_package_version(package)}".encode())
+    return hasher.hexdigest()
+
+
+def _flow_http_routes(flow: ServeRequest) -> List[Tuple[str, List[str]]]:
+    """Return the endpoints and methods of the HTTP triggers of a json flow.
+
+    They are read from the flow definition, so the routes are known before the flow
+    is built.
+    """
+    routes: List[Tuple[str, List[str]]] = []
+    if flow.define_type != "json" or not flow.flow_data:
+        return routes
+    for node in flow.flow_data.nodes:
+        data = node.data
+        if not isinstance(data, ViewMetadata):
+            continue
+        if data.category != OperatorCategory.TRIGGER:
+            continue
+        values = {
+            p.name: p.value if p.value is not None else p.default
+            for p in data.parameters
+        }
+        endpoint = values.get("endpoint")
+        if not endpoint:
+            continue
+        methods = values.get("methods") or "GET"
+        if isinstance(methods, str):
+            methods = [methods]
+        routes.append((endpoint, [m.upper() for m in methods]))
+    return routes
+
+
+def _in_event_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """Whether the current thread runs the event loop."""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class _LazyFlowRoute:
+    """The ASGI app mounted at a trigger route of a flow waiting to be built.
+
+    The first request of the route builds the flow, which mounts the real route of
+    the trigger, then removes the stubs of the flow and dispatches the request again
+    to the real route.
+    """
+
+    def __init__(self, service: "Service", flow_uid: str):
+        self._service = service
+        self._flow_uid = flow_uid
+
+    async def __call__(self, scope, receive, send):
+        await self._service.amaterialize_flow(self._flow_uid)
+        self._service._remove_flow_route_stubs(self._flow_uid)
+        # The body is not read yet, the real route receives the whole request
+        await scope["app"].router(scope, receive, send)
+
+
 class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
     """The service class for Flow"""
 
@@ -51,6 +172,19 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         self._dao: ServeDao = dao
         self._flow_factory: FlowFactory = FlowFactory()
         self._gptdbs_loader: Optional[GPTDBsLoader] = None
+        # flow uid -> resolved callable, avoid querying the flow table in chat
+        self._flow_callables: Dict[str, _FlowCallable] = {}
+        self._flow_callables_lock = threading.Lock()
+        # flow uid -> fingerprint of the flow which the registered DAG built from
+        self._flow_fingerprints: Dict[str, str] = {}
+        # Flows waiting to be built in lazy load mode
+        self._pending_flows: Dict[str, ServerResponse] = {}
+        self._materializing_flows: Dict[str, Future] = {}
+        # flow uid -> the routes mounted for the triggers of a pending flow
+        self._flow_route_stubs: Dict[str, List[Any]] = {}
+        self._pending_lock = threading.Lock()
+        # The event loop of the app, the routes of the lazy flows are changed in it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         super().__init__(system_app)
 
@@ -73,6 +207,12 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             or_register_component=GPTDBsLoader,
             load_gptdbs_interval=self._serve_config.load_gptdbs_interval,
         )
+        if self._serve_config.dag_max_concurrency:
+            get_admission_registry().default_dag_policy = AdmissionPolicy(
+                self._serve_config.dag_max_concurrency,
+                self._serve_config.dag_max_queue_size,
+                self._serve_config.dag_max_wait_time,
+            )
 
     def before_start(self):
         """Execute before the application starts"""
@@ -155,6 +295,8 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             if state == State.DEPLOYED:
                 # Register the DAG
                 self.dag_manager.register_dag(dag, request.uid)
+                self._index_flow_callable(request.uid, dag, request.flow_category)
+                self._record_flow_fingerprint(request)
                 # Update state to RUNNING
                 request.state = State.RUNNING
                 request.error_message = ""
@@ -187,26 +329,244 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
                 )
 
     def load_dag_from_db(self):
-        """Load DAG from db"""
-        entities = self.dao.get_list({})
-        for entity in entities:
+        """Load DAG from db
+
+        The DAGs are built concurrently when ``load_dag_concurrency`` is greater than
+        1. In lazy load mode, the flows are only queued here, the routes of their HTTP
+        triggers are mounted as stubs, and a flow is built on its first chat call or
+        the first request of one of its routes.
+        """
+        entities = []
+        for entity in self.dao.get_list({}):
+            if entity.define_type != "json":
+                continue
+            if entity.state in [State.DEPLOYED, State.RUNNING] or (
+                entity.version == "0.1.0" and entity.state == State.INITIALIZING
+            ):
+                entities.append(entity)
+        if self.config.lazy_load_dag:
             try:
-                if entity.define_type != "json":
-                    continue
-                dag = self._flow_factory.build(entity)
-                if entity.state in [State.DEPLOYED, State.RUNNING] or (
-                    entity.version == "0.1.0" and entity.state == State.INITIALIZING
-                ):
-                    # Register the DAG
-                    self.dag_manager.register_dag(dag, entity.uid)
-                    # Update state to RUNNING
-                    entity.state = State.RUNNING
-                    entity.error_message = ""
-                    self.dao.update({"uid": entity.uid}, entity)
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._loop = None
+            with self._pending_lock:
+                for entity in entities:
+                    self._pending_flows[entity.uid] = entity
+                    self._record_flow_fingerprint(entity)
+            for entity in entities:
+                self._mount_flow_route_stubs(entity)
+            logger.info(f"Lazy load mode, {len(entities)} flows wait to be built")
+            return
+        self._load_dags(entities)
+
+    def _load_dags(self, entities: List[ServerResponse]):
+        """Build the DAGs of the flows and register them."""
+        self._save_running_flows(self._register_dags(self._build_dags(entities)))
+
+    def _register_dags(
+        self, built: List[Tuple[ServerResponse, Optional[DAG], Optional[Exception]]]
+    ) -> List[ServerResponse]:
+        """Register the built DAGs, which mounts the routes of their triggers.
+
+        The route stubs of a lazy flow are removed right before its real routes are
+        mounted, call it in the event loop thread so no request is routed between.
+
+        Returns:
+            List[ServerResponse]: The flows whose state must be saved as running
+        """
+        to_save = []
+        for entity, dag, error in built:
+            self._remove_flow_route_stubs(entity.uid)
+            if error:
+                logger.warning(
+                    f"Load DAG({entity.name}, {entity.dag_id}) from db error: "
+                    f"{str(error)}"
+                )
+                continue
+            try:
+                # Register the DAG
+                self.dag_manager.register_dag(dag, entity.uid)
+                self._index_flow_callable(entity.uid, dag, entity.flow_category)
+                self._record_flow_fingerprint(entity)
+                if entity.state != State.RUNNING or entity.error_message:
+                    to_save.append(entity)
             except Exception as e:
                 logger.warning(
                     f"Load DAG({entity.name}, {entity.dag_id}) from db error: {str(e)}"
                 )
+        return to_save
+
+    def _save_running_flows(self, entities: List[ServerResponse]):
+        for entity in entities:
+            try:
+                # Update state to RUNNING
+                entity.state = State.RUNNING
+                entity.error_message = ""
+                self.dao.update({"uid": entity.uid}, entity)
+            except Exception as e:
+                logger.warning(f"Update flow({entity.name}) state error: {str(e)}")
+
+    def _build_dags(
+        self, entities: List[ServerResponse]
+    ) -> List[Tuple[ServerResponse, Optional[DAG], Optional[Exception]]]:
+        """Build the DAGs of the flows, concurrently if configured.
+
+        Returns:
+            List[Tuple[ServerResponse, Optional[DAG], Optional[Exception]]]: The
+                flow, the DAG built from it and the error raised when building, in
+                the order of the given flows
+        """
+
+        def _build(
+            entity: ServerResponse,
+        ) -> Tuple[ServerResponse, Optional[DAG], Optional[Exception]]:
+            try:
+                return entity, self._flow_factory.build(entity), None
+            except Exception as e:
+                return entity, None, e
+
+        concurrency = min(self.config.load_dag_concurrency, len(entities))
+        if concurrency <= 1:
+            return [_build(entity) for entity in entities]
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="flow_dag_builder"
+        ) as executor:
+            return list(executor.map(_build, entities))
+
+    def materialize_flow(self, flow_uid: str) -> None:
+        """Build and register a flow waiting in lazy load mode.
+
+        It does nothing if the flow is not waiting to be built. If the flow is being
+        built by another thread, wait for it to finish. Called outside the event loop
+        of the app, the flow is materialized in the event loop.
+
+        Args:
+            flow_uid (str): The uid of the flow
+        """
+        loop = self._loop
+        if loop and loop.is_running() and not _in_event_loop(loop):
+            asyncio.run_coroutine_threadsafe(
+                self.amaterialize_flow(flow_uid), loop
+            ).result()
+            return
+        entity, building = self._claim_pending_flow(flow_uid)
+        if entity is None:
+            if building:
+                building.result()
+            return
+        try:
+            self._load_dags([entity])
+        finally:
+            self._release_pending_flow(flow_uid, building)
+
+    async def amaterialize_flow(self, flow_uid: str) -> None:
+        """Build and register a flow waiting in lazy load mode, asynchronously.
+
+        The DAG is built in a thread, then its route stubs are replaced with the real
+        routes of its triggers in the event loop thread.
+
+        Args:
+            flow_uid (str): The uid of the flow
+        """
+        entity, building = self._claim_pending_flow(flow_uid)
+        if entity is None:
+            if building:
+                await asyncio.wrap_future(building)
+            return
+        try:
+            built = await blocking_func_to_async_no_executor(self._build_dags, [entity])
+            to_save = self._register_dags(built)
+            if to_save:
+                await blocking_func_to_async_no_executor(
+                    self._save_running_flows, to_save
+                )
+        finally:
+            self._release_pending_flow(flow_uid, building)
+
+    def _claim_pending_flow(
+        self, flow_uid: str
+    ) -> Tuple[Optional[ServerResponse], Optional[Future]]:
+        """Take the pending flow to build it.
+
+        Returns:
+            Tuple[Optional[ServerResponse], Optional[Future]]: The flow and the future
+                to set when it is built. The flow is None if it is not pending, the
+                future is then the one of the flow being built by another caller.
+        """
+        with self._pending_lock:
+            entity = self._pending_flows.pop(flow_uid, None)
+            if entity is None:
+                return None, self._materializing_flows.get(flow_uid)
+            building: Future = Future()
+            self._materializing_flows[flow_uid] = building
+            return entity, building
+
+    def _release_pending_flow(self, flow_uid: str, building: Future) -> None:
+        with self._pending_lock:
+            self._materializing_flows.pop(flow_uid, None)
+        building.set_result(None)
+
+    def _mount_flow_route_stubs(self, flow: ServerResponse) -> None:
+        """Mount the routes of the HTTP triggers of a pending flow as stubs."""
+        from starlette.routing import Route
+
+        from gptdb.core.awel.trigger.trigger_manager import DefaultTriggerManager
+
+        app = self._system_app.app if self._system_app else None
+        routes = _flow_http_routes(flow)
+        if not app or not routes:
+            return
+        trigger_manager = self._system_app.get_component(
+            ComponentType.AWEL_TRIGGER_MANAGER,
+            DefaultTriggerManager,
+            default_component=None,
+        )
+        if not trigger_manager or not trigger_manager.http_router_prefix:
+            return
+        stub = _LazyFlowRoute(self, flow.uid)
+        router = app.router
+        stubs = []
+        for endpoint, methods in routes:
+            path = join_paths(trigger_manager.http_router_prefix, endpoint)
+            route = Route(path, endpoint=stub, methods=methods, include_in_schema=False)
+            # Before the other routes, like the real routes of the triggers
+            router.routes.insert(0, route)
+            if hasattr(router, "route_priority"):
+                router.route_priority.setdefault(path, 10)
+                router.sort_routes_by_priority()
+            stubs.append(route)
+        with self._pending_lock:
+            self._flow_route_stubs[flow.uid] = stubs
+
+    def _remove_flow_route_stubs(self, flow_uid: str) -> None:
+        with self._pending_lock:
+            stubs = self._flow_route_stubs.pop(flow_uid, [])
+        if not stubs:
+            return
+        routes = self._system_app.app.router.routes
+        for route in stubs:
+            if route in routes:
+                routes.remove(route)
+
+    def _is_flow_pending(self, flow_uid: str) -> bool:
+        return flow_uid in self._pending_flows or flow_uid in self._materializing_flows
+
+    def _record_flow_fingerprint(self, flow: ServeRequest) -> None:
+        fingerprint = _flow_fingerprint(flow)
+        if fingerprint:
+            self._flow_fingerprints[flow.uid] = fingerprint
+        else:
+            self._flow_fingerprints.pop(flow.uid, None)
+
+    def _is_flow_unchanged(self, flow: ServeRequest, flow_uid: str) -> bool:
+        """Whether the running or pending DAG of the flow was built from the same
+        definition and dependency versions."""
+        fingerprint = _flow_fingerprint(flow)
+        if not fingerprint or self._flow_fingerprints.get(flow_uid) != fingerprint:
+            return False
+        return self._is_flow_pending(flow_uid) or bool(
+            self.dag_manager.get_dag(alias_name=flow_uid)
+        )
 
     def _pre_load_dag_from_gptdbs(self):
         """Pre load DAG from gptdbs"""
@@ -233,6 +593,11 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
                 exist_inst = self.get({"name": flow.name})
                 if not exist_inst:
                     self.create_and_save_dag(flow, save_failed_flow=True)
+                elif exist_inst.state == State.RUNNING and self._is_flow_unchanged(
+                    flow, exist_inst.uid
+                ):
+                    # Reuse the DAG built from the same flow definition
+                    continue
                 elif is_first_load or exist_inst.state != State.RUNNING:
                     # TODO check version, must be greater than the exist one
                     flow.uid = exist_inst.uid
@@ -346,6 +711,13 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         # TODO: implement your own logic here
         # Build the query request from the request
         query_request = {"uid": uid}
+        with self._pending_lock:
+            # A pending flow has no registered DAG to unregister
+            pending = self._pending_flows.pop(uid, None) is not None
+        self._remove_flow_route_stubs(uid)
+        building = self._materializing_flows.get(uid)
+        if building:
+            building.result()
         inst = self.get(query_request)
         if inst is None:
             raise HTTPException(status_code=404, detail=f"Flow {uid} not found")
@@ -353,8 +725,10 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             raise HTTPException(
                 status_code=404, detail=f"Running flow {uid}'s dag id not found"
             )
+        self._evict_flow_callable(uid)
+        self._flow_fingerprints.pop(uid, None)
         try:
-            if inst.dag_id:
+            if inst.dag_id and not pending:
                 self.dag_manager.unregister_dag(inst.dag_id)
         except Exception as e:
             logger.warning(f"Unregister DAG({inst.dag_id}) error: {str(e)}")
@@ -498,6 +872,26 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         except Exception as e:
             yield ModelOutput(error_code=1, text=str(e), incremental=incremental)
 
+    async def admit_flow(self, flow_uid: str) -> Optional[AdmissionTicket]:
+        """Take a slot of the DAG of the flow before chatting with it.
+
+        Args:
+            flow_uid (str): The flow uid
+
+        Returns:
+            Optional[AdmissionTicket]: The ticket to release when the chat ends, None
+                if the flow can't be resolved, the chat reports the error then.
+
+        Raises:
+            AdmissionRejectedError: If the DAG of the flow is overloaded.
+        """
+        try:
+            task = await self._get_callable_task(flow_uid)
+        except Exception:
+            return None
+        dag = task.dag
+        return await admit(dag.admission_limiter if dag else None)
+
     async def _get_callable_task(
         self,
         flow_uid: str,
@@ -511,6 +905,11 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
             HTTPException: If the flow is not found
             ValueError: If the flow is not a chat flow or the leaf node is not found.
         """
+        if self._is_flow_pending(flow_uid):
+            await self.amaterialize_flow(flow_uid)
+        flow_callable = self._get_flow_callable(flow_uid)
+        if flow_callable:
+            return flow_callable.task
         flow = self.get({"uid": flow_uid})
         if not flow:
             raise HTTPException(status_code=404, detail=f"Flow {flow_uid} not found")
@@ -525,10 +924,58 @@ class Service(BaseService[ServeEntity, ServeRequest, ServerResponse]):
         #     and self._parse_flow_category(dag) != FlowCategory.CHAT_FLOW
         # ):
         #     raise ValueError(f"Flow {flow_uid} is not a chat flow")
+        return self._index_flow_callable(flow_uid, dag, flow.flow_category).task
+
+    def _index_flow_callable(
+        self, flow_uid: str, dag: DAG, flow_category: Optional[FlowCategory] = None
+    ) -> _FlowCallable:
+        """Resolve the callable task of the DAG and index it by the flow uid.
+
+        Args:
+            flow_uid (str): The flow uid
+            dag (DAG): The DAG registered for the flow
+            flow_category (Optional[FlowCategory]): The flow category
+
+        Returns:
+            _FlowCallable: The resolved callable
+
+        Raises:
+            ValueError: If the leaf node is not found.
+        """
         leaf_nodes = dag.leaf_nodes
         if len(leaf_nodes) != 1:
             raise ValueError("Chat Flow just support one leaf node in dag")
-        return cast(BaseOperator, leaf_nodes[0])
+        flow_callable = _FlowCallable(
+            dag_id=dag.dag_id,
+            dag=dag,
+            task=cast(BaseOperator, leaf_nodes[0]),
+            flow_category=flow_category,
+        )
+        with self._flow_callables_lock:
+            self._flow_callables[flow_uid] = flow_callable
+        return flow_callable
+
+    def _evict_flow_callable(self, flow_uid: str) -> None:
+        """Remove the indexed callable of the flow."""
+        with self._flow_callables_lock:
+            self._flow_callables.pop(flow_uid, None)
+
+    def _get_flow_callable(self, flow_uid: str) -> Optional[_FlowCallable]:
+        """Get the callable of the flow without querying the database.
+
+        The index is validated against the DAGManager, so a DAG unregistered or
+        replaced outside this service is never returned. DAGs registered by the
+        DAGManager with the flow uid as alias are indexed on the first access.
+        """
+        flow_callable = self._flow_callables.get(flow_uid)
+        if flow_callable:
+            if self.dag_manager.dag_map.get(flow_callable.dag_id) is flow_callable.dag:
+                return flow_callable
+            self._evict_flow_callable(flow_uid)
+        dag = self.dag_manager.get_dag(alias_name=flow_uid)
+        if not dag or len(dag.leaf_nodes) != 1:
+            return None
+        return self._index_flow_callable(flow_uid, dag, self._parse_flow_category(dag))
 
     def _parse_flow_category(self, dag: DAG) -> FlowCategory:
         """Parse the flow category
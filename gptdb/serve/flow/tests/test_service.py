@@ -1,6 +1,9 @@
+import asyncio
+import threading
 from typing import List
 
 import pytest
+from fastapi import HTTPException
 
 from gptdb.component import SystemApp
 from gptdb.serve.core.tests.conftest import system_app
@@ -76,3 +79,292 @@ def test_service_get_list_by_page(service: Service):
 
 
 # Add more test cases according to your own logic
+
+
+@pytest.fixture
+def flow_service(system_app: SystemApp):
+    from gptdb.core.awel.dag.dag_manager import DAGManager
+
+    system_app.register(DAGManager, dag_dirs=[])
+    instance = Service(system_app)
+    instance.init_app(system_app)
+    instance.before_start()
+    return instance
+
+
+def _build_flow_request(name: str) -> ServeRequest:
+    from gptdb.core.awel import DAG, MapOperator
+    from gptdb.core.awel.flow.flow_factory import State
+
+    with DAG(f"test_flow_dag_{name}") as dag:
+        MapOperator(lambda x: x)
+    return ServeRequest(
+        uid=f"uid_{name}",
+        name=name,
+        label=name,
+        define_type="python",
+        flow_dag=dag,
+        state=State.DEPLOYED,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_callable_task_without_db_query(flow_service: Service, mocker):
+    request = _build_flow_request("chat")
+    flow_service.create_and_save_dag(request)
+    dag = flow_service.dag_manager.get_dag(alias_name=request.uid)
+    get_one = mocker.spy(flow_service.dao, "get_one")
+
+    for _ in range(3):
+        task = await flow_service._get_callable_task(request.uid)
+        assert task is dag.leaf_nodes[0]
+    assert get_one.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_callable_index_follows_dag_manager(flow_service: Service):
+    request = _build_flow_request("index")
+    flow_service.create_and_save_dag(request)
+    dag_id = flow_service.dag_manager.get_dag(alias_name=request.uid).dag_id
+
+    # Unregister outside the service, the index must not return the stale task
+    flow_service.dag_manager.unregister_dag(dag_id)
+    assert flow_service._get_flow_callable(request.uid) is None
+    with pytest.raises(HTTPException):
+        await flow_service._get_callable_task(request.uid)
+
+    # Register by the DAGManager directly, the index is filled on first access
+    new_request = _build_flow_request("index")
+    flow_service.dag_manager.register_dag(new_request.flow_dag, request.uid)
+    task = await flow_service._get_callable_task(request.uid)
+    assert task is new_request.flow_dag.leaf_nodes[0]
+
+    flow_service.delete(request.uid)
+    assert request.uid not in flow_service._flow_callables
+
+
+def _create_stored_flows(service: Service, num: int) -> List[str]:
+    from gptdb.core.awel.flow.flow_factory import State
+
+    uids = []
+    for i in range(num):
+        request = ServeRequest(
+            uid=f"stored_uid_{i}",
+            name=f"stored_{i}",
+            label=f"stored_{i}",
+            define_type="json",
+            state=State.RUNNING,
+        )
+        service.dao.create(request)
+        uids.append(request.uid)
+    return uids
+
+
+def _fake_build(flow):
+    from gptdb.core.awel import DAG, MapOperator
+
+    with DAG(f"stored_dag_{flow.uid}") as dag:
+        MapOperator(lambda x: x)
+    return dag
+
+
+def test_load_dag_from_db_concurrently(flow_service: Service, mocker):
+    uids = _create_stored_flows(flow_service, 8)
+    flow_service.config.load_dag_concurrency = 4
+    # Every build waits for 3 others, it fails unless 4 builds overlap
+    barrier = threading.Barrier(4, timeout=5)
+
+    def _build(flow):
+        barrier.wait()
+        return _fake_build(flow)
+
+    build = mocker.patch.object(flow_service._flow_factory, "build", side_effect=_build)
+    update = mocker.spy(flow_service.dao, "update")
+
+    flow_service.load_dag_from_db()
+
+    assert build.call_count == len(uids)
+    for uid in uids:
+        assert flow_service.dag_manager.get_dag(alias_name=uid)
+    # The stored flows are already running, no need to update them
+    assert update.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_lazy_load_dag_from_db(flow_service: Service, mocker):
+    uids = _create_stored_flows(flow_service, 3)
+    flow_service.config.lazy_load_dag = True
+    build = mocker.patch.object(
+        flow_service._flow_factory, "build", side_effect=_fake_build
+    )
+
+    flow_service.load_dag_from_db()
+    assert build.call_count == 0
+
+    # Build on the first call
+    task = await flow_service._get_callable_task(uids[0])
+    assert task is flow_service.dag_manager.get_dag(alias_name=uids[0]).leaf_nodes[0]
+    await flow_service._get_callable_task(uids[0])
+    assert build.call_count == 1
+
+    # The others are still waiting for their first call
+    for uid in uids[1:]:
+        assert flow_service.dag_manager.get_dag(alias_name=uid) is None
+    flow_service.materialize_flow(uids[1])
+    assert build.call_count == 2
+    assert flow_service.dag_manager.get_dag(alias_name=uids[1])
+
+
+@pytest.mark.asyncio
+async def test_materialize_flow_from_thread_registers_in_loop(
+    flow_service: Service, mocker
+):
+    uids = _create_stored_flows(flow_service, 1)
+    flow_service.config.lazy_load_dag = True
+    mocker.patch.object(flow_service._flow_factory, "build", side_effect=_fake_build)
+    register_threads = []
+    register_dags = flow_service._register_dags
+
+    def _register(built):
+        register_threads.append(threading.get_ident())
+        return register_dags(built)
+
+    mocker.patch.object(flow_service, "_register_dags", side_effect=_register)
+    flow_service.load_dag_from_db()
+
+    await asyncio.to_thread(flow_service.materialize_flow, uids[0])
+    assert flow_service.dag_manager.get_dag(alias_name=uids[0])
+    assert register_threads == [threading.get_ident()]
+
+
+def _http_flow_data(endpoint: str):
+    from gptdb._private.pydantic import model_to_dict
+    from gptdb.core.awel.flow.flow_factory import (
+        FlowData,
+        FlowNodeData,
+        FlowPositionData,
+    )
+    from gptdb.core.awel.trigger.http_trigger import DictHttpTrigger
+
+    metadata = model_to_dict(DictHttpTrigger.metadata)
+    for param in metadata["parameters"]:
+        if param["name"] == "endpoint":
+            param["value"] = endpoint
+    position = FlowPositionData(x=0, y=0, zoom=0)
+    node = FlowNodeData(
+        width=100,
+        height=100,
+        id=f"{metadata['id']}_0",
+        position=position,
+        position_absolute=position,
+        data=metadata,
+    )
+    return FlowData(nodes=[node], edges=[], viewport=position)
+
+
+@pytest.mark.asyncio
+async def test_lazy_flow_built_on_first_route_hit(system_app: SystemApp, mocker):
+    from httpx import ASGITransport, AsyncClient
+
+    from gptdb.core.awel import DAG, MapOperator
+    from gptdb.core.awel.dag.dag_manager import DAGManager
+    from gptdb.core.awel.flow.flow_factory import State
+    from gptdb.core.awel.trigger.http_trigger import DictHttpTrigger
+    from gptdb.core.awel.trigger.trigger_manager import DefaultTriggerManager
+    from gptdb.util.fastapi import replace_router
+
+    # The dynamic routes of the triggers are mounted to a priority router
+    replace_router(system_app.app)
+    system_app.register(DefaultTriggerManager)
+    dag_manager = system_app.register(DAGManager, dag_dirs=[])
+    dag_manager.before_start()
+    service = Service(system_app)
+    service.init_app(system_app)
+    service.before_start()
+    service.config.lazy_load_dag = True
+    for name in ["echo", "other"]:
+        service.dao.create(
+            ServeRequest(
+                uid=f"lazy_{name}",
+                name=f"lazy_{name}",
+                label=f"lazy_{name}",
+                dag_id=f"lazy_dag_lazy_{name}",
+                define_type="json",
+                state=State.RUNNING,
+                flow_data=_http_flow_data(f"/lazy/{name}"),
+            )
+        )
+
+    def _build(flow):
+        with DAG(f"lazy_dag_{flow.uid}") as dag:
+            trigger = DictHttpTrigger(f"/lazy/{flow.name[5:]}", methods="POST")
+            trigger >> MapOperator(lambda body: {"echo": body["text"]})
+        return dag
+
+    build = mocker.patch.object(service._flow_factory, "build", side_effect=_build)
+    register_threads = []
+    register_dags = service._register_dags
+
+    def _register(built):
+        register_threads.append(threading.get_ident())
+        return register_dags(built)
+
+    mocker.patch.object(service, "_register_dags", side_effect=_register)
+    service.load_dag_from_db()
+    assert build.call_count == 0
+
+    async with AsyncClient(
+        transport=ASGITransport(app=system_app.app), base_url="http://test"
+    ) as client:
+        for i in range(2):
+            response = await client.post(
+                "/api/v1/awel/trigger/lazy/echo", json={"text": f"hi {i}"}
+            )
+            assert response.status_code == 200
+            assert response.json() == {"echo": f"hi {i}"}
+    # Only the requested flow is built, once
+    assert build.call_count == 1
+    # The stubs are replaced with the real routes in the event loop thread
+    assert register_threads == [threading.get_ident()]
+    assert service.dag_manager.get_dag(alias_name="lazy_echo")
+    assert service.dag_manager.get_dag(alias_name="lazy_other") is None
+
+    service.delete("lazy_other")
+    paths = [getattr(route, "path", None) for route in system_app.app.router.routes]
+    assert "/api/v1/awel/trigger/lazy/other" not in paths
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "system_app",
+    [
+        {
+            "app_config": {
+                "gptdb.serve.flow.dag_max_concurrency": 1,
+                "gptdb.serve.flow.dag_max_queue_size": 0,
+            }
+        }
+    ],
+    indirect=True,
+)
+async def test_admit_flow_with_default_dag_limit(flow_service: Service):
+    from gptdb.core.awel.trigger.admission import (
+        AdmissionRejectedError,
+        get_admission_registry,
+    )
+
+    registry = get_admission_registry()
+    try:
+        request = _build_flow_request("admission")
+        flow_service.create_and_save_dag(request)
+
+        ticket = await flow_service.admit_flow(request.uid)
+        with pytest.raises(AdmissionRejectedError):
+            await flow_service.admit_flow(request.uid)
+        ticket.release()
+        (await flow_service.admit_flow(request.uid)).release()
+
+        # The unknown flow is reported by the chat
+        assert await flow_service.admit_flow("unknown") is None
+    finally:
+        registry.default_dag_policy = None
@@ -418,6 +418,19 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         """
         return self._chunk_dao.get_list_page(request, page, page_size)
 
+    def get_chunk_list_by_cursor(
+        self, request: QUERY_SPEC, cursor: Optional[int], page_size: int
+    ):
+        """get document chunks after the cursor (keyset pagination)
+        Args:
+            - request: QUERY_SPEC
+            - cursor: the next_cursor of the previous page, 0 for the first page
+            - page_size: the page size
+        """
+        return self._chunk_dao.get_list_by_cursor(
+            request, cursor, page_size, with_total=not cursor
+        )
+
     def update_chunk(self, request: ChunkServeRequest):
         """update knowledge document chunk"""
         if not request.id:
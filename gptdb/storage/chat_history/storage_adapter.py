@@ -1,7 +1,7 @@
 """Adapter for chat history storage."""
 
 import json
-from typing import Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type
 
 from sqlalchemy.orm import Session
 
@@ -25,8 +25,21 @@ class DBStorageConversationItemAdapter(
     """Adapter for chat history storage."""
 
     def to_storage_format(self, item: StorageConversation) -> ChatHistoryEntity:
-        """Convert to storage format."""
-        message_ids = ",".join(item.message_ids)
+        """Convert to storage format.
+
+        The appended message ids are concatenated to the stored ones in the database,
+        the column is not written if no message id is appended.
+        """
+        appended_message_ids = item.appended_message_ids
+        message_ids: Any
+        if appended_message_ids is None:
+            message_ids = ",".join(item.message_ids)
+        elif appended_message_ids:
+            message_ids = ChatHistoryEntity.message_ids + (
+                "," + ",".join(appended_message_ids)
+            )
+        else:
+            message_ids = None
         messages = None
         if not item.save_message_independent and item.messages:
             message_dict_list = [_conversation_to_dict(item)]
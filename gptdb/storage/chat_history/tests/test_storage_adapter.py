@@ -1,8 +1,16 @@
+import time
 from typing import List
 
 import pytest
 
-from gptdb.core.interface.message import AIMessage, HumanMessage, StorageConversation
+from gptdb.core.interface.message import (
+    AIMessage,
+    ConversationCache,
+    HumanMessage,
+    MessageIdentifier,
+    MessageStorageItem,
+    StorageConversation,
+)
 from gptdb.core.interface.storage import QuerySpec
 from gptdb.storage.chat_history.chat_history_db import (
     ChatHistoryEntity,
@@ -218,3 +226,226 @@ def test_query_with_page(
     assert page_result.page_size == 2
     assert len(page_result.items) == 2
     assert page_result.items[0].conv_uid == "conv0"
+
+
+def _add_rounds(conversation: StorageConversation, rounds: int):
+    for _ in range(rounds):
+        conversation.start_new_round()
+        conversation.add_user_message(f"question {conversation.chat_order}")
+        conversation.add_ai_message(f"answer {conversation.chat_order}")
+        conversation.end_current_round()
+
+
+def _load(conv_uid: str, conv_storage, message_storage, **kwargs):
+    return StorageConversation(
+        conv_uid=conv_uid,
+        conv_storage=conv_storage,
+        message_storage=message_storage,
+        **kwargs,
+    )
+
+
+def _stored_message_ids(db_manager, conv_uid: str) -> List[str]:
+    with db_manager.session() as session:
+        entity = session.query(ChatHistoryEntity).filter_by(conv_uid=conv_uid).one()
+        return entity.message_ids.split(",")
+
+
+def test_load_latest_rounds(
+    conversation: StorageConversation, conv_storage, message_storage
+):
+    _add_rounds(conversation, 10)
+
+    windowed = _load("conv1", conv_storage, message_storage, history_rounds=3)
+    assert [m.content for m in windowed.messages] == [
+        "question 8",
+        "answer 8",
+        "question 9",
+        "answer 9",
+        "question 10",
+        "answer 10",
+    ]
+    assert windowed.chat_order == 10
+    assert windowed.has_earlier_messages
+
+    earlier = windowed.load_earlier_rounds(2)
+    assert [m.content for m in earlier] == [
+        "question 6",
+        "answer 6",
+        "question 7",
+        "answer 7",
+    ]
+    assert len(windowed.messages) == 10
+    windowed.load_earlier_rounds(100)
+    assert not windowed.has_earlier_messages
+    assert windowed.load_earlier_rounds(1) == []
+    assert len(windowed.messages) == 20
+
+
+def test_save_windowed_conversation(
+    conversation: StorageConversation, conv_storage, message_storage, db_manager
+):
+    _add_rounds(conversation, 5)
+
+    windowed = _load("conv1", conv_storage, message_storage, history_rounds=1)
+    _add_rounds(windowed, 1)
+    assert windowed.messages[-1].index == 11
+
+    full = _load("conv1", conv_storage, message_storage)
+    assert [m.content for m in full.messages][-4:] == [
+        "question 5",
+        "answer 5",
+        "question 6",
+        "answer 6",
+    ]
+    assert [m.index for m in full.messages] == list(range(12))
+    assert _stored_message_ids(db_manager, "conv1") == full.message_ids
+    assert len(full.message_ids) == 12
+
+    # Saving without new messages keeps the stored ids
+    windowed.save_to_storage()
+    assert len(_stored_message_ids(db_manager, "conv1")) == 12
+
+    windowed.clear()
+    assert _load("conv1", conv_storage, message_storage).messages == []
+    assert (
+        message_storage.load_list(
+            [MessageIdentifier("conv1", i) for i in range(12)], MessageStorageItem
+        )
+        == []
+    )
+
+
+def test_zero_history_rounds(
+    conversation: StorageConversation, conv_storage, message_storage
+):
+    _add_rounds(conversation, 3)
+    windowed = _load("conv1", conv_storage, message_storage, history_rounds=0)
+    assert windowed.messages == []
+    assert windowed.chat_order == 3
+    _add_rounds(windowed, 1)
+    full = _load("conv1", conv_storage, message_storage)
+    assert [m.round_index for m in full.messages] == [1, 1, 2, 2, 3, 3, 4, 4]
+
+
+def test_conversation_cache(
+    conversation: StorageConversation, conv_storage, message_storage, mocker
+):
+    cache = ConversationCache()
+    writer = _load(
+        "conv1", conv_storage, message_storage, user_name="user1", conv_cache=cache
+    )
+    _add_rounds(writer, 4)
+    assert len(cache) == 1
+
+    load = mocker.spy(conv_storage, "load")
+    load_list = mocker.spy(message_storage, "load_list")
+    cached = _load(
+        "conv1", conv_storage, message_storage, history_rounds=2, conv_cache=cache
+    )
+    assert load.call_count == 0 and load_list.call_count == 0
+    assert [m.content for m in cached.messages] == [
+        "question 3",
+        "answer 3",
+        "question 4",
+        "answer 4",
+    ]
+    assert cached.chat_order == 4
+    assert cached.user_name == "user1"
+
+    # The cached messages are copies
+    cached.messages[0].content = "changed"
+    _add_rounds(cached, 1)
+    reloaded = _load(
+        "conv1", conv_storage, message_storage, history_rounds=3, conv_cache=cache
+    )
+    assert load.call_count == 0
+    assert [m.content for m in reloaded.messages] == [
+        "question 3",
+        "answer 3",
+        "question 4",
+        "answer 4",
+        "question 5",
+        "answer 5",
+    ]
+    # All the messages are not cached
+    full = _load("conv1", conv_storage, message_storage, conv_cache=cache)
+    assert load.call_count == 1
+    assert [m.content for m in full.messages][-6:] == [
+        m.content for m in reloaded.messages
+    ]
+    assert len(full.messages) == 10
+
+    reloaded.delete()
+    assert len(cache) == 0
+    assert (
+        _load("conv1", conv_storage, message_storage, conv_cache=cache).messages == []
+    )
+
+
+def test_conversation_cache_needs_more_rounds(
+    conversation: StorageConversation, conv_storage, message_storage
+):
+    _add_rounds(conversation, 6)
+    cache = ConversationCache()
+    _load("conv1", conv_storage, message_storage, history_rounds=2, conv_cache=cache)
+    assert cache.misses == 1
+    more = _load(
+        "conv1", conv_storage, message_storage, history_rounds=4, conv_cache=cache
+    )
+    assert cache.hits == 1
+    assert len(more.messages) == 8
+    assert more.has_earlier_messages
+
+
+def _create_long_conversation(db_manager, conv_uid: str, rounds: int):
+    message_ids = []
+    entities = []
+    for i in range(rounds * 2):
+        message_ids.append(MessageIdentifier(conv_uid, i).str_identifier)
+        message = (HumanMessage if i % 2 == 0 else AIMessage)(
+            content=f"message {i}", index=i, round_index=i // 2 + 1
+        )
+        entities.append(
+            DBMessageStorageItemAdapter().to_storage_format(
+                MessageStorageItem(conv_uid, i, message.to_dict())
+            )
+        )
+    with db_manager.session() as session:
+        session.add_all(entities)
+        session.add(
+            ChatHistoryEntity(
+                conv_uid=conv_uid,
+                chat_mode="chat_normal",
+                summary="long",
+                user_name="user1",
+                message_ids=",".join(message_ids),
+            )
+        )
+
+
+def test_per_turn_load_is_constant(db_manager, conv_storage, message_storage, mocker):
+    _create_long_conversation(db_manager, "short", 10)
+    _create_long_conversation(db_manager, "long", 5000)
+    load_list = mocker.spy(message_storage, "load_list")
+
+    def _turn(conv_uid: str) -> float:
+        start = time.perf_counter()
+        conv = _load(conv_uid, conv_storage, message_storage, history_rounds=2)
+        assert len(conv.messages) == 4
+        _add_rounds(conv, 1)
+        return time.perf_counter() - start
+
+    def _loaded_messages() -> int:
+        return sum(len(call.args[0]) for call in load_list.call_args_list)
+
+    _turn("short")
+    short_loaded = _loaded_messages()
+    load_list.reset_mock()
+    _turn("long")
+    assert _loaded_messages() == short_loaded
+
+    short_time = min(_turn("short") for _ in range(3))
+    long_time = min(_turn("long") for _ in range(3))
+    assert long_time < short_time * 5
+    assert len(_stored_message_ids(db_manager, "long")) == 10000 + 8
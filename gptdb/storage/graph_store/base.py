@@ -32,6 +32,15 @@ class GraphStoreBase(ABC):
     def insert_triplet(self, sub: str, rel: str, obj: str):
         """Add triplet."""
 
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        """Add triplets in bulk.
+
+        Backends should override it to write a batch of triplets in one round trip,
+        the default implementation inserts them one by one.
+        """
+        for triplet in triplets:
+            self.insert_triplet(*triplet)
+
     @abstractmethod
     def get_triplets(self, sub: str) -> List[Tuple[str, str]]:
         """Get triplets."""
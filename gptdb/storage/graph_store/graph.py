@@ -6,7 +6,7 @@ import re
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from enum import Enum
-from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
 
 import networkx as nx
 
@@ -204,8 +204,22 @@ class Graph(ABC):
         """Format graph data to string."""
 
 
+def _index_key(key: str, value: Any) -> Optional[Tuple[str, Hashable]]:
+    """Return the inverted index key of a property, None if it can't be indexed."""
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return key, value
+
+
 class MemoryGraph(Graph):
-    """Graph class."""
+    """Graph class.
+
+    The vertices and edges are indexed by their properties, the labels included,
+    see :meth:`find_vertices` and :meth:`find_edges`. The index only tracks the
+    properties set through the graph methods.
+    """
 
     def __init__(self, vertex_label: Optional[str] = None, edge_label: str = "label"):
         """Initialize MemoryGraph with vertex label and edge label."""
@@ -223,6 +237,10 @@ class MemoryGraph(Graph):
         self._oes: Any = defaultdict(lambda: defaultdict(set))
         self._ies: Any = defaultdict(lambda: defaultdict(set))
 
+        # inverted index of the properties: (key, value) -> vertex ids / edges
+        self._vertex_index: Dict[Tuple[str, Hashable], Set[str]] = defaultdict(set)
+        self._edge_index: Dict[Tuple[str, Hashable], Set[Edge]] = defaultdict(set)
+
     @property
     def vertex_label(self):
         """Return the label for vertices."""
@@ -256,9 +274,16 @@ class MemoryGraph(Graph):
     def upsert_vertex(self, vertex: Vertex):
         """Insert or update a vertex based on its ID."""
         if vertex.vid in self._vs:
-            self._vs[vertex.vid].props.update(vertex.props)
+            old_props = self._vs[vertex.vid].props
+            self._unindex(
+                self._vertex_index,
+                vertex.vid,
+                {k: old_props[k] for k in vertex.props.keys() if k in old_props},
+            )
+            old_props.update(vertex.props)
         else:
             self._vs[vertex.vid] = vertex
+        self._index(self._vertex_index, vertex.vid, vertex.props)
 
         # update metadata
         self._vertex_prop_keys.update(vertex.props.keys())
@@ -275,12 +300,15 @@ class MemoryGraph(Graph):
             return False
 
         # init vertex index
-        self._vs.setdefault(sid, Vertex(sid))
-        self._vs.setdefault(tid, Vertex(tid))
+        if sid not in self._vs:
+            self._vs[sid] = Vertex(sid)
+        if tid not in self._vs:
+            self._vs[tid] = Vertex(tid)
 
         # update edge index
         self._oes[sid][tid].add(edge)
         self._ies[tid][sid].add(edge)
+        self._index(self._edge_index, edge, edge.props)
 
         # update metadata
         self._edge_prop_keys.update(edge.props.keys())
@@ -295,6 +323,56 @@ class MemoryGraph(Graph):
         """Retrieve a vertex by ID."""
         return self._vs[vid]
 
+    @staticmethod
+    def _index(index: Dict, item: Any, props: Dict[str, Any]):
+        for k, v in props.items():
+            key = _index_key(k, v)
+            if key is not None:
+                index[key].add(item)
+
+    @staticmethod
+    def _unindex(index: Dict, item: Any, props: Dict[str, Any]):
+        for k, v in props.items():
+            key = _index_key(k, v)
+            items = index.get(key) if key is not None else None
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del index[key]
+
+    @staticmethod
+    def _find(index: Dict, props: Dict[str, Any]) -> Set:
+        matches = []
+        for k, v in props.items():
+            key = _index_key(k, v)
+            if key is None:
+                raise ValueError(f"Property '{k}' is not hashable")
+            items = index.get(key)
+            if not items:
+                return set()
+            matches.append(items)
+        # intersect from the smallest set
+        matches.sort(key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def find_vertices(self, **props) -> Iterator[Vertex]:
+        """Find the vertices with the properties by the inverted index.
+
+        Examples:
+            .. code-block:: python
+
+                graph.find_vertices(label="person", city="Paris")
+        """
+        if not props:
+            return self.vertices()
+        return (self._vs[vid] for vid in self._find(self._vertex_index, props))
+
+    def find_edges(self, **props) -> Iterator[Edge]:
+        """Find the edges with the properties by the inverted index."""
+        if not props:
+            return self.edges()
+        return iter(self._find(self._edge_index, props))
+
     def get_neighbor_edges(
         self,
         vid: str,
@@ -302,15 +380,16 @@ class MemoryGraph(Graph):
         limit: Optional[int] = None,
     ) -> Iterator[Edge]:
         """Get edges connected to a vertex by direction."""
+        # don't create the index entries of the unknown vertices
         if direction == Direction.OUT:
-            es = (e for es in self._oes[vid].values() for e in es)
+            es = (e for es in self._oes.get(vid, {}).values() for e in es)
 
         elif direction == Direction.IN:
-            es = iter(e for es in self._ies[vid].values() for e in es)
+            es = iter(e for es in self._ies.get(vid, {}).values() for e in es)
 
         elif direction == Direction.BOTH:
-            oes = (e for es in self._oes[vid].values() for e in es)
-            ies = (e for es in self._ies[vid].values() for e in es)
+            oes = (e for es in self._oes.get(vid, {}).values() for e in es)
+            ies = (e for es in self._ies.get(vid, {}).values() for e in es)
 
             # merge
             tuples = itertools.zip_longest(oes, ies)
@@ -344,33 +423,41 @@ class MemoryGraph(Graph):
         """Delete specified vertices."""
         for vid in vids:
             self.del_neighbor_edges(vid, Direction.BOTH)
-            self._vs.pop(vid, None)
+            vertex = self._vs.pop(vid, None)
+            if vertex is not None:
+                self._unindex(self._vertex_index, vid, vertex.props)
 
     def del_edges(self, sid: str, tid: str, **props):
         """Delete edges."""
-        old_edge_cnt = len(self._oes[sid][tid])
+        old_edges = self._oes.get(sid, {}).get(tid)
+        if not old_edges:
+            return
 
         if not props:
-            self._edge_count -= old_edge_cnt
+            self._edge_count -= len(old_edges)
+            for edge in old_edges:
+                self._unindex(self._edge_index, edge, edge.props)
             self._oes[sid].pop(tid, None)
             self._ies[tid].pop(sid, None)
             return
 
-        def remove_matches(es):
-            return set(filter(lambda e: not e.has_props(**props), es))
-
-        self._oes[sid][tid] = remove_matches(self._oes[sid][tid])
-        self._ies[tid][sid] = remove_matches(self._ies[tid][sid])
+        removed = {e for e in old_edges if e.has_props(**props)}
+        for edge in removed:
+            self._unindex(self._edge_index, edge, edge.props)
+        self._oes[sid][tid] = old_edges - removed
+        self._ies[tid][sid] = self._ies[tid][sid] - removed
 
-        self._edge_count -= old_edge_cnt - len(self._oes[sid][tid])
+        self._edge_count -= len(removed)
 
     def del_neighbor_edges(self, vid: str, direction: Direction = Direction.OUT):
         """Delete all neighbor edges."""
 
         def del_index(idx, i_idx):
-            for nid in idx[vid].keys():
-                self._edge_count -= len(i_idx[nid][vid])
-                i_idx[nid].pop(vid, None)
+            for nid in idx.get(vid, {}).keys():
+                edges = i_idx[nid].pop(vid, set())
+                self._edge_count -= len(edges)
+                for edge in edges:
+                    self._unindex(self._edge_index, edge, edge.props)
             idx.pop(vid, None)
 
         if direction in [Direction.OUT, Direction.BOTH]:
@@ -387,52 +474,54 @@ class MemoryGraph(Graph):
         fan: Optional[int] = None,
         limit: Optional[int] = None,
     ) -> "MemoryGraph":
-        """Search the graph from a vertex with specified parameters."""
-        subgraph = MemoryGraph()
-
-        for vid in vids:
-            self.__search(vid, direct, depth, fan, limit, 0, set(), subgraph)
+        """Search the graph from the vertices with specified parameters.
+
+        The graph is explored breadth first from each vertex, so the depth is not
+        bound by the recursion limit. At most ``fan`` edges are read from each
+        vertex, and the search stops as soon as ``limit`` edges are found.
+
+        Args:
+            vids (List[str]): The ids of the start vertices.
+            direct (Direction): The direction of the edges to follow.
+            depth (Optional[int]): The max number of hops, unlimited if None.
+            fan (Optional[int]): The max number of edges read from each vertex.
+            limit (Optional[int]): The max number of edges of the subgraph.
+        """
+        subgraph = MemoryGraph(self._vertex_label, self._edge_label)
+
+        def full() -> bool:
+            return bool(limit) and subgraph.edge_count >= limit  # type: ignore
+
+        def add_vertex(vid: str):
+            if not subgraph.has_vertex(vid):
+                subgraph.upsert_vertex(self.get_vertex(vid))
+
+        for start in vids:
+            if full():
+                break
+            if not self.has_vertex(start):
+                continue
+            add_vertex(start)
+            visited = {start}
+            frontier = [start]
+            hops = 0
+            while frontier and not (depth and hops >= depth):
+                next_frontier = []
+                for vid in frontier:
+                    for edge in self.get_neighbor_edges(vid, direct, fan):
+                        if full():
+                            return subgraph
+                        nid = edge.nid(vid)
+                        add_vertex(nid)
+                        # append edge success then visit new vertex
+                        if subgraph.append_edge(edge) and nid not in visited:
+                            visited.add(nid)
+                            next_frontier.append(nid)
+                frontier = next_frontier
+                hops += 1
 
         return subgraph
 
-    def __search(
-        self,
-        vid: str,
-        direct: Direction,
-        depth: Optional[int],
-        fan: Optional[int],
-        limit: Optional[int],
-        _depth: int,
-        _visited: Set,
-        _subgraph: "MemoryGraph",
-    ):
-        if vid in _visited or depth and _depth >= depth:
-            return
-
-        # visit vertex
-        if not self.has_vertex(vid):
-            return
-        _subgraph.upsert_vertex(self.get_vertex(vid))
-        _visited.add(vid)
-
-        # visit edges
-        nids = set()
-        for edge in self.get_neighbor_edges(vid, direct, fan):
-            if limit and _subgraph.edge_count >= limit:
-                return
-
-            # append edge success then visit new vertex
-            if _subgraph.append_edge(edge):
-                nid = edge.nid(vid)
-                if nid not in _visited:
-                    nids.add(nid)
-
-        # next hop
-        for nid in nids:
-            self.__search(
-                nid, direct, depth, fan, limit, _depth + 1, _visited, _subgraph
-            )
-
     def schema(self) -> Dict[str, Any]:
         """Return schema."""
         return {
@@ -1,11 +1,15 @@
 """Graph store base class."""
+import gc
 import json
 import logging
-from typing import List, Optional, Tuple
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
 
 from gptdb._private.pydantic import ConfigDict, Field
 from gptdb.storage.graph_store.base import GraphStoreBase, GraphStoreConfig
-from gptdb.storage.graph_store.graph import Direction, Edge, Graph, MemoryGraph
+from gptdb.storage.graph_store.graph import Direction, Edge, Graph, MemoryGraph, Vertex
 
 logger = logging.getLogger(__name__)
 
@@ -19,19 +23,194 @@ class MemoryGraphStoreConfig(GraphStoreConfig):
         default="label",
         description="The label of edge name, `label` by default.",
     )
+    persist_path: Optional[str] = Field(
+        default=None,
+        description="The directory to persist the graph, kept in memory only if "
+        "None.",
+    )
+    compact_threshold: int = Field(
+        default=100000,
+        description="Rewrite the snapshot when the append log has this many "
+        "operations.",
+    )
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the garbage collector while building many objects, it is much faster."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class MemoryGraphPersistence:
+    """Persist a memory graph as a snapshot and an append log on local disk.
+
+    The snapshot is a JSON document of all the vertices and edges, every change
+    after it is appended to a JSON lines log. Loading reads the snapshot and
+    replays the log, the log is folded into a new snapshot when it has
+    ``compact_threshold`` operations.
+
+    Args:
+        path (str): The directory of the files.
+        name (str): The name of the graph, the prefix of the files.
+        compact_threshold (int): The number of log operations to compact.
+    """
+
+    _VERSION = 1
+
+    def __init__(self, path: str, name: str, compact_threshold: int = 100000):
+        """Create the persistence of a graph."""
+        os.makedirs(path, exist_ok=True)
+        self.snapshot_path = os.path.join(path, f"{name}.snapshot.json")
+        self.log_path = os.path.join(path, f"{name}.log.jsonl")
+        self._compact_threshold = max(compact_threshold, 1)
+        self._log_ops = 0
+        self._lock = threading.Lock()
+
+    @property
+    def log_ops(self) -> int:
+        """Return the number of operations in the append log."""
+        return self._log_ops
+
+    def load(self, graph: MemoryGraph) -> MemoryGraph:
+        """Load the snapshot and replay the log into the graph."""
+        with _gc_paused():
+            self._load(graph)
+        if self._log_ops >= self._compact_threshold:
+            self.compact(graph)
+        return graph
+
+    def _load(self, graph: MemoryGraph):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            for vid, props in snapshot["vertices"]:
+                graph.upsert_vertex(Vertex(vid, **props))
+            for sid, tid, props in snapshot["edges"]:
+                graph.append_edge(Edge(sid, tid, **props))
+        self._log_ops = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the tail of a crashed write
+                        logger.warning(f"Skip the broken log line of {self.log_path}")
+                        continue
+                    self._apply(graph, op)
+                    self._log_ops += 1
+
+    @staticmethod
+    def _apply(graph: MemoryGraph, op: List[Any]):
+        kind = op[0]
+        if kind == "v":
+            graph.upsert_vertex(Vertex(op[1], **op[2]))
+        elif kind == "e":
+            graph.append_edge(Edge(op[1], op[2], **op[3]))
+        elif kind == "de":
+            graph.del_edges(op[1], op[2], **op[3])
+        elif kind == "dv":
+            graph.del_vertices(op[1])
+        else:
+            raise ValueError(f"Unknown graph log operation: {kind}")
+
+    def append(self, graph: MemoryGraph, ops: List[List[Any]]):
+        """Append the operations applied to the graph to the log."""
+        if not ops:
+            return
+        lines = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops)
+        with self._lock:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self._log_ops += len(ops)
+            compact = self._log_ops >= self._compact_threshold
+        if compact:
+            self.compact(graph)
+
+    def compact(self, graph: MemoryGraph):
+        """Write the graph to a new snapshot and truncate the log.
+
+        The snapshot is built and the log is truncated in one critical section, the
+        operations appended meanwhile wait and go to the new log. An operation
+        applied to the graph before the snapshot may also be in the new log,
+        replaying it again is harmless.
+        """
+        with self._lock:
+            snapshot: Dict[str, Any] = {
+                "version": self._VERSION,
+                "vertices": [[v.vid, v.props] for v in graph.vertices()],
+                "edges": [[e.sid, e.tid, e.props] for e in graph.edges()],
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                # json.dump encodes in small chunks, dumps is much faster
+                f.write(json.dumps(snapshot, ensure_ascii=False))
+            os.replace(tmp_path, self.snapshot_path)
+            with open(self.log_path, "w", encoding="utf-8"):
+                pass
+            self._log_ops = 0
+
+    def delete(self):
+        """Delete the files of the graph."""
+        with self._lock:
+            for path in [self.snapshot_path, self.log_path]:
+                if os.path.exists(path):
+                    os.remove(path)
+            self._log_ops = 0
 
 
 class MemoryGraphStore(GraphStoreBase):
-    """Memory graph store."""
+    """Memory graph store.
+
+    The graph is kept in memory, it is also persisted to local disk and reloaded
+    on start if ``persist_path`` is set. A change of the graph, its log append and
+    the compaction it triggers hold the store lock, so a snapshot never iterates a
+    graph being changed.
+    """
 
     def __init__(self, graph_store_config: MemoryGraphStoreConfig):
         """Initialize MemoryGraphStore with a memory graph."""
         self._edge_name_key = graph_store_config.edge_name_key
         self._graph = MemoryGraph(edge_label=self._edge_name_key)
+        self._lock = threading.RLock()
+        persist_path = (
+            os.getenv("MEMORY_GRAPH_PERSIST_PATH") or graph_store_config.persist_path
+        )
+        self._persistence: Optional[MemoryGraphPersistence] = None
+        if persist_path:
+            self._persistence = MemoryGraphPersistence(
+                persist_path,
+                graph_store_config.name,
+                graph_store_config.compact_threshold,
+            )
+            self._persistence.load(self._graph)
+
+    def _log(self, ops: List[List[Any]]):
+        if self._persistence:
+            self._persistence.append(self._graph, ops)
 
     def insert_triplet(self, sub: str, rel: str, obj: str):
         """Insert a triplet into the graph."""
-        self._graph.append_edge(Edge(sub, obj, **{self._edge_name_key: rel}))
+        self.insert_triplets([(sub, rel, obj)])
+
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        """Insert triplets into the graph in bulk."""
+        with self._lock:
+            ops = []
+            with _gc_paused():
+                for sub, rel, obj in triplets:
+                    props = {self._edge_name_key: rel}
+                    if self._graph.append_edge(Edge(sub, obj, **props)):
+                        ops.append(["e", sub, obj, props])
+            self._log(ops)
 
     def get_triplets(self, sub: str) -> List[Tuple[str, str]]:
         """Retrieve triplets originating from a subject."""
@@ -40,11 +219,23 @@ class MemoryGraphStore(GraphStoreBase):
 
     def delete_triplet(self, sub: str, rel: str, obj: str):
         """Delete a specific triplet from the graph."""
-        self._graph.del_edges(sub, obj, **{self._edge_name_key: rel})
+        props = {self._edge_name_key: rel}
+        with self._lock:
+            self._graph.del_edges(sub, obj, **props)
+            self._log([["de", sub, obj, props]])
+
+    def persist(self):
+        """Write the graph to a new snapshot, do nothing if not persisted."""
+        if self._persistence:
+            with self._lock:
+                self._persistence.compact(self._graph)
 
     def drop(self):
-        """Drop graph."""
-        self._graph = None
+        """Drop graph and delete its persisted files."""
+        with self._lock:
+            self._graph = MemoryGraph(edge_label=self._edge_name_key)
+            if self._persistence:
+                self._persistence.delete()
 
     def get_schema(self, refresh: bool = False) -> str:
         """Return the graph schema as a JSON string."""
@@ -55,7 +246,7 @@ class MemoryGraphStore(GraphStoreBase):
         if not limit:
             return self._graph
 
-        subgraph = MemoryGraph()
+        subgraph = MemoryGraph(edge_label=self._edge_name_key)
         for count, edge in enumerate(self._graph.edges()):
             if count >= limit:
                 break
@@ -26,7 +26,14 @@ class Neo4jStore(GraphStoreBase):
 
     def insert_triplet(self, sub: str, rel: str, obj: str):
         """Insert triplets."""
-        pass
+        logger.warning("Neo4jStore is not implemented yet, the triplet is not written")
+
+    def insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        """Insert triplets in bulk."""
+        logger.warning(
+            f"Neo4jStore is not implemented yet, {len(triplets)} triplets are not "
+            "written"
+        )
 
     def get_triplets(self, sub: str) -> List[Tuple[str, str]]:
         """Get triplets."""
@@ -0,0 +1,193 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from gptdb.storage.graph_store.graph import Direction, Edge, MemoryGraph, Vertex
+from gptdb.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+
+
+@pytest.fixture
+def graph():
+    g = MemoryGraph(vertex_label="label")
+    g.upsert_vertex(Vertex("A", label="person", city="Paris"))
+    g.upsert_vertex(Vertex("B", label="person", city="Berlin"))
+    g.upsert_vertex(Vertex("C", label="company", city="Paris"))
+    g.append_edge(Edge("A", "B", label="knows"))
+    g.append_edge(Edge("A", "C", label="works_at"))
+    g.append_edge(Edge("B", "C", label="works_at"))
+    return g
+
+
+def _chain(length: int) -> MemoryGraph:
+    g = MemoryGraph()
+    for i in range(length):
+        g.append_edge(Edge(f"v{i}", f"v{i + 1}", label="next"))
+    return g
+
+
+def test_search_deeper_than_recursion_limit():
+    length = sys.getrecursionlimit() * 2
+    subgraph = _chain(length).search(["v0"], Direction.OUT)
+    assert subgraph.edge_count == length
+    assert subgraph.vertex_count == length + 1
+
+
+def test_search_depth():
+    g = _chain(10)
+    assert g.search(["v0"], Direction.OUT, depth=3).edge_count == 3
+    assert g.search(["v5"], Direction.BOTH, depth=2).edge_count == 4
+    assert g.search(["v5"], Direction.IN).edge_count == 5
+
+
+def test_search_fan_and_limit():
+    g = MemoryGraph()
+    for i in range(10):
+        g.append_edge(Edge("root", f"child{i}", label="has"))
+        for j in range(10):
+            g.append_edge(Edge(f"child{i}", f"leaf{i}_{j}", label="has"))
+
+    assert g.search(["root"], Direction.OUT, fan=2).edge_count == 2 + 2 * 2
+    assert g.search(["root"], Direction.OUT, limit=15).edge_count == 15
+    assert g.search(["root"], Direction.OUT, depth=1, limit=100).edge_count == 10
+
+
+def test_search_unknown_vertex():
+    g = _chain(2)
+    subgraph = g.search(["unknown", "v1"], Direction.OUT)
+    assert subgraph.edge_count == 1
+    assert not g.has_vertex("unknown")
+
+
+def test_search_keeps_vertex_props(graph):
+    subgraph = graph.search(["A"], Direction.OUT, depth=1)
+    assert subgraph.get_vertex("B").get_prop("city") == "Berlin"
+    assert {v.vid for v in subgraph.find_vertices(label="person")} == {"A", "B"}
+
+
+def test_find_by_index(graph):
+    assert {v.vid for v in graph.find_vertices(label="person")} == {"A", "B"}
+    assert {v.vid for v in graph.find_vertices(city="Paris")} == {"A", "C"}
+    assert {v.vid for v in graph.find_vertices(label="person", city="Paris")} == {"A"}
+    assert list(graph.find_vertices(label="animal")) == []
+    assert {(e.sid, e.tid) for e in graph.find_edges(label="works_at")} == {
+        ("A", "C"),
+        ("B", "C"),
+    }
+
+
+def test_index_follows_updates(graph):
+    graph.upsert_vertex(Vertex("A", city="Rome"))
+    assert {v.vid for v in graph.find_vertices(city="Paris")} == {"C"}
+    assert {v.vid for v in graph.find_vertices(city="Rome")} == {"A"}
+
+    graph.del_edges("A", "C", label="works_at")
+    assert {(e.sid, e.tid) for e in graph.find_edges(label="works_at")} == {("B", "C")}
+
+    graph.del_vertices("C")
+    assert list(graph.find_edges(label="works_at")) == []
+    assert list(graph.find_vertices(label="company")) == []
+    assert graph.edge_count == 1
+
+
+def test_store_reload(tmp_path):
+    config = MemoryGraphStoreConfig(name="kg", persist_path=str(tmp_path))
+    store = MemoryGraphStore(config)
+    store.insert_triplets([("A", "knows", "B"), ("B", "knows", "C")])
+    store.insert_triplet("C", "knows", "D")
+    store.delete_triplet("A", "knows", "B")
+
+    reloaded = MemoryGraphStore(config)
+    assert reloaded.get_triplets("B") == [("knows", "C")]
+    assert reloaded.get_triplets("A") == []
+    assert reloaded.explore(["B"], Direction.OUT).edge_count == 2
+
+
+def test_store_compaction(tmp_path):
+    config = MemoryGraphStoreConfig(
+        name="kg", persist_path=str(tmp_path), compact_threshold=3
+    )
+    store = MemoryGraphStore(config)
+    store.insert_triplets([("A", "r", "B"), ("B", "r", "C")])
+    assert os.path.getsize(tmp_path / "kg.log.jsonl") > 0
+    store.insert_triplet("C", "r", "D")
+    # the log is folded into the snapshot
+    assert os.path.getsize(tmp_path / "kg.log.jsonl") == 0
+    store.insert_triplet("D", "r", "E")
+
+    reloaded = MemoryGraphStore(config)
+    assert reloaded.get_full_graph().edge_count == 4
+
+
+def test_store_compaction_keeps_concurrent_ops(tmp_path, mocker):
+    config = MemoryGraphStoreConfig(name="kg", persist_path=str(tmp_path))
+    store = MemoryGraphStore(config)
+    store.insert_triplet("A", "r", "B")
+
+    writer = threading.Thread(target=store.insert_triplet, args=("B", "r", "C"))
+    edges = store._graph.edges
+
+    def _edges_then_concurrent_write():
+        yield from edges()
+        # Another thread writes after the snapshot is built
+        writer.start()
+        writer.join(timeout=0.5)
+
+    mocker.patch.object(store._graph, "edges", side_effect=_edges_then_concurrent_write)
+    store.persist()
+    writer.join()
+
+    reloaded = MemoryGraphStore(config)
+    assert reloaded.get_full_graph().edge_count == 2
+    assert reloaded.get_triplets("B") == [("r", "C")]
+
+
+def test_store_concurrent_insert_and_compaction(tmp_path):
+    config = MemoryGraphStoreConfig(
+        name="kg", persist_path=str(tmp_path), compact_threshold=200
+    )
+    store = MemoryGraphStore(config)
+    errors = []
+
+    def _write(worker: int):
+        try:
+            for i in range(0, 2000, 50):
+                store.insert_triplets(
+                    [
+                        (f"{worker}-{j}", "r", f"{worker}-{j + 1}")
+                        for j in range(i, i + 50)
+                    ]
+                )
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=_write, args=(i,)) for i in range(4)]
+    # Switch the threads often, a compaction is interleaved with the inserts
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    reloaded = MemoryGraphStore(config)
+    assert reloaded.get_full_graph().edge_count == 8000
+
+
+def test_store_drop(tmp_path):
+    config = MemoryGraphStoreConfig(name="kg", persist_path=str(tmp_path))
+    store = MemoryGraphStore(config)
+    store.insert_triplet("A", "r", "B")
+    store.persist()
+    store.drop()
+    assert store.get_full_graph().edge_count == 0
+    assert os.listdir(tmp_path) == []
+    assert MemoryGraphStore(config).get_full_graph().edge_count == 0
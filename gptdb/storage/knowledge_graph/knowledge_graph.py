@@ -2,7 +2,8 @@
 import asyncio
 import logging
 import os
-from typing import List, Optional
+import threading
+from typing import List, Optional, Set, Tuple
 
 from gptdb._private.pydantic import ConfigDict, Field
 from gptdb.core import Chunk, LLMClient
@@ -13,6 +14,7 @@ from gptdb.storage.graph_store.factory import GraphStoreFactory
 from gptdb.storage.graph_store.graph import Graph
 from gptdb.storage.knowledge_graph.base import KnowledgeGraphBase, KnowledgeGraphConfig
 from gptdb.storage.vector_store.filters import MetadataFilters
+from gptdb.util.executor_utils import blocking_func_to_async
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,16 @@ class BuiltinKnowledgeGraphConfig(KnowledgeGraphConfig):
         default="TuGraph", description="The type of graph store."
     )
 
+    extract_concurrency: int = Field(
+        default=8,
+        description="The max number of chunks to extract triplets from concurrently.",
+    )
+
+    write_batch_size: int = Field(
+        default=500,
+        description="The max number of triplets to write to graph store at once.",
+    )
+
 
 class BuiltinKnowledgeGraph(KnowledgeGraphBase):
     """Builtin knowledge graph class."""
@@ -56,40 +68,92 @@ class BuiltinKnowledgeGraph(KnowledgeGraphBase):
         self._graph_store: GraphStoreBase = GraphStoreFactory.create(
             self._graph_store_type, configure
         )
+        # The graph stores are not thread-safe, the batches are written one by one
+        self._write_lock = threading.Lock()
 
     def load_document(self, chunks: List[Chunk]) -> List[str]:
         """Extract and persist triplets to graph store."""
-
-        async def process_chunk(chunk):
-            triplets = await self._triplet_extractor.extract(chunk.content)
-            for triplet in triplets:
-                self._graph_store.insert_triplet(*triplet)
-            logger.info(f"load {len(triplets)} triplets from chunk {chunk.chunk_id}")
-            return chunk.chunk_id
-
-        # wait async tasks completed
-        tasks = [process_chunk(chunk) for chunk in chunks]
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(asyncio.gather(*tasks))
-        loop.close()
-        return result
+        return asyncio.run(self.aload_document(chunks))
 
     async def aload_document(self, chunks: List[Chunk]) -> List[str]:  # type: ignore
         """Extract and persist triplets to graph store.
 
+        The triplets are extracted from the chunks concurrently, deduplicated across
+        the chunks and written to the graph store in batches.
+
         Args:
             chunks: List[Chunk]: document chunks.
         Return:
             List[str]: chunk ids.
         """
-        for chunk in chunks:
-            triplets = await self._triplet_extractor.extract(chunk.content)
-            for triplet in triplets:
-                self._graph_store.insert_triplet(*triplet)
-            logger.info(f"load {len(triplets)} triplets from chunk {chunk.chunk_id}")
+        semaphore = asyncio.Semaphore(max(self._config.extract_concurrency, 1))
+        return await self._aload_chunks(chunks, semaphore, set())
+
+    async def aload_document_with_limit(
+        self, chunks: List[Chunk], max_chunks_once_load: int = 10, max_threads: int = 1
+    ) -> List[str]:
+        """Load document in graph store with specified limit.
+
+        The chunks are loaded in groups of ``max_chunks_once_load``, at most
+        ``max_threads`` groups at once. The extraction concurrency of all the groups
+        is bounded by the config and the triplets are deduplicated across the groups.
+
+        Args:
+            chunks(List[Chunk]): Document chunks.
+            max_chunks_once_load(int): Max number of chunks to load at once.
+            max_threads(int): Max number of groups to load concurrently.
+        Return:
+            List[str]: Chunk ids.
+        """
+        group_size = max(max_chunks_once_load, 1)
+        groups = [chunks[i : i + group_size] for i in range(0, len(chunks), group_size)]
+        semaphore = asyncio.Semaphore(max(self._config.extract_concurrency, 1))
+        group_semaphore = asyncio.Semaphore(max(max_threads, 1))
+        seen: Set[Tuple[str, str, str]] = set()
+
+        async def load_group(group: List[Chunk]) -> List[str]:
+            async with group_semaphore:
+                return await self._aload_chunks(group, semaphore, seen)
+
+        results = await asyncio.gather(*[load_group(group) for group in groups])
+        logger.info(f"Loaded {len(chunks)} chunks in {len(groups)} groups")
+        return [chunk_id for ids in results for chunk_id in ids]
+
+    async def _aload_chunks(
+        self,
+        chunks: List[Chunk],
+        semaphore: asyncio.Semaphore,
+        seen: Set[Tuple[str, str, str]],
+    ) -> List[str]:
+        """Extract the triplets of the chunks and write the ones not seen yet."""
+
+        async def extract(chunk: Chunk) -> List[Tuple[str, str, str]]:
+            async with semaphore:
+                triplets = await self._triplet_extractor.extract(chunk.content)
+            logger.info(f"extract {len(triplets)} triplets from chunk {chunk.chunk_id}")
+            return triplets
+
+        chunk_triplets = await asyncio.gather(*[extract(chunk) for chunk in chunks])
+        # Deduplicate the triplets across chunks, keep the first seen order
+        triplets = []
+        for triplet in dict.fromkeys(
+            tuple(triplet) for triplets in chunk_triplets for triplet in triplets
+        ):
+            if triplet not in seen:
+                seen.add(triplet)
+                triplets.append(triplet)
+        batch_size = max(self._config.write_batch_size, 1)
+        for i in range(0, len(triplets), batch_size):
+            await blocking_func_to_async(
+                self._executor, self._insert_triplets, triplets[i : i + batch_size]
+            )
+        logger.info(f"load {len(triplets)} triplets from {len(chunks)} chunks")
         return [chunk.chunk_id for chunk in chunks]
 
+    def _insert_triplets(self, triplets: List[Tuple[str, str, str]]):
+        with self._write_lock:
+            self._graph_store.insert_triplets(triplets)
+
     def similar_search_with_scores(
         self,
         text,
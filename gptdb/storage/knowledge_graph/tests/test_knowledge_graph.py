@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import AsyncIterator, List
+
+import pytest
+
+from gptdb.core import Chunk, LLMClient, ModelMetadata, ModelOutput, ModelRequest
+from gptdb.storage.knowledge_graph.knowledge_graph import (
+    BuiltinKnowledgeGraph,
+    BuiltinKnowledgeGraphConfig,
+)
+
+
+class FakeTripletLLMClient(LLMClient):
+    """Return the triplets written in the text, track the concurrent calls."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def generate(self, request: ModelRequest) -> ModelOutput:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        text = request.messages[-1].content.split("Text: ")[-1]
+        return ModelOutput(error_code=0, text=text.split("\n")[0])
+
+    async def generate_stream(
+        self, request: ModelRequest
+    ) -> AsyncIterator[ModelOutput]:
+        yield await self.generate(request)
+
+    async def models(self) -> List[ModelMetadata]:
+        return [ModelMetadata(model="fake")]
+
+    async def count_token(self, model: str, prompt: str) -> int:
+        return len(prompt)
+
+
+@pytest.fixture
+def llm_client():
+    return FakeTripletLLMClient()
+
+
+@pytest.fixture
+def knowledge_graph(llm_client, monkeypatch):
+    monkeypatch.setenv("GRAPH_STORE_TYPE", "Memory")
+    config = BuiltinKnowledgeGraphConfig(
+        name="test_kg",
+        llm_client=llm_client,
+        model_name="fake",
+        extract_concurrency=3,
+        write_batch_size=2,
+    )
+    return BuiltinKnowledgeGraph(config)
+
+
+@pytest.mark.asyncio
+async def test_aload_document(knowledge_graph, llm_client, mocker):
+    chunks = [
+        Chunk(content=f"(A, knows, B{i % 3}) (B{i % 3}, likes, C)") for i in range(10)
+    ]
+    insert_triplets = mocker.spy(knowledge_graph._graph_store, "insert_triplets")
+
+    ids = await knowledge_graph.aload_document(chunks)
+
+    assert ids == [chunk.chunk_id for chunk in chunks]
+    assert llm_client.max_running == 3
+    # 6 unique triplets across 10 chunks, written in batches of 2
+    written = [t for call in insert_triplets.call_args_list for t in call.args[0]]
+    assert len(written) == len(set(written)) == 6
+    assert insert_triplets.call_count == 3
+    assert knowledge_graph.query_graph().edge_count == 6
+
+
+def test_load_document(knowledge_graph):
+    ids = knowledge_graph.load_document([Chunk(content="(A, knows, B)")])
+    assert len(ids) == 1
+    assert knowledge_graph.query_graph().edge_count == 1
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit(knowledge_graph, llm_client, mocker):
+    chunks = [Chunk(content=f"(A, knows, B{i % 4})") for i in range(10)]
+    load_chunks = mocker.spy(knowledge_graph, "_aload_chunks")
+
+    ids = await knowledge_graph.aload_document_with_limit(
+        chunks, max_chunks_once_load=4, max_threads=1
+    )
+
+    assert ids == [chunk.chunk_id for chunk in chunks]
+    # Loaded in groups of at most 4 chunks
+    assert [len(call.args[0]) for call in load_chunks.call_args_list] == [4, 4, 2]
+    # The extraction is still bounded by extract_concurrency
+    assert llm_client.max_running == 3
+    assert knowledge_graph.query_graph().edge_count == 4
+
+
+@pytest.mark.asyncio
+async def test_graph_writes_are_serial(knowledge_graph, mocker):
+    chunks = [Chunk(content=f"(A, knows, B{i})") for i in range(12)]
+    running = []
+    max_running = []
+    lock = threading.Lock()
+    insert_triplets = knowledge_graph._graph_store.insert_triplets
+
+    def _insert(triplets):
+        with lock:
+            running.append(1)
+            max_running.append(len(running))
+        time.sleep(0.01)
+        insert_triplets(triplets)
+        with lock:
+            running.pop()
+
+    mocker.patch.object(
+        knowledge_graph._graph_store, "insert_triplets", side_effect=_insert
+    )
+    await knowledge_graph.aload_document_with_limit(
+        chunks, max_chunks_once_load=2, max_threads=4
+    )
+    assert max(max_running) == 1
+    assert knowledge_graph.query_graph().edge_count == 12
+
+
+def test_neo4j_store_skips_writes(caplog):
+    from gptdb.storage.graph_store.neo4j_store import Neo4jStore, Neo4jStoreConfig
+
+    store = Neo4jStore(Neo4jStoreConfig(name="test"))
+    with caplog.at_level(logging.WARNING):
+        store.insert_triplets([("A", "knows", "B")])
+    assert "1 triplets are not written" in caplog.text
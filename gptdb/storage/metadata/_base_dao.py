@@ -5,7 +5,7 @@ from sqlalchemy import desc
 from sqlalchemy.orm.session import Session
 
 from gptdb._private.pydantic import model_to_dict
-from gptdb.util.pagination_utils import PaginationResult
+from gptdb.util.pagination_utils import CursorPaginationResult, PaginationResult
 
 from .db_manager import BaseQuery, DatabaseManager, db
 
@@ -263,6 +263,56 @@ class BaseDao(Generic[T, REQ, RES]):
                 page_size=page_size,
             )
 
+    def get_list_by_cursor(
+        self,
+        query_request: QUERY_SPEC,
+        cursor: Optional[int],
+        page_size: int,
+        cursor_column: str = "id",
+        with_total: bool = False,
+        descending: bool = False,
+    ) -> CursorPaginationResult[RES]:
+        """Get a page of entity objects after the cursor (keyset pagination).
+
+        The items are ordered by the cursor column, which must be unique and
+        indexed, e.g. the primary key. Unlike :meth:`get_list_page`, the page is
+        read with the index instead of skipping all the items before it.
+
+        Args:
+            query_request (REQ): The request schema object or dict for query.
+            cursor (Optional[int]): The ``next_cursor`` of the previous page, None or
+                0 for the first page.
+            page_size (int): The page size.
+            cursor_column (str): The column to order and seek by.
+            with_total (bool): Whether to count all the items of the query.
+            descending (bool): Whether to order the items by the cursor column in
+                descending order, e.g. the newest items first.
+
+        Returns:
+            CursorPaginationResult: The pagination result.
+        """
+        model_cls = type(self.from_request(query_request))
+        column = getattr(model_cls, cursor_column)
+        with self.session() as session:
+            query = self._create_query_object(session, query_request)
+            total_count = query.order_by(None).count() if with_total else None
+            if cursor:
+                query = query.filter(column < cursor if descending else column > cursor)
+            order = column.desc() if descending else column.asc()
+            # Read one more item to know whether there is a next page
+            items = query.order_by(None).order_by(order).limit(page_size + 1)
+            items = items.all()
+            next_cursor = None
+            if len(items) > page_size:
+                items = items[:page_size]
+                next_cursor = getattr(items[-1], cursor_column)
+            return CursorPaginationResult(
+                items=[self.to_response(item) for item in items],
+                next_cursor=next_cursor,
+                page_size=page_size,
+                total_count=total_count,
+            )
+
     def _create_query_object(
         self,
         session: Session,
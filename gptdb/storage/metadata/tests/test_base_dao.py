@@ -11,6 +11,7 @@ from gptdb.storage.metadata.db_manager import (
     PaginationResult,
     create_model,
 )
+from gptdb.util.pagination_utils import CursorPaginationResult
 
 from .._base_dao import BaseDao
 
@@ -175,3 +176,35 @@ def test_get_list_page_user(db: DatabaseManager, User: Type[BaseModel], user_dao
     assert page_result.total_pages == 4
     assert len(page_result.items) == 3
     assert page_result.items[0].name == "User 6"
+
+
+def test_get_list_by_cursor_user(db: DatabaseManager, User: Type[BaseModel], user_dao):
+    for i in range(20):
+        user_dao.create(
+            UserRequest(
+                name=f"User {i}", age=i, password="123456" if i % 2 == 0 else "abcdefg"
+            )
+        )
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        page_result: CursorPaginationResult = user_dao.get_list_by_cursor(
+            {"password": "123456"}, cursor, page_size=3, with_total=cursor is None
+        )
+        if cursor is None:
+            assert page_result.total_count == 10
+        else:
+            assert page_result.total_count is None
+        names.extend(item.name for item in page_result.items)
+        pages += 1
+        cursor = page_result.next_cursor
+        if cursor is None:
+            break
+    assert pages == 4
+    assert names == [f"User {i}" for i in range(0, 20, 2)]
+
+    # The exact last page has no next cursor
+    page_result = user_dao.get_list_by_cursor({"password": "123456"}, None, 10)
+    assert len(page_result.items) == 10
+    assert page_result.next_cursor is None
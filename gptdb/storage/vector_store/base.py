@@ -1,9 +1,11 @@
 """Vector store base class."""
 import logging
 import math
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, List, Optional, Tuple
 
 from gptdb._private.pydantic import ConfigDict, Field
 from gptdb.core import Chunk, Embeddings
@@ -126,7 +128,7 @@ class VectorStoreBase(IndexStoreBase, ABC):
                     metadata=chunk.metadata,
                     content=chunk.content,
                     score=chunk.score,
-                    chunk_id=str(id),
+                    chunk_id=chunk.chunk_id,
                 )
                 for chunk in chunks
                 if chunk.score >= score_threshold
@@ -151,6 +153,121 @@ class VectorStoreBase(IndexStoreBase, ABC):
         """
         raise NotImplementedError
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar documents with a query vector.
+
+        Use it when the query embedding is already computed, e.g. the same query is
+        searched in multiple vector stores.
+
+        Args:
+            vector(List[float]): The query vector.
+            topk(int): The number of similar documents to return.
+            score_threshold(Optional[float]): Optional, a floating point value between
+                0 to 1 to filter the retrieved chunks.
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[Chunk]: The similar chunks with scores.
+        """
+        raise NotImplementedError
+
+    async def asimilarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Async search similar documents with a query vector."""
+        return await blocking_func_to_async(
+            self._executor,
+            self.similarity_search_by_vector,
+            vector,
+            topk,
+            score_threshold,
+            filters,
+        )
+
+    def _support_embedding_pipeline(self) -> bool:
+        """Whether the chunks can be embedded and written in separate steps.
+
+        The vector stores which return True must implement :meth:`_embed_chunks` and
+        :meth:`_load_embedded_chunks`.
+        """
+        return False
+
+    def _embed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Compute the embeddings of the chunks."""
+        raise NotImplementedError
+
+    def _load_embedded_chunks(
+        self, chunks: List[Chunk], embeddings: List[List[float]]
+    ) -> List[str]:
+        """Write the chunks with their precomputed embeddings."""
+        raise NotImplementedError
+
+    def load_document_with_limit(
+        self, chunks: List[Chunk], max_chunks_once_load: int = 10, max_threads: int = 1
+    ) -> List[str]:
+        """Load document in vector database with specified limit.
+
+        If the vector store supports it, the embedding and the writing of the chunk
+        groups are pipelined: up to ``max_threads`` threads embed the next groups
+        while the current group is written to the vector store. At most
+        ``max_threads + 1`` embedded groups are held in memory.
+
+        Args:
+            chunks(List[Chunk]): Document chunks.
+            max_chunks_once_load(int): Max number of chunks to load at once.
+            max_threads(int): Max number of threads to embed the chunks.
+
+        Return:
+            List[str]: Chunk ids.
+        """
+        if not self._support_embedding_pipeline():
+            return super().load_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+        chunk_groups = iter(
+            [
+                chunks[i : i + max_chunks_once_load]
+                for i in range(0, len(chunks), max_chunks_once_load)
+            ]
+        )
+        logger.info(
+            f"Loading {len(chunks)} chunks with pipelined embedding, "
+            f"{max_threads} embedding threads."
+        )
+        ids: List[str] = []
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+            pending: Deque[Tuple[List[Chunk], Future]] = deque()
+
+            def _submit_next():
+                group = next(chunk_groups, None)
+                if group is not None:
+                    pending.append((group, executor.submit(self._embed_chunks, group)))
+
+            for _i in range(max_threads):
+                _submit_next()
+            while pending:
+                group, future = pending.popleft()
+                embeddings = future.result()
+                # Keep the embedding threads busy while writing this group, the
+                # group and the pending ones are the max_threads + 1 groups held
+                _submit_next()
+                ids.extend(self._load_embedded_chunks(group, embeddings))
+                logger.info(f"Loaded {len(ids)} chunks, total {len(chunks)} chunks.")
+        logger.info(
+            f"Loaded {len(chunks)} chunks in {time.time() - start_time} seconds"
+        )
+        return ids
+
     def _normalization_vectors(self, vectors):
         """Return L2-normalization vectors to scale[0,1].
 
@@ -128,18 +128,27 @@ class ChromaStore(VectorStoreBase):
             topk=topk,
             filters=filters,
         )
+        return self._to_scored_chunks(chroma_results, score_threshold)
+
+    def _to_scored_chunks(
+        self, chroma_results: Dict[str, Any], score_threshold: Optional[float]
+    ) -> List[Chunk]:
+        if not chroma_results:
+            return []
         chunks = [
             (
                 Chunk(
                     content=chroma_result[0],
                     metadata=chroma_result[1] or {},
                     score=(1 - chroma_result[2]),
+                    chunk_id=chroma_result[3],
                 )
             )
             for chroma_result in zip(
                 chroma_results["documents"][0],
                 chroma_results["metadatas"][0],
                 chroma_results["distances"][0],
+                chroma_results["ids"][0],
             )
         ]
         return self.filter_by_score_threshold(chunks, score_threshold)
@@ -157,13 +166,46 @@ class ChromaStore(VectorStoreBase):
     def load_document(self, chunks: List[Chunk]) -> List[str]:
         """Load document to vector store."""
         logger.info("ChromaStore load document")
+        embeddings = self._embed_chunks(chunks) if self.embeddings else None
+        return self._load_embedded_chunks(chunks, embeddings)
+
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar documents with a query vector.
+
+        Args:
+            vector(List[float]): query vector.
+            topk(int): return docs nums.
+            score_threshold(Optional[float]): the min relevance score in the range
+                [0, 1], no filtering if None.
+            filters(MetadataFilters): metadata filters, defaults to None
+        """
+        chroma_results = self._query(topk=topk, filters=filters, query_embedding=vector)
+        return self._to_scored_chunks(chroma_results, score_threshold)
+
+    def _support_embedding_pipeline(self) -> bool:
+        return self.embeddings is not None
+
+    def _embed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        return self.embeddings.embed_documents([chunk.content for chunk in chunks])
+
+    def _load_embedded_chunks(
+        self, chunks: List[Chunk], embeddings: Optional[List[List[float]]]
+    ) -> List[str]:
         texts = [chunk.content for chunk in chunks]
         metadatas = [chunk.metadata for chunk in chunks]
         ids = [chunk.chunk_id for chunk in chunks]
         chroma_metadatas = [
             _transform_chroma_metadata(metadata) for metadata in metadatas
         ]
-        self._add_texts(texts=texts, metadatas=chroma_metadatas, ids=ids)
+        self._add_texts(
+            texts=texts, metadatas=chroma_metadatas, ids=ids, embeddings=embeddings
+        )
         return ids
 
     def delete_vector_name(self, vector_name: str):
@@ -222,6 +264,7 @@ class ChromaStore(VectorStoreBase):
         texts: Iterable[str],
         ids: List[str],
         metadatas: Optional[List[Mapping[str, Union[str, int, float, bool]]]] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> List[str]:
         """Add texts to Chroma collection.
 
@@ -229,12 +272,13 @@ class ChromaStore(VectorStoreBase):
             texts(Iterable[str]): texts.
             metadatas(Optional[List[dict]]): metadatas.
             ids(Optional[List[str]]): ids.
+            embeddings(Optional[List[List[float]]]): the precomputed embeddings of
+                the texts, computed with the embedding function if None.
         Returns:
             List[str]: ids.
         """
-        embeddings = None
         texts = list(texts)
-        if self.embeddings is not None:
+        if embeddings is None and self.embeddings is not None:
             embeddings = self.embeddings.embed_documents(texts)
         if metadatas:
             try:
@@ -254,22 +298,31 @@ class ChromaStore(VectorStoreBase):
             )
         return ids
 
-    def _query(self, text: str, topk: int, filters: Optional[MetadataFilters] = None):
+    def _query(
+        self,
+        text: Optional[str] = None,
+        topk: int = 4,
+        filters: Optional[MetadataFilters] = None,
+        query_embedding: Optional[List[float]] = None,
+    ):
         """Query Chroma collection.
 
         Args:
             text(str): query text.
             topk(int): topk.
             filters(MetadataFilters): metadata filters.
+            query_embedding(Optional[List[float]]): the query vector, the text is
+                embedded if None.
         Returns:
             dict: query result.
         """
-        if not text:
-            return {}
+        if query_embedding is None:
+            if not text:
+                return {}
+            if self.embeddings is None:
+                raise ValueError("Chroma Embeddings is None")
+            query_embedding = self.embeddings.embed_query(text)
         where_filters = self.convert_metadata_filters(filters) if filters else None
-        if self.embeddings is None:
-            raise ValueError("Chroma Embeddings is None")
-        query_embedding = self.embeddings.embed_query(text)
         return self._collection.query(
             query_embeddings=query_embedding,
             n_results=topk,
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from gptdb._private.pydantic import Field
 from gptdb.core import Chunk, Embeddings
@@ -14,7 +14,7 @@ from gptdb.storage.vector_store.base import (
     VectorStoreBase,
     VectorStoreConfig,
 )
-from gptdb.storage.vector_store.filters import MetadataFilters
+from gptdb.storage.vector_store.filters import FilterOperator, MetadataFilters
 from gptdb.util import string_utils
 from gptdb.util.i18n_utils import _
 
@@ -389,6 +389,52 @@ class ElasticStore(VectorStoreBase):
             info_docs.append(doc_with_score)
         return info_docs
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Perform a kNN search on the dense vectors.
+
+        Only the equality metadata filters are supported.
+
+        Args:
+            vector (List[float]): The query vector.
+            topk (int): The number of similar documents to return.
+            score_threshold (Optional[float]): Optional, a floating point value
+                between 0 to 1.
+            filters (Optional[MetadataFilters]): Optional, metadata filters.
+        Returns:
+            List[Chunk]: Result chunks with scores.
+        """
+        knn: Dict[str, Any] = {
+            "field": "dense_vector",
+            "query_vector": vector,
+            "k": topk,
+            "num_candidates": max(topk * 10, 100),
+        }
+        if filters:
+            knn["filter"] = [
+                {"term": {f"metadata.{f.key}.keyword": f.value}}
+                for f in filters.filters
+                if f.operator == FilterOperator.EQ
+            ]
+        search_results = self.es_client_python.search(
+            index=self.index_name, knn=knn, size=topk
+        )["hits"]["hits"]
+        chunks = [
+            Chunk(
+                content=result["_source"]["context"],
+                metadata=result["_source"]["metadata"],
+                score=result["_score"],
+                chunk_id=result["_id"],
+            )
+            for result in search_results
+        ]
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
     def vector_name_exists(self):
         """Whether vector name exists."""
         return self.es_client_python.indices.exists(index=self.index_name)
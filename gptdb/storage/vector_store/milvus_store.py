@@ -184,6 +184,7 @@ class MilvusStore(VectorStoreBase):
             raise ValueError("embedding_fn is required for MilvusStore")
         self.embedding: Embeddings = vector_store_config.embedding_fn
         self.fields: List = []
+        self.col: Optional[Any] = None
         self.alias = milvus_vector_config.get("alias") or "default"
 
         # use HNSW by default.
@@ -267,19 +268,7 @@ class MilvusStore(VectorStoreBase):
         embeddings = self.embedding.embed_query(texts[0])
 
         if utility.has_collection(self.collection_name):
-            self.col = Collection(self.collection_name, using=self.alias)
-            self.fields = []
-            for x in self.col.schema.fields:
-                self.fields.append(x.name)
-                if x.auto_id:
-                    self.fields.remove(x.name)
-                if x.is_primary:
-                    self.primary_field = x.name
-                if (
-                    x.dtype == DataType.FLOAT_VECTOR
-                    or x.dtype == DataType.BINARY_VECTOR
-                ):
-                    self.vector_field = x.name
+            self._load_fields(Collection(self.collection_name, using=self.alias))
             return self._add_documents(texts, metadatas)
             # return self.collection_name
 
@@ -310,24 +299,42 @@ class MilvusStore(VectorStoreBase):
         schema = CollectionSchema(fields)
         # Create the collection
         collection = Collection(collection_name, schema)
-        self.col = collection
         # index parameters for the collection
         index = self.index_params
         # milvus index
         collection.create_index(vector_field, index)
         collection.load()
-        schema = collection.schema
-        for x in schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
+        self._load_fields(collection)
+        ids = self._add_documents(texts, metadatas)
+
+        return ids
+
+    def _load_fields(self, collection: Any) -> None:
+        """Use the collection and read the fields of its schema."""
+        from pymilvus import DataType
+
+        fields = []
+        for x in collection.schema.fields:
+            if not x.auto_id:
+                fields.append(x.name)
             if x.is_primary:
                 self.primary_field = x.name
             if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
                 self.vector_field = x.name
-        ids = self._add_documents(texts, metadatas)
+        self.col = collection
+        self.fields = fields
 
-        return ids
+    def _load_collection(self) -> None:
+        """Load the collection for searching, its fields are read once."""
+        try:
+            from pymilvus import Collection
+        except ImportError:
+            raise ValueError(
+                "Could not import pymilvus python package. "
+                "Please install it with `pip install pymilvus`."
+            )
+        if self.col is None or not self.fields:
+            self._load_fields(Collection(self.collection_name))
 
     def _add_documents(
         self,
@@ -379,24 +386,7 @@ class MilvusStore(VectorStoreBase):
         self, text, topk, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
         """Perform a search on a query string and return results."""
-        try:
-            from pymilvus import Collection, DataType
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
-        """similar_search in vector database."""
-        self.col = Collection(self.collection_name)
-        schema = self.col.schema
-        for x in schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
-            if x.is_primary:
-                self.primary_field = x.name
-            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
-                self.vector_field = x.name
+        self._load_collection()
         # convert to milvus expr filter.
         milvus_filter_expr = self.convert_metadata_filters(filters) if filters else None
         _, docs_and_scores = self._search(text, topk, expr=milvus_filter_expr)
@@ -430,30 +420,10 @@ class MilvusStore(VectorStoreBase):
         Returns:
             List[Tuple[Document, float]]: Result doc and score.
         """
-        try:
-            from pymilvus import Collection, DataType
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
-
-        self.col = Collection(self.collection_name)
-        schema = self.col.schema
-        for x in schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
-            if x.is_primary:
-                self.primary_field = x.name
-
-            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
-                self.vector_field = x.name
+        self._load_collection()
         # convert to milvus expr filter.
         milvus_filter_expr = self.convert_metadata_filters(filters) if filters else None
-        _, docs_and_scores = self._search(
-            query=text, topk=topk, expr=milvus_filter_expr
-        )
+        _, docs_and_scores = self._search(query=text, k=topk, expr=milvus_filter_expr)
         if any(score < 0.0 or score > 1.0 for _, score, id in docs_and_scores):
             logger.warning(
                 "similarity score need between" f" 0 and 1, got {docs_and_scores}"
@@ -477,27 +447,63 @@ class MilvusStore(VectorStoreBase):
                 )
         return docs_and_scores
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar documents with a query vector.
+
+        Args:
+            vector (List[float]): The query vector.
+            topk (int): The number of similar documents to return.
+            score_threshold (Optional[float]): Optional, a floating point value
+                between 0 to 1.
+            filters (Optional[MetadataFilters]): Optional, metadata filters.
+        Returns:
+            List[Chunk]: Result chunks with scores.
+        """
+        self._load_collection()
+        milvus_filter_expr = self.convert_metadata_filters(filters) if filters else None
+        _, docs_and_scores = self._search(
+            query=None, k=topk, expr=milvus_filter_expr, query_vector=vector
+        )
+        chunks = [
+            Chunk(
+                metadata=doc.metadata,
+                content=doc.content,
+                score=score,
+                chunk_id=str(id),
+            )
+            for doc, score, id in docs_and_scores
+        ]
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
     def _search(
         self,
-        query: str,
+        query: Optional[str],
         k: int = 4,
         param: Optional[dict] = None,
         expr: Optional[str] = None,
         partition_names: Optional[List[str]] = None,
         round_decimal: int = -1,
         timeout: Optional[int] = None,
+        query_vector: Optional[List[float]] = None,
         **kwargs: Any,
     ):
         """Search in vector database.
 
         Args:
-            query: query text.
+            query: query text, ignored if query_vector is given.
             k: topk.
             param: search params.
             expr: search expr.
             partition_names: partition names.
             round_decimal: round decimal.
             timeout: timeout.
+            query_vector: the precomputed query vector.
             **kwargs: kwargs.
         Returns:
             Tuple[Document, float, int]: Result doc and score.
@@ -508,7 +514,8 @@ class MilvusStore(VectorStoreBase):
             index_type = self.col.indexes[0].params["index_type"]
             param = self.index_params_map[index_type].get("params")
         #  query text embedding.
-        query_vector = self.embedding.embed_query(query)
+        if query_vector is None:
+            query_vector = self.embedding.embed_query(query)
         # Determine result metadata fields.
         output_fields = self.fields[:]
         output_fields.remove(self.vector_field)
@@ -565,6 +572,8 @@ class MilvusStore(VectorStoreBase):
         """milvus delete collection name"""
         logger.info(f"milvus vector_name:{vector_name} begin delete...")
         utility.drop_collection(self.collection_name)
+        self.col = None
+        self.fields = []
         return True
 
     def delete_by_ids(self, ids):
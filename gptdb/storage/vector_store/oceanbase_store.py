@@ -787,6 +787,31 @@ class OceanBaseStore(VectorStoreBase):
             for doc, score in docs_and_scores
         ]
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Perform a search with a query vector.
+
+        Metadata filters are not supported yet, a ValueError is raised if any is given.
+        """
+        self.logger.info("OceanBase: similarity_search_by_vector..")
+        if filters and filters.filters:
+            raise ValueError("OceanBase vector store does not support metadata filters")
+        docs_and_scores = (
+            self.vector_store_client.similarity_search_with_score_by_vector(
+                vector, topk
+            )
+        )
+        chunks = [
+            Chunk(content=doc.content, metadata=doc.metadata, score=score)
+            for doc, score in docs_and_scores
+        ]
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
     def vector_name_exists(self):
         """Whether vector name exists."""
         self.logger.info("OceanBase: vector_name_exists..")
@@ -1,7 +1,7 @@
 """Postgres vector store."""
 
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from gptdb._private.pydantic import ConfigDict, Field
 from gptdb.core import Chunk
@@ -11,7 +11,11 @@ from gptdb.storage.vector_store.base import (
     VectorStoreBase,
     VectorStoreConfig,
 )
-from gptdb.storage.vector_store.filters import MetadataFilters
+from gptdb.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilters,
+)
 from gptdb.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -80,6 +84,54 @@ class PGVectorStore(VectorStoreBase):
         """Perform similar search in PGVector."""
         return self.vector_store_client.similarity_search(text, topk, filters)
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Perform similar search in PGVector with a query vector.
+
+        Only the equality and ``in`` metadata filters joined with ``and`` are
+        supported, a ValueError is raised for the others.
+        """
+        pg_filter = self.convert_metadata_filters(filters) if filters else None
+        docs_and_scores = (
+            self.vector_store_client.similarity_search_with_score_by_vector(
+                vector, k=topk, filter=pg_filter
+            )
+        )
+        chunks = [
+            Chunk(content=doc.page_content, metadata=doc.metadata, score=1 - distance)
+            for doc, distance in docs_and_scores
+        ]
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
+    def convert_metadata_filters(self, filters: MetadataFilters) -> dict:
+        """Convert metadata filters to PGVector filters.
+
+        Args:
+            filters(MetadataFilters): metadata filters.
+        Returns:
+            dict: PGVector filters.
+        """
+        if filters.condition != FilterCondition.AND and len(filters.filters) > 1:
+            raise ValueError(
+                f"PGVector does not support the {filters.condition.value} condition"
+            )
+        pg_filter: Dict[str, Any] = {}
+        for filter in filters.filters:
+            if filter.operator == FilterOperator.EQ:
+                pg_filter[filter.key] = filter.value
+            elif filter.operator == FilterOperator.IN:
+                pg_filter[filter.key] = {"in": filter.value}
+            else:
+                raise ValueError(
+                    f"PGVector does not support the {filter.operator.value} operator"
+                )
+        return pg_filter
+
     def vector_name_exists(self) -> bool:
         """Check if vector name exists."""
         try:
@@ -0,0 +1,140 @@
+import threading
+import time
+import zlib
+from typing import List
+
+import pytest
+
+from gptdb.core import Chunk, Embeddings
+from gptdb.storage.vector_store.chroma_store import ChromaStore, ChromaVectorConfig
+from gptdb.storage.vector_store.filters import MetadataFilter, MetadataFilters
+
+_DELAY = 0.2
+
+
+class SlowEmbeddings(Embeddings):
+    """Deterministic embeddings which take a while for each call."""
+
+    def __init__(self, delay: float = _DELAY):
+        self.delay = delay
+        self.calls = 0
+
+    def _embed(self, text: str) -> List[float]:
+        seed = zlib.crc32(text.encode("utf-8"))
+        return [((seed >> i) & 0xFF) / 255 + 0.01 for i in range(0, 32, 4)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+@pytest.fixture
+def store(tmp_path):
+    config = ChromaVectorConfig(
+        name="test_pipeline",
+        persist_path=str(tmp_path),
+        embedding_fn=SlowEmbeddings(),
+    )
+    store = ChromaStore(config)
+    add_texts = store._add_texts
+
+    def slow_add_texts(*args, **kwargs):
+        time.sleep(_DELAY)
+        return add_texts(*args, **kwargs)
+
+    store._add_texts = slow_add_texts
+    return store
+
+
+def _chunks(n: int) -> List[Chunk]:
+    return [
+        Chunk(
+            content=f"content {i}",
+            metadata={"source": f"doc_{i % 2}"},
+            chunk_id=f"chunk_{i}",
+        )
+        for i in range(n)
+    ]
+
+
+def test_pipelined_load_overlaps_embedding_and_write(store):
+    chunks = _chunks(40)
+
+    start = time.perf_counter()
+    for i in range(0, 20, 5):
+        store.load_document(chunks[i : i + 5])
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ids = store.load_document_with_limit(chunks[20:], max_chunks_once_load=5)
+    pipelined = time.perf_counter() - start
+
+    assert ids == [chunk.chunk_id for chunk in chunks[20:]]
+    assert store._collection.count() == 40
+    # 4 groups: sequential ~ 4 * (embed + write), pipelined ~ 5 * delay
+    assert pipelined < sequential * 0.8
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit(store):
+    chunks = _chunks(12)
+    ids = await store.aload_document_with_limit(
+        chunks, max_chunks_once_load=4, max_threads=2
+    )
+    assert ids == [chunk.chunk_id for chunk in chunks]
+    assert store.embeddings.calls == 3
+    assert store._collection.count() == 12
+
+
+def test_similarity_search_by_vector(store):
+    chunks = _chunks(6)
+    store.load_document(chunks)
+    vector = store.embeddings.embed_query("content 3")
+
+    results = store.similarity_search_by_vector(vector, topk=2)
+    assert results[0].chunk_id == "chunk_3"
+    assert results[0].content == "content 3"
+    assert results[0].score == pytest.approx(1.0, abs=1e-5)
+
+    results = store.similarity_search_by_vector(vector, topk=6, score_threshold=0.999)
+    assert [r.chunk_id for r in results] == ["chunk_3"]
+
+    filters = MetadataFilters(filters=[MetadataFilter(key="source", value="doc_0")])
+    results = store.similarity_search_by_vector(vector, topk=6, filters=filters)
+    assert len(results) == 3
+    assert all(r.metadata["source"] == "doc_0" for r in results)
+
+
+def test_pipelined_load_bounds_embedded_groups(store):
+    store.embeddings.delay = _DELAY / 4
+    held, max_held = 0, 0
+    lock = threading.Lock()
+    embed_chunks, load_embedded_chunks = (
+        store._embed_chunks,
+        store._load_embedded_chunks,
+    )
+
+    def _embed_chunks(chunks):
+        nonlocal held, max_held
+        embeddings = embed_chunks(chunks)
+        with lock:
+            held += 1
+            max_held = max(max_held, held)
+        return embeddings
+
+    def _load_embedded_chunks(chunks, embeddings):
+        nonlocal held
+        ids = load_embedded_chunks(chunks, embeddings)
+        with lock:
+            held -= 1
+        return ids
+
+    store._embed_chunks = _embed_chunks
+    store._load_embedded_chunks = _load_embedded_chunks
+    store.load_document_with_limit(_chunks(24), max_chunks_once_load=4, max_threads=2)
+    # The group being written and the embedded groups waiting for it
+    assert max_held == 3
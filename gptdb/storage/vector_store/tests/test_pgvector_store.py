@@ -0,0 +1,50 @@
+import pytest
+
+from gptdb.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from gptdb.storage.vector_store.pgvector_store import PGVectorStore
+
+
+class _PGVectorStore(PGVectorStore):
+    similar_search_with_scores = None
+
+
+@pytest.fixture
+def store():
+    # The filters are converted without a PGVector client
+    return _PGVectorStore.__new__(_PGVectorStore)
+
+
+def test_convert_metadata_filters(store):
+    filters = MetadataFilters(
+        filters=[
+            MetadataFilter(key="source", value="a.md"),
+            MetadataFilter(key="page", operator=FilterOperator.IN, value=[1, 2]),
+        ]
+    )
+    assert store.convert_metadata_filters(filters) == {
+        "source": "a.md",
+        "page": {"in": [1, 2]},
+    }
+
+
+def test_convert_metadata_filters_unsupported(store):
+    filters = MetadataFilters(
+        filters=[MetadataFilter(key="page", operator=FilterOperator.GT, value=1)]
+    )
+    with pytest.raises(ValueError):
+        store.convert_metadata_filters(filters)
+
+    filters = MetadataFilters(
+        condition=FilterCondition.OR,
+        filters=[
+            MetadataFilter(key="source", value="a.md"),
+            MetadataFilter(key="source", value="b.md"),
+        ],
+    )
+    with pytest.raises(ValueError):
+        store.similarity_search_by_vector([0.1], topk=1, filters=filters)
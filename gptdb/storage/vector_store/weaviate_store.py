@@ -106,6 +106,38 @@ class WeaviateStore(VectorStoreBase):
             )
         return docs
 
+    def similarity_search_by_vector(
+        self,
+        vector: List[float],
+        topk: int,
+        score_threshold: Optional[float] = None,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Perform similar search in Weaviate with a query vector.
+
+        The metadata filters are not supported yet.
+        """
+        logger.info("Weaviate similar search by vector")
+        response = (
+            self.vector_store_client.query.get(
+                self.vector_name, ["metadata", "page_content"]
+            )
+            .with_near_vector({"vector": vector})
+            .with_additional(["distance"])
+            .with_limit(topk)
+            .do()
+        )
+        res = response["data"]["Get"][list(response["data"]["Get"].keys())[0]]
+        chunks = [
+            Chunk(
+                content=r["page_content"],
+                metadata={"metadata": r["metadata"]},
+                score=1 - r["_additional"]["distance"],
+            )
+            for r in res
+        ]
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
     def vector_name_exists(self) -> bool:
         """Whether the vector name exists in Weaviate.
 
@@ -0,0 +1,140 @@
+"""Benchmark the encoding of a long multi-agent chat stream.
+
+The legacy OpenAI-compatible output parses the server-sent events of the web app and
+sends the whole output in each chunk, the typed events are encoded once. The vis text
+of the agent messages rewrites its tail while a message streams, so its chunks are
+still full snapshots, the plain text of the chat flow apps only appends and only the
+delta of each chunk is sent.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.agent.agent_chat_stream_benchmarks --messages 50
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from functools import partial
+from typing import Callable, Iterator, List
+
+from gptdb._private.pydantic import model_to_json
+from gptdb.core.schema.api import (
+    ChatCompletionResponseStreamChoice,
+    ChatCompletionStreamResponse,
+    DeltaMessage,
+)
+from gptdb.serve.agent.agents.chat_events import (
+    AgentChatEventBuilder,
+    AgentChatEventType,
+    OpenAIStreamEncoder,
+    encode_sse_event,
+)
+
+AGENTS = ["Planner", "DataAnalyst", "CodeEngineer", "Reporter"]
+
+
+def fake_conversation(
+    messages: int, tokens: int, vis: bool = True, seed: int = 42
+) -> Iterator[str]:
+    """Yield the full output after each token of a fake multi-agent chat."""
+    rng = random.Random(seed)
+    words = ["select", "from", "table", "where", "sales", "total", "the", "查询"]
+    finished: List[str] = []
+    for i in range(messages):
+        sender = AGENTS[i % len(AGENTS)]
+        content = ""
+        for _ in range(tokens):
+            content += rng.choice(words) + " "
+            if not vis:
+                yield "\n".join(finished + [f"{sender}: {content}"])
+                continue
+            current = json.dumps(
+                {"sender": sender, "receiver": "User", "markdown": content},
+                ensure_ascii=False,
+            )
+            yield "\n".join(finished + [f"```agent-messages\n{current}\n```"])
+        if vis:
+            finished.append(f"```agent-messages\n{current}\n```")
+        else:
+            finished.append(f"{sender}: {content}")
+
+
+def legacy_openai_stream(vis_texts: List[str]) -> Iterator[str]:
+    """Encode the web events, parse them back and resend the vis, as before."""
+    for vis_text in vis_texts + ["[DONE]"]:
+        output = f"data:{json.dumps({'vis': vis_text}, ensure_ascii=False)}\n\n"
+        match = re.search(r"data:\s*({.*})", output)
+        if match:
+            vis = json.loads(match.group(1))
+            vis_content = vis.get("vis", None)
+            if vis_content != "[DONE]":
+                choice_data = ChatCompletionResponseStreamChoice(
+                    index=0,
+                    delta=DeltaMessage(role="assistant", content=vis_content),
+                )
+                chunk = ChatCompletionStreamResponse(
+                    id="conv_1",
+                    choices=[choice_data],
+                    model="fake_model",
+                    created=int(time.time()),
+                )
+                json_content = model_to_json(
+                    chunk, exclude_unset=True, ensure_ascii=False
+                )
+                yield f"data: {json_content}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def event_openai_stream(vis_texts: List[str], vis: bool = True) -> Iterator[str]:
+    events = AgentChatEventBuilder("conv_1")
+    encoder = OpenAIStreamEncoder("conv_1", "fake_model")
+    event_type = AgentChatEventType.VIS if vis else AgentChatEventType.TEXT
+    for vis_text in vis_texts:
+        content = encoder.encode(events.output(vis_text, event_type))
+        if content:
+            yield content
+    yield encoder.finish()
+
+
+def event_sse_stream(vis_texts: List[str]) -> Iterator[str]:
+    events = AgentChatEventBuilder("conv_1")
+    for vis_text in vis_texts:
+        yield encode_sse_event(events.output(vis_text))
+    yield encode_sse_event(events.done())
+
+
+def measure(stream: Callable[[List[str]], Iterator[str]], vis_texts: List[str]):
+    start = time.process_time()
+    size = sum(len(chunk.encode("utf-8")) for chunk in stream(vis_texts))
+    return (time.process_time() - start) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--tokens", type=int, default=100)
+    args = parser.parse_args()
+
+    for vis in [True, False]:
+        vis_texts = list(fake_conversation(args.messages, args.tokens, vis=vis))
+        print(
+            f"{'vis' if vis else 'plain text'} output, {len(vis_texts)} chunks, "
+            f"final output: {len(vis_texts[-1].encode('utf-8')) / 1024:.1f} KiB"
+        )
+        print(f"{'output':<28}{'CPU (ms)':>12}{'bytes on wire':>16}")
+        for name, stream in [
+            ("OpenAI, legacy round trip", legacy_openai_stream),
+            ("OpenAI, typed events", partial(event_openai_stream, vis=vis)),
+            ("web SSE, typed events", event_sse_stream),
+        ]:
+            cpu_ms, size = measure(stream, vis_texts)
+            print(f"{name:<28}{cpu_ms:>12.1f}{size:>16,}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
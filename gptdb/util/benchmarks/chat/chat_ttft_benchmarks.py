@@ -0,0 +1,354 @@
+"""Benchmark the time to the first token of the knowledge chat with a fake model.
+
+Every request constructs the chat scene in the executor like ``get_chat_instance``
+of the chat API and streams its answer, the time to the first token is measured
+from the start of the construction. The metadata (knowledge space, documents,
+chunks and conversations) is stored in SQLite and the chunks in Chroma, the model
+and the embeddings are deterministic fakes.
+
+The time to the first token is compared:
+
+- with the components built for every request, as before: the chat component
+  cache is cleared before every request and the history is loaded in the
+  constructor.
+- with the cached components of the knowledge space: the prompt template, the
+  retriever, the vector store and the model operators.
+- with the cached components and the history prefetched concurrently with the
+  retrieval.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.chat.chat_ttft_benchmarks --requests 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from gptdb.util.benchmarks.rag.fakes import (
+    FakeEmbeddings,
+    FakeLLMClient,
+    generate_document,
+)
+
+SPACE_NAME = "ttft_bench"
+
+
+class FakeWorkerManager:
+    """Serve the model requests of the chat with the fake model."""
+
+    def __init__(self, client: FakeLLMClient, delay: float):
+        self._client = client
+        self._delay = delay
+
+    @staticmethod
+    def _to_request(params: Dict):
+        from gptdb.core import ModelMessage, ModelRequest
+
+        messages = [ModelMessage(**m) for m in params["messages"]]
+        return ModelRequest.build_request(params["model"], messages)
+
+    async def generate_stream(self, params: Dict):
+        # The latency of the model before its first token
+        await asyncio.sleep(self._delay)
+        async for output in self._client.generate_stream(self._to_request(params)):
+            yield output
+
+    async def generate(self, params: Dict):
+        await asyncio.sleep(self._delay)
+        return await self._client.generate(self._to_request(params))
+
+    async def get_all_model_instances(self, worker_type: str, healthy_only: bool):
+        from gptdb.model.parameter import WorkerType
+
+        return [SimpleNamespace(worker_key=WorkerType.to_worker_key("fake", "llm"))]
+
+    async def get_model_metadata(self, params: Dict):
+        return (await self._client.models())[0]
+
+    async def count_token(self, params: Dict) -> int:
+        return await self._client.count_token(params["model"], params["prompt"])
+
+
+def setup_system_app(
+    db_path: str, embedding_delay: float, model_delay: float, output_tokens: int
+):
+    from fastapi import FastAPI
+
+    from gptdb._private.config import Config
+    from gptdb.component import SystemApp
+    from gptdb.model.cluster import WorkerManagerFactory
+    from gptdb.rag.embedding.embedding_factory import EmbeddingFactory
+    from gptdb.serve.conversation.serve import Serve as ConversationServe
+    from gptdb.storage.cache import initialize_cache
+    from gptdb.storage.metadata import db
+    from gptdb.util.executor_utils import DefaultExecutorFactory
+
+    class _FakeEmbeddingFactory(EmbeddingFactory):
+        def __init__(self):
+            super().__init__()
+            self._embeddings = FakeEmbeddings(delay_per_text=embedding_delay)
+
+        def init_app(self, system_app):
+            pass
+
+        def create(self, model_name=None, embedding_cls=None):
+            return self._embeddings
+
+    class _FakeWorkerManagerFactory(WorkerManagerFactory):
+        def __init__(self):
+            super().__init__()
+            self._manager = FakeWorkerManager(
+                FakeLLMClient(output_tokens=output_tokens), model_delay
+            )
+
+        def create(self):
+            return self._manager
+
+    cfg = Config()
+    cfg.VECTOR_STORE_TYPE = "Chroma"
+    cfg.KNOWLEDGE_SEARCH_REWRITE = False
+    cfg.RERANK_MODEL = None
+    # The fake embeddings are random, retrieve the top chunks regardless of score
+    cfg.KNOWLEDGE_SEARCH_RECALL_SCORE = 0.0
+    system_app = SystemApp(FastAPI())
+    cfg.SYSTEM_APP = system_app
+
+    db.init_db(f"sqlite:///{db_path}")
+    from gptdb.app.knowledge.chunk_db import DocumentChunkEntity  # noqa: F401
+    from gptdb.app.knowledge.document_db import KnowledgeDocumentEntity  # noqa: F401
+    from gptdb.serve.rag.models.models import KnowledgeSpaceEntity  # noqa: F401
+    from gptdb.storage.chat_history.chat_history_db import (  # noqa: F401
+        ChatHistoryEntity,
+        ChatHistoryMessageEntity,
+    )
+
+    db.create_all()
+
+    system_app.register(DefaultExecutorFactory)
+    system_app.register_instance(_FakeEmbeddingFactory())
+    system_app.register_instance(_FakeWorkerManagerFactory())
+    initialize_cache(system_app, "memory", 64, None)
+    # Only the storages of the conversations are needed, not the other services
+    conv_serve = system_app.register(ConversationServe)
+    conv_serve.before_start()
+    return system_app
+
+
+def create_knowledge_space(documents: int, chunks_per_document: int, words: int):
+    from gptdb._private.config import Config
+    from gptdb.app.knowledge.chunk_db import DocumentChunkDao, DocumentChunkEntity
+    from gptdb.app.knowledge.document_db import (
+        KnowledgeDocumentDao,
+        KnowledgeDocumentEntity,
+    )
+    from gptdb.core import Chunk
+    from gptdb.rag.embedding.embedding_factory import EmbeddingFactory
+    from gptdb.serve.rag.connector import VectorStoreConnector
+    from gptdb.serve.rag.models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+    from gptdb.storage.vector_store.base import VectorStoreConfig
+
+    KnowledgeSpaceDao().create_knowledge_space(
+        KnowledgeSpaceEntity(
+            name=SPACE_NAME, vector_type="Chroma", desc="benchmark", owner="bench"
+        )
+    )
+    document_dao = KnowledgeDocumentDao()
+    chunk_dao = DocumentChunkDao()
+    chunks = []
+    for i in range(documents):
+        doc_name = f"doc_{i}.md"
+        document_id = document_dao.create_knowledge_document(
+            KnowledgeDocumentEntity(
+                doc_name=doc_name,
+                doc_type="TEXT",
+                space=SPACE_NAME,
+                chunk_size=chunks_per_document,
+                status="FINISHED",
+                content="",
+                result="",
+                gmt_created=datetime.now(),
+                gmt_modified=datetime.now(),
+            )
+        )
+        contents = [
+            generate_document(words, seed=i * 1000 + j)
+            for j in range(chunks_per_document)
+        ]
+        chunk_dao.create_documents_chunks(
+            [
+                DocumentChunkEntity(
+                    doc_name=doc_name,
+                    doc_type="TEXT",
+                    document_id=document_id,
+                    content=content,
+                    meta_info="",
+                )
+                for content in contents
+            ]
+        )
+        chunks.extend(
+            Chunk(content=content, metadata={"source": doc_name})
+            for content in contents
+        )
+    cfg = Config()
+    embedding_fn = cfg.SYSTEM_APP.get_component(
+        "embedding_factory", EmbeddingFactory
+    ).create()
+    connector = VectorStoreConnector(
+        vector_store_type="Chroma",
+        vector_store_config=VectorStoreConfig(
+            name=SPACE_NAME, embedding_fn=embedding_fn
+        ),
+    )
+    connector.load_document(chunks)
+
+
+def create_conversations(conversations: int, rounds: int, words: int) -> List[str]:
+    from gptdb._private.config import Config
+    from gptdb.core.interface.message import StorageConversation
+    from gptdb.serve.conversation.serve import Serve as ConversationServe
+
+    conv_serve = ConversationServe.get_instance(Config().SYSTEM_APP)
+    conv_uids = []
+    for i in range(conversations):
+        conv_uid = f"ttft_conv_{i}"
+        conv = StorageConversation(
+            conv_uid,
+            chat_mode="chat_knowledge",
+            user_name="bench",
+            conv_storage=conv_serve.conv_storage,
+            message_storage=conv_serve.message_storage,
+        )
+        for j in range(rounds):
+            text = generate_document(words, seed=i * 100 + j)
+            conv.start_new_round()
+            conv.add_user_message(text)
+            conv.add_ai_message(text)
+            conv.end_current_round()
+        conv_uids.append(conv_uid)
+    return conv_uids
+
+
+async def chat_request(conv_uid: str, question: str) -> float:
+    """Construct the chat and stream its answer, return the time to first token."""
+    from gptdb._private.config import Config
+    from gptdb.app.scene import ChatFactory
+    from gptdb.component import ComponentType
+    from gptdb.util.executor_utils import ExecutorFactory, blocking_func_to_async
+
+    cfg = Config()
+    executor = cfg.SYSTEM_APP.get_component(
+        ComponentType.EXECUTOR_DEFAULT, ExecutorFactory
+    ).create()
+    chat_param = {
+        "chat_session_id": conv_uid,
+        "user_name": "bench",
+        "sys_code": None,
+        "current_user_input": question,
+        "select_param": SPACE_NAME,
+        "model_name": "fake",
+    }
+    start = time.perf_counter()
+    chat = await blocking_func_to_async(
+        executor,
+        ChatFactory.get_implementation,
+        "chat_knowledge",
+        **{"chat_param": chat_param},
+    )
+    ttft: Optional[float] = None
+    async for _ in chat.stream_call():
+        if ttft is None:
+            ttft = (time.perf_counter() - start) * 1000
+    return ttft
+
+
+async def run_mode(
+    conv_uids: List[str], requests: int, cached: bool, prefetch: bool
+) -> Dict[str, float]:
+    from gptdb.app.scene.chat_components import get_chat_component_cache
+    from gptdb.app.scene.chat_knowledge.v1.chat import ChatKnowledge
+
+    ChatKnowledge.prefetch_history = prefetch
+    cache = get_chat_component_cache()
+    cache.clear()
+    latencies = []
+    for i in range(requests):
+        if not cached:
+            cache.clear()
+        conv_uid = conv_uids[i % len(conv_uids)]
+        latencies.append(await chat_request(conv_uid, f"What is the data {i}?"))
+    # The first request of the cached modes builds the components
+    first = latencies[0]
+    steady = sorted(latencies[1:]) or [first]
+    return {
+        "first": first,
+        "mean": statistics.mean(steady),
+        "p50": steady[len(steady) // 2],
+        "p95": steady[int(len(steady) * 0.95)],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--chunks-per-document", type=int, default=50)
+    parser.add_argument("--chunk-words", type=int, default=100)
+    parser.add_argument("--conversations", type=int, default=10)
+    parser.add_argument("--history-rounds", type=int, default=20)
+    parser.add_argument("--embedding-delay", type=float, default=0.02)
+    parser.add_argument("--model-delay", type=float, default=0.05)
+    parser.add_argument("--output-tokens", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The vector store of the space is created in the temporary directory
+        os.environ["CHROMA_PERSIST_PATH"] = tmp_dir
+        setup_system_app(
+            os.path.join(tmp_dir, "metadata.db"),
+            args.embedding_delay,
+            args.model_delay,
+            args.output_tokens,
+        )
+        create_knowledge_space(
+            args.documents, args.chunks_per_document, args.chunk_words
+        )
+        conv_uids = create_conversations(
+            args.conversations, args.history_rounds, args.chunk_words
+        )
+        print(
+            f"{args.requests} requests, {args.documents * args.chunks_per_document} "
+            f"chunks, {args.history_rounds} history rounds, embedding delay "
+            f"{args.embedding_delay * 1000:.0f} ms, model delay "
+            f"{args.model_delay * 1000:.0f} ms"
+        )
+        print(
+            f"{'mode':<36}{'first (ms)':>12}{'mean (ms)':>11}{'p50 (ms)':>10}"
+            f"{'p95 (ms)':>10}"
+        )
+        modes = [
+            ("built for every request", False, False),
+            ("cached components", True, False),
+            ("cached components, prefetch", True, True),
+        ]
+        for name, cached, prefetch in modes:
+            result = await run_mode(conv_uids, args.requests, cached, prefetch)
+            print(
+                f"{name:<36}{result['first']:>12.1f}{result['mean']:>11.1f}"
+                f"{result['p50']:>10.1f}{result['p95']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
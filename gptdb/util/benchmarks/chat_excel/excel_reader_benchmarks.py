@@ -0,0 +1,77 @@
+"""Benchmark the first-turn and repeat-turn latency of the ChatExcel reader.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.chat_excel.excel_reader_benchmarks --rows 500000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from gptdb.app.scene.chat_data.chat_excel.excel_reader import ExcelReader
+
+QUERY = (
+    "SELECT region, COUNT(*) AS orders, SUM(amount) AS total "
+    "FROM excel_data GROUP BY region ORDER BY total DESC"
+)
+
+
+def generate_csv(file_path: str, rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "order_id": np.arange(rows),
+            "region": rng.choice(["east", "west", "north", "south"], rows),
+            "product": rng.choice([f"product_{i}" for i in range(100)], rows),
+            "amount": [f"${v:.2f}" for v in rng.uniform(1, 1000, rows)],
+            "order date": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+        }
+    )
+    df.to_csv(file_path, index=False)
+
+
+def run_turn(conv_uid: str, file_path: str, cache_dir: str) -> float:
+    start = time.perf_counter()
+    reader = ExcelReader(conv_uid, file_path, cache_dir=cache_dir)
+    reader.get_sample_data()
+    reader.run(QUERY)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "orders.csv")
+        cache_dir = os.path.join(tmp_dir, "excel_cache")
+        generate_csv(file_path, args.rows)
+        file_size = os.path.getsize(file_path) / 1024 / 1024
+        print(f"Generated {args.rows} rows csv file, size: {file_size:.2f} MiB")
+
+        first_turn = run_turn("conv_0", file_path, cache_dir)
+        repeat_turns = [
+            run_turn(f"conv_{i}", file_path, cache_dir)
+            for i in range(1, args.turns + 1)
+        ]
+        print(f"first turn latency: {first_turn:.2f} ms")
+        print(
+            f"repeat turn latency: mean {statistics.mean(repeat_turns):.2f} ms, "
+            f"max {max(repeat_turns):.2f} ms"
+        )
+        print(f"speedup: {first_turn / statistics.mean(repeat_turns):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark the explore latency and the reload time of the memory graph store.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.graph_store.memgraph_benchmarks --edges 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from gptdb.storage.graph_store.graph import Direction
+from gptdb.storage.graph_store.memgraph_store import (
+    MemoryGraphStore,
+    MemoryGraphStoreConfig,
+)
+
+RELATIONS = [f"relation_{i}" for i in range(50)]
+
+
+def generate_triplets(edges: int, vertices: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        (
+            f"entity_{rng.randrange(vertices)}",
+            rng.choice(RELATIONS),
+            f"entity_{rng.randrange(vertices)}",
+        )
+        for _ in range(edges)
+    ]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def explore_latency(store: MemoryGraphStore, subs, **kwargs):
+    latencies = []
+    edge_count = 0
+    for sub in subs:
+        subgraph, ms = timed(store.explore, [sub], **kwargs)
+        latencies.append(ms)
+        edge_count += subgraph.edge_count
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    return statistics.mean(latencies), p95, edge_count / len(subs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--vertices", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    triplets = generate_triplets(args.edges, args.vertices)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = MemoryGraphStoreConfig(
+            name="bench", persist_path=tmp_dir, compact_threshold=args.edges * 2
+        )
+        store = MemoryGraphStore(config)
+        _, insert_ms = timed(store.insert_triplets, triplets)
+        print(f"insert {args.edges} triplets with the append log: {insert_ms:.2f} ms")
+
+        rng = random.Random(7)
+        subs = [f"entity_{rng.randrange(args.vertices)}" for _ in range(args.queries)]
+        print(f"{'explore':<36}{'mean (ms)':>12}{'p95 (ms)':>12}{'edges':>10}")
+        for name, kwargs in [
+            ("depth=2, both", {"direct": Direction.BOTH, "depth": 2}),
+            ("depth=3, both, limit=100", {"depth": 3, "limit": 100}),
+            ("unbounded, both, limit=1000", {"limit": 1000}),
+            ("unbounded, both, fan=5, limit=1000", {"fan": 5, "limit": 1000}),
+        ]:
+            mean, p95, edges = explore_latency(store, subs, **kwargs)
+            print(f"{name:<36}{mean:>12.2f}{p95:>12.2f}{edges:>10.1f}")
+        _, ms = timed(store.explore, [subs[0]], direct=Direction.BOTH)
+        print(f"{'unbounded, both, whole component':<36}{ms:>12.2f}")
+
+        log_size = os.path.getsize(os.path.join(tmp_dir, "bench.log.jsonl"))
+        reloaded, replay_ms = timed(MemoryGraphStore, config)
+        assert reloaded.get_full_graph().edge_count == args.edges
+
+        _, compact_ms = timed(store.persist)
+        snapshot_size = os.path.getsize(os.path.join(tmp_dir, "bench.snapshot.json"))
+        reloaded, snapshot_ms = timed(MemoryGraphStore, config)
+        assert reloaded.get_full_graph().edge_count == args.edges
+
+        print(f"{'reload':<36}{'time (ms)':>12}{'size (MiB)':>12}")
+        print(
+            f"{'replay the append log':<36}{replay_ms:>12.2f}{log_size / 2**20:>12.2f}"
+        )
+        print(
+            f"{'read the snapshot':<36}{snapshot_ms:>12.2f}"
+            f"{snapshot_size / 2**20:>12.2f}"
+        )
+        print(f"write the snapshot: {compact_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark the pagination and the content search of the knowledge chunks.
+
+A synthetic SQLite database of document chunks is created, then the latency of
+reading page N with ``OFFSET`` is compared with the keyset pagination (the id of
+the last chunk of the previous page), and the content search with ``LIKE`` is
+compared with the FTS5 content index of :class:`DocumentChunkDao`.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.rag.chunk_pagination_benchmarks --chunks 2000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, List
+
+import numpy as np
+from sqlalchemy import text
+
+from gptdb.app.knowledge.chunk_db import DocumentChunkDao, DocumentChunkEntity
+from gptdb.storage.metadata import db
+
+_WORDS = ["data", "query", "table", "index", "vector", "model", "agent", "chunk"]
+
+
+def generate_chunks(conn, chunks: int, chunks_per_document: int, words: int):
+    """Insert the synthetic chunks, every chunk has a rare tag word."""
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    batch_size = 50000
+    for start in range(0, chunks, batch_size):
+        size = min(batch_size, chunks - start)
+        indexes = rng.integers(0, len(_WORDS), size=(size, words))
+        tags = rng.integers(0, 100000, size=size)
+        rows = []
+        for i in range(size):
+            content = " ".join(_WORDS[j] for j in indexes[i])
+            rows.append(
+                {
+                    "document_id": (start + i) // chunks_per_document,
+                    "doc_name": "doc.md",
+                    "doc_type": "DOCUMENT",
+                    "content": f"{content} tag{tags[i]:05d}.",
+                    "meta_info": "",
+                    "gmt_created": now,
+                    "gmt_modified": now,
+                }
+            )
+        conn.execute(DocumentChunkEntity.__table__.insert(), rows)
+
+
+def measure(func: Callable, repeats: int) -> float:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def benchmark_pages(dao: DocumentChunkDao, chunks: int, page_size: int, repeats: int):
+    print(f"{'page':>10}{'offset (ms)':>14}{'keyset (ms)':>14}")
+    pages = [1, 10, 100, 1000, 10000, 100000]
+    pages = [p for p in pages if (p - 1) * page_size < chunks]
+    if chunks // page_size not in pages:
+        pages.append(chunks // page_size)
+    query = DocumentChunkEntity()
+    with db.session() as session:
+        ids: List[int] = [
+            row[0] for row in session.execute(text("SELECT id FROM document_chunk"))
+        ]
+    ids.sort()
+    for page in pages:
+        after_id = ids[(page - 1) * page_size - 1] if page > 1 else 0
+        offset_ms = measure(
+            lambda: dao.get_document_chunks(query, page=page, page_size=page_size),
+            repeats,
+        )
+        keyset_ms = measure(
+            lambda: dao.get_document_chunks(
+                query, page_size=page_size, after_id=after_id
+            ),
+            repeats,
+        )
+        print(f"{page:>10}{offset_ms:>14.2f}{keyset_ms:>14.2f}")
+
+
+def benchmark_search(dao: DocumentChunkDao, page_size: int, repeats: int) -> dict:
+    queries = [
+        ("rare tag, page 1", "tag04242", False),
+        ("rare tag, count", "tag04242", True),
+        ("common words, page 1", "index vector", False),
+        ("missing words, page 1", "no such chunk", False),
+    ]
+    results = {}
+    for name, content, count in queries:
+        query = DocumentChunkEntity(content=content)
+        if count:
+            results[name] = measure(
+                lambda: dao.get_document_chunks_count(query), repeats
+            )
+        else:
+            results[name] = measure(
+                lambda: dao.get_document_chunks(query, page_size=page_size), repeats
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=2000000)
+    parser.add_argument("--chunks-per-document", type=int, default=200)
+    parser.add_argument("--words", type=int, default=40)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db-path", type=str, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = args.db_path or os.path.join(tmp_dir, "chunks.db")
+        db.init_db(f"sqlite:///{db_path}")
+        db.create_all()
+        dao = DocumentChunkDao()
+        start = time.perf_counter()
+        with db.engine.begin() as conn:
+            generate_chunks(conn, args.chunks, args.chunks_per_document, args.words)
+        print(
+            f"insert {args.chunks} chunks of {args.words} words: "
+            f"{time.perf_counter() - start:.1f} s"
+        )
+
+        benchmark_pages(dao, args.chunks, args.page_size, args.repeats)
+
+        like = benchmark_search(dao, args.page_size, args.repeats)
+        start = time.perf_counter()
+        dao.create_content_index()
+        print(f"build the content index: {time.perf_counter() - start:.1f} s")
+        fts = benchmark_search(dao, args.page_size, args.repeats)
+        print(f"{'search':<24}{'like (ms)':>12}{'fts (ms)':>12}")
+        for name in like:
+            print(f"{name:<24}{like[name]:>12.2f}{fts[name]:>12.2f}")
+        db_size = os.path.getsize(db_path) / 1024 / 1024
+        print(f"database size with the content index: {db_size:.1f} MiB")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Deterministic fake models for the offline benchmarks."""
+
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, List
+
+import numpy as np
+
+from gptdb.core import (
+    Embeddings,
+    LLMClient,
+    ModelMetadata,
+    ModelOutput,
+    ModelRequest,
+    RerankEmbeddings,
+)
+
+_WORDS = [
+    "data",
+    "query",
+    "table",
+    "index",
+    "vector",
+    "model",
+    "agent",
+    "chunk",
+    "graph",
+    "token",
+]
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.md5(text.encode("utf-8")).digest()[:4], "little")
+
+
+class FakeEmbeddings(Embeddings):
+    """Embed the text with a random unit vector seeded by its hash.
+
+    Args:
+        dim (int): The dimension of the vectors.
+        delay_per_text (float): Seconds to sleep for each text, to simulate the
+            latency of a real model.
+    """
+
+    def __init__(self, dim: int = 384, delay_per_text: float = 0.0):
+        self.dim = dim
+        self.delay_per_text = delay_per_text
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.random.default_rng(_seed(text)).standard_normal(self.dim)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.delay_per_text:
+            time.sleep(self.delay_per_text * len(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class FakeRerankModel(RerankEmbeddings):
+    """Score the candidates by the number of query words they contain."""
+
+    def __init__(self, delay_per_candidate: float = 0.0):
+        self.delay_per_candidate = delay_per_candidate
+
+    def predict(self, query: str, candidates: List[str]) -> List[float]:
+        if self.delay_per_candidate:
+            time.sleep(self.delay_per_candidate * len(candidates))
+        words = set(query.split())
+        return [
+            float(sum(word in words for word in candidate.split()))
+            for candidate in candidates
+        ]
+
+
+class FakeLLMClient(LLMClient):
+    """Generate ``output_tokens`` words picked by the hash of the prompt.
+
+    Args:
+        output_tokens (int): The number of generated words.
+        delay_per_token (float): Seconds to wait for each streamed word.
+    """
+
+    def __init__(self, output_tokens: int = 64, delay_per_token: float = 0.0):
+        self.output_tokens = output_tokens
+        self.delay_per_token = delay_per_token
+
+    def _words(self, request: ModelRequest) -> List[str]:
+        seed = _seed(request.messages[-1].content)
+        return [_WORDS[(seed + i * 7) % len(_WORDS)] for i in range(self.output_tokens)]
+
+    async def generate(self, request: ModelRequest) -> ModelOutput:
+        if self.delay_per_token:
+            await asyncio.sleep(self.delay_per_token * self.output_tokens)
+        return ModelOutput(error_code=0, text=" ".join(self._words(request)))
+
+    async def generate_stream(
+        self, request: ModelRequest
+    ) -> AsyncIterator[ModelOutput]:
+        text = ""
+        for word in self._words(request):
+            if self.delay_per_token:
+                await asyncio.sleep(self.delay_per_token)
+            text = f"{text} {word}" if text else word
+            yield ModelOutput(error_code=0, text=text)
+
+    async def models(self) -> List[ModelMetadata]:
+        return [ModelMetadata(model="fake")]
+
+    async def count_token(self, model: str, prompt: str) -> int:
+        return len(prompt.split())
+
+
+def generate_document(words: int, seed: int = 0) -> str:
+    """Return a deterministic document of paragraphs and sentences."""
+    rng = np.random.default_rng(seed)
+    indexes = rng.integers(0, len(_WORDS), size=words)
+    sentences = []
+    for i in range(0, words, 12):
+        sentences.append(" ".join(_WORDS[j] for j in indexes[i : i + 12]) + ".")
+    paragraphs = [" ".join(sentences[i : i + 8]) for i in range(0, len(sentences), 8)]
+    return "\n\n".join(paragraphs)
@@ -0,0 +1,471 @@
+"""Micro-benchmarks of the RAG paths and the AWEL DAG overhead.
+
+All the models are deterministic fakes, so the suite runs offline on CPU and the
+results can be compared across commits.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.rag.rag_benchmarks --output before.json
+    # ... change the code ...
+    python -m gptdb.util.benchmarks.rag.rag_benchmarks --output after.json \
+        --compare before.json
+
+Every benchmark runs in its own process, so the peak resident set size of its
+results is its own and not the peak of the benchmarks run before it.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from gptdb.core import Chunk, ModelMessage, ModelRequest
+from gptdb.util.benchmarks.rag.fakes import (
+    FakeEmbeddings,
+    FakeLLMClient,
+    FakeRerankModel,
+    generate_document,
+)
+
+
+@dataclass
+class BenchmarkResult:
+    """The result of a benchmark.
+
+    The latencies are measured per iteration, the throughput is the number of
+    processed items (chunks, queries, requests...) per second.
+    """
+
+    name: str
+    iterations: int
+    items: int
+    total_seconds: float
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dict."""
+        return asdict(self)
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of the process in MiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on Linux
+    return max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))
+    return sorted_values[index]
+
+
+def _result(
+    name: str, latencies: List[float], items_per_iteration: int
+) -> BenchmarkResult:
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    items = items_per_iteration * len(latencies)
+    return BenchmarkResult(
+        name=name,
+        iterations=len(latencies),
+        items=items,
+        total_seconds=round(total, 6),
+        throughput=round(items / total, 3) if total else 0.0,
+        p50_ms=round(_percentile(latencies, 50) * 1000, 4),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 4),
+        peak_rss_mb=round(peak_rss_mb(), 2),
+    )
+
+
+def measure(
+    name: str,
+    func: Callable[[int], Any],
+    iterations: int,
+    items_per_iteration: int = 1,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """Call ``func(i)`` for every iteration and measure it."""
+    for i in range(warmup):
+        func(-i - 1)
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - start)
+    return _result(name, latencies, items_per_iteration)
+
+
+async def ameasure(
+    name: str,
+    func: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    items_per_iteration: int = 1,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """Await ``func(i)`` for every iteration and measure it."""
+    for i in range(warmup):
+        await func(-i - 1)
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        await func(i)
+        latencies.append(time.perf_counter() - start)
+    return _result(name, latencies, items_per_iteration)
+
+
+def bench_text_splitter(scale: float) -> List[BenchmarkResult]:
+    """Split a long document with the recursive character splitter."""
+    from gptdb.rag.text_splitter.text_splitter import RecursiveCharacterTextSplitter
+
+    document = generate_document(int(50000 * scale))
+    splitter = RecursiveCharacterTextSplitter(chunk_size=512, chunk_overlap=50)
+    chunks = len(splitter.split_text(document))
+    return [
+        measure(
+            "text_splitter.recursive",
+            lambda i: splitter.split_text(document),
+            iterations=10,
+            items_per_iteration=chunks,
+        )
+    ]
+
+
+def bench_embedding(scale: float) -> List[BenchmarkResult]:
+    """Embed chunks through the async embedding interface."""
+    embeddings = FakeEmbeddings()
+    texts = [f"chunk {i} {generate_document(64, seed=i)}" for i in range(64)]
+    iterations = max(1, int(50 * scale))
+
+    async def _embed(i: int):
+        await embeddings.aembed_documents(texts)
+
+    return [
+        asyncio.run(
+            ameasure(
+                "embedding.aembed_documents",
+                _embed,
+                iterations,
+                items_per_iteration=len(texts),
+            )
+        )
+    ]
+
+
+def bench_llm_cache(scale: float) -> List[BenchmarkResult]:
+    """Look up the LLM cache in the memory storage."""
+    from gptdb.component import SystemApp
+    from gptdb.core import ModelOutput
+    from gptdb.storage.cache.llm_cache import LLMCacheClient
+    from gptdb.storage.cache.manager import LocalCacheManager
+    from gptdb.storage.cache.storage.base import MemoryCacheStorage
+    from gptdb.util.executor_utils import DefaultExecutorFactory
+    from gptdb.util.serialization.json_serialization import JsonSerializer
+
+    system_app = SystemApp()
+    system_app.register(DefaultExecutorFactory)
+    cache_manager = LocalCacheManager(
+        system_app, JsonSerializer(), MemoryCacheStorage(max_memory_mb=256)
+    )
+    client = LLMCacheClient(cache_manager)
+    keys = 1000
+    lookups = 100
+    iterations = max(1, int(20 * scale))
+
+    async def _run():
+        for i in range(keys):
+            key = client.new_key(prompt=f"prompt {i}", model_name="fake")
+            value = client.new_value(
+                output=ModelOutput(error_code=0, text=f"output {i}")
+            )
+            await client.set(key, value)
+
+        async def _lookup(n: int):
+            for j in range(lookups):
+                index = (n * lookups + j) % (keys * 2)
+                key = client.new_key(prompt=f"prompt {index}", model_name="fake")
+                await client.get(key)
+
+        return await ameasure(
+            "llm_cache.get", _lookup, iterations, items_per_iteration=lookups
+        )
+
+    return [asyncio.run(_run())]
+
+
+def bench_vector_store(scale: float) -> List[BenchmarkResult]:
+    """Insert chunks into and search a Chroma store in a temporary directory."""
+    from gptdb.storage.vector_store.chroma_store import ChromaStore, ChromaVectorConfig
+
+    chunk_count = int(2000 * scale)
+    batch = 100
+    chunks = [
+        Chunk(
+            content=generate_document(64, seed=i),
+            metadata={"source": f"doc_{i % 10}"},
+            chunk_id=f"chunk_{i}",
+        )
+        for i in range(chunk_count)
+    ]
+    queries = [generate_document(12, seed=100000 + i) for i in range(100)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ChromaStore(
+            ChromaVectorConfig(
+                name="benchmark", persist_path=tmp_dir, embedding_fn=FakeEmbeddings()
+            )
+        )
+        insert = measure(
+            "vector_store.chroma.insert",
+            lambda i: store.load_document_with_limit(
+                chunks[i * batch : (i + 1) * batch], max_chunks_once_load=10
+            ),
+            iterations=chunk_count // batch,
+            items_per_iteration=batch,
+            warmup=0,
+        )
+        search = measure(
+            "vector_store.chroma.search",
+            lambda i: store.similar_search_with_scores(
+                queries[i % len(queries)], topk=10, score_threshold=0.0
+            ),
+            iterations=len(queries),
+        )
+    return [insert, search]
+
+
+def _bench_ranker(
+    name: str, cache_size: int, candidates: List[str], queries: List[str]
+) -> BenchmarkResult:
+    from gptdb.rag.retriever.rerank import RerankEmbeddingsRanker
+    from gptdb.rag.retriever.rerank_registry import RerankModelRegistry
+
+    registry = RerankModelRegistry(idle_timeout=None, cache_size=cache_size)
+    ranker = RerankEmbeddingsRanker(
+        registry.acquire("fake", lambda: FakeRerankModel(1e-4)), topk=5
+    )
+    if cache_size:
+        # Warm up the cache
+        for query in queries:
+            ranker.rank([Chunk(content=c) for c in candidates], query)
+
+    async def _rank(i: int):
+        await ranker.arank(
+            [Chunk(content=c) for c in candidates], queries[i % len(queries)]
+        )
+
+    try:
+        return asyncio.run(
+            ameasure(name, _rank, len(queries), items_per_iteration=len(candidates))
+        )
+    finally:
+        registry.close()
+
+
+def bench_rerank(scale: float) -> List[BenchmarkResult]:
+    """Rerank the candidates without and with the score cache."""
+    candidates = [generate_document(48, seed=i) for i in range(50)]
+    queries = [
+        generate_document(8, seed=100000 + i) for i in range(max(1, int(100 * scale)))
+    ]
+    return [
+        _bench_ranker("rerank.uncached", 0, candidates, queries),
+        _bench_ranker("rerank.cached", 100000, candidates, queries),
+    ]
+
+
+def bench_awel(scale: float) -> List[BenchmarkResult]:
+    """Measure the overhead of calling AWEL DAGs."""
+    from gptdb.core.awel import (
+        DAG,
+        InputOperator,
+        MapOperator,
+        SimpleCallDataInputSource,
+    )
+    from gptdb.core.interface.operators.llm_operator import BaseLLMOperator
+
+    iterations = max(1, int(500 * scale))
+    with DAG("benchmark_map_chain"):
+        task = InputOperator(input_source=SimpleCallDataInputSource())
+        for _i in range(10):
+            next_task = MapOperator(lambda x: x + 1)
+            task >> next_task
+            task = next_task
+    map_chain = task
+
+    llm_client = FakeLLMClient(output_tokens=64)
+    with DAG("benchmark_llm"):
+        input_task = InputOperator(input_source=SimpleCallDataInputSource())
+        llm_task = BaseLLMOperator(llm_client)
+        input_task >> llm_task
+
+    def _request(i: int) -> ModelRequest:
+        return ModelRequest(
+            model="fake", messages=[ModelMessage.build_human_message(f"question {i}")]
+        )
+
+    async def _call_map_chain(i: int):
+        assert await map_chain.call(call_data=i) == i + 10
+
+    async def _call_llm(i: int):
+        await llm_task.call(call_data=_request(i))
+
+    async def _stream_llm(i: int):
+        async for _ in llm_client.generate_stream(_request(i)):
+            pass
+
+    async def _run():
+        return [
+            await ameasure("awel.map_chain_10", _call_map_chain, iterations),
+            await ameasure("awel.llm_operator", _call_llm, iterations),
+            await ameasure(
+                "llm.fake_stream",
+                _stream_llm,
+                iterations,
+                items_per_iteration=llm_client.output_tokens,
+            ),
+        ]
+
+    return asyncio.run(_run())
+
+
+BENCHMARKS: Dict[str, Callable[[float], List[BenchmarkResult]]] = {
+    "text_splitter": bench_text_splitter,
+    "embedding": bench_embedding,
+    "llm_cache": bench_llm_cache,
+    "vector_store": bench_vector_store,
+    "rerank": bench_rerank,
+    "awel": bench_awel,
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def _run_isolated(name: str, scale: float) -> List[BenchmarkResult]:
+    """Run a benchmark in a new process, its peak RSS is not shared."""
+    module = __spec__.name if __spec__ else __name__
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = os.path.join(tmp_dir, "report.json")
+        subprocess.run(
+            [sys.executable, "-m", module, "--benchmarks", name, "--scale", str(scale)]
+            + ["--no-isolate", "--output", output],
+            check=True,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(output, encoding="utf-8") as f:
+            report = json.load(f)
+    return [BenchmarkResult(**result) for result in report["results"]]
+
+
+def run_benchmarks(
+    names: Optional[List[str]] = None, scale: float = 1.0, isolate: bool = True
+) -> Dict[str, Any]:
+    """Run the benchmarks and return the JSON report.
+
+    Args:
+        names (Optional[List[str]]): The benchmarks to run, all if None.
+        scale (float): Scale the amount of the data and the iterations.
+        isolate (bool): Run every benchmark in its own process, so the peak RSS of
+            a benchmark does not include the ones run before it.
+    """
+    results: List[BenchmarkResult] = []
+    for name in names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            raise ValueError(
+                f"Unknown benchmark {name}, choose from {list(BENCHMARKS)}"
+            )
+        if isolate:
+            new_results = _run_isolated(name, scale)
+        else:
+            new_results = BENCHMARKS[name](scale)
+        results.extend(new_results)
+        for result in new_results:
+            print(
+                f"{result.name:<30}{result.throughput:>14.1f}/s"
+                f"{result.p50_ms:>12.3f} ms{result.p99_ms:>12.3f} ms"
+                f"{result.peak_rss_mb:>10.1f} MiB"
+            )
+    return {
+        "metadata": {
+            "commit": _git_commit(),
+            "time": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": scale,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def compare_reports(base: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Return the lines of the throughput and p99 changes of the benchmarks."""
+    base_results = {r["name"]: r for r in base["results"]}
+    lines = []
+    for result in current["results"]:
+        old = base_results.get(result["name"])
+        if not old or not old["throughput"] or not old["p99_ms"]:
+            continue
+        throughput = (result["throughput"] / old["throughput"] - 1) * 100
+        p99 = (result["p99_ms"] / old["p99_ms"] - 1) * 100
+        lines.append(
+            f"{result['name']:<30}throughput {throughput:+7.1f}%  p99 {p99:+7.1f}%"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--benchmarks",
+        nargs="*",
+        choices=list(BENCHMARKS),
+        help="The benchmarks to run, all by default.",
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--output", type=str, help="Write the JSON report to it.")
+    parser.add_argument("--compare", type=str, help="A JSON report to compare with.")
+    parser.add_argument(
+        "--no-isolate",
+        dest="isolate",
+        action="store_false",
+        help="Run all the benchmarks in this process, the peak RSS is cumulative.",
+    )
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<30}{'throughput':>16}{'p50':>15}{'p99':>15}{'peak rss':>14}")
+    report = run_benchmarks(args.benchmarks, args.scale, args.isolate)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+        print("\n".join(compare_reports(base, report)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark the overhead of the tracer on the chat path with a fake model.
+
+Each request builds a model request with the chat history, starts the spans of
+``BaseChat.stream_call`` and the model worker like the chat path does and streams
+the output of a fake model. The latency of the requests is compared with the
+tracer off, with the metadata built eagerly as the chat path did, with the lazy
+metadata and with the lazy metadata of 10% sampled traces. The spans are written
+by the background writer of the span storage, its work is not in the request
+latency but it shares the CPU with the requests.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.tracer.chat_tracing_benchmarks --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from gptdb.component import ComponentType, SystemApp
+from gptdb.core import ModelMessage, ModelMessageRoleType, ModelRequest
+from gptdb.util.benchmarks.rag.fakes import FakeLLMClient, generate_document
+from gptdb.util.tracer import SpanStorage, initialize_tracer, root_tracer
+
+
+def build_request(history_rounds: int, message_words: int, seed: int) -> ModelRequest:
+    messages = [ModelMessage(role=ModelMessageRoleType.SYSTEM, content="You are ...")]
+    for i in range(history_rounds):
+        text = generate_document(message_words, seed=seed * 1000 + i)
+        messages.append(ModelMessage(role=ModelMessageRoleType.HUMAN, content=text))
+        messages.append(ModelMessage(role=ModelMessageRoleType.AI, content=text))
+    messages.append(
+        ModelMessage(role=ModelMessageRoleType.HUMAN, content="What is the answer?")
+    )
+    return ModelRequest(model="fake", messages=messages, temperature=0.5)
+
+
+async def chat(client: FakeLLMClient, request: ModelRequest, lazy: bool) -> str:
+    metadata = request.to_dict if lazy else request.to_dict()
+    span = root_tracer.start_span("BaseChat.stream_call", metadata=metadata)
+    request.span_id = span.span_id
+
+    def _worker_metadata() -> Dict:
+        return {
+            "model": request.model,
+            "prompt": request.messages_to_string(),
+            "temperature": request.temperature,
+        }
+
+    worker_span = root_tracer.start_span(
+        "DefaultModelWorker.generate_stream",
+        parent_span_id=span.span_id,
+        metadata=_worker_metadata if lazy else _worker_metadata(),
+    )
+    text = ""
+    async for output in client.generate_stream(request):
+        text = output.text
+    worker_span.end()
+    span.end()
+    return text
+
+
+async def run_mode(
+    client: FakeLLMClient,
+    requests: List[ModelRequest],
+    lazy: bool,
+    enabled: bool,
+    sample_rate: float,
+    tracer_file: str,
+) -> Dict[str, float]:
+    storage: Optional[SpanStorage] = None
+    if enabled:
+        system_app = SystemApp()
+        initialize_tracer(
+            tracer_file,
+            system_app=system_app,
+            sample_rate=sample_rate,
+            max_metadata_bytes=64 * 1024,
+        )
+        storage = system_app.get_component(
+            ComponentType.TRACER_SPAN_STORAGE, SpanStorage
+        )
+    else:
+        root_tracer.initialize(None)
+
+    # Warm up
+    for request in requests[:20]:
+        await chat(client, request, lazy)
+    latencies = []
+    for request in requests:
+        start = time.perf_counter()
+        await chat(client, request, lazy)
+        latencies.append((time.perf_counter() - start) * 1000)
+    dropped = 0
+    if storage is not None:
+        # Wait for the writer thread
+        storage.before_stop()
+        storage.executor.shutdown(wait=True)
+        dropped = getattr(storage, "dropped_count", 0)
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "dropped": dropped,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--history-rounds", type=int, default=10)
+    parser.add_argument("--message-words", type=int, default=200)
+    parser.add_argument("--output-tokens", type=int, default=64)
+    parser.add_argument("--delay-per-token", type=float, default=0.0)
+    args = parser.parse_args()
+
+    client = FakeLLMClient(
+        output_tokens=args.output_tokens, delay_per_token=args.delay_per_token
+    )
+    modes = [
+        ("tracing off", False, True, 1.0),
+        ("tracing on, eager metadata", True, False, 1.0),
+        ("tracing on, lazy metadata", True, True, 1.0),
+        ("tracing on, lazy metadata, 10% sampled", True, True, 0.1),
+    ]
+    print(
+        f"{args.requests} requests, {args.history_rounds} history rounds of "
+        f"{args.message_words} words, {args.output_tokens} output tokens"
+    )
+    print(
+        f"{'mode':<42}{'mean (ms)':>11}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+        f"{'added (ms)':>12}{'dropped':>9}"
+    )
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, enabled, lazy, sample_rate in modes:
+            requests = [
+                build_request(args.history_rounds, args.message_words, i)
+                for i in range(args.requests)
+            ]
+            tracer_file = os.path.join(tmp_dir, f"{len(name)}_tracer.jsonl")
+            result = await run_mode(
+                client, requests, lazy, enabled, sample_rate, tracer_file
+            )
+            if baseline is None:
+                baseline = result["mean"]
+            added = result["mean"] - baseline
+            print(
+                f"{name:<42}{result['mean']:>11.3f}{result['p50']:>11.3f}"
+                f"{result['p95']:>11.3f}{added:>12.3f}{result['dropped']:>9}"
+            )
+    root_tracer.initialize(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
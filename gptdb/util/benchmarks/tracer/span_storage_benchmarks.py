@@ -0,0 +1,128 @@
+"""Benchmark the span queries of the JSONL span files and the SQLite span storage.
+
+Run it with:
+
+.. code-block:: shell
+
+    python -m gptdb.util.benchmarks.tracer.span_storage_benchmarks --spans 1000000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from gptdb.util.tracer.span_storage import (
+    SQLiteSpanStorage,
+    compute_latency_percentiles,
+)
+from gptdb.util.tracer.tracer_cli import read_spans_from_files
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+OPERATIONS = [f"operation_{i}" for i in range(20)]
+
+
+def generate_span_file(file_path: str, spans: int, seed: int = 42) -> str:
+    """Write the start and end records of ``spans // 2`` spans, return a trace id."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    trace_id = None
+    with open(file_path, "w", encoding="utf-8") as f:
+        for i in range(spans // 2):
+            trace_id = f"{i // 10:032x}"
+            start_time = start + timedelta(milliseconds=i * 5)
+            end_time = start_time + timedelta(milliseconds=rng.expovariate(1 / 50))
+            record = {
+                "span_type": "chat" if i % 10 == 0 else "base",
+                "trace_id": trace_id,
+                "span_id": f"{trace_id}:{i:016x}",
+                "parent_span_id": None,
+                "operation_name": OPERATIONS[i % len(OPERATIONS)],
+                "start_time": start_time.strftime(_TIME_FORMAT)[:-3],
+                "end_time": None,
+                "metadata": {"conv_uid": f"conv_{i // 10}", "user_input": "x" * 64},
+            }
+            f.write(json.dumps(record) + "\n")
+            record["end_time"] = end_time.strftime(_TIME_FORMAT)[:-3]
+            f.write(json.dumps(record) + "\n")
+    return trace_id
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def import_file(storage: SQLiteSpanStorage, file_path: str, batch_size: int = 10000):
+    spans = iter(read_spans_from_files([file_path]))
+    while True:
+        batch = list(itertools.islice(spans, batch_size))
+        if not batch:
+            break
+        storage.append_span_dicts(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spans", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "gptdb_tracer.jsonl")
+        trace_id = generate_span_file(file_path, args.spans)
+        file_size = os.path.getsize(file_path) / 1024 / 1024
+        print(f"Generated {args.spans} span records, size: {file_size:.2f} MiB")
+
+        storage = SQLiteSpanStorage(os.path.join(tmp_dir, "gptdb_tracer.db"))
+        _, import_ms = timed(import_file, storage, file_path)
+        print(f"import into SQLite: {import_ms:.2f} ms")
+
+        file_trace, file_trace_ms = timed(
+            lambda: [
+                s
+                for s in read_spans_from_files([file_path])
+                if s["trace_id"] == trace_id
+            ]
+        )
+        db_trace, db_trace_ms = timed(storage.query_spans, trace_id=trace_id)
+        assert len(file_trace) == len(db_trace)
+
+        file_chat, file_chat_ms = timed(
+            lambda: sorted(
+                (
+                    s
+                    for s in read_spans_from_files([file_path])
+                    if s["span_type"] == "chat"
+                ),
+                key=lambda s: s["start_time"],
+                reverse=True,
+            )[:20]
+        )
+        db_chat, db_chat_ms = timed(
+            storage.query_spans, span_type="chat", limit=20, desc=True
+        )
+        assert [s["span_id"] for s in file_chat] == [s["span_id"] for s in db_chat]
+
+        file_latency, file_latency_ms = timed(
+            compute_latency_percentiles, read_spans_from_files([file_path])
+        )
+        db_latency, db_latency_ms = timed(storage.latency_percentiles)
+        assert [r["count"] for r in file_latency] == [r["count"] for r in db_latency]
+        storage.close()
+
+        print(f"{'query':<28}{'file scan (ms)':>16}{'SQLite (ms)':>14}")
+        for name, file_ms, db_ms in [
+            ("trace by id", file_trace_ms, db_trace_ms),
+            ("latest 20 chat spans", file_chat_ms, db_chat_ms),
+            ("p50/p95/p99 by operation", file_latency_ms, db_latency_ms),
+        ]:
+            print(f"{name:<28}{file_ms:>16.2f}{db_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 """Utilities for the json_fixes package."""
 import json
 import logging
+import math
 import re
 from dataclasses import asdict, is_dataclass
-from datetime import date, datetime
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,54 @@ class EnhancedJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def to_json_value(value: Any) -> Any:
+    """Convert a value of a query result to a JSON serializable value.
+
+    The result is the same as the value in
+    ``json.loads(df.to_json(orient="records", date_format="iso", date_unit="s"))``
+    without the round trip through a JSON string.
+    """
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if math.isnan(value) or math.isinf(value) else value
+    if value != value:
+        # NaN or NaT
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.replace(microsecond=0, tzinfo=None).isoformat()
+    if isinstance(value, date):
+        return f"{value.isoformat()}T00:00:00"
+    if isinstance(value, time):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    if hasattr(value, "item"):
+        # numpy scalar
+        return to_json_value(value.item())
+    return str(value)
+
+
+def rows_to_json_records(
+    columns: Sequence[str], rows: Iterable[Sequence[Any]]
+) -> List[Dict[str, Any]]:
+    """Convert the rows of a query result to JSON serializable records."""
+    columns = [str(column) for column in columns]
+    return [
+        {column: to_json_value(value) for column, value in zip(columns, row)}
+        for row in rows
+    ]
+
+
+def df_to_json_records(df) -> List[Dict[str, Any]]:
+    """Convert a DataFrame to JSON serializable records."""
+    return rows_to_json_records(df.columns, df.itertuples(index=False, name=None))
+
+
 def extract_char_position(error_message: str) -> int:
     """Extract the character position from the JSONDecodeError message.
 
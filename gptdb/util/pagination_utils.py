@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 
 from gptdb._private.pydantic import BaseModel, ConfigDict, Field
 
@@ -15,3 +15,22 @@ class PaginationResult(BaseModel, Generic[T]):
     total_pages: int = Field(..., description="total number of pages")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Number of items per page")
+
+
+class CursorPaginationResult(BaseModel, Generic[T]):
+    """Keyset pagination result
+
+    The next page starts after the cursor, the cost of a page does not depend on how
+    many items are before it.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    items: List[T] = Field(..., description="The items in the current page")
+    next_cursor: Optional[int] = Field(
+        None, description="The cursor of the next page, None if it is the last page"
+    )
+    page_size: int = Field(..., description="Number of items per page")
+    total_count: Optional[int] = Field(
+        None, description="Total number of items, only counted if requested"
+    )
@@ -146,6 +146,52 @@ class BaseServerParameters(BaseParameters):
             "help": "The filename to store tracer span records",
         },
     )
+    tracer_sample_rate: Optional[float] = field(
+        default=float(os.getenv("TRACER_SAMPLE_RATE", "1.0")),
+        metadata={
+            "help": "The probability to record a trace, between 0 and 1",
+        },
+    )
+    tracer_slow_span_ms: Optional[float] = field(
+        default=(
+            float(os.getenv("TRACER_SLOW_SPAN_MS"))
+            if os.getenv("TRACER_SLOW_SPAN_MS")
+            else None
+        ),
+        metadata={
+            "help": "Always record the traces which have a span slower than it "
+            "(milliseconds) or failed, even if they are not sampled",
+        },
+    )
+    tracer_max_metadata_bytes: Optional[int] = field(
+        default=(
+            int(os.getenv("TRACER_MAX_METADATA_BYTES"))
+            if os.getenv("TRACER_MAX_METADATA_BYTES")
+            else None
+        ),
+        metadata={
+            "help": "The max bytes of the metadata of a span record, the long "
+            "strings are truncated",
+        },
+    )
+    tracer_max_queue_size: Optional[int] = field(
+        default=(
+            int(os.getenv("TRACER_MAX_QUEUE_SIZE"))
+            if os.getenv("TRACER_MAX_QUEUE_SIZE")
+            else None
+        ),
+        metadata={
+            "help": "The max number of span records waiting to be written, the "
+            "records beyond it are dropped, 10000 by default",
+        },
+    )
+    tracer_db_file: Optional[str] = field(
+        default=os.getenv("TRACER_DB_FILE"),
+        metadata={
+            "help": "The SQLite file to store tracer span records with indexes, "
+            "relative to the log directory",
+        },
+    )
     tracer_to_open_telemetry: Optional[bool] = field(
         default=os.getenv("TRACER_TO_OPEN_TELEMETRY", "False").lower() == "true",
         metadata={
@@ -1,15 +1,194 @@
 import asyncio
 import logging
+import threading
+import time
 import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 
+class LatencyHistogram:
+    """A rolling window of the latencies of a callee.
+
+    Args:
+        window (int): The number of recent latencies to keep.
+    """
+
+    def __init__(self, window: int = 200):
+        """Create a latency histogram."""
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        """Record a latency in seconds."""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def __len__(self) -> int:
+        """Return the number of recorded latencies."""
+        return len(self._latencies)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Return the latency percentile in seconds, None if there is no sample."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        return latencies[index]
+
+
+@dataclass
+class HedgePolicy:
+    """When to start the duplicates of a call.
+
+    The first call starts immediately. A duplicate starts when the running calls
+    have taken longer than the ``percentile`` latency of the callee, or right after
+    a call fails. The first successful result is returned and the other calls are
+    cancelled.
+
+    The latencies of the successful calls are recorded, and so are the elapsed
+    times of the cancelled calls. The latter are lower bounds of the real latencies,
+    so the delay still leans a little low when many calls are hedged.
+
+    Args:
+        percentile (float): The latency percentile to wait before a duplicate.
+        min_samples (int): The min number of latencies to compute the percentile,
+            ``default_delay`` is used before.
+        default_delay (float): Seconds to wait before a duplicate when there are not
+            enough latencies.
+        min_delay (float): The min seconds to wait before a duplicate.
+        window (int): The number of recent latencies kept for each callee.
+        key_func (Optional[Callable[..., str]]): Return the callee key from the call
+            arguments, e.g. the model name, the decorated function by default.
+    """
+
+    percentile: float = 95.0
+    min_samples: int = 20
+    default_delay: float = 0.0
+    min_delay: float = 0.0
+    window: int = 200
+    key_func: Optional[Callable[..., str]] = None
+
+    def __post_init__(self):
+        """Create the histograms of the callees."""
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, key: str) -> LatencyHistogram:
+        """Return the latency histogram of the callee."""
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = LatencyHistogram(self.window)
+            return self._histograms[key]
+
+    def hedge_delay(self, key: str) -> float:
+        """Return the seconds to wait before starting a duplicate of the call."""
+        histogram = self.histogram(key)
+        if len(histogram) < self.min_samples:
+            return max(self.default_delay, self.min_delay)
+        return max(histogram.percentile(self.percentile) or 0.0, self.min_delay)
+
+
+async def _first_success(
+    func,
+    args,
+    kwargs,
+    parallel_executions: int,
+    catch_exceptions,
+    hedge: Optional[HedgePolicy],
+    attempt_info: str,
+) -> Any:
+    """Run up to ``parallel_executions`` copies of the call, return the first result.
+
+    Raise the last caught exception if all the copies fail.
+    """
+    key = ""
+    histogram = None
+    delay = 0.0
+    if hedge is not None:
+        if hedge.key_func:
+            key = hedge.key_func(*args, **kwargs)
+        else:
+            key = getattr(func, "__qualname__", type(func).__qualname__)
+        histogram = hedge.histogram(key)
+        delay = hedge.hedge_delay(key)
+
+    async def _timed_call():
+        start = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            # The losing call has taken at least this long, leaving it out would
+            # only keep the fast winners and bias the delay downward
+            if histogram is not None:
+                histogram.record(time.monotonic() - start)
+            raise
+        if histogram is not None:
+            histogram.record(time.monotonic() - start)
+        return result
+
+    pending = set()
+    started = 0
+    last_exception = None
+
+    def _start(count: int):
+        nonlocal started
+        for _ in range(min(count, parallel_executions - started)):
+            pending.add(asyncio.ensure_future(_timed_call()))
+            started += 1
+
+    _start(1 if delay > 0 else parallel_executions)
+    try:
+        while pending:
+            timeout = delay if started < parallel_executions else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.info(f"Hedging the slow call {key}, {attempt_info}")
+                _start(1)
+                continue
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    return task.result()
+                if not isinstance(exc, catch_exceptions):
+                    raise exc
+                last_exception = exc
+                logger.error(
+                    f"{attempt_info} failed with error: "
+                    f"{type(exc).__name__}, {str(exc)}"
+                )
+                logger.debug(
+                    "".join(
+                        traceback.format_exception(type(exc), exc, exc.__traceback__)
+                    )
+                )
+                # Replace the failed call without waiting for the delay
+                _start(1)
+    finally:
+        for task in pending:
+            task.cancel()
+    raise last_exception  # type: ignore
+
+
 def async_retry(
-    retries: int = 1, parallel_executions: int = 1, catch_exceptions=(Exception,)
+    retries: int = 1,
+    parallel_executions: int = 1,
+    catch_exceptions=(Exception,),
+    hedge: Optional[HedgePolicy] = None,
 ):
     """Async retry decorator.
 
+    Each attempt runs up to ``parallel_executions`` copies of the function, the
+    first successful result is returned and the other copies are cancelled. By
+    default all the copies start together, with a :class:`HedgePolicy` the
+    duplicates only start when the first call is slower than usual.
+
     Examples:
         .. code-block:: python
 
@@ -18,29 +197,34 @@ def async_retry(
                 # Some code that may raise exceptions
                 pass
 
+
+            @async_retry(parallel_executions=2, hedge=HedgePolicy(percentile=95))
+            async def my_hedged_func():
+                pass
+
     Args:
         retries (int): Number of retries.
         parallel_executions (int): Number of parallel executions.
         catch_exceptions (tuple): Tuple of exceptions to catch.
+        hedge (Optional[HedgePolicy]): Delay the duplicates of the call.
     """
 
     def decorator(func):
         async def wrapper(*args, **kwargs):
             last_exception = None
             for attempt in range(retries):
-                tasks = [func(*args, **kwargs) for _ in range(parallel_executions)]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                for result in results:
-                    if not isinstance(result, Exception):
-                        return result
-                    if isinstance(result, catch_exceptions):
-                        last_exception = result
-                        logger.error(
-                            f"Attempt {attempt + 1} of {retries} failed with error: "
-                            f"{type(result).__name__}, {str(result)}"
-                        )
-                        logger.debug(traceback.format_exc())
+                try:
+                    return await _first_success(
+                        func,
+                        args,
+                        kwargs,
+                        parallel_executions,
+                        catch_exceptions,
+                        hedge,
+                        f"Attempt {attempt + 1} of {retries}",
+                    )
+                except catch_exceptions as e:
+                    last_exception = e
 
                 logger.info(f"Retrying... (Attempt {attempt + 1} of {retries})")
 
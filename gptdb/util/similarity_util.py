@@ -1,5 +1,5 @@
 """Utility functions for calculating similarity."""
-from typing import TYPE_CHECKING, Any, List, Sequence
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
 
 if TYPE_CHECKING:
     from gptdb.core.interface.embeddings import Embeddings
@@ -48,6 +48,102 @@ def sigmoid_function(x: float) -> float:
     return 1 / (1 + np.exp(-x))
 
 
+class NormalizedEmbeddingMatrix:
+    """A growable, contiguous matrix of L2-normalized embeddings.
+
+    The cosine similarities between a vector and all the stored embeddings are
+    calculated by one matrix-vector product.
+
+    Examples:
+        .. code-block:: python
+
+            matrix = NormalizedEmbeddingMatrix()
+            matrix.append([1.0, 0.0])
+            matrix.append([0.0, 2.0])
+            assert matrix.similarities([1.0, 1.0]).round(4).tolist() == [
+                0.7071,
+                0.7071,
+            ]
+    """
+
+    def __init__(self, embeddings: Optional[Sequence[Sequence[float]]] = None):
+        """Create a normalized embedding matrix."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("numpy is required for NormalizedEmbeddingMatrix")
+        self._np = np
+        # Rows [0, _size) are valid, the rest is the reserved capacity
+        self._matrix: Optional[np.ndarray] = None
+        # The raw embeddings, keep them to return the original values
+        self._raw: List[List[float]] = []
+        self._size = 0
+        for embedding in embeddings or []:
+            self.append(embedding)
+
+    def __len__(self) -> int:
+        """Return the number of embeddings."""
+        return self._size
+
+    def _normalize(self, embedding: Sequence[float]) -> Any:
+        vector = self._np.asarray(embedding, dtype=self._np.float32).reshape(-1)
+        norm = self._np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def append(self, embedding: Sequence[float]) -> None:
+        """Append an embedding to the end of the matrix."""
+        np = self._np
+        vector = self._normalize(embedding)
+        if self._matrix is None:
+            self._matrix = np.zeros((4, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {vector.shape[0]} does not match the matrix "
+                f"dimension {self._matrix.shape[1]}"
+            )
+        if self._size == self._matrix.shape[0]:
+            # Double the capacity, amortized O(1) append
+            grown = np.zeros((self._size * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._raw.append(list(embedding))
+        self._size += 1
+
+    def pop(self, idx: int) -> List[float]:
+        """Remove the embedding at the index and return its raw value."""
+        if idx < 0:
+            idx += self._size
+        if idx < 0 or idx >= self._size or self._matrix is None:
+            raise IndexError("pop index out of range")
+        self._matrix[idx : self._size - 1] = self._matrix[idx + 1 : self._size]
+        self._size -= 1
+        return self._raw.pop(idx)
+
+    def select(self, indexes: Sequence[int]) -> None:
+        """Keep only the embeddings at the indexes, in the given order."""
+        if self._matrix is None:
+            return
+        self._matrix[: len(indexes)] = self._matrix[list(indexes)]
+        self._raw = [self._raw[i] for i in indexes]
+        self._size = len(indexes)
+
+    def similarities(self, embedding: Sequence[float]) -> Any:
+        """Return the cosine similarities between the embedding and all rows.
+
+        Returns:
+            numpy.ndarray: The cosine similarities, one for each stored embedding.
+        """
+        np = self._np
+        if self._matrix is None or self._size == 0:
+            return np.zeros(0, dtype=np.float32)
+        return self._matrix[: self._size] @ self._normalize(embedding)
+
+    def to_list(self) -> List[List[float]]:
+        """Return the raw embeddings."""
+        return list(self._raw)
+
+
 def calculate_cosine_similarity(
     embeddings: "Embeddings", prediction: str, contexts: Sequence[str]
 ) -> Any:
@@ -0,0 +1,42 @@
+import json
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from gptdb.util.json_utils import df_to_json_records, rows_to_json_records
+
+
+def test_df_to_json_records_matches_to_json():
+    df = pd.DataFrame(
+        {
+            "int": [1, 2, 3],
+            "float": [1.5, float("nan"), 3.0],
+            "str": ["a", None, "c"],
+            "date": [date(2024, 1, 2), None, date(2024, 3, 4)],
+            "datetime": pd.to_datetime(
+                ["2024-01-02 03:04:05.123", None, "2024-03-04 05:06:07.000"]
+            ),
+            "decimal": [Decimal("1.25"), Decimal("2"), None],
+            "bool": [True, False, True],
+        }
+    )
+    expected = json.loads(
+        df.to_json(orient="records", date_format="iso", date_unit="s")
+    )
+    assert df_to_json_records(df) == expected
+
+
+def test_rows_to_json_records():
+    rows = [
+        (
+            np.int64(1),
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            time(1, 2, 3),
+            b"bytes",
+        )
+    ]
+    assert rows_to_json_records(["id", "ts", "t", "b"], rows) == [
+        {"id": 1, "ts": "2024-01-02T03:04:05", "t": "01:02:03", "b": "bytes"}
+    ]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from gptdb.util.retry import HedgePolicy, LatencyHistogram, async_retry
+
+
+class FakeCallee:
+    """Return the configured result of each call after its delay."""
+
+    def __init__(self, plan):
+        # (delay, error) of each call, the last one is reused
+        self.plan = plan
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, value):
+        delay, error = self.plan[min(self.calls, len(self.plan) - 1)]
+        index = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if error:
+            raise error
+        return f"{value}-{index}"
+
+
+@pytest.mark.asyncio
+async def test_first_success_wins_and_cancels_the_rest():
+    callee = FakeCallee([(1.0, None), (0.05, None), (1.0, None)])
+    func = async_retry(parallel_executions=3)(callee)
+
+    start = time.monotonic()
+    assert await func("x") == "x-1"
+    assert time.monotonic() - start < 0.5
+    await asyncio.sleep(0)
+    assert callee.cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_copy_does_not_hide_success():
+    callee = FakeCallee([(0.01, ValueError("boom")), (0.05, None)])
+    func = async_retry(parallel_executions=2)(callee)
+    assert await func("x") == "x-1"
+
+
+@pytest.mark.asyncio
+async def test_all_failures_are_retried_then_raised():
+    callee = FakeCallee([(0.01, ValueError("boom"))])
+    func = async_retry(retries=2, parallel_executions=2)(callee)
+    with pytest.raises(ValueError, match="boom"):
+        await func("x")
+    assert callee.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_uncaught_exception_is_raised_immediately():
+    callee = FakeCallee([(0.01, KeyError("bad")), (1.0, None)])
+    func = async_retry(parallel_executions=2, catch_exceptions=(ValueError,))(callee)
+    start = time.monotonic()
+    with pytest.raises(KeyError):
+        await func("x")
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_hedge_starts_duplicate_after_delay():
+    hedge = HedgePolicy(default_delay=0.1, min_samples=1000)
+    fast = FakeCallee([(0.02, None)])
+    func = async_retry(parallel_executions=2, hedge=hedge)(fast)
+    assert await func("x") == "x-0"
+    # The first call is faster than the delay, no duplicate is started
+    assert fast.calls == 1
+
+    slow = FakeCallee([(1.0, None), (0.02, None)])
+    func = async_retry(parallel_executions=2, hedge=hedge)(slow)
+    start = time.monotonic()
+    assert await func("x") == "x-1"
+    elapsed = time.monotonic() - start
+    assert 0.1 <= elapsed < 0.5
+    await asyncio.sleep(0)
+    assert slow.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_latency_percentile():
+    hedge = HedgePolicy(
+        percentile=50, min_samples=5, default_delay=1.0, key_func=lambda v: v
+    )
+    callee = FakeCallee([(0.02, None)])
+    func = async_retry(parallel_executions=2, hedge=hedge)(callee)
+    for _ in range(5):
+        await func("model_a")
+    assert callee.calls == 5
+    assert 0.02 <= hedge.hedge_delay("model_a") < 0.1
+    # The other callee has no sample yet
+    assert hedge.hedge_delay("model_b") == 1.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_records_cancelled_call_latency():
+    hedge = HedgePolicy(default_delay=0.1, min_samples=1000, key_func=lambda v: v)
+    slow = FakeCallee([(1.0, None), (0.02, None)])
+    func = async_retry(parallel_executions=2, hedge=hedge)(slow)
+    assert await func("x") == "x-1"
+    await asyncio.sleep(0)
+    assert slow.cancelled == 1
+    # Both the winner and the cancelled slow call are recorded
+    histogram = hedge.histogram("x")
+    assert len(histogram) == 2
+    assert histogram.percentile(0) < 0.1 <= histogram.percentile(99)
+
+
+def test_latency_histogram_window():
+    histogram = LatencyHistogram(window=3)
+    assert histogram.percentile(99) is None
+    for latency in [5.0, 1.0, 2.0, 3.0]:
+        histogram.record(latency)
+    assert len(histogram) == 3
+    assert histogram.percentile(0) == 1.0
+    assert histogram.percentile(99) == 3.0
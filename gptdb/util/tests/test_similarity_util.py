@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from gptdb.util.similarity_util import NormalizedEmbeddingMatrix, cosine_similarity
+
+
+def test_similarities_match_cosine_similarity():
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(50, 8)).tolist()
+    query = rng.normal(size=8).tolist()
+    matrix = NormalizedEmbeddingMatrix(embeddings)
+
+    similarities = matrix.similarities(query)
+    expected = [cosine_similarity(e, query) for e in embeddings]
+    assert len(matrix) == 50
+    assert np.allclose(similarities, expected, atol=1e-5)
+
+
+def test_pop_and_select():
+    matrix = NormalizedEmbeddingMatrix([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    assert matrix.pop(0) == [1.0, 0.0]
+    assert matrix.to_list() == [[0.0, 1.0], [1.0, 1.0]]
+    matrix.select([1])
+    assert matrix.to_list() == [[1.0, 1.0]]
+    assert np.allclose(matrix.similarities([1.0, 1.0]), [1.0])
+
+
+def test_empty_and_dimension_mismatch():
+    matrix = NormalizedEmbeddingMatrix()
+    assert len(matrix.similarities([1.0, 0.0])) == 0
+    matrix.append([1.0, 0.0])
+    with pytest.raises(ValueError):
+        matrix.append([1.0, 0.0, 0.0])
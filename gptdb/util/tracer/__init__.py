@@ -8,10 +8,12 @@ from gptdb.util.tracer.base import (
     Tracer,
     TracerContext,
 )
+from gptdb.util.tracer.sampler import SpanSampler
 from gptdb.util.tracer.span_storage import (
     FileSpanStorage,
     MemorySpanStorage,
     SpanStorageContainer,
+    SQLiteSpanStorage,
 )
 from gptdb.util.tracer.tracer_impl import (
     DefaultTracer,
@@ -33,6 +35,8 @@ __all__ = [
     "MemorySpanStorage",
     "FileSpanStorage",
     "SpanStorageContainer",
+    "SQLiteSpanStorage",
+    "SpanSampler",
     "root_tracer",
     "trace",
     "initialize_tracer",
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import secrets
+import threading
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -38,9 +39,39 @@ class SpanTypeRunName(str, Enum):
         return [item.value for item in SpanTypeRunName]
 
 
+class _LazyMetadata:
+    """Evaluate a metadata function once, the copies of a span share the result."""
+
+    def __init__(self, func: Callable[[], Dict]):
+        self._func: Optional[Callable[[], Dict]] = func
+        self._value: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def value(self) -> Dict:
+        with self._lock:
+            if self._func is not None:
+                try:
+                    value = self._func()
+                except Exception as e:
+                    value = {"metadata_error": f"{type(e).__name__}: {e}"}
+                self._value = value if isinstance(value, dict) else {"value": value}
+                # Release the objects referenced by the function
+                self._func = None
+            return self._value or {}
+
+
+MetadataType = Union[Dict, Callable[[], Dict]]
+
+
 class Span:
     """Represents a unit of work that is being traced.
     This can be any operation like a function call or a database query.
+
+    The metadata can be a function which returns the metadata, it is only called
+    when the span is recorded, in the writer thread of the span storage, so the
+    spans dropped by the sampler don't pay for building large metadata such as the
+    prompt. The function should not depend on the objects changed after the span
+    starts.
     """
 
     def __init__(
@@ -50,8 +81,9 @@ class Span:
         span_type: SpanType = None,
         parent_span_id: str = None,
         operation_name: str = None,
-        metadata: Dict = None,
+        metadata: MetadataType = None,
         end_caller: Callable[[Span], None] = None,
+        max_metadata_bytes: Optional[int] = None,
     ):
         if not span_type:
             span_type = SpanType.BASE
@@ -68,8 +100,15 @@ class Span:
         self.start_time = datetime.now()
         # Timestamp when this span ended, initially None
         self.end_time = None
+        # The metadata built when the span is recorded
+        self._lazy_metadata: Optional[_LazyMetadata] = None
+        if callable(metadata):
+            self._lazy_metadata = _LazyMetadata(metadata)
+            metadata = None
         # Additional metadata associated with the span
         self.metadata = metadata or {}
+        # The max bytes of the serialized metadata, overrides the limit of the storage
+        self.max_metadata_bytes = max_metadata_bytes
         self._end_callers = []
         if end_caller:
             self._end_callers.append(end_caller)
@@ -79,6 +118,7 @@ class Span:
         self.end_time = datetime.now()
         if "metadata" in kwargs:
             self.metadata = kwargs.get("metadata")
+            self._lazy_metadata = None
         for caller in self._end_callers:
             caller(self)
 
@@ -86,6 +126,16 @@ class Span:
         if end_caller:
             self._end_callers.append(end_caller)
 
+    def resolve_metadata(self) -> Dict:
+        """Evaluate the lazy metadata and merge it into :attr:`metadata`.
+
+        The keys set on :attr:`metadata` take precedence over the lazy metadata.
+        """
+        if self._lazy_metadata is not None:
+            self.metadata = {**self._lazy_metadata.value(), **(self.metadata or {})}
+            self._lazy_metadata = None
+        return self.metadata
+
     def __enter__(self):
         return self
 
@@ -94,6 +144,7 @@ class Span:
         return False
 
     def to_dict(self) -> Dict:
+        metadata = self.resolve_metadata()
         return {
             "span_type": self.span_type.value,
             "trace_id": self.trace_id,
@@ -110,7 +161,7 @@ class Span:
                 if not self.end_time
                 else self.end_time.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
             ),
-            "metadata": _clean_for_json(self.metadata) if self.metadata else None,
+            "metadata": _clean_for_json(metadata) if metadata else None,
         }
 
     def copy(self) -> Span:
@@ -123,7 +174,9 @@ class Span:
             self.parent_span_id,
             self.operation_name,
             metadata=metadata,
+            max_metadata_bytes=self.max_metadata_bytes,
         )
+        span._lazy_metadata = self._lazy_metadata
         span.start_time = self.start_time
         span.end_time = self.end_time
         return span
@@ -182,10 +235,14 @@ class Tracer(BaseComponent, ABC):
         operation_name: str,
         parent_span_id: str = None,
         span_type: SpanType = None,
-        metadata: Dict = None,
+        metadata: MetadataType = None,
+        max_metadata_bytes: Optional[int] = None,
     ) -> Span:
         """Begin a new span for the given operation. If provided, the span will be
         a child of the span with the given parent_span_id.
+
+        The metadata can be a function which is called when the span is recorded,
+        ``max_metadata_bytes`` caps the serialized metadata of this span.
         """
 
     @abstractmethod
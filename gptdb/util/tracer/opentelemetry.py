@@ -48,6 +48,7 @@ class OpenTelemetrySpanStorage(SpanStorage):
 
     def append_span(self, span: Span):
         span_id = span.span_id
+        span.resolve_metadata()
 
         if span_id in self.spans:
             otel_span = self.spans.pop(span_id)
@@ -0,0 +1,179 @@
+"""Span sampling and metadata size caps applied when spans are recorded."""
+
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from gptdb.util.tracer.base import Span, SpanType, _clean_for_json
+
+_TRUNCATED_MARKER = "...[truncated {} chars]"
+
+
+class SpanSampler:
+    """Decide which spans are recorded.
+
+    Head-based sampling keeps a trace with the probability of ``sample_rate``. The
+    decision is made from the trace id, so every service keeps or drops the same
+    trace without any coordination.
+
+    Tail-based sampling buffers the spans of the dropped traces for a while, if a
+    span of the trace ends with an error or takes longer than ``slow_span_ms``,
+    the buffered spans and the rest of the trace are kept.
+
+    The spans of :attr:`SpanType.RUN` are always kept, they record the parameters of
+    the running services.
+
+    Args:
+        sample_rate (float): The probability to keep a trace, between 0 and 1.
+        slow_span_ms (Optional[float]): Keep the trace which has a span slower than
+            it, tail-based sampling is disabled if None.
+        max_buffered_traces (int): The max number of dropped traces to buffer.
+        max_spans_per_trace (int): The max number of spans buffered for one trace.
+        buffer_ttl (float): Seconds, the buffered trace is discarded after it.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        slow_span_ms: Optional[float] = None,
+        max_buffered_traces: int = 1000,
+        max_spans_per_trace: int = 256,
+        buffer_ttl: float = 300,
+    ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in [0, 1], got {sample_rate}")
+        self._sample_rate = sample_rate
+        self._slow_span_ms = slow_span_ms
+        self._max_buffered_traces = max_buffered_traces
+        self._max_spans_per_trace = max_spans_per_trace
+        self._buffer_ttl = buffer_ttl
+        self._lock = threading.Lock()
+        # trace_id -> (first buffered time, buffered spans)
+        self._buffers: "OrderedDict[str, Tuple[float, List[Span]]]" = OrderedDict()
+        # The dropped traces which are kept by the tail-based sampling
+        self._kept_traces: "OrderedDict[str, None]" = OrderedDict()
+        self.dropped_count = 0
+
+    @property
+    def tail_sampling(self) -> bool:
+        """Whether the tail-based sampling is enabled."""
+        return self._slow_span_ms is not None
+
+    def head_sampled(self, trace_id: str) -> bool:
+        """Return whether the trace is kept by the head-based sampling."""
+        if self._sample_rate >= 1:
+            return True
+        if self._sample_rate <= 0:
+            return False
+        return zlib.crc32(trace_id.encode("utf-8")) / 2**32 < self._sample_rate
+
+    def sample(self, span: Span) -> List[Span]:
+        """Return the spans to be recorded after receiving the span.
+
+        The result may be empty if the span is dropped or buffered, or contain the
+        buffered spans of the trace when it is kept by the tail-based sampling.
+        """
+        if span.span_type == SpanType.RUN or self.head_sampled(span.trace_id):
+            return [span]
+        if not self.tail_sampling:
+            self.dropped_count += 1
+            return []
+        with self._lock:
+            if span.trace_id in self._kept_traces:
+                return [span]
+            if self._is_interesting(span):
+                _, buffered = self._buffers.pop(span.trace_id, (0, []))
+                self._kept_traces[span.trace_id] = None
+                while len(self._kept_traces) > self._max_buffered_traces:
+                    self._kept_traces.popitem(last=False)
+                return buffered + [span]
+            self._buffer(span)
+            return []
+
+    def _is_interesting(self, span: Span) -> bool:
+        if not span.end_time:
+            return False
+        if span.metadata and "error" in span.metadata:
+            return True
+        duration_ms = (span.end_time - span.start_time).total_seconds() * 1000
+        return duration_ms >= self._slow_span_ms
+
+    def _buffer(self, span: Span):
+        now = time.monotonic()
+        created, buffered = self._buffers.get(span.trace_id, (now, []))
+        if len(buffered) < self._max_spans_per_trace:
+            buffered.append(span)
+        else:
+            self.dropped_count += 1
+        self._buffers[span.trace_id] = (created, buffered)
+        # Discard the expired and the oldest buffers
+        while self._buffers:
+            trace_id, (first_time, spans) = next(iter(self._buffers.items()))
+            if (
+                len(self._buffers) <= self._max_buffered_traces
+                and now - first_time <= self._buffer_ttl
+            ):
+                break
+            self._buffers.pop(trace_id)
+            self.dropped_count += len(spans)
+
+
+def truncate_metadata(
+    metadata: Optional[Dict[str, Any]], max_bytes: Optional[int]
+) -> Optional[Dict[str, Any]]:
+    """Cap the serialized size of the span metadata.
+
+    The longest strings are truncated first, a marker with the number of removed
+    characters is appended to each truncated string. If the metadata is still too
+    large, it is replaced by a summary of its size.
+
+    Args:
+        metadata (Optional[Dict[str, Any]]): The metadata of the span.
+        max_bytes (Optional[int]): The max bytes of the serialized metadata, no
+            limit if None.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata which fits in the limit.
+    """
+    if not metadata or not max_bytes:
+        return metadata
+    data = _clean_for_json(metadata)
+    size = _json_size(data)
+    if size <= max_bytes:
+        return data
+    limit = _max_str_length(data)
+    while limit > 16:
+        limit //= 2
+        truncated = _truncate_strings(data, limit)
+        if _json_size(truncated) <= max_bytes:
+            return truncated
+    return {"metadata_truncated": True, "metadata_bytes": size}
+
+
+def _json_size(data: Any) -> int:
+    return len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _max_str_length(data: Any) -> int:
+    if isinstance(data, str):
+        return len(data)
+    if isinstance(data, dict):
+        return max((_max_str_length(v) for v in data.values()), default=0)
+    if isinstance(data, list):
+        return max((_max_str_length(v) for v in data), default=0)
+    return 0
+
+
+def _truncate_strings(data: Any, limit: int) -> Any:
+    if isinstance(data, str):
+        if len(data) <= limit:
+            return data
+        return data[:limit] + _TRUNCATED_MARKER.format(len(data) - limit)
+    if isinstance(data, dict):
+        return {k: _truncate_strings(v, limit) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_truncate_strings(v, limit) for v in data]
+    return data
@@ -1,15 +1,18 @@
 import datetime
 import json
 import logging
+import math
 import os
 import queue
+import sqlite3
 import threading
 import time
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from gptdb.component import SystemApp
 from gptdb.util.tracer.base import Span, SpanStorage
+from gptdb.util.tracer.sampler import SpanSampler, truncate_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +29,37 @@ class MemorySpanStorage(SpanStorage):
 
 
 class SpanStorageContainer(SpanStorage):
+    """Write the spans to the storages in batches in a background thread.
+
+    :meth:`append_span` only puts the span into a bounded queue, the sampling, the
+    lazy metadata and the metadata caps are handled in the writer thread, so the
+    traced code never waits for the serialization or the storages. When the queue
+    is full, the new spans are dropped and counted in :attr:`dropped_count`.
+
+    Args:
+        system_app (SystemApp): The system app.
+        batch_size (int): Flush the queue when it has so many spans.
+        flush_interval (int): Seconds, flush the queue at least once in it.
+        executor (Executor): Run the writes of the storages.
+        sampler (Optional[SpanSampler]): Decide which spans are recorded.
+        max_metadata_bytes (Optional[int]): The default max bytes of the serialized
+            metadata of a span, a span can set its own limit.
+        max_queue_size (int): The max number of spans waiting to be written.
+    """
+
     def __init__(
         self,
         system_app: SystemApp | None = None,
         batch_size=10,
         flush_interval=10,
         executor: Executor = None,
+        sampler: Optional[SpanSampler] = None,
+        max_metadata_bytes: Optional[int] = None,
+        max_queue_size: int = 10000,
     ):
         super().__init__(system_app)
+        self.sampler = sampler
+        self.max_metadata_bytes = max_metadata_bytes
         if not executor:
             executor = ThreadPoolExecutor(thread_name_prefix="trace_storage_sync_")
         self.executor = executor
@@ -41,11 +67,13 @@ class SpanStorageContainer(SpanStorage):
         self.last_date = (
             datetime.datetime.now().date()
         )  # Store the current date for checking date changes
-        self.queue = queue.Queue()
+        self.queue = queue.Queue(maxsize=max_queue_size)
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.last_flush_time = time.time()
         self.flush_signal_queue = queue.Queue()
+        self.dropped_count = 0
+        self._dropped_lock = threading.Lock()
         self.flush_thread = threading.Thread(
             target=self._flush_to_storages, daemon=True
         )
@@ -62,13 +90,44 @@ class SpanStorageContainer(SpanStorage):
         self.storages.append(storage)
 
     def append_span(self, span: Span):
-        self.queue.put(span)
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped_count += 1
+                dropped_count = self.dropped_count
+            if dropped_count == 1 or dropped_count % 1000 == 0:
+                logger.warning(
+                    f"The span queue is full, {dropped_count} spans are dropped"
+                )
         if self.queue.qsize() >= self.batch_size:
             try:
                 self.flush_signal_queue.put_nowait(True)
             except queue.Full:
                 pass  # If the signal queue is full, it's okay. The flush thread will handle it.
 
+    def _prepare_spans(self, spans: List[Span]) -> List[Span]:
+        """Sample the spans, build and cap their metadata.
+
+        A span which fails to be prepared is dropped alone, the others are kept.
+        """
+        prepared = []
+        for span in spans:
+            try:
+                prepared.extend(self._prepare_span(span))
+            except Exception as e:
+                logger.warning(f"Prepare span {span.span_id} failed: {str(e)}")
+        return prepared
+
+    def _prepare_span(self, span: Span) -> List[Span]:
+        sampled_spans = self.sampler.sample(span) if self.sampler else [span]
+        for sampled_span in sampled_spans:
+            metadata = sampled_span.resolve_metadata()
+            max_bytes = sampled_span.max_metadata_bytes or self.max_metadata_bytes
+            if max_bytes:
+                sampled_span.metadata = truncate_metadata(metadata, max_bytes)
+        return sampled_spans
+
     def _flush_to_storages(self):
         while not self._stop_event.is_set():
             interval = time.time() - self.last_flush_time
@@ -84,6 +143,10 @@ class SpanStorageContainer(SpanStorage):
             spans_to_write = []
             while not self.queue.empty():
                 spans_to_write.append(self.queue.get())
+            spans_to_write = self._prepare_spans(spans_to_write)
+            self.last_flush_time = time.time()
+            if not spans_to_write:
+                continue
             for s in self.storages:
 
                 def append_and_ignore_error(
@@ -100,7 +163,6 @@ class SpanStorageContainer(SpanStorage):
                     self.executor.submit(append_and_ignore_error, s, spans_to_write)
                 except RuntimeError:
                     append_and_ignore_error(s, spans_to_write)
-            self.last_flush_time = time.time()
 
     def before_stop(self):
         try:
@@ -161,3 +223,283 @@ class FileSpanStorage(SpanStorage):
                     logger.warning(
                         f"Write span to file failed: {str(e)}, span_data: {span_data}"
                     )
+
+
+_SPAN_COLUMNS = [
+    "span_type",
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+    "operation_name",
+    "start_time",
+    "end_time",
+    "metadata",
+]
+
+
+class SQLiteSpanStorage(SpanStorage):
+    """Store the spans in a SQLite database.
+
+    The spans are indexed by trace id, span type, start time and duration, so the
+    queries of a trace or the latency of the operations don't scan all the spans.
+    The times are stored in the same text format as :meth:`Span.to_dict`, which
+    can be compared as strings.
+    """
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS spans ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, span_type TEXT, "
+                "trace_id TEXT, span_id TEXT, parent_span_id TEXT, "
+                "operation_name TEXT, start_time TEXT, end_time TEXT, "
+                "duration_ms REAL, metadata TEXT)"
+            )
+            for name, columns in [
+                ("idx_spans_trace_id", "trace_id"),
+                ("idx_spans_type_start", "span_type, start_time"),
+                ("idx_spans_start", "start_time"),
+                ("idx_spans_op_duration", "operation_name, duration_ms"),
+            ]:
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON spans ({columns})"
+                )
+
+    def append_span(self, span: Span):
+        self.append_span_batch([span])
+
+    def append_span_batch(self, spans: List[Span]):
+        self.append_span_dicts(span.to_dict() for span in spans)
+
+    def append_span_dicts(self, spans: Iterable[Dict[str, Any]]):
+        """Write the spans in the format of :meth:`Span.to_dict`."""
+        rows = [self._to_row(span) for span in spans]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO spans ({', '.join(_SPAN_COLUMNS)}, duration_ms) "
+                f"VALUES ({', '.join(['?'] * (len(_SPAN_COLUMNS) + 1))})",
+                rows,
+            )
+
+    def query_spans(
+        self,
+        trace_id: Optional[str] = None,
+        span_id: Optional[str] = None,
+        span_type: Optional[str] = None,
+        parent_span_id: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        limit: Optional[int] = None,
+        desc: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Query the spans ordered by the start time.
+
+        Args:
+            trace_id (Optional[str]): The trace id.
+            span_id (Optional[str]): The span id.
+            span_type (Optional[str]): The span type.
+            parent_span_id (Optional[str]): The parent span id.
+            operation_name (Optional[str]): The operation name.
+            start_time (Optional[str]): The min start time, format:
+                "YYYY-MM-DD HH:MM:SS.mmm".
+            end_time (Optional[str]): The max start time.
+            limit (Optional[int]): The max number of spans to return.
+            desc (bool): Whether to order by the start time descending.
+
+        Returns:
+            List[Dict[str, Any]]: The spans in the format of :meth:`Span.to_dict`.
+        """
+        where, params = self._where(
+            trace_id=trace_id,
+            span_id=span_id,
+            span_type=span_type,
+            parent_span_id=parent_span_id,
+            operation_name=operation_name,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        order = "DESC" if desc else "ASC"
+        sql = (
+            f"SELECT {', '.join(_SPAN_COLUMNS)} FROM spans{where} "
+            f"ORDER BY start_time {order}, id {order}"
+        )
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def latency_percentiles(
+        self,
+        percentiles: Sequence[float] = (50, 95, 99),
+        span_type: Optional[str] = None,
+        operation_name: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the latency percentiles of each operation.
+
+        Only the finished spans are counted, the percentiles use the nearest-rank
+        method, each of them is read with the duration index.
+
+        Args:
+            percentiles (Sequence[float]): The percentiles to compute.
+            span_type (Optional[str]): Filter by the span type.
+            operation_name (Optional[str]): Filter by the operation name.
+            start_time (Optional[str]): The min start time.
+            end_time (Optional[str]): The max start time.
+
+        Returns:
+            List[Dict[str, Any]]: The latency of each operation, eg: [{
+                "operation_name": "op", "count": 10, "p50": 1.0, "p95": 2.0,
+                "p99": 3.0}]
+        """
+        filters = dict(
+            span_type=span_type,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        where, params = self._where(
+            operation_name=operation_name, finished=True, **filters
+        )
+        with self._lock:
+            counts = self._conn.execute(
+                "SELECT operation_name, COUNT(*) FROM spans"
+                f"{where} GROUP BY operation_name ORDER BY operation_name",
+                params,
+            ).fetchall()
+            results = []
+            for op_name, count in counts:
+                op_where, op_params = self._where(
+                    operation_name=op_name, finished=True, **filters
+                )
+                if op_name is None:
+                    # The spans without operation name make their own group
+                    op_where += " AND operation_name IS NULL"
+                item: Dict[str, Any] = {"operation_name": op_name, "count": count}
+                for p in percentiles:
+                    row = self._conn.execute(
+                        f"SELECT duration_ms FROM spans{op_where} "
+                        "ORDER BY duration_ms LIMIT 1 OFFSET ?",
+                        op_params + [_percentile_rank(count, p)],
+                    ).fetchone()
+                    item[_percentile_key(p)] = row[0] if row else None
+                results.append(item)
+        return results
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def before_stop(self):
+        self.close()
+
+    @staticmethod
+    def _where(
+        finished: bool = False, **filters: Optional[str]
+    ) -> Tuple[str, List[Any]]:
+        conditions = []
+        params: List[Any] = []
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key == "start_time":
+                conditions.append("start_time >= ?")
+            elif key == "end_time":
+                conditions.append("start_time <= ?")
+            else:
+                conditions.append(f"{key} = ?")
+            params.append(value)
+        if finished:
+            conditions.append("duration_ms IS NOT NULL")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    @staticmethod
+    def _to_row(span: Dict[str, Any]) -> tuple:
+        row = [span.get(key) for key in _SPAN_COLUMNS]
+        metadata = span.get("metadata")
+        row[_SPAN_COLUMNS.index("metadata")] = (
+            None if metadata is None else json.dumps(metadata, ensure_ascii=False)
+        )
+        return tuple(row) + (_span_duration_ms(span),)
+
+    @staticmethod
+    def _from_row(row: Sequence[Any]) -> Dict[str, Any]:
+        span = dict(zip(_SPAN_COLUMNS, row))
+        if span["metadata"] is not None:
+            span["metadata"] = json.loads(span["metadata"])
+        return span
+
+
+def compute_latency_percentiles(
+    spans: Iterable[Dict[str, Any]],
+    percentiles: Sequence[float] = (50, 95, 99),
+    span_type: Optional[str] = None,
+    operation_name: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Compute the latency percentiles of each operation from span records.
+
+    It is the in-memory counterpart of :meth:`SQLiteSpanStorage.latency_percentiles`
+    for the span files.
+
+    Args:
+        spans (Iterable[Dict[str, Any]]): The spans in the format of
+            :meth:`Span.to_dict`.
+        percentiles (Sequence[float]): The percentiles to compute.
+        span_type (Optional[str]): Filter by the span type.
+        operation_name (Optional[str]): Filter by the operation name.
+    """
+    durations: Dict[str, List[float]] = {}
+    for span in spans:
+        if span_type and span.get("span_type") != span_type:
+            continue
+        if operation_name and span.get("operation_name") != operation_name:
+            continue
+        duration = _span_duration_ms(span)
+        if duration is not None:
+            durations.setdefault(span.get("operation_name"), []).append(duration)
+    results = []
+    for op_name in sorted(durations, key=str):
+        values = sorted(durations[op_name])
+        item: Dict[str, Any] = {"operation_name": op_name, "count": len(values)}
+        for p in percentiles:
+            item[_percentile_key(p)] = values[_percentile_rank(len(values), p)]
+        results.append(item)
+    return results
+
+
+def _span_duration_ms(span: Dict[str, Any]) -> Optional[float]:
+    start_time, end_time = span.get("start_time"), span.get("end_time")
+    if not start_time or not end_time:
+        return None
+    delta = _parse_span_time(end_time) - _parse_span_time(start_time)
+    return delta.total_seconds() * 1000
+
+
+def _parse_span_time(value: str) -> datetime.datetime:
+    try:
+        # Much faster than strptime, it accepts the format of Span.to_dict
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
+
+
+def _percentile_rank(count: int, percentile: float) -> int:
+    """Return the zero-based nearest-rank index of the percentile."""
+    return min(max(math.ceil(percentile / 100 * count) - 1, 0), count - 1)
+
+
+def _percentile_key(percentile: float) -> str:
+    return f"p{percentile:g}"
@@ -11,10 +11,14 @@ import pytest
 from gptdb.util.tracer import (
     FileSpanStorage,
     Span,
+    SpanSampler,
     SpanStorage,
     SpanStorageContainer,
     SpanType,
+    SQLiteSpanStorage,
 )
+from gptdb.util.tracer.sampler import truncate_metadata
+from gptdb.util.tracer.span_storage import compute_latency_percentiles
 
 
 @pytest.fixture
@@ -173,3 +177,233 @@ async def test_container_flush_policy(
 
     spans_in_file = read_spans_from_file(filename)
     assert len(spans_in_file) == storage_container.batch_size
+
+
+def _finished_span(trace_id, span_id, op, duration_ms, metadata=None):
+    span = Span(trace_id, span_id, SpanType.BASE, None, op, metadata=metadata)
+    span.start_time = datetime(2024, 1, 1, 12, 0, 0)
+    span.end_time = span.start_time + timedelta(milliseconds=duration_ms)
+    return span
+
+
+@pytest.fixture
+def sqlite_storage():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage = SQLiteSpanStorage(os.path.join(tmp_dir, "spans.db"))
+        yield storage
+        storage.close()
+
+
+def test_sqlite_storage_query(sqlite_storage: SQLiteSpanStorage):
+    start_span = Span("t1", "t1:a", SpanType.CHAT, None, "op1", metadata={"k": "v"})
+    start_span.start_time = datetime(2024, 1, 1, 11, 0, 0)
+    sqlite_storage.append_span(start_span)
+    sqlite_storage.append_span_batch(
+        [
+            _finished_span("t1", "t1:a", "op1", 10),
+            _finished_span("t2", "t2:b", "op2", 20),
+        ]
+    )
+    spans = sqlite_storage.query_spans(trace_id="t1")
+    assert len(spans) == 2
+    assert spans[0] == start_span.to_dict()
+    assert sqlite_storage.query_spans(span_type="chat")[0]["metadata"] == {"k": "v"}
+    assert len(sqlite_storage.query_spans(limit=1)) == 1
+    assert sqlite_storage.query_spans(operation_name="op3") == []
+
+
+def test_sqlite_storage_latency_percentiles(sqlite_storage: SQLiteSpanStorage):
+    spans = [_finished_span(str(i), str(i), "op1", i + 1) for i in range(100)]
+    spans.append(_finished_span("x", "x", "op2", 5))
+    # Unfinished spans are not counted
+    spans.append(Span("y", "y", SpanType.BASE, None, "op2"))
+    sqlite_storage.append_span_batch(spans)
+
+    results = sqlite_storage.latency_percentiles()
+    assert results == [
+        {"operation_name": "op1", "count": 100, "p50": 50, "p95": 95, "p99": 99},
+        {"operation_name": "op2", "count": 1, "p50": 5, "p95": 5, "p99": 5},
+    ]
+    # Same results from the span records
+    assert compute_latency_percentiles(span.to_dict() for span in spans) == results
+    assert sqlite_storage.latency_percentiles([90], operation_name="op1") == [
+        {"operation_name": "op1", "count": 100, "p90": 90}
+    ]
+
+
+def test_sqlite_storage_latency_percentiles_without_operation_name(
+    sqlite_storage: SQLiteSpanStorage,
+):
+    spans = [_finished_span(str(i), str(i), "op", i + 1) for i in range(10)]
+    spans += [_finished_span(f"n{i}", f"n{i}", None, 100 + i) for i in range(4)]
+    sqlite_storage.append_span_batch(spans)
+
+    results = sqlite_storage.latency_percentiles([50, 99])
+    assert results == [
+        {"operation_name": None, "count": 4, "p50": 101, "p99": 103},
+        {"operation_name": "op", "count": 10, "p50": 5, "p99": 10},
+    ]
+    spans = [span.to_dict() for span in spans]
+    assert compute_latency_percentiles(spans, [50, 99]) == results
+
+
+def test_sampler_head_based():
+    sampler = SpanSampler(sample_rate=0.3)
+    trace_ids = [f"{i:032x}" for i in range(2000)]
+    kept = [t for t in trace_ids if sampler.sample(Span(t, t, SpanType.BASE))]
+    assert 400 < len(kept) < 800
+    # The decision of the same trace is stable
+    assert all(sampler.head_sampled(t) for t in kept)
+    # The run spans are always kept
+    assert SpanSampler(sample_rate=0).sample(Span("t", "t", SpanType.RUN))
+
+
+def test_sampler_tail_based():
+    sampler = SpanSampler(sample_rate=0, slow_span_ms=100)
+    start_span = Span("slow", "slow:a", SpanType.BASE, None, "op")
+    assert sampler.sample(start_span) == []
+    assert sampler.sample(_finished_span("fast", "fast:a", "op", 1)) == []
+
+    slow_span = _finished_span("slow", "slow:a", "op", 200)
+    assert sampler.sample(slow_span) == [start_span, slow_span]
+    # The rest spans of the kept trace are recorded directly
+    child_span = Span("slow", "slow:b", SpanType.BASE, "slow:a", "child")
+    assert sampler.sample(child_span) == [child_span]
+
+    error_span = _finished_span("error", "error:a", "op", 1, {"error": "failed"})
+    assert sampler.sample(error_span) == [error_span]
+
+
+def test_truncate_metadata():
+    metadata = {"prompt": "x" * 10000, "model_name": "m", "tokens": [1, 2]}
+    assert truncate_metadata(metadata, None) is metadata
+    truncated = truncate_metadata(metadata, 1024)
+    assert len(json.dumps(truncated)) <= 1024
+    assert truncated["model_name"] == "m"
+    assert truncated["tokens"] == [1, 2]
+    assert truncated["prompt"].startswith("x")
+    assert "truncated" in truncated["prompt"]
+
+    too_large = truncate_metadata({"values": list(range(1000))}, 100)
+    assert too_large["metadata_truncated"]
+
+
+@pytest.mark.asyncio
+async def test_container_sample_and_cap(storage: FileSpanStorage):
+    storage_container = SpanStorageContainer(
+        batch_size=1,
+        sampler=SpanSampler(sample_rate=0),
+        max_metadata_bytes=256,
+    )
+    storage_container.append_storage(storage)
+    storage_container.append_span(Span("t", "t:a", SpanType.BASE, None, "op"))
+    storage_container.append_span(
+        Span("t", "t:b", SpanType.RUN, None, "run", metadata={"params": "x" * 1000})
+    )
+    await asyncio.sleep(0.1)
+
+    spans_in_file = read_spans_from_file(storage.filename)
+    assert len(spans_in_file) == 1
+    assert spans_in_file[0]["span_type"] == "run"
+    assert len(json.dumps(spans_in_file[0]["metadata"])) <= 256
+
+
+@pytest.mark.asyncio
+async def test_container_lazy_metadata(storage: FileSpanStorage):
+    calls = []
+
+    def _metadata(name: str):
+        def _build():
+            calls.append(name)
+            return {"name": name, "prompt": "x" * 1000}
+
+        return _build
+
+    storage_container = SpanStorageContainer(
+        batch_size=1, sampler=SpanSampler(sample_rate=0)
+    )
+    storage_container.append_storage(storage)
+    dropped = Span("t", "t:a", SpanType.BASE, None, "op", metadata=_metadata("a"))
+    kept = Span("t", "t:b", SpanType.RUN, None, "run", metadata=_metadata("b"))
+    kept.metadata["model_name"] = "m"
+    # The copies of a span share the lazy metadata
+    storage_container.append_span(kept.copy())
+    storage_container.append_span(dropped)
+    kept.end()
+    storage_container.append_span(kept.copy())
+    await asyncio.sleep(0.1)
+
+    # The metadata of the dropped span is never built
+    assert calls == ["b"]
+    spans_in_file = read_spans_from_file(storage.filename)
+    assert len(spans_in_file) == 2
+    for span in spans_in_file:
+        assert span["metadata"]["name"] == "b"
+        assert span["metadata"]["model_name"] == "m"
+
+
+def test_span_lazy_metadata():
+    span = Span("t", "t:a", metadata=lambda: {"a": 1, "b": 2})
+    span.metadata["b"] = 3
+    assert span.to_dict()["metadata"] == {"a": 1, "b": 3}
+
+    failed = Span("t", "t:b", metadata=lambda: 1 / 0)
+    assert "ZeroDivisionError" in failed.resolve_metadata()["metadata_error"]
+
+    # The metadata passed to end replaces the lazy metadata
+    ended = Span("t", "t:c", metadata=lambda: {"a": 1})
+    ended.end(metadata={"error": "failed"})
+    assert ended.to_dict()["metadata"] == {"error": "failed"}
+
+
+@pytest.mark.asyncio
+async def test_container_span_metadata_budget(storage: FileSpanStorage):
+    storage_container = SpanStorageContainer(batch_size=1, max_metadata_bytes=4096)
+    storage_container.append_storage(storage)
+    storage_container.append_span(
+        Span("t", "t:a", SpanType.BASE, None, "op", metadata={"p": "x" * 3000})
+    )
+    storage_container.append_span(
+        Span(
+            "t",
+            "t:b",
+            SpanType.BASE,
+            None,
+            "op",
+            metadata=lambda: {"p": "x" * 3000},
+            max_metadata_bytes=256,
+        )
+    )
+    await asyncio.sleep(0.1)
+
+    spans_in_file = read_spans_from_file(storage.filename)
+    assert len(spans_in_file) == 2
+    assert spans_in_file[0]["metadata"]["p"] == "x" * 3000
+    capped = spans_in_file[1]["metadata"]
+    assert len(json.dumps(capped)) <= 256
+    assert "truncated" in capped["p"]
+
+
+def test_container_drops_spans_when_queue_is_full():
+    storage_container = SpanStorageContainer(
+        batch_size=100, flush_interval=100, max_queue_size=5
+    )
+    for i in range(8):
+        storage_container.append_span(Span("t", f"t:{i}", SpanType.BASE))
+    assert storage_container.queue.qsize() == 5
+    assert storage_container.dropped_count == 3
+
+
+def test_container_prepare_drops_only_failed_span():
+    storage_container = SpanStorageContainer(batch_size=100, flush_interval=100)
+    bad = Span("t", "t:bad", SpanType.BASE, metadata=lambda: {"a": 1})
+    # Not a mapping, merging it with the lazy metadata fails
+    bad.metadata = ["not a dict"]
+    spans = [
+        Span("t", "t:a", SpanType.BASE, metadata=lambda: {"a": 1}),
+        bad,
+        Span("t", "t:b", SpanType.BASE, metadata={"b": 2}),
+    ]
+    prepared = storage_container._prepare_spans(spans)
+    assert [span.span_id for span in prepared] == ["t:a", "t:b"]
+    assert prepared[0].metadata == {"a": 1}
@@ -1,9 +1,10 @@
 import glob
+import itertools
 import json
 import logging
 import os
 from datetime import datetime
-from typing import Callable, Dict, Iterable
+from typing import Callable, Dict, Iterable, List, Tuple
 
 import click
 
@@ -110,8 +111,28 @@ def list(
     """List your trace spans"""
     from prettytable import PrettyTable
 
+    file_patterns, db_files = _split_span_sources(files)
     # If no files are explicitly specified, use the default pattern to get them
-    spans = read_spans_from_files(files)
+    spans = (
+        read_spans_from_files(file_patterns) if file_patterns or not db_files else []
+    )
+    # The filters are pushed down to the indexes of the SQLite files
+    spans = itertools.chain(
+        spans,
+        *(
+            _open_span_db(db_file).query_spans(
+                trace_id=trace_id,
+                span_id=span_id,
+                span_type=span_type,
+                parent_span_id=parent_span_id,
+                start_time=start_time,
+                end_time=end_time,
+                limit=None if search else limit,
+                desc=desc,
+            )
+            for db_file in db_files
+        ),
+    )
 
     if trace_id:
         spans = filter(lambda s: s["trace_id"] == trace_id, spans)
@@ -182,6 +203,132 @@ def tree(trace_id: str, files):
     _print_trace_hierarchy(hierarchy)
 
 
+@trace_cli_group.command()
+@click.option(
+    "--span_type",
+    required=False,
+    type=str,
+    default=None,
+    help="Only count the spans of the span type.",
+)
+@click.option(
+    "--operation_name",
+    required=False,
+    type=str,
+    default=None,
+    help="Only count the spans of the operation.",
+)
+@click.option(
+    "--percentiles",
+    type=str,
+    default="50,95,99",
+    show_default=True,
+    help="The percentiles to compute, split by `,`",
+)
+@click.option(
+    "--start_time",
+    type=str,
+    help='Filter by start time. Format: "YYYY-MM-DD HH:MM:SS.mmm"',
+)
+@click.option(
+    "--end_time", type=str, help='Filter by end time. Format: "YYYY-MM-DD HH:MM:SS.mmm"'
+)
+@click.option(
+    "--output",
+    required=False,
+    type=click.Choice(["text", "html", "csv", "latex", "json"]),
+    default="text",
+    help="The output format",
+)
+@click.argument("files", nargs=-1, type=click.Path(exists=True, readable=True))
+def latency(
+    span_type: str,
+    operation_name: str,
+    percentiles: str,
+    start_time: str,
+    end_time: str,
+    output: str,
+    files=None,
+):
+    """Show the latency percentiles(milliseconds) of each operation"""
+    from prettytable import PrettyTable
+
+    from gptdb.util.tracer.span_storage import compute_latency_percentiles
+
+    percentile_values = [float(p) for p in percentiles.split(",") if p.strip()]
+    file_patterns, db_files = _split_span_sources(files)
+    results = []
+    if file_patterns or not db_files:
+        spans = read_spans_from_files(file_patterns)
+        if start_time:
+            start_dt = _parse_datetime(start_time)
+            spans = filter(
+                lambda span: _parse_datetime(span["start_time"]) >= start_dt, spans
+            )
+        if end_time:
+            end_dt = _parse_datetime(end_time)
+            spans = filter(
+                lambda span: _parse_datetime(span["start_time"]) <= end_dt, spans
+            )
+        results.extend(
+            compute_latency_percentiles(
+                spans, percentile_values, span_type, operation_name
+            )
+        )
+    for db_file in db_files:
+        results.extend(
+            _open_span_db(db_file).latency_percentiles(
+                percentile_values,
+                span_type=span_type,
+                operation_name=operation_name,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        )
+    if not results:
+        _print_empty_message(files)
+        return
+    keys = [k for k in results[0].keys() if k not in ("operation_name", "count")]
+    table = PrettyTable(["Operation Name", "Count"] + keys)
+    for item in sorted(results, key=lambda r: r["count"], reverse=True):
+        table.add_row(
+            [item["operation_name"], item["count"]]
+            + [round(item[k], 3) if item[k] is not None else None for k in keys]
+        )
+    out_kwargs = {"ensure_ascii": False} if output == "json" else {}
+    print(table.get_formatted_string(out_format=output, **out_kwargs))
+
+
+@trace_cli_group.command("import")
+@click.option(
+    "--db",
+    required=True,
+    type=str,
+    help="The SQLite file to import the spans into.",
+)
+@click.option(
+    "--batch_size",
+    type=int,
+    default=10000,
+    show_default=True,
+    help="The number of spans written in one transaction.",
+)
+@click.argument("files", nargs=-1, type=click.Path(exists=True, readable=True))
+def import_spans(db: str, batch_size: int, files=None):
+    """Import the span files into an indexed SQLite file"""
+    storage = _open_span_db(db)
+    spans = iter(read_spans_from_files(files))
+    count = 0
+    while True:
+        batch = [*itertools.islice(spans, batch_size)]
+        if not batch:
+            break
+        storage.append_span_dicts(batch)
+        count += len(batch)
+    storage.close()
+    print(f"Imported {count} spans into {db}")
+
+
 @trace_cli_group.command()
 @click.option(
     "--trace_id",
@@ -414,17 +561,48 @@ def chat(
 def read_spans_from_files(files=None) -> Iterable[Dict]:
     """
     Reads spans from multiple files based on the provided file paths.
+
+    The SQLite span files written by `SQLiteSpanStorage` are read as well.
     """
     if not files:
         files = [_DEFAULT_FILE_PATTERN]
 
     for filepath in files:
         for filename in glob.glob(filepath):
+            if _is_sqlite_file(filename):
+                yield from _open_span_db(filename).query_spans()
+                continue
             with open(filename, "r") as file:
                 for line in file:
                     yield json.loads(line)
 
 
+def _is_sqlite_file(filename: str) -> bool:
+    try:
+        with open(filename, "rb") as f:
+            return f.read(16) == b"SQLite format 3\x00"
+    except OSError:
+        return False
+
+
+def _split_span_sources(files=None) -> Tuple[List[str], List[str]]:
+    """Split the span files into JSONL file patterns and SQLite files."""
+    file_patterns, db_files = [], []
+    for filepath in files or []:
+        filenames = glob.glob(filepath)
+        if filenames and all(_is_sqlite_file(f) for f in filenames):
+            db_files.extend(filenames)
+        else:
+            file_patterns.append(filepath)
+    return file_patterns, db_files
+
+
+def _open_span_db(filename: str):
+    from gptdb.util.tracer.span_storage import SQLiteSpanStorage
+
+    return SQLiteSpanStorage(filename)
+
+
 def _print_empty_message(files=None):
     if not files:
         files = [_DEFAULT_FILE_PATTERN]
@@ -505,8 +683,13 @@ def _build_trace_hierarchy(spans, parent_span_id=None, indent=0):
 
 def _view_trace_hierarchy(trace_id, files=None):
     """Find and display the calls of the entire link based on the given trace_id"""
-    spans = read_spans_from_files(files)
+    file_patterns, db_files = _split_span_sources(files)
+    spans = (
+        read_spans_from_files(file_patterns) if file_patterns or not db_files else []
+    )
     trace_spans = [span for span in spans if span["trace_id"] == trace_id]
+    for db_file in db_files:
+        trace_spans.extend(_open_span_db(db_file).query_spans(trace_id=trace_id))
     if not trace_spans:
         return None
     hierarchy = _build_trace_hierarchy(trace_spans)
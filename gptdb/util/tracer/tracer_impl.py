@@ -8,6 +8,7 @@ from typing import Any, AsyncIterator, Dict, Optional
 from gptdb.component import ComponentType, SystemApp
 from gptdb.util.module_utils import import_from_checked_string
 from gptdb.util.tracer.base import (
+    MetadataType,
     Span,
     SpanStorage,
     SpanStorageType,
@@ -43,7 +44,8 @@ class DefaultTracer(Tracer):
         operation_name: str,
         parent_span_id: str = None,
         span_type: SpanType = None,
-        metadata: Dict = None,
+        metadata: MetadataType = None,
+        max_metadata_bytes: Optional[int] = None,
     ) -> Span:
         trace_id = (
             self._new_random_trace_id()
@@ -59,6 +61,7 @@ class DefaultTracer(Tracer):
             parent_span_id,
             operation_name,
             metadata=metadata,
+            max_metadata_bytes=max_metadata_bytes,
         )
 
         if self._span_storage_type in [
@@ -126,22 +129,34 @@ class TracerManager:
         operation_name: str,
         parent_span_id: str = None,
         span_type: SpanType = None,
-        metadata: Dict = None,
+        metadata: MetadataType = None,
+        max_metadata_bytes: Optional[int] = None,
     ) -> Span:
         """Start a new span with operation_name
         This method must not throw an exception under any case and try not to block as much as possible
+
+        Pass a function as the metadata if it is expensive to build, e.g.
+        ``metadata=payload.to_dict``, it is only called when the span is recorded.
         """
         tracer = self._get_tracer()
         if not tracer:
             return Span(
-                "empty_span", "empty_span", span_type=span_type, metadata=metadata
+                "empty_span",
+                "empty_span",
+                span_type=span_type,
+                metadata=metadata,
+                max_metadata_bytes=max_metadata_bytes,
             )
         if not parent_span_id:
             parent_span_id = self.get_current_span_id()
         if not span_type and parent_span_id:
             span_type = self._get_current_span_type()
         return tracer.start_span(
-            operation_name, parent_span_id, span_type=span_type, metadata=metadata
+            operation_name,
+            parent_span_id,
+            span_type=span_type,
+            metadata=metadata,
+            max_metadata_bytes=max_metadata_bytes,
         )
 
     def end_span(self, span: Span, **kwargs):
@@ -244,9 +259,26 @@ def initialize_tracer(
     otlp_endpoint: Optional[str] = None,
     otlp_insecure: Optional[bool] = None,
     otlp_timeout: Optional[int] = None,
+    sample_rate: float = 1.0,
+    slow_span_ms: Optional[float] = None,
+    max_metadata_bytes: Optional[int] = None,
+    tracer_db_file: Optional[str] = None,
+    max_queue_size: Optional[int] = None,
 ):
-    """Initialize the tracer with the given filename and system app."""
-    from gptdb.util.tracer.span_storage import FileSpanStorage, SpanStorageContainer
+    """Initialize the tracer with the given filename and system app.
+
+    The traces are kept with the probability of ``sample_rate``, a dropped trace is
+    still recorded if one of its spans fails or takes longer than ``slow_span_ms``.
+    If ``tracer_db_file`` is set, the spans are also written to an indexed SQLite
+    database for fast queries. The spans are written in a background thread, at
+    most ``max_queue_size`` spans wait to be written, the others are dropped.
+    """
+    from gptdb.util.tracer.sampler import SpanSampler
+    from gptdb.util.tracer.span_storage import (
+        FileSpanStorage,
+        SpanStorageContainer,
+        SQLiteSpanStorage,
+    )
 
     if not system_app and create_system_app:
         system_app = SystemApp()
@@ -259,8 +291,18 @@ def initialize_tracer(
     )
     tracer = DefaultTracer(system_app)
 
-    storage_container = SpanStorageContainer(system_app)
+    sampler = None
+    if sample_rate < 1 or slow_span_ms is not None:
+        sampler = SpanSampler(sample_rate=sample_rate, slow_span_ms=slow_span_ms)
+    storage_container = SpanStorageContainer(
+        system_app,
+        sampler=sampler,
+        max_metadata_bytes=max_metadata_bytes,
+        max_queue_size=max_queue_size or 10000,
+    )
     storage_container.append_storage(FileSpanStorage(tracer_filename))
+    if tracer_db_file:
+        storage_container.append_storage(SQLiteSpanStorage(tracer_db_file))
     if enable_open_telemetry:
         from gptdb.util.tracer.opentelemetry import OpenTelemetrySpanStorage
 
@@ -1,7 +1,8 @@
 """Chart visualization protocol conversion class."""
-import json
 from typing import Any, Dict, Optional
 
+from gptdb.util.json_utils import df_to_json_records
+
 from ..base import Vis
 
 
@@ -80,9 +81,14 @@ class VisChart(Vis):
         param["title"] = chart.get("title", "")
         param["describe"] = chart.get("thought", "")
 
-        param["data"] = json.loads(
-            data_df.to_json(orient="records", date_format="iso", date_unit="s")
-        )
+        from gptdb.datasource.base import QueryResult
+
+        if isinstance(data_df, QueryResult):
+            param["data"] = data_df.to_records()
+            if data_df.truncated:
+                param["truncated"] = True
+        else:
+            param["data"] = df_to_json_records(data_df)
         return param
 
     @classmethod